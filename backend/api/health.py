@@ -9,8 +9,11 @@ import aiohttp
 from fastapi import APIRouter, Depends, HTTPException
 from loguru import logger
 
+from backend.audit import get_audit_logger
 from backend.database import check_connection
 from backend.dependencies import get_current_user
+from backend.post_call_jobs import get_post_call_worker
+from backend.webhook_delivery import get_webhook_delivery_worker
 
 router = APIRouter()
 
@@ -171,5 +174,8 @@ async def health_detailed(current_user: dict = Depends(get_current_user)):
     # Add environment info
     health_data["environment"] = os.getenv("ENV", "local")
     health_data["version"] = os.getenv("APP_VERSION", "unknown")
+    health_data["audit"] = get_audit_logger().stats()
+    health_data["webhooks"] = get_webhook_delivery_worker().stats()
+    health_data["post_call_jobs"] = get_post_call_worker().stats()
 
     return health_data
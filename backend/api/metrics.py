@@ -1,5 +1,7 @@
 """Metrics API endpoints for call analytics."""
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 
 from backend.dependencies import get_current_user, get_current_user_organization_id
@@ -48,6 +50,21 @@ async def get_error_breakdown(
     return {"breakdown": breakdown, "period": period}
 
 
+@router.get("/latency")
+async def get_latency_percentiles(
+    period: str = Query("day", pattern="^(day|week|month)$"),
+    workflow: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    org_id: str = Depends(get_current_user_organization_id),
+):
+    """Get p50/p90/p95/p99 latency per component, overall and per workflow.
+
+    Components: v2v (voice-to-voice), stt, llm_ttfb, tts_ttfb.
+    """
+    metrics = get_metrics_collector()
+    return await metrics.get_latency_percentiles(org_id, period, workflow)
+
+
 @router.get("/daily")
 async def get_daily_metrics(
     current_user: dict = Depends(get_current_user),
@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from loguru import logger
 from slowapi import Limiter
 
@@ -13,7 +17,15 @@ from backend.dependencies import (
     log_phi_access,
 )
 from backend.models import AsyncPatientRecord
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
 from backend.schemas import BulkPatientRequest, BulkUploadResponse, PatientCreate, PatientResponse
+from backend.services.patient_import import (
+    ImportFormatError,
+    PatientImporter,
+    get_import_job,
+    iter_upload_rows,
+    start_import_job,
+)
 from backend.utils import convert_objectid, mask_id
 
 router = APIRouter()
@@ -24,19 +36,29 @@ limiter = Limiter(key_func=get_user_id_from_request)
 async def list_patients(
     request: Request,
     workflow: str = None,
+    call_status: str = None,
+    cursor: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: str = Query("list", pattern="^(list|detail)$"),
     current_user: dict = Depends(get_current_user),
     org_id: str = Depends(get_current_user_organization_id),
     patient_db: AsyncPatientRecord = Depends(get_patient_db),
     audit_logger: AuditLogger = Depends(get_audit_logger_dep)
 ):
+    """List patients newest first.
+
+    Returns at most limit patients (DEFAULT_PAGE_SIZE by default); pass the
+    returned next_cursor as cursor for the next page. view=list omits
+    transcripts and SMS conversation state.
+    """
     try:
         logger.info(f"Fetching patients for org, workflow={workflow}")
 
-        all_patients = await patient_db.find_patients_by_organization(org_id, workflow=workflow)
-
-        logger.info(f"🔍 Found {len(all_patients)} patients for organization")
+        page, next_cursor = await patient_db.find_patients_by_organization(
+            org_id, workflow=workflow, call_status=call_status, cursor=cursor, limit=limit, view=view
+        )
 
-        patients = [convert_objectid(p) for p in all_patients]
+        patients = [convert_objectid(p) for p in page]
 
         ip_address, user_agent = get_client_info(request)
         await audit_logger.log_phi_access(
@@ -47,7 +69,7 @@ async def list_patients(
             ip_address=ip_address,
             user_agent=user_agent,
             endpoint=request.url.path,
-            details={"count": len(patients), "workflow": workflow},
+            details={"count": len(patients), "workflow": workflow, "call_status": call_status},
             organization_id=org_id
         )
 
@@ -55,14 +77,56 @@ async def list_patients(
 
         return {
             "patients": patients,
-            "total_count": len(patients)
+            "total_count": len(patients),
+            "next_cursor": next_cursor
         }
 
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         logger.exception("Error fetching patients")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+@limiter.limit("10/minute")
+async def export_patients(
+    request: Request,
+    workflow: str = None,
+    call_status: str = None,
+    view: str = Query("list", pattern="^(list|detail)$"),
+    current_user: dict = Depends(get_current_user),
+    org_id: str = Depends(get_current_user_organization_id),
+    patient_db: AsyncPatientRecord = Depends(get_patient_db),
+    audit_logger: AuditLogger = Depends(get_audit_logger_dep)
+):
+    """Stream all matching patients as NDJSON (one JSON document per line)."""
+    ip_address, user_agent = get_client_info(request)
+    await audit_logger.log_phi_access(
+        user_id=current_user["sub"],
+        action="export",
+        resource_type="patient",
+        resource_id="all",
+        ip_address=ip_address,
+        user_agent=user_agent,
+        endpoint=request.url.path,
+        details={"workflow": workflow, "call_status": call_status, "view": view},
+        organization_id=org_id
+    )
+
+    async def ndjson():
+        async for patient in patient_db.iter_patients_by_organization(
+            org_id, workflow=workflow, call_status=call_status, view=view
+        ):
+            yield json.dumps(convert_objectid(patient), default=str) + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="patients.ndjson"'}
+    )
+
+
 @router.get("/{patient_id}")
 async def get_patient_by_id(
     patient_id: str,
@@ -146,27 +210,12 @@ async def add_patients_bulk(
     patient_db: AsyncPatientRecord = Depends(get_patient_db),
     audit_logger: AuditLogger = Depends(get_audit_logger_dep)
 ):
-    success_count = 0
-    failed_count = 0
-    errors = []
-    created_ids = []
-
-    for idx, patient_model in enumerate(bulk_request.patients):
-        patient_dict = patient_model.model_dump()
-        patient_dict['organization_id'] = org_id
-
-        patient_id = await patient_db.add_patient(patient_dict)
-
-        if patient_id:
-            success_count += 1
-            created_ids.append(patient_id)
-            logger.info(f"Bulk add: patient {mask_id(patient_id)} to org {mask_id(org_id)}")
-        else:
-            failed_count += 1
-            errors.append({
-                "row": idx + 1,
-                "error": "Database insertion failed"
-            })
+    rows = (patient_model.model_dump() for patient_model in bulk_request.patients)
+    importer = await PatientImporter(patient_db, org_id).ingest(rows)
+    logger.info(
+        f"Bulk add: {importer.success_count} patients to org {mask_id(org_id)} "
+        f"({importer.duplicate_count} duplicates, {importer.failed_count} failed)"
+    )
 
     ip_address, user_agent = get_client_info(request)
     await audit_logger.log_phi_access(
@@ -177,19 +226,98 @@ async def add_patients_bulk(
         ip_address=ip_address,
         user_agent=user_agent,
         endpoint=request.url.path,
-        details={"success_count": success_count, "failed_count": failed_count},
+        details={
+            "success_count": importer.success_count,
+            "failed_count": importer.failed_count,
+            "duplicate_count": importer.duplicate_count,
+        },
         organization_id=org_id
     )
 
-    return BulkUploadResponse(
-        status="completed",
-        success_count=success_count,
-        failed_count=failed_count,
-        total=len(bulk_request.patients),
-        created_ids=created_ids,
-        errors=errors if errors else None
+    return BulkUploadResponse(status="completed", **importer.summary())
+
+
+@router.post("/import")
+@limiter.limit("5/hour")
+async def import_patients(
+    request: Request,
+    file: UploadFile = File(...),
+    workflow: Optional[str] = Form(None),
+    background: bool = Form(False),
+    current_user: dict = Depends(get_current_user),
+    org_id: str = Depends(get_current_user_organization_id),
+    patient_db: AsyncPatientRecord = Depends(get_patient_db),
+    audit_logger: AuditLogger = Depends(get_audit_logger_dep)
+):
+    """Import patients from a CSV or XLSX file (header row + one patient per row).
+
+    workflow is used for rows without a workflow column. With background=true
+    the import runs as a job; poll GET /patients/import/{job_id} for progress.
+    """
+    filename = file.filename or ""
+    try:
+        rows = iter_upload_rows(filename, file.file)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    ip_address, user_agent = get_client_info(request)
+    audit_details = {"filename": filename, "workflow": workflow, "background": background}
+
+    if background:
+        job_id = await start_import_job(
+            patient_db, org_id, filename, file.file, workflow, current_user["sub"]
+        )
+        await audit_logger.log_phi_access(
+            user_id=current_user["sub"],
+            action="import",
+            resource_type="patient",
+            resource_id=job_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            endpoint=request.url.path,
+            details=audit_details,
+            organization_id=org_id
+        )
+        return JSONResponse(status_code=202, content={"status": "running", "job_id": job_id})
+
+    try:
+        importer = await PatientImporter(patient_db, org_id, default_workflow=workflow).ingest(rows)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await audit_logger.log_phi_access(
+        user_id=current_user["sub"],
+        action="import",
+        resource_type="patient",
+        resource_id="bulk",
+        ip_address=ip_address,
+        user_agent=user_agent,
+        endpoint=request.url.path,
+        details={
+            **audit_details,
+            "success_count": importer.success_count,
+            "failed_count": importer.failed_count,
+            "duplicate_count": importer.duplicate_count,
+        },
+        organization_id=org_id
     )
 
+    return BulkUploadResponse(status="completed", **importer.summary())
+
+
+@router.get("/import/{job_id}")
+async def get_import_status(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+    org_id: str = Depends(get_current_user_organization_id),
+):
+    """Progress of a background import job."""
+    job = await get_import_job(job_id, org_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    job["job_id"] = job.pop("_id")
+    return convert_objectid(job)
+
 
 @router.put("/{patient_id}")
 async def update_patient(
@@ -1,5 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from loguru import logger
+from slowapi import Limiter
 
 from backend.audit import AuditLogger
 from backend.dependencies import (
@@ -7,11 +11,14 @@ from backend.dependencies import (
     get_client_info,
     get_current_user,
     get_current_user_organization_id,
+    get_user_id_from_request,
 )
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
 from backend.sessions import AsyncSessionRecord, get_async_session_db
 from backend.utils import convert_objectid
 
 router = APIRouter()
+limiter = Limiter(key_func=get_user_id_from_request)
 
 
 def get_session_db() -> AsyncSessionRecord:
@@ -23,18 +30,28 @@ async def list_sessions(
     request: Request,
     workflow: str = None,
     patient_id: str = None,
+    status: str = None,
+    cursor: str = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: str = Query("list", pattern="^(list|detail)$"),
     current_user: dict = Depends(get_current_user),
     org_id: str = Depends(get_current_user_organization_id),
     session_db: AsyncSessionRecord = Depends(get_session_db),
     audit_logger: AuditLogger = Depends(get_audit_logger_dep)
 ):
+    """List sessions newest first.
+
+    Returns at most limit sessions (DEFAULT_PAGE_SIZE by default); pass the
+    returned next_cursor as cursor for the next page. view=list omits call
+    transcripts (fetch them via GET /sessions/{id}).
+    """
     try:
-        if patient_id:
-            sessions = await session_db.find_sessions_by_patient(patient_id, org_id)
-        else:
-            sessions = await session_db.find_sessions_by_organization(org_id, workflow=workflow)
+        page, next_cursor = await session_db.find_sessions_by_organization(
+            org_id, workflow=workflow, status=status, patient_id=patient_id,
+            cursor=cursor, limit=limit, view=view
+        )
 
-        sessions = [convert_objectid(s) for s in sessions]
+        sessions = [convert_objectid(s) for s in page]
 
         ip_address, user_agent = get_client_info(request)
         await audit_logger.log_phi_access(
@@ -45,17 +62,59 @@ async def list_sessions(
             ip_address=ip_address,
             user_agent=user_agent,
             endpoint=request.url.path,
-            details={"count": len(sessions), "workflow": workflow, "patient_id": patient_id},
+            details={"count": len(sessions), "workflow": workflow, "patient_id": patient_id, "status": status},
             organization_id=org_id
         )
 
-        return {"sessions": sessions, "total_count": len(sessions)}
+        return {"sessions": sessions, "total_count": len(sessions), "next_cursor": next_cursor}
 
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         logger.exception("Error fetching sessions")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+@limiter.limit("10/minute")
+async def export_sessions(
+    request: Request,
+    workflow: str = None,
+    patient_id: str = None,
+    status: str = None,
+    view: str = Query("list", pattern="^(list|detail)$"),
+    current_user: dict = Depends(get_current_user),
+    org_id: str = Depends(get_current_user_organization_id),
+    session_db: AsyncSessionRecord = Depends(get_session_db),
+    audit_logger: AuditLogger = Depends(get_audit_logger_dep)
+):
+    """Stream all matching sessions as NDJSON (one JSON document per line)."""
+    ip_address, user_agent = get_client_info(request)
+    await audit_logger.log_phi_access(
+        user_id=current_user["sub"],
+        action="export",
+        resource_type="session",
+        resource_id="all",
+        ip_address=ip_address,
+        user_agent=user_agent,
+        endpoint=request.url.path,
+        details={"workflow": workflow, "patient_id": patient_id, "status": status, "view": view},
+        organization_id=org_id
+    )
+
+    async def ndjson():
+        async for session in session_db.iter_sessions_by_organization(
+            org_id, workflow=workflow, status=status, patient_id=patient_id, view=view
+        ):
+            yield json.dumps(convert_objectid(session), default=str) + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="sessions.ndjson"'}
+    )
+
+
 @router.get("/{session_id}")
 async def get_session(
     session_id: str,
@@ -1,3 +1,20 @@
+"""HIPAA audit log.
+
+Audit entries are queued and written in batches by a background task so API
+responses don't wait on Mongo. The queue is bounded: high-volume api_access
+entries are dropped (and counted) when it is full, while auth and PHI events
+fall back to an inline write. With AUDIT_FAIL_CLOSED=true, auth and PHI events
+are always written inline and a failed write raises AuditWriteError, so the
+request fails instead of proceeding unaudited.
+
+Login events are always written inline because account lockout counts them
+straight after they are logged. The writer is started and drained by
+backend/lifespan.py; when it isn't running (scripts) every entry is written
+inline.
+"""
+
+import asyncio
+import os
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
@@ -9,12 +26,142 @@ if TYPE_CHECKING:
 
 from backend.database import MONGO_DB_NAME, get_mongo_client
 
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+AUDIT_FAIL_CLOSED = os.getenv("AUDIT_FAIL_CLOSED", "false").lower() == "true"
+
+# Routine per-request entries - may be dropped under back-pressure
+DROPPABLE_EVENT_TYPES = frozenset({"api_access"})
+# Always written inline: get_failed_login_attempts reads these back for lockout
+INLINE_EVENT_TYPES = frozenset({"login", "login_central"})
+
+
+class AuditWriteError(Exception):
+    """Raised in fail-closed mode when a critical audit entry can't be written."""
+
 
 class AuditLogger:
-    def __init__(self, db_client: "AsyncIOMotorClient"):
+    def __init__(
+        self,
+        db_client: "AsyncIOMotorClient",
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        fail_closed: bool = AUDIT_FAIL_CLOSED,
+    ):
         self.client = db_client
         self.db = db_client[MONGO_DB_NAME]
         self.audit_logs = self.db.audit_logs
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fail_closed = fail_closed
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    # ==================== Background writer ====================
+
+    def start(self) -> None:
+        """Start the batch writer. Called from the API lifespan."""
+        if self._writer_task is not None:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._writer_task = asyncio.create_task(self._run_writer())
+        logger.info(
+            f"Audit writer started - queue={self._queue_size}, batch={self.batch_size}, "
+            f"fail_closed={self.fail_closed}"
+        )
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Drain queued entries and stop the batch writer. Called on shutdown."""
+        if self._writer_task is None:
+            return
+        self._stopping = True
+        try:
+            await asyncio.wait_for(self._writer_task, timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            lost = self._queue.qsize()
+            self.dropped += lost
+            logger.error(f"Audit writer drain timed out - {lost} audit log(s) not written")
+        self._writer_task = None
+        self._queue = None
+        logger.info(f"Audit writer stopped - {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._writer_task is not None,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self._queue_size,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "fail_closed": self.fail_closed,
+        }
+
+    def _take_batch(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run_writer(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                continue
+            if not self._stopping and self._queue.qsize() < self.batch_size - 1:
+                # Short queue: give concurrent requests a moment to add to the batch
+                await asyncio.sleep(self.flush_interval)
+            await self._write_batch([entry] + self._take_batch(self.batch_size - 1))
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            await self.audit_logs.insert_many(batch, ordered=False)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} audit log(s): {e}")
+
+    async def _insert(self, log_entry: Dict[str, Any]) -> bool:
+        """Queue an entry, or write it inline when the writer isn't running."""
+        event_type = log_entry["event_type"]
+        critical = event_type not in DROPPABLE_EVENT_TYPES
+        queueable = event_type not in INLINE_EVENT_TYPES and not (critical and self.fail_closed)
+
+        if self._queue is not None and not self._stopping and queueable:
+            try:
+                self._queue.put_nowait(log_entry)
+                return True
+            except asyncio.QueueFull:
+                if not critical:
+                    self.dropped += 1
+                    if self.dropped % 1000 == 1:
+                        logger.warning(f"Audit queue full - dropped {self.dropped} api_access log(s)")
+                    return False
+
+        try:
+            await self.audit_logs.insert_one(log_entry)
+            self.written += 1
+            return True
+        except Exception as e:
+            self.failed += 1
+            if critical and self.fail_closed:
+                raise AuditWriteError(f"Audit write failed for {event_type}") from e
+            raise
+
+    # ==================== Event logging ====================
 
     async def log_event(
         self,
@@ -39,9 +186,11 @@ class AuditLogger:
                 "success": success,
                 "details": details or {}
             }
-            await self.audit_logs.insert_one(log_entry)
+            await self._insert(log_entry)
             logger.info(f"Audit log: {event_type} for {email} - Success: {success}")
             return True
+        except AuditWriteError:
+            raise
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
             return False
@@ -107,9 +256,11 @@ class AuditLogger:
                 "success": success,
                 "details": details or {}
             }
-            await self.audit_logs.insert_one(log_entry)
+            await self._insert(log_entry)
             logger.trace(f"PHI access log: {action} {resource_type}/{resource_id}")
             return True
+        except AuditWriteError:
+            raise
         except Exception as e:
             logger.error(f"Failed to write PHI access log: {e}")
             return False
@@ -140,8 +291,7 @@ class AuditLogger:
                 "success": success,
                 "details": details or {}
             }
-            await self.audit_logs.insert_one(log_entry)
-            return True
+            return await self._insert(log_entry)
         except Exception as e:
             logger.error(f"Failed to write API access log: {e}")
             return False
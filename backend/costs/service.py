@@ -169,15 +169,19 @@ class CostService:
                 provider = model_data.get("provider", "unknown")
                 prompt_tokens = model_data.get("prompt_tokens", 0)
                 completion_tokens = model_data.get("completion_tokens", 0)
+                cached_tokens = model_data.get("cached_tokens", 0)
 
                 result = self._calculator.calculate_llm_cost(
-                    provider, model_name, prompt_tokens, completion_tokens
+                    provider, model_name, prompt_tokens, completion_tokens, cached_tokens
                 )
 
+                usage_text = f"{prompt_tokens:,} in / {completion_tokens:,} out"
+                if cached_tokens:
+                    usage_text += f" ({cached_tokens:,} cached)"
                 breakdown.append(
                     CostBreakdownItem(
                         service=model_name,
-                        usage=f"{prompt_tokens:,} in / {completion_tokens:,} out",
+                        usage=usage_text,
                         rate=result.rate_unit,
                         formula=result.formula,
                         cost_usd=result.cost_usd,
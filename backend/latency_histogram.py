@@ -0,0 +1,125 @@
+"""Mergeable latency histograms with bounded relative error.
+
+Values (milliseconds) are counted in logarithmic buckets whose bounds grow by
+GAMMA, so any reported percentile is within RELATIVE_ACCURACY of the true
+value regardless of magnitude (DDSketch-style). Histograms from different
+calls merge by adding bucket counts, which makes per-workflow percentiles an
+exact merge of per-call data instead of an average of averages.
+
+The serialized form (to_dict) is stored on the session document under
+latency.histograms and is small: a 2-hour call still only touches a few dozen
+buckets.
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+MIN_VALUE_MS = 1.0  # Values below this land in the first bucket
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Histogram names recorded by LangfuseLatencyObserver
+COMPONENTS = ("v2v", "stt", "llm_ttfb", "tts_ttfb")
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of millisecond values."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def _index(value_ms: float) -> int:
+        return math.ceil(math.log(max(value_ms, MIN_VALUE_MS)) / _LOG_GAMMA)
+
+    @staticmethod
+    def _bucket_value(index: int) -> float:
+        # Midpoint (in relative terms) of (GAMMA^(i-1), GAMMA^i]
+        return 2 * GAMMA ** index / (GAMMA + 1)
+
+    def record(self, value_ms: float) -> None:
+        if value_ms is None or value_ms < 0:
+            return
+        index = self._index(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Value at percentile p (0-100), or None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Clamp so p0/p100 never fall outside the observed range
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles: Iterable[int] = PERCENTILES) -> Dict[str, Optional[int]]:
+        """{"count", "mean_ms", "min_ms", "max_ms", "p50_ms", ...} rounded to whole ms."""
+        result = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count) if self.count else None,
+            "min_ms": round(self.min) if self.min is not None else None,
+            "max_ms": round(self.max) if self.max is not None else None,
+        }
+        for p in percentiles:
+            value = self.percentile(p)
+            result[f"p{p}_ms"] = round(value) if value is not None else None
+        return result
+
+    def to_dict(self) -> dict:
+        # Mongo keys must be strings
+        return {
+            "gamma": GAMMA,
+            "buckets": {str(index): n for index, n in self.buckets.items()},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "LatencyHistogram":
+        """Rebuild a stored histogram. Data recorded with another GAMMA is ignored."""
+        histogram = cls()
+        if not data or not math.isclose(data.get("gamma", 0), GAMMA):
+            return histogram
+        histogram.buckets = {int(index): n for index, n in (data.get("buckets") or {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total = data.get("total", 0.0)
+        histogram.min = data.get("min")
+        histogram.max = data.get("max")
+        return histogram
+
+
+def merge_histograms(stored: Iterable[Optional[dict]]) -> LatencyHistogram:
+    merged = LatencyHistogram()
+    for data in stored:
+        merged.merge(LatencyHistogram.from_dict(data))
+    return merged
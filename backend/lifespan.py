@@ -5,7 +5,10 @@ import aiohttp
 from fastapi import FastAPI
 from loguru import logger
 
+from backend.audit import get_audit_logger
 from backend.database import close_mongo_client
+from backend.post_call_jobs import get_post_call_worker
+from backend.webhook_delivery import get_webhook_delivery_worker
 
 
 @asynccontextmanager
@@ -15,6 +18,10 @@ async def lifespan(app: FastAPI):
     app.state.http_session = aiohttp.ClientSession()
     logger.info("HTTP session created")
 
+    get_audit_logger().start()
+    await get_webhook_delivery_worker().start()
+    await get_post_call_worker().start()
+
     logger.info("Application ready")
 
     yield
@@ -23,5 +30,8 @@ async def lifespan(app: FastAPI):
     await app.state.http_session.close()
     logger.info("HTTP session closed")
     await asyncio.sleep(2)
+    await get_webhook_delivery_worker().stop()
+    await get_post_call_worker().stop()
+    await get_audit_logger().stop()
     await close_mongo_client()
     logger.info("Graceful shutdown complete")
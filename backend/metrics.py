@@ -7,6 +7,7 @@ from bson import ObjectId
 from loguru import logger
 
 from backend.database import get_database
+from backend.latency_histogram import COMPONENTS, LatencyHistogram
 
 
 class MetricsCollector:
@@ -351,6 +352,65 @@ class MetricsCollector:
             logger.error(f"Failed to get period cost: {e}")
             return 0.0
 
+    async def get_latency_percentiles(
+        self,
+        organization_id: str,
+        period: str = "day",
+        workflow: str = None,
+    ) -> dict:
+        """Merge per-call latency histograms into p50/p90/p95/p99 per workflow."""
+        now = datetime.now(timezone.utc)
+
+        if period == "week":
+            start_date = now - timedelta(weeks=1)
+        elif period == "month":
+            start_date = now - timedelta(days=30)
+        else:
+            start_date = now - timedelta(days=1)
+
+        query = {
+            "organization_id": ObjectId(organization_id),
+            "created_at": {"$gte": start_date},
+            "latency.histograms": {"$exists": True},
+        }
+        if workflow:
+            query["workflow"] = workflow
+
+        overall = {name: LatencyHistogram() for name in COMPONENTS}
+        by_workflow: dict = {}
+        calls = 0
+        try:
+            cursor = self.db["sessions"].find(
+                query, {"workflow": 1, "latency.histograms": 1}
+            ).batch_size(500)
+            async for session in cursor:
+                calls += 1
+                histograms = by_workflow.setdefault(
+                    session.get("workflow") or "unknown",
+                    {name: LatencyHistogram() for name in COMPONENTS},
+                )
+                stored = session["latency"]["histograms"]
+                for name in COMPONENTS:
+                    if name in stored:
+                        call_histogram = LatencyHistogram.from_dict(stored[name])
+                        histograms[name].merge(call_histogram)
+                        overall[name].merge(call_histogram)
+        except Exception as e:
+            logger.error(f"Failed to get latency percentiles: {e}")
+            return {}
+
+        def summarize(histograms: dict) -> dict:
+            return {name: h.summary() for name, h in histograms.items() if h.count}
+
+        return {
+            "period": period,
+            "period_start": start_date.isoformat(),
+            "period_end": now.isoformat(),
+            "calls": calls,
+            "overall": summarize(overall),
+            "workflows": {name: summarize(h) for name, h in sorted(by_workflow.items())},
+        }
+
     async def get_status_breakdown(
         self,
         organization_id: str,
@@ -1,13 +1,21 @@
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from loguru import logger
+from pymongo.errors import BulkWriteError
 
 if TYPE_CHECKING:
     from motor.motor_asyncio import AsyncIOMotorClient
 
 from backend.database import MONGO_DB_NAME, get_mongo_client
+from backend.pagination import EXPORT_BATCH_SIZE, KEYSET_SORT, apply_cursor, split_page
+
+# Projection profiles. List views never need transcripts or SMS conversation state.
+PATIENT_PROJECTIONS = {
+    "list": {"call_transcript": 0, "text_conversation_state": 0, "text_handoff_message": 0},
+    "detail": None,
+}
 
 
 class AsyncPatientRecord:
@@ -15,10 +23,28 @@ class AsyncPatientRecord:
         self.client = db_client
         self.db = db_client[MONGO_DB_NAME]
         self.patients = self.db.patients
+        self._indexes_ensured = False
 
     async def _ensure_indexes(self):
+        if self._indexes_ensured:
+            return
         try:
-            await self.patients.create_index([("organization_id", 1), ("created_at", -1)])
+            # Keyset pagination: equality filters first, then the (created_at, _id) sort
+            await self.patients.create_index([("organization_id", 1), ("created_at", -1), ("_id", -1)])
+            await self.patients.create_index(
+                [("organization_id", 1), ("workflow", 1), ("created_at", -1), ("_id", -1)]
+            )
+            await self.patients.create_index(
+                [("organization_id", 1), ("call_status", 1), ("created_at", -1), ("_id", -1)]
+            )
+            # Bulk import dedup (backend/services/patient_import.py). Partial so
+            # patients added one at a time without a key never conflict.
+            await self.patients.create_index(
+                [("organization_id", 1), ("dedup_key", 1)],
+                unique=True,
+                partialFilterExpression={"dedup_key": {"$exists": True}},
+            )
+            self._indexes_ensured = True
         except Exception as e:
             logger.warning(f"Index creation warning: {e}")
 
@@ -34,18 +60,49 @@ class AsyncPatientRecord:
             logger.error(f"Error finding patient {patient_id}: {e}")
             return None
 
+    @staticmethod
+    def _organization_query(
+        organization_id: str, workflow: str = None, call_status: str = None
+    ) -> dict:
+        query = {"organization_id": ObjectId(organization_id)}
+        if workflow:
+            query["workflow"] = workflow
+        if call_status:
+            query["call_status"] = call_status
+        return query
+
     async def find_patients_by_organization(
-        self, organization_id: str, workflow: str = None
-    ) -> List[dict]:
+        self,
+        organization_id: str,
+        workflow: str = None,
+        call_status: str = None,
+        cursor: str = None,
+        limit: int = None,
+        view: str = "list",
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of an organization's patients, newest first. Returns (patients, next_cursor).
+
+        limit=None returns every match. Raises InvalidCursorError for a malformed cursor.
+        """
+        query = apply_cursor(self._organization_query(organization_id, workflow, call_status), cursor)
         try:
-            query = {"organization_id": ObjectId(organization_id)}
-            if workflow:
-                query["workflow"] = workflow
-            cursor = self.patients.find(query).sort("created_at", -1)
-            return await cursor.to_list(length=None)
+            await self._ensure_indexes()
+            find = self.patients.find(query, PATIENT_PROJECTIONS[view]).sort(KEYSET_SORT)
+            if limit:
+                find = find.limit(limit + 1)
+            return split_page(await find.to_list(length=None), limit)
         except Exception as e:
             logger.error(f"Error finding patients for org {organization_id}: {e}")
-            return []
+            return [], None
+
+    async def iter_patients_by_organization(
+        self, organization_id: str, workflow: str = None, call_status: str = None, view: str = "list"
+    ) -> AsyncIterator[dict]:
+        """Stream an organization's patients without loading them all into memory."""
+        query = self._organization_query(organization_id, workflow, call_status)
+        find = self.patients.find(query, PATIENT_PROJECTIONS[view]).sort(KEYSET_SORT)
+        async for patient in find.batch_size(EXPORT_BATCH_SIZE):
+            yield patient
 
     async def find_patients_by_field(
         self, field_key: str, field_value: Any, organization_id: str = None
@@ -82,6 +139,19 @@ class AsyncPatientRecord:
             logger.error(f"Error adding patient: {e}")
             return None
 
+    async def insert_patients(self, patients: List[dict]) -> Dict[int, dict]:
+        """Unordered insert_many. Returns {index: write_error} for rows that were not inserted.
+
+        Inserted documents get their _id set in place. Errors other than per-row
+        write errors (e.g. connection loss) propagate.
+        """
+        await self._ensure_indexes()
+        try:
+            await self.patients.insert_many(patients, ordered=False)
+            return {}
+        except BulkWriteError as e:
+            return {err["index"]: err for err in e.details.get("writeErrors", [])}
+
     async def update_patient(
         self, patient_id: str, update_fields: dict, organization_id: str = None
     ) -> bool:
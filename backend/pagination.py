@@ -0,0 +1,76 @@
+"""Keyset (cursor) pagination helpers for list endpoints.
+
+Lists are sorted newest first on (created_at, _id). The cursor is the sort key
+of the last document on a page, so the next page is an index range scan
+instead of an ever-growing skip.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = 100  # List endpoints without an explicit limit
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+# Stable sort: created_at alone has ties for bulk-inserted documents
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    created_at = doc.get("created_at")
+    payload = {
+        "c": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        "d": isinstance(created_at, datetime),
+        "i": str(doc["_id"]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """Return (created_at, _id) from a cursor. Raises InvalidCursorError."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(payload["c"]) if payload["d"] and payload["c"] else payload["c"]
+        return created_at, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def apply_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict a query to documents after the cursor in KEYSET_SORT order."""
+    if not cursor:
+        return query
+    created_at, last_id = decode_cursor(cursor)
+    after_cursor = [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}},
+    ]
+    if "$or" in query:
+        # Keep the caller's own $or
+        return {**query, "$and": [*query.get("$and", []), {"$or": after_cursor}]}
+    return {**query, "$or": after_cursor}
+
+
+def clamp_page_size(limit: Optional[int]) -> Optional[int]:
+    if limit is None:
+        return None
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def split_page(
+    docs: List[Dict[str, Any]], limit: Optional[int]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split limit + 1 fetched docs into (page, next_cursor). next_cursor is None on the last page."""
+    if not limit or len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    return page, encode_cursor(page[-1])
@@ -0,0 +1,508 @@
+"""Durable post-call job queue.
+
+Work that only matters after the caller hangs up (persisting the transcript,
+usage and latency, deleting the Daily recordings, the eligibility gpt-4o
+extraction sweep) used to run inside the bot, keeping its container up and
+billed until every step finished. The bot now queues that work with
+enqueue_post_call_jobs (one bulk write) and exits. PostCallJobWorker, started
+by the API lifespan, claims due jobs with a lease (safe with several API
+instances), runs them with a per-type timeout and retries failures with
+exponential backoff.
+
+Execution is at-least-once, so every job type is idempotent:
+    save_call_data     $set transcript / usage / latency on the session, then
+                       queue delete_recordings for the room
+    delete_recordings  list the room's recordings and delete them concurrently;
+                       already-deleted recordings count as done
+    final_extraction   re-read the patient and ask the LLM only for fields that
+                       are still empty
+
+Job ids are "<session_id>:<job_type>", so enqueueing the same job twice is a
+no-op. Each job document records queue_wait_ms, duration_ms and attempts; the
+worker keeps per-type histograms (stats()).
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import aiohttp
+from loguru import logger
+from pymongo import ReturnDocument, UpdateOne
+
+from backend.database import get_database
+from backend.latency_histogram import LatencyHistogram
+from backend.models.patient import get_async_patient_db
+from backend.sessions import get_async_session_db
+from backend.webhook_delivery import backoff_delay
+
+POST_CALL_JOBS_COLLECTION = "post_call_jobs"
+
+MAX_ATTEMPTS = int(os.getenv("POST_CALL_MAX_ATTEMPTS", "6"))
+MAX_IN_FLIGHT = int(os.getenv("POST_CALL_MAX_IN_FLIGHT", "8"))
+LEASE_SECONDS = 180  # In-flight jobs are reclaimed after this; longer than any job timeout
+POLL_INTERVAL = 1.0
+COMPLETED_TTL_SECONDS = 7 * 24 * 60 * 60
+HTTP_TIMEOUT = 30  # seconds
+
+DAILY_API_URL = "https://api.daily.co/v1"
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+RETRYABLE_STATUS_CODES = {408, 429}
+
+
+class JobType:
+    SAVE_CALL_DATA = "save_call_data"
+    DELETE_RECORDINGS = "delete_recordings"
+    FINAL_EXTRACTION = "final_extraction"
+
+
+# Seconds a single attempt may run before it is abandoned and retried
+JOB_TIMEOUTS = {
+    JobType.SAVE_CALL_DATA: 30,
+    JobType.DELETE_RECORDINGS: 60,
+    JobType.FINAL_EXTRACTION: 120,
+}
+
+
+class PermanentJobError(Exception):
+    """A failure retrying won't fix (bad credentials, missing record)."""
+
+
+def job_id(session_id: str, job_type: str) -> str:
+    return f"{session_id}:{job_type}"
+
+
+def _raise_for_status(status: int, what: str) -> None:
+    if status < 400:
+        return
+    if status >= 500 or status in RETRYABLE_STATUS_CODES:
+        raise RuntimeError(f"{what}: HTTP {status}")
+    raise PermanentJobError(f"{what}: HTTP {status}")
+
+
+async def enqueue_post_call_jobs(
+    session_id: str,
+    organization_id: Optional[str],
+    jobs: Iterable[Tuple[str, dict]],
+    db=None,
+) -> bool:
+    """Queue (job_type, payload) pairs for a session in one round trip.
+
+    Jobs that are already queued for the session are left untouched. Returns
+    False if the queue could not be written; callers then run the jobs inline.
+    """
+    jobs = list(jobs)
+    now = datetime.now(timezone.utc)
+    ops = [
+        UpdateOne(
+            {"_id": job_id(session_id, job_type)},
+            {"$setOnInsert": {
+                "job_type": job_type,
+                "session_id": session_id,
+                "organization_id": organization_id,
+                "payload": payload,
+                "status": "pending",
+                "attempts": 0,
+                "created_at": now,
+                "next_attempt_at": now,
+            }},
+            upsert=True,
+        )
+        for job_type, payload in jobs
+    ]
+    if not ops:
+        return True
+    try:
+        db = db if db is not None else get_database()
+        await db[POST_CALL_JOBS_COLLECTION].bulk_write(ops, ordered=False)
+        logger.info(f"Post-call jobs queued for session {session_id}: {[job_type for job_type, _ in jobs]}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to queue post-call jobs for session {session_id}: {e}")
+        return False
+
+
+# ==================== Job handlers ====================
+
+async def save_call_data(job: dict, http: aiohttp.ClientSession) -> dict:
+    payload = job["payload"]
+    session_id = job["session_id"]
+    organization_id = job.get("organization_id")
+    now = datetime.now(timezone.utc)
+
+    updates: Dict[str, Any] = {}
+    transcript = payload.get("transcript")
+    if transcript:
+        updates["call_transcript"] = transcript
+        updates["transcript_saved_at"] = now
+    if payload.get("usage"):
+        updates.update(payload["usage"])
+    if payload.get("latency"):
+        updates["latency"] = payload["latency"]
+    if not updates:
+        return {"saved": []}
+
+    if not await get_async_session_db().update_session(session_id, updates, organization_id):
+        raise RuntimeError(f"session {session_id} update failed")
+
+    patient_id = payload.get("patient_id")
+    if transcript and patient_id:
+        try:
+            await get_async_patient_db().update_patient(patient_id, {
+                "last_call_session_id": session_id,
+                "last_call_timestamp": now.isoformat(),
+            }, organization_id)
+        except Exception as e:
+            logger.warning(f"Could not update patient last_call reference: {e}")
+
+    # Recordings are deleted only once the transcript is stored (HIPAA)
+    room_name = payload.get("room_name")
+    if transcript and room_name:
+        follow_up = (JobType.DELETE_RECORDINGS, {"room_name": room_name})
+        if not await enqueue_post_call_jobs(session_id, organization_id, [follow_up]):
+            await delete_recordings({**job, "job_type": follow_up[0], "payload": follow_up[1]}, http)
+    return {"saved": sorted(k for k in updates if k != "transcript_saved_at")}
+
+
+async def delete_recordings(job: dict, http: aiohttp.ClientSession) -> dict:
+    daily_api_key = os.getenv("DAILY_API_KEY")
+    if not daily_api_key:
+        return {"skipped": "no DAILY_API_KEY"}
+    headers = {"Authorization": f"Bearer {daily_api_key}"}
+    room_name = job["payload"]["room_name"]
+
+    async with http.get(
+        f"{DAILY_API_URL}/recordings", headers=headers, params={"room_name": room_name}
+    ) as response:
+        _raise_for_status(response.status, "list recordings")
+        recordings = (await response.json()).get("data", [])
+
+    async def delete(recording_id: str) -> bool:
+        async with http.delete(f"{DAILY_API_URL}/recordings/{recording_id}", headers=headers) as response:
+            await response.read()
+            return response.status in (200, 204, 404)
+
+    ids = [r["id"] for r in recordings if r.get("id")]
+    results = await asyncio.gather(*(delete(rid) for rid in ids), return_exceptions=True)
+    failed = [rid for rid, ok in zip(ids, results) if ok is not True]
+    if failed:
+        raise RuntimeError(f"failed to delete {len(failed)}/{len(ids)} recordings")
+    if ids:
+        logger.info(f"Deleted {len(ids)} Daily recording(s) for room {room_name} (HIPAA compliance)")
+    return {"deleted": len(ids)}
+
+
+async def final_extraction(job: dict, http: aiohttp.ClientSession) -> dict:
+    """Recover fields the live observer missed, from the full transcript.
+
+    payload: patient_id, fields, system_prompt, transcript, model
+    """
+    payload = job["payload"]
+    organization_id = job.get("organization_id")
+    patient_id = payload["patient_id"]
+
+    patient_db = get_async_patient_db()
+    patient = await patient_db.find_patient_by_id(patient_id, organization_id)
+    if patient is None:
+        raise PermanentJobError(f"patient {patient_id} not found")
+    missing = [f for f in payload["fields"] if not patient.get(f)]
+    if not missing:
+        return {"recovered": []}
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise PermanentJobError("OPENAI_API_KEY not set")
+    body = {
+        "model": payload.get("model", "gpt-4o"),
+        "temperature": 0,
+        "max_tokens": 256,
+        "messages": [
+            {"role": "system", "content": payload["system_prompt"]},
+            {"role": "user", "content": payload["transcript"]},
+        ],
+        "tools": [{
+            "type": "function",
+            "function": {
+                "name": "extract_missing_data",
+                "description": "Extract any missing eligibility data from the full transcript.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {f: {"type": "string"} for f in missing},
+                    "required": [],
+                },
+            },
+        }],
+        "tool_choice": {"type": "function", "function": {"name": "extract_missing_data"}},
+    }
+    async with http.post(
+        OPENAI_CHAT_URL, json=body, headers={"Authorization": f"Bearer {api_key}"}
+    ) as response:
+        _raise_for_status(response.status, "chat completion")
+        data = await response.json()
+
+    recovered = {}
+    for call in data["choices"][0]["message"].get("tool_calls") or []:
+        for field, value in json.loads(call["function"]["arguments"]).items():
+            if isinstance(value, str):
+                value = value.strip()
+            if value and field in missing:
+                recovered[field] = value
+
+    if recovered:
+        if not await patient_db.update_fields(patient_id, recovered, organization_id):
+            raise RuntimeError(f"patient {patient_id} update failed")
+        logger.info(f"[Observer] Final extraction recovered: {', '.join(f'{k}={v}' for k, v in recovered.items())}")
+    else:
+        logger.info("[Observer] Final extraction: no additional data found")
+    return {"recovered": sorted(recovered)}
+
+
+JobHandler = Callable[[dict, aiohttp.ClientSession], Awaitable[dict]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    JobType.SAVE_CALL_DATA: save_call_data,
+    JobType.DELETE_RECORDINGS: delete_recordings,
+    JobType.FINAL_EXTRACTION: final_extraction,
+}
+
+
+async def run_job(job: dict, http: aiohttp.ClientSession) -> dict:
+    """Run one job attempt with its type's timeout."""
+    handler = JOB_HANDLERS.get(job["job_type"])
+    if handler is None:
+        raise PermanentJobError(f"unknown job type {job['job_type']}")
+    return await asyncio.wait_for(handler(job, http), timeout=JOB_TIMEOUTS.get(job["job_type"], 60))
+
+
+async def run_jobs_inline(
+    session_id: str,
+    organization_id: Optional[str],
+    jobs: Iterable[Tuple[str, dict]],
+    http: Optional[aiohttp.ClientSession] = None,
+) -> None:
+    """Run jobs in the caller's process, once each (fallback when the queue is unreachable)."""
+    owned = http is None
+    if owned:
+        http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+    try:
+        for job_type, payload in jobs:
+            job = {"job_type": job_type, "session_id": session_id, "organization_id": organization_id, "payload": payload}
+            try:
+                await run_job(job, http)
+            except Exception as e:
+                logger.error(f"Post-call job {job_type} failed for session {session_id}: {e}")
+    finally:
+        if owned:
+            await http.close()
+
+
+class _TypeStats:
+    __slots__ = ("completed", "retried", "failed", "duration", "queue_wait")
+
+    def __init__(self):
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self.duration = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+
+    def to_dict(self) -> dict:
+        return {
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "duration_ms": self.duration.summary(),
+            "queue_wait_ms": self.queue_wait.summary(),
+        }
+
+
+class PostCallJobWorker:
+    """Claims queued post-call jobs, runs them and records the outcome."""
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else get_database()
+        self.jobs = self.db[POST_CALL_JOBS_COLLECTION]
+        self._http: Optional[aiohttp.ClientSession] = None
+
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._claim_task: Optional[asyncio.Task] = None
+        self._jobs_in_flight: Set[asyncio.Task] = set()
+        self._indexes_ensured = False
+        self._stats: Dict[str, _TypeStats] = {}
+
+    async def ensure_indexes(self) -> None:
+        if self._indexes_ensured:
+            return
+        try:
+            await self.jobs.create_index([("status", 1), ("next_attempt_at", 1)])
+            await self.jobs.create_index("session_id")
+            # Only done/failed jobs have completed_at, so queued ones never expire
+            await self.jobs.create_index("completed_at", expireAfterSeconds=COMPLETED_TTL_SECONDS)
+            self._indexes_ensured = True
+        except Exception as e:
+            logger.error(f"Failed to ensure post-call job indexes: {e}")
+
+    def notify(self) -> None:
+        """Wake the claim loop after new jobs were queued in this process."""
+        self._wake.set()
+
+    async def start(self) -> None:
+        if self._claim_task is not None:
+            return
+        self._stopping = False
+        await self.ensure_indexes()
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_IN_FLIGHT * 4, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+        self._claim_task = asyncio.create_task(self._run_claims())
+        logger.info(f"Post-call job worker started - max_in_flight={MAX_IN_FLIGHT}")
+
+    async def stop(self, drain_timeout: float = 15.0) -> None:
+        """Stop claiming and let in-flight jobs finish; unfinished ones are reclaimed later."""
+        if self._claim_task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._claim_task
+        if self._jobs_in_flight:
+            await asyncio.wait(self._jobs_in_flight, timeout=drain_timeout)
+        await self._http.close()
+        self._claim_task = self._http = None
+        logger.info(f"Post-call job worker stopped - {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._jobs_in_flight),
+            "by_type": {job_type: s.to_dict() for job_type, s in self._stats.items()},
+        }
+
+    def _type_stats(self, job_type: str) -> _TypeStats:
+        stats = self._stats.get(job_type)
+        if stats is None:
+            stats = self._stats[job_type] = _TypeStats()
+        return stats
+
+    # ==================== Claim loop ====================
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self.jobs.find_one_and_update(
+            {"status": {"$in": ["pending", "in_flight"]}, "next_attempt_at": {"$lte": now}},
+            {
+                # next_attempt_at doubles as the lease expiry while in flight
+                "$set": {"status": "in_flight", "next_attempt_at": now + timedelta(seconds=LEASE_SECONDS)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run_claims(self) -> None:
+        while not self._stopping:
+            if len(self._jobs_in_flight) >= MAX_IN_FLIGHT:
+                await asyncio.wait(self._jobs_in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Post-call job claim failed: {e}")
+                job = None
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._execute(job))
+            self._jobs_in_flight.add(task)
+            task.add_done_callback(self._jobs_in_flight.discard)
+
+    async def _execute(self, job: dict) -> None:
+        started = datetime.now(timezone.utc)
+        try:
+            result = await run_job(job, self._http)
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else str(e)[:200]
+            await self._record_failure(job, error, retryable=not isinstance(e, PermanentJobError))
+            return
+        await self._record_success(job, started, result)
+
+    async def _update(self, job: dict, update: dict) -> None:
+        # attempts identifies this claim: a job reclaimed after its lease expired has a higher count,
+        # so a stale worker can't overwrite the new attempt's outcome
+        try:
+            await self.jobs.update_one(
+                {"_id": job["_id"], "status": "in_flight", "attempts": job["attempts"]}, update
+            )
+        except Exception as e:
+            # The lease expires, so the job is retried rather than lost
+            logger.error(f"Failed to record post-call job {job['_id']}: {e}")
+
+    async def _record_success(self, job: dict, started: datetime, result: dict) -> None:
+        now = datetime.now(timezone.utc)
+        created_at = job["created_at"]
+        if created_at.tzinfo is None:  # Motor returns naive UTC datetimes by default
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        duration_ms = (now - started).total_seconds() * 1000
+        queue_wait_ms = (started - created_at).total_seconds() * 1000
+
+        stats = self._type_stats(job["job_type"])
+        stats.completed += 1
+        stats.duration.record(duration_ms)
+        stats.queue_wait.record(queue_wait_ms)
+
+        await self._update(job, {
+            "$set": {
+                "status": "done",
+                "completed_at": now,
+                "result": result,
+                "duration_ms": round(duration_ms),
+                "queue_wait_ms": round(queue_wait_ms),
+            },
+            # Transcripts and prompts are PHI; keep them only until the job has run
+            "$unset": {"payload": "", "last_error": ""},
+        })
+        logger.info(
+            f"Post-call job {job['_id']} done in {duration_ms:.0f}ms "
+            f"(queued {queue_wait_ms:.0f}ms, attempt {job.get('attempts', 1)}): {result}"
+        )
+
+    async def _record_failure(self, job: dict, error: str, retryable: bool) -> None:
+        now = datetime.now(timezone.utc)
+        attempt = job.get("attempts", 1)
+        stats = self._type_stats(job["job_type"])
+
+        if retryable and attempt < MAX_ATTEMPTS:
+            stats.retried += 1
+            delay = backoff_delay(attempt)
+            await self._update(job, {"$set": {
+                "status": "pending",
+                "next_attempt_at": now + timedelta(seconds=delay),
+                "last_error": error,
+            }})
+            logger.warning(
+                f"Post-call job {job['_id']} failed ({error}) - retry {attempt}/{MAX_ATTEMPTS - 1} in {delay:.0f}s"
+            )
+        else:
+            stats.failed += 1
+            await self._update(job, {
+                "$set": {"status": "failed", "completed_at": now, "last_error": error},
+                # Same as a success: a finished job keeps no PHI, only its error and timing
+                "$unset": {"payload": ""},
+            })
+            logger.error(f"Post-call job {job['_id']} failed permanently after {attempt} attempt(s): {error}")
+
+
+_worker_instance: Optional[PostCallJobWorker] = None
+
+
+def get_post_call_worker() -> PostCallJobWorker:
+    global _worker_instance
+    if _worker_instance is None:
+        _worker_instance = PostCallJobWorker()
+    return _worker_instance
@@ -49,6 +49,7 @@ class BulkUploadResponse(BaseModel):
     failed_count: int
     total: int
     created_ids: List[str]
+    duplicate_count: int = 0
     errors: Optional[List[dict]] = None
 
 
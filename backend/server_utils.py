@@ -245,7 +245,9 @@ async def start_bot_local(body_data: BotBodyData, session: aiohttp.ClientSession
                 if response.status != 200:
                     error_text = await response.text()
                     await _record_bot_start_failure(body_data, "api_error", error_text)
-                    raise HTTPException(status_code=500, detail=f"Local bot error: {error_text}")
+                    # 503 = worker over its admission budget; let callers retry/back off
+                    status_code = 503 if response.status == 503 else 500
+                    raise HTTPException(status_code=status_code, detail=f"Local bot error: {error_text}")
                 logger.info("Bot started successfully via local server")
     except asyncio.TimeoutError:
         logger.error(f"Local bot timed out after {BOT_START_TIMEOUT}s")
@@ -0,0 +1,345 @@
+"""
+Bulk patient ingestion: chunked unordered insert_many with per-row errors and dedup.
+
+Rows come from the JSON bulk endpoint or from an uploaded CSV/XLSX file, which
+is read row by row from Starlette's spooled upload file instead of being loaded
+into memory, a chunk at a time in a worker thread so parsing never blocks the
+event loop. Each row gets a dedup_key hashed from its workflow, identity fields
+and the workflow's discriminator fields (test, medication, date of service...);
+a unique (organization_id, dedup_key) index turns re-uploads of the same list
+into per-row "duplicate" results instead of new patients.
+
+Large files can run as a background job whose progress is stored in the
+patient_import_jobs collection, so any API instance can answer a poll.
+"""
+
+import asyncio
+import codecs
+import csv
+import hashlib
+import itertools
+import shutil
+import tempfile
+import uuid
+from datetime import date, datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from bson import ObjectId
+from loguru import logger
+
+from backend.database import MONGO_DB_NAME, get_mongo_client
+from backend.models.patient import AsyncPatientRecord
+
+CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 100_000
+MAX_REPORTED_ERRORS = 1000
+DUPLICATE_KEY_ERROR = 11000
+
+# Patient identity fields shared by the workflow patient schemas
+IDENTITY_KEY_FIELDS = (
+    "patient_name",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "phone_number",
+)
+
+# Per workflow, the fields that tell two rows for the same patient apart (a
+# second test, medication or date of service is a new row, a re-upload is not).
+# Workflows not listed key on every field in the row.
+WORKFLOW_KEY_FIELDS: Dict[str, tuple] = {
+    "eligibility_verification": (
+        "insurance_member_id",
+        "insurance_company_name",
+        "provider_npi",
+        "cpt_code",
+        "place_of_service",
+        "date_of_service",
+    ),
+    "lab_results": ("test_type", "test_date", "ordering_physician"),
+    "prescription_status": ("medication_name", "dosage", "prescribing_physician", "pharmacy_name"),
+}
+
+# Bookkeeping fields that never make two rows different patients
+_NON_KEY_FIELDS = {"workflow", "organization_id", "created_at", "updated_at", "call_status", "dedup_key", "_id"}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def dedup_key_fields(workflow: str, row: Dict[str, Any]) -> tuple:
+    discriminators = WORKFLOW_KEY_FIELDS.get(workflow)
+    if discriminators is None:
+        discriminators = tuple(sorted(set(row) - _NON_KEY_FIELDS - set(IDENTITY_KEY_FIELDS)))
+    return IDENTITY_KEY_FIELDS + discriminators
+
+
+def dedup_key(row: Dict[str, Any]) -> Optional[str]:
+    """Natural key of an import row, or None when it has no key fields to dedup on."""
+    workflow = str(row.get("workflow", "")).strip().lower()
+    parts = [workflow]
+    for field in dedup_key_fields(workflow, row):
+        value = row.get(field)
+        if value not in (None, ""):
+            parts.append(f"{field}={str(value).strip().lower()}")
+    if len(parts) == 1:
+        return None
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _clean_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        str(key).strip(): _cell_value(value)
+        for key, value in row.items()
+        if key and value not in (None, "")
+    }
+
+
+def iter_csv_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield rows from a CSV upload without reading the whole file."""
+    reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+    try:
+        for row in reader:
+            yield row
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Invalid CSV near line {reader.line_num}: {e}") from e
+
+
+def iter_xlsx_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield rows from the first sheet of an XLSX upload (openpyxl read-only mode)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportFormatError("XLSX upload is not available on this server - upload CSV instead") from e
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFormatError(f"Invalid XLSX file: {e}") from e
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def iter_upload_rows(filename: str, file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "csv":
+        return iter_csv_rows(file)
+    if extension == "xlsx":
+        return iter_xlsx_rows(file)
+    raise ImportFormatError("Unsupported file type - upload .csv or .xlsx")
+
+
+def _read_batch(rows: Iterator[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+    return list(itertools.islice(rows, size))
+
+
+def spool_upload(file: IO[bytes]) -> IO[bytes]:
+    """Copy an upload to a temp file the import owns (uploads close when the request ends)."""
+    spooled = tempfile.TemporaryFile()
+    file.seek(0)
+    shutil.copyfileobj(file, spooled)
+    spooled.seek(0)
+    return spooled
+
+
+class PatientImporter:
+    """Inserts patient rows in chunks and accumulates a per-row result report."""
+
+    def __init__(
+        self,
+        patient_db: AsyncPatientRecord,
+        organization_id: str,
+        default_workflow: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+        on_progress=None,
+    ):
+        self.patient_db = patient_db
+        self.organization_id = organization_id
+        self.default_workflow = default_workflow
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.total = 0
+        self.success_count = 0
+        self.failed_count = 0
+        self.duplicate_count = 0
+        self.created_ids: List[str] = []
+        self.errors: List[dict] = []
+
+    def _error(self, row: int, message: str, **extra) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message, **extra})
+
+    def _prepare(self, row_number: int, row: Dict[str, Any], now: str) -> Optional[dict]:
+        patient = _clean_row(row)
+        patient.setdefault("workflow", self.default_workflow)
+        if not patient.get("workflow"):
+            self.failed_count += 1
+            self._error(row_number, "Workflow is required")
+            return None
+        patient.pop("_id", None)
+        patient.pop("dedup_key", None)
+        key = dedup_key(patient)
+        patient.update({
+            "organization_id": ObjectId(self.organization_id),
+            "created_at": now,
+            "updated_at": now,
+            "call_status": patient.get("call_status", "Not Started"),
+        })
+        if key:
+            patient["dedup_key"] = key
+        return patient
+
+    async def _insert_chunk(self, chunk: List[dict], row_numbers: List[int]) -> None:
+        try:
+            write_errors = await self.patient_db.insert_patients(chunk)
+        except Exception as e:
+            logger.error(f"Bulk import chunk of {len(chunk)} failed: {e}")
+            self.failed_count += len(chunk)
+            for row_number in row_numbers:
+                self._error(row_number, "Database insertion failed")
+            return
+
+        for index, (patient, row_number) in enumerate(zip(chunk, row_numbers)):
+            error = write_errors.get(index)
+            if error is None:
+                self.success_count += 1
+                self.created_ids.append(str(patient["_id"]))
+            elif error.get("code") == DUPLICATE_KEY_ERROR:
+                self.duplicate_count += 1
+                self._error(row_number, "Duplicate of an existing patient", duplicate=True)
+            else:
+                self.failed_count += 1
+                self._error(row_number, "Database insertion failed")
+
+        if self.on_progress:
+            await self.on_progress(self)
+
+    async def ingest(self, rows: Iterable[Dict[str, Any]]) -> "PatientImporter":
+        """Insert rows (1-based row numbers in the report).
+
+        Rows are read a chunk at a time in a worker thread, since CSV/XLSX
+        parsing is blocking file I/O and CPU work.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        reader = iter(rows)
+        row_number = 0
+
+        while batch := await asyncio.to_thread(_read_batch, reader, self.chunk_size):
+            chunk: List[dict] = []
+            row_numbers: List[int] = []
+            for row in batch:
+                row_number += 1
+                if row_number > MAX_IMPORT_ROWS:
+                    self._error(row_number, f"Import limited to {MAX_IMPORT_ROWS} rows - remaining rows skipped")
+                    break
+                self.total += 1
+                patient = self._prepare(row_number, row, now)
+                if patient is None:
+                    continue
+                chunk.append(patient)
+                row_numbers.append(row_number)
+            if chunk:
+                await self._insert_chunk(chunk, row_numbers)
+            if row_number > MAX_IMPORT_ROWS:
+                break
+        return self
+
+    def summary(self, include_ids: bool = True) -> Dict[str, Any]:
+        result = {
+            "total": self.total,
+            "success_count": self.success_count,
+            "failed_count": self.failed_count,
+            "duplicate_count": self.duplicate_count,
+            "errors": self.errors or None,
+        }
+        if include_ids:
+            result["created_ids"] = self.created_ids
+        return result
+
+
+# ==================== Background jobs ====================
+
+_background_tasks: set = set()
+
+
+def _jobs_collection():
+    return get_mongo_client()[MONGO_DB_NAME].patient_import_jobs
+
+
+async def start_import_job(
+    patient_db: AsyncPatientRecord,
+    organization_id: str,
+    filename: str,
+    file: IO[bytes],
+    default_workflow: Optional[str],
+    user_id: str,
+) -> str:
+    """Spool the upload and import it in the background. Returns the job id."""
+    job_id = uuid.uuid4().hex
+    spooled = await asyncio.to_thread(spool_upload, file)
+    jobs = _jobs_collection()
+    await jobs.insert_one({
+        "_id": job_id,
+        "organization_id": ObjectId(organization_id),
+        "user_id": user_id,
+        "filename": filename,
+        "status": "running",
+        "processed": 0,
+        "success_count": 0,
+        "failed_count": 0,
+        "duplicate_count": 0,
+        "created_at": datetime.now(timezone.utc),
+    })
+
+    async def report_progress(importer: PatientImporter):
+        await jobs.update_one({"_id": job_id}, {"$set": {
+            "processed": importer.total,
+            "success_count": importer.success_count,
+            "failed_count": importer.failed_count,
+            "duplicate_count": importer.duplicate_count,
+        }})
+
+    async def run():
+        importer = PatientImporter(patient_db, organization_id, default_workflow, on_progress=report_progress)
+        try:
+            await importer.ingest(iter_upload_rows(filename, spooled))
+            update = {"status": "completed", **importer.summary(include_ids=False)}
+        except Exception as e:
+            logger.exception(f"Patient import job {job_id} failed")
+            update = {"status": "failed", "error": str(e), **importer.summary(include_ids=False)}
+        finally:
+            spooled.close()
+        update["processed"] = importer.total
+        update["completed_at"] = datetime.now(timezone.utc)
+        await jobs.update_one({"_id": job_id}, {"$set": update})
+        logger.info(
+            f"Patient import job {job_id} {update['status']}: {importer.success_count} added, "
+            f"{importer.duplicate_count} duplicates, {importer.failed_count} failed"
+        )
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return job_id
+
+
+async def get_import_job(job_id: str, organization_id: str) -> Optional[dict]:
+    return await _jobs_collection().find_one(
+        {"_id": job_id, "organization_id": ObjectId(organization_id)}
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple
 
 from loguru import logger
 
@@ -8,6 +8,14 @@ if TYPE_CHECKING:
 
 from backend.constants import SessionStatus
 from backend.database import MONGO_DB_NAME, get_mongo_client
+from backend.pagination import EXPORT_BATCH_SIZE, KEYSET_SORT, apply_cursor, split_page
+
+# Projection profiles. Transcripts and raw latency histograms are fetched per
+# session (GET /sessions/{id}).
+SESSION_PROJECTIONS = {
+    "list": {"call_transcript": 0, "latency.histograms": 0},
+    "detail": None,
+}
 
 
 class AsyncSessionRecord:
@@ -15,12 +23,21 @@ class AsyncSessionRecord:
         self.client = db_client
         self.db = db_client[MONGO_DB_NAME]
         self.sessions = self.db.sessions
+        self._indexes_ensured = False
 
     async def _ensure_indexes(self):
+        if self._indexes_ensured:
+            return
         try:
-            await self.sessions.create_index([("organization_id", 1), ("created_at", -1)])
+            # Keyset pagination: equality filters first, then the (created_at, _id) sort
+            await self.sessions.create_index([("organization_id", 1), ("created_at", -1), ("_id", -1)])
+            for field in ("workflow", "status", "patient_id"):
+                await self.sessions.create_index(
+                    [("organization_id", 1), (field, 1), ("created_at", -1), ("_id", -1)]
+                )
             # Unique index on call_id for dial-in dedup (sparse to allow null for dial-out)
             await self.sessions.create_index("call_id", unique=True, sparse=True)
+            self._indexes_ensured = True
         except Exception as e:
             logger.warning(f"Index creation warning: {e}")
 
@@ -110,20 +127,58 @@ class AsyncSessionRecord:
             "transcript_saved_at": datetime.now(timezone.utc)
         }, organization_id)
 
+    @staticmethod
+    def _organization_query(
+        organization_id: str, workflow: str = None, status: str = None, patient_id: str = None
+    ) -> dict:
+        from bson import ObjectId
+        query = {"organization_id": ObjectId(organization_id)}
+        if workflow:
+            query["workflow"] = workflow
+        if status:
+            query["status"] = status
+        if patient_id:
+            query["patient_id"] = patient_id
+        return query
+
     async def find_sessions_by_organization(
-        self, organization_id: str, workflow: str = None
-    ) -> List[dict]:
-        """Find sessions for an organization, optionally filtered by workflow."""
+        self,
+        organization_id: str,
+        workflow: str = None,
+        status: str = None,
+        patient_id: str = None,
+        cursor: str = None,
+        limit: int = None,
+        view: str = "list",
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of an organization's sessions, newest first. Returns (sessions, next_cursor).
+
+        limit=None returns every match. Raises InvalidCursorError for a malformed cursor.
+        """
+        query = apply_cursor(self._organization_query(organization_id, workflow, status, patient_id), cursor)
         try:
-            from bson import ObjectId
-            query = {"organization_id": ObjectId(organization_id)}
-            if workflow:
-                query["workflow"] = workflow
-            cursor = self.sessions.find(query).sort("created_at", -1)
-            return await cursor.to_list(length=None)
+            await self._ensure_indexes()
+            find = self.sessions.find(query, SESSION_PROJECTIONS[view]).sort(KEYSET_SORT)
+            if limit:
+                find = find.limit(limit + 1)
+            return split_page(await find.to_list(length=None), limit)
         except Exception as e:
             logger.error(f"Error finding sessions for org {organization_id}: {e}")
-            return []
+            return [], None
+
+    async def iter_sessions_by_organization(
+        self,
+        organization_id: str,
+        workflow: str = None,
+        status: str = None,
+        patient_id: str = None,
+        view: str = "list",
+    ) -> AsyncIterator[dict]:
+        """Stream an organization's sessions without loading them all into memory."""
+        query = self._organization_query(organization_id, workflow, status, patient_id)
+        find = self.sessions.find(query, SESSION_PROJECTIONS[view]).sort(KEYSET_SORT)
+        async for session in find.batch_size(EXPORT_BATCH_SIZE):
+            yield session
 
     async def find_sessions_by_patient(
         self, patient_id: str, organization_id: str = None
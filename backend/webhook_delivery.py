@@ -0,0 +1,368 @@
+"""Durable webhook delivery queue.
+
+WebhookDispatcher.dispatch_event (backend/webhooks.py) serializes and signs an
+event once per subscriber and inserts it into webhook_deliveries.
+WebhookDeliveryWorker, started by the API lifespan, claims due deliveries with a
+lease (safe with several API instances), posts them over one shared keep-alive
+connection pool with a per-endpoint concurrency limit, and retries transient
+failures (timeouts, connection errors, 408/429/5xx) with exponential backoff.
+Delivery logs, webhook health counters and queue state changes are written in
+batches.
+
+Delivery is at-least-once: a delivery whose result was not flushed before a
+crash is retried when its lease expires.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+import aiohttp
+from loguru import logger
+from pymongo import ReturnDocument, UpdateOne
+
+from backend.database import get_database
+
+WEBHOOK_DELIVERIES_COLLECTION = "webhook_deliveries"
+
+MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+PER_ENDPOINT_CONCURRENCY = int(os.getenv("WEBHOOK_PER_ENDPOINT_CONCURRENCY", "4"))
+MAX_IN_FLIGHT = int(os.getenv("WEBHOOK_MAX_IN_FLIGHT", "64"))
+DELIVERY_TIMEOUT = 10  # seconds
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 60 * 60
+LEASE_SECONDS = 60  # In-flight deliveries are reclaimed after this
+POLL_INTERVAL = 1.0
+FLUSH_INTERVAL = 1.0
+COMPLETED_TTL_SECONDS = 7 * 24 * 60 * 60
+
+RETRYABLE_STATUS_CODES = {408, 429}
+
+
+@dataclass
+class DeliveryResult:
+    success: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    retryable: bool = False
+
+
+def signed_headers(event_type: str, timestamp: str, body: bytes, secret: str) -> Dict[str, str]:
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return {
+        "Content-Type": "application/json",
+        "X-Webhook-Signature": f"sha256={signature}",
+        "X-Webhook-Event": event_type,
+        "X-Webhook-Timestamp": timestamp,
+    }
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number `attempt` (1-based), with +-20% jitter."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class WebhookSender:
+    """Posts webhook bodies over one shared keep-alive pool, limited per endpoint."""
+
+    def __init__(
+        self,
+        per_endpoint_concurrency: int = PER_ENDPOINT_CONCURRENCY,
+        max_connections: int = MAX_IN_FLIGHT,
+        timeout: float = DELIVERY_TIMEOUT,
+    ):
+        self.per_endpoint_concurrency = per_endpoint_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._endpoint_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def open(self) -> None:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_endpoint_concurrency,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _endpoint_limit(self, url: str) -> asyncio.Semaphore:
+        endpoint = urlsplit(url).netloc
+        limit = self._endpoint_limits.get(endpoint)
+        if limit is None:
+            limit = self._endpoint_limits[endpoint] = asyncio.Semaphore(self.per_endpoint_concurrency)
+        return limit
+
+    async def send(self, url: str, body: bytes, headers: Dict[str, str]) -> DeliveryResult:
+        await self.open()
+        async with self._endpoint_limit(url):
+            try:
+                async with self._session.post(url, data=body, headers=headers) as resp:
+                    await resp.read()  # Drain so the connection goes back to the pool
+                    if resp.status < 400:
+                        return DeliveryResult(True, resp.status)
+                    retryable = resp.status >= 500 or resp.status in RETRYABLE_STATUS_CODES
+                    return DeliveryResult(False, resp.status, f"HTTP {resp.status}", retryable)
+            except asyncio.TimeoutError:
+                return DeliveryResult(False, None, "timeout", retryable=True)
+            except aiohttp.ClientError as e:
+                return DeliveryResult(False, None, str(e)[:200], retryable=True)
+
+
+class WebhookDeliveryWorker:
+    """Claims queued deliveries, sends them and records results in batches."""
+
+    def __init__(self, db=None, sender: Optional[WebhookSender] = None):
+        self.db = db if db is not None else get_database()
+        self.deliveries = self.db[WEBHOOK_DELIVERIES_COLLECTION]
+        self.webhooks = self.db["webhooks"]
+        self.webhook_logs = self.db["webhook_logs"]
+        self.sender = sender or WebhookSender()
+
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._claim_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._deliveries_in_flight: Set[asyncio.Task] = set()
+        self._indexes_ensured = False
+
+        # Buffered writes, flushed every FLUSH_INTERVAL
+        self._log_docs: List[dict] = []
+        self._delivery_ops: List[UpdateOne] = []
+        self._webhook_ops: List[UpdateOne] = []
+        self._failed_webhook_ids: Set[Any] = set()
+
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def ensure_indexes(self) -> None:
+        if self._indexes_ensured:
+            return
+        try:
+            # Claim query: due pending deliveries and expired leases
+            await self.deliveries.create_index([("status", 1), ("next_attempt_at", 1)])
+            await self.deliveries.create_index("webhook_id")
+            # Only delivered/failed documents have completed_at, so pending ones never expire
+            await self.deliveries.create_index("completed_at", expireAfterSeconds=COMPLETED_TTL_SECONDS)
+            self._indexes_ensured = True
+        except Exception as e:
+            logger.error(f"Failed to ensure webhook delivery indexes: {e}")
+
+    def notify(self) -> None:
+        """Wake the claim loop after new deliveries were queued."""
+        self._wake.set()
+
+    async def start(self) -> None:
+        if self._claim_task is not None:
+            return
+        self._stopping = False
+        await self.ensure_indexes()
+        await self.sender.open()
+        self._claim_task = asyncio.create_task(self._run_claims())
+        self._flush_task = asyncio.create_task(self._run_flusher())
+        logger.info(
+            f"Webhook delivery worker started - max_in_flight={MAX_IN_FLIGHT}, "
+            f"per_endpoint={self.sender.per_endpoint_concurrency}"
+        )
+
+    async def stop(self, drain_timeout: float = 15.0) -> None:
+        """Stop claiming, let in-flight deliveries finish, then flush results."""
+        if self._claim_task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._claim_task
+        if self._deliveries_in_flight:
+            await asyncio.wait(self._deliveries_in_flight, timeout=drain_timeout)
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+        await self.sender.close()
+        self._claim_task = self._flush_task = None
+        logger.info(f"Webhook delivery worker stopped - {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._deliveries_in_flight),
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "failed": self.failed,
+            "buffered_writes": len(self._log_docs) + len(self._delivery_ops) + len(self._webhook_ops),
+        }
+
+    # ==================== Claim loop ====================
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        return await self.deliveries.find_one_and_update(
+            {"status": {"$in": ["pending", "in_flight"]}, "next_attempt_at": {"$lte": now}},
+            {
+                # next_attempt_at doubles as the lease expiry while in flight
+                "$set": {"status": "in_flight", "next_attempt_at": now + timedelta(seconds=LEASE_SECONDS)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run_claims(self) -> None:
+        while not self._stopping:
+            if len(self._deliveries_in_flight) >= MAX_IN_FLIGHT:
+                await asyncio.wait(self._deliveries_in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                delivery = await self._claim()
+            except Exception as e:
+                logger.error(f"Webhook delivery claim failed: {e}")
+                delivery = None
+            if delivery is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._deliver(delivery))
+            self._deliveries_in_flight.add(task)
+            task.add_done_callback(self._deliveries_in_flight.discard)
+
+    async def _deliver(self, delivery: dict) -> None:
+        try:
+            result = await self.sender.send(delivery["url"], delivery["body"].encode(), delivery["headers"])
+        except Exception as e:
+            # Record it as an attempt so the delivery backs off and fails at MAX_ATTEMPTS
+            # instead of being re-claimed forever after each lease expires
+            logger.error(f"Webhook delivery {delivery['_id']} raised: {e}")
+            result = DeliveryResult(False, None, str(e)[:200], retryable=True)
+        self._record(delivery, result)
+
+    def _record(self, delivery: dict, result: DeliveryResult) -> None:
+        now = datetime.now(timezone.utc)
+        webhook_id = delivery["webhook_id"]
+        attempt = delivery.get("attempts", 1)
+
+        self._log_docs.append({
+            "webhook_id": webhook_id,
+            "delivery_id": delivery["_id"],
+            "event_type": delivery["event_type"],
+            "timestamp": now,
+            "attempt": attempt,
+            "success": result.success,
+            "status_code": result.status_code,
+            "error": result.error,
+        })
+
+        if result.success:
+            self.delivered += 1
+            self._delivery_ops.append(UpdateOne(
+                {"_id": delivery["_id"]},
+                {"$set": {"status": "delivered", "completed_at": now, "status_code": result.status_code}},
+            ))
+            self._webhook_ops.append(UpdateOne(
+                {"_id": webhook_id}, {"$set": {"last_success": now, "failure_count": 0}}
+            ))
+            logger.debug(f"Webhook delivered: {delivery['event_type']} to {delivery['url']}")
+            return
+
+        self._webhook_ops.append(UpdateOne(
+            {"_id": webhook_id}, {"$inc": {"failure_count": 1}, "$set": {"last_failure": now}}
+        ))
+        self._failed_webhook_ids.add(webhook_id)
+
+        if result.retryable and attempt < MAX_ATTEMPTS:
+            self.retried += 1
+            delay = backoff_delay(attempt)
+            self._delivery_ops.append(UpdateOne(
+                {"_id": delivery["_id"]},
+                {"$set": {
+                    "status": "pending",
+                    "next_attempt_at": now + timedelta(seconds=delay),
+                    "last_error": result.error,
+                }},
+            ))
+            logger.warning(
+                f"Webhook {delivery['event_type']} to {delivery['url']} failed ({result.error}) - "
+                f"retry {attempt}/{MAX_ATTEMPTS - 1} in {delay:.0f}s"
+            )
+        else:
+            self.failed += 1
+            self._delivery_ops.append(UpdateOne(
+                {"_id": delivery["_id"]},
+                {"$set": {"status": "failed", "completed_at": now, "last_error": result.error}},
+            ))
+            logger.error(
+                f"Webhook {delivery['event_type']} to {delivery['url']} failed permanently "
+                f"after {attempt} attempt(s): {result.error}"
+            )
+
+    # ==================== Batched writes ====================
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self) -> None:
+        from backend.webhooks import WebhookDispatcher
+
+        log_docs, self._log_docs = self._log_docs, []
+        delivery_ops, self._delivery_ops = self._delivery_ops, []
+        webhook_ops, self._webhook_ops = self._webhook_ops, []
+        failed_ids, self._failed_webhook_ids = self._failed_webhook_ids, set()
+
+        if delivery_ops:
+            try:
+                await self.deliveries.bulk_write(delivery_ops, ordered=False)
+            except Exception as e:
+                # Leases expire, so affected deliveries are retried rather than lost
+                logger.error(f"Failed to update {len(delivery_ops)} webhook deliveries: {e}")
+        if webhook_ops:
+            try:
+                # Ordered: a success resets failure_count that earlier failures incremented
+                await self.webhooks.bulk_write(webhook_ops, ordered=True)
+                if failed_ids:
+                    result = await self.webhooks.update_many(
+                        {
+                            "_id": {"$in": list(failed_ids)},
+                            "enabled": True,
+                            "failure_count": {"$gte": WebhookDispatcher.MAX_FAILURE_COUNT},
+                        },
+                        {"$set": {"enabled": False}},
+                    )
+                    if result.modified_count:
+                        logger.warning(f"Disabled {result.modified_count} webhook(s) after too many failures")
+            except Exception as e:
+                logger.error(f"Failed to update webhook health: {e}")
+        if log_docs:
+            try:
+                await self.webhook_logs.insert_many(log_docs, ordered=False)
+            except Exception as e:
+                logger.error(f"Failed to log {len(log_docs)} webhook deliveries: {e}")
+
+
+_worker_instance: Optional[WebhookDeliveryWorker] = None
+
+
+def get_webhook_delivery_worker() -> WebhookDeliveryWorker:
+    global _worker_instance
+    if _worker_instance is None:
+        _worker_instance = WebhookDeliveryWorker()
+    return _worker_instance
@@ -1,17 +1,21 @@
-"""Webhook dispatcher for call events with HMAC signing."""
+"""Webhook dispatcher for call events with HMAC signing.
+
+Events are queued per subscriber and delivered by backend.webhook_delivery.
+"""
 
-import asyncio
-import hashlib
-import hmac
 import json
 from datetime import datetime, timezone
 from typing import List, Optional
 
-import aiohttp
 from bson import ObjectId
 from loguru import logger
 
 from backend.database import get_database
+from backend.webhook_delivery import (
+    WEBHOOK_DELIVERIES_COLLECTION,
+    get_webhook_delivery_worker,
+    signed_headers,
+)
 
 
 class WebhookDispatcher:
@@ -19,7 +23,6 @@ class WebhookDispatcher:
 
     WEBHOOKS_COLLECTION = "webhooks"
     WEBHOOK_LOGS_COLLECTION = "webhook_logs"
-    WEBHOOK_DELIVERY_TIMEOUT = 10  # seconds
     MAX_FAILURE_COUNT = 10  # Disable after this many failures
     LOG_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
 
@@ -160,153 +163,61 @@ class WebhookDispatcher:
         event_type: str,
         payload: dict,
     ):
-        """Dispatch event to all registered webhooks for the organization."""
+        """Queue an event for every subscribed webhook of the organization.
+
+        The body is serialized once; each subscriber gets its own signed copy in
+        the delivery queue, which WebhookDeliveryWorker sends with retries.
+        """
         if event_type not in self.EVENT_TYPES:
             logger.warning(f"Unknown webhook event type: {event_type}")
             return
 
-        await self.ensure_indexes()
-
         # Find all enabled webhooks that subscribe to this event
-        webhooks = await self.webhooks.find({
-            "organization_id": ObjectId(organization_id),
-            "event_types": event_type,
-            "enabled": True
-        }).to_list(length=100)
+        webhooks = await self.webhooks.find(
+            {
+                "organization_id": ObjectId(organization_id),
+                "event_types": event_type,
+                "enabled": True
+            },
+            {"url": 1, "secret": 1},
+        ).to_list(length=100)
 
         if not webhooks:
             logger.debug(f"No webhooks registered for {event_type} in org {organization_id}")
             return
 
-        # Dispatch to all webhooks in parallel
-        tasks = [
-            self._send_webhook(webhook, event_type, payload)
-            for webhook in webhooks
-        ]
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-    async def _send_webhook(
-        self,
-        webhook: dict,
-        event_type: str,
-        payload: dict,
-    ):
-        """Send webhook with HMAC signature."""
-        body = {
-            "event": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": payload
-        }
-        body_bytes = json.dumps(body, default=str).encode()
-
-        # HMAC signature
-        signature = hmac.new(
-            webhook["secret"].encode(),
-            body_bytes,
-            hashlib.sha256
-        ).hexdigest()
-
-        webhook_id = webhook["_id"]
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook["url"],
-                    data=body_bytes,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Webhook-Signature": f"sha256={signature}",
-                        "X-Webhook-Event": event_type,
-                        "X-Webhook-Timestamp": body["timestamp"],
-                    },
-                    timeout=aiohttp.ClientTimeout(total=self.WEBHOOK_DELIVERY_TIMEOUT)
-                ) as resp:
-                    success = resp.status < 400
-
-                    await self._log_delivery(
-                        webhook_id, event_type, success, resp.status
-                    )
-
-                    if success:
-                        await self._record_success(webhook_id)
-                        logger.debug(f"Webhook delivered: {event_type} to {webhook['url']}")
-                    else:
-                        await self._increment_failure(webhook_id)
-                        logger.warning(f"Webhook failed: {event_type} - HTTP {resp.status}")
-
-        except asyncio.TimeoutError:
-            await self._log_delivery(webhook_id, event_type, False, None, "timeout")
-            await self._increment_failure(webhook_id)
-            logger.warning(f"Webhook timeout: {event_type} to {webhook['url']}")
-        except Exception as e:
-            await self._log_delivery(webhook_id, event_type, False, None, str(e)[:200])
-            await self._increment_failure(webhook_id)
-            logger.error(f"Webhook error: {event_type} to {webhook['url']} - {e}")
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
+        body = json.dumps(
+            {"event": event_type, "timestamp": timestamp, "data": payload}, default=str
+        )
+        body_bytes = body.encode()
 
-    async def _log_delivery(
-        self,
-        webhook_id: ObjectId,
-        event_type: str,
-        success: bool,
-        status_code: Optional[int],
-        error: str = None,
-    ):
-        """Log webhook delivery attempt."""
-        try:
-            await self.webhook_logs.insert_one({
-                "webhook_id": webhook_id,
+        deliveries = [
+            {
+                "webhook_id": webhook["_id"],
+                "organization_id": ObjectId(organization_id),
                 "event_type": event_type,
-                "timestamp": datetime.now(timezone.utc),
-                "success": success,
-                "status_code": status_code,
-                "error": error
-            })
-        except Exception as e:
-            logger.error(f"Failed to log webhook delivery: {e}")
-
-    async def _record_success(self, webhook_id: ObjectId):
-        """Record successful delivery and reset failure count."""
-        try:
-            await self.webhooks.update_one(
-                {"_id": webhook_id},
-                {
-                    "$set": {
-                        "last_success": datetime.now(timezone.utc),
-                        "failure_count": 0
-                    }
-                }
-            )
-        except Exception as e:
-            logger.error(f"Failed to record webhook success: {e}")
-
-    async def _increment_failure(self, webhook_id: ObjectId):
-        """Increment failure count and disable if threshold exceeded."""
-        try:
-            result = await self.webhooks.find_one_and_update(
-                {"_id": webhook_id},
-                {
-                    "$inc": {"failure_count": 1},
-                    "$set": {"last_failure": datetime.now(timezone.utc)}
-                },
-                return_document=True
-            )
-
-            # Disable after too many consecutive failures
-            if result and result.get("failure_count", 0) >= self.MAX_FAILURE_COUNT:
-                await self.webhooks.update_one(
-                    {"_id": webhook_id},
-                    {"$set": {"enabled": False}}
-                )
-                logger.warning(f"Webhook {webhook_id} disabled after too many failures")
-        except Exception as e:
-            logger.error(f"Failed to increment webhook failure: {e}")
+                "url": webhook["url"],
+                "headers": signed_headers(event_type, timestamp, body_bytes, webhook["secret"]),
+                "body": body,
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+            for webhook in webhooks
+        ]
+        await self.db[WEBHOOK_DELIVERIES_COLLECTION].insert_many(deliveries, ordered=False)
+        get_webhook_delivery_worker().notify()
+        logger.debug(f"Queued {len(deliveries)} webhook deliveries for {event_type}")
 
     async def send_test_event(
         self,
         webhook_id: str,
         organization_id: str,
     ) -> dict:
-        """Send a test event to a webhook."""
+        """Send a test event to a webhook (directly, without queueing or retries)."""
         webhook = await self.webhooks.find_one({
             "_id": ObjectId(webhook_id),
             "organization_id": ObjectId(organization_id)
@@ -320,41 +231,17 @@ class WebhookDispatcher:
             "patient_id": "test-patient-id",
             "message": "This is a test webhook event"
         }
+        timestamp = datetime.now(timezone.utc).isoformat()
+        body_bytes = json.dumps({"event": "test", "timestamp": timestamp, "data": test_payload}).encode()
 
-        try:
-            body = {
-                "event": "test",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": test_payload
-            }
-            body_bytes = json.dumps(body).encode()
-
-            signature = hmac.new(
-                webhook["secret"].encode(),
-                body_bytes,
-                hashlib.sha256
-            ).hexdigest()
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook["url"],
-                    data=body_bytes,
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-Webhook-Signature": f"sha256={signature}",
-                        "X-Webhook-Event": "test",
-                    },
-                    timeout=aiohttp.ClientTimeout(total=self.WEBHOOK_DELIVERY_TIMEOUT)
-                ) as resp:
-                    if resp.status < 400:
-                        return {"success": True, "status_code": resp.status}
-                    else:
-                        return {"success": False, "status_code": resp.status}
-
-        except asyncio.TimeoutError:
-            return {"success": False, "error": "timeout"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        result = await get_webhook_delivery_worker().sender.send(
+            webhook["url"], body_bytes, signed_headers("test", timestamp, body_bytes, webhook["secret"])
+        )
+        if result.success:
+            return {"success": True, "status_code": result.status_code}
+        if result.status_code is not None:
+            return {"success": False, "status_code": result.status_code}
+        return {"success": False, "error": result.error}
 
 
 # Singleton instance
@@ -9,8 +9,10 @@ from pipecat.runner.types import DailyRunnerArguments
 from backend.models.patient import get_async_patient_db
 from backend.sessions import get_async_session_db
 from backend.utils import mask_id, mask_phone
+from core.client_registry import get_client_registry
 from logging_config import setup_logging
 from pipeline.session import CallSession
+from services.client_pool import open_pools
 
 try:
     from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
@@ -39,11 +41,18 @@ if IS_TRACING_ENABLED and TRACING_AVAILABLE:
 elif IS_TRACING_ENABLED and not TRACING_AVAILABLE:
     logger.warning("Tracing enabled but OpenTelemetry packages not installed")
 
+# Parse services.yaml and import flow classes once per process, not per call
+get_client_registry().load()
+
 
 async def bot(args: DailyRunnerArguments):
     session_db = get_async_session_db()
     call_session = None
 
+    # Single-call containers: share one HTTP/2 pool across the call's processors
+    # (already open under CallWorker). The container exits with the call.
+    await open_pools()
+
     try:
         body = args.body
         session_id = body.get("session_id")
@@ -126,11 +135,13 @@ async def bot(args: DailyRunnerArguments):
 # Local development mode - runs FastAPI server with /start endpoint
 if __name__ == "__main__":
     import asyncio
+    from contextlib import asynccontextmanager
 
     import uvicorn
     from fastapi import FastAPI, HTTPException
     from pydantic import BaseModel
 
+    from pipeline.worker import CallWorker
     from validate import validate_bot_startup
 
     # Check if running in Pipecat runner mode (e.g., uv run bot.py -t daily)
@@ -145,8 +156,16 @@ if __name__ == "__main__":
             logger.error(f"Bot startup failed: {e}")
             sys.exit(1)
 
-        # Default: run local FastAPI server for development
-        app = FastAPI()
+        # Default: run local FastAPI server as a multi-call worker
+        worker = CallWorker(bot)
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            await worker.start()
+            yield
+            await worker.stop()
+
+        app = FastAPI(lifespan=lifespan)
 
         class BotStartRequest(BaseModel):
             createDailyRoom: bool = False
@@ -155,11 +174,16 @@ if __name__ == "__main__":
         @app.post("/start")
         async def start_bot(request: BotStartRequest):
             """Local bot start endpoint - mimics Pipecat Cloud API"""
-            import asyncio
+            patient_id = request.body.get('patient_id')
+            session_id = request.body.get('session_id')
+
+            rejection = worker.admission_error()
+            if rejection:
+                worker.rejected += 1
+                logger.warning(f"Call rejected - session={mask_id(session_id)}: {rejection}")
+                raise HTTPException(status_code=503, detail=f"Worker unavailable: {rejection}")
 
             try:
-                patient_id = request.body.get('patient_id')
-                session_id = request.body.get('session_id')
                 logger.info(f"Local bot start - patient={mask_id(patient_id)}, session={mask_id(session_id)}")
 
                 # Create DailyRunnerArguments object
@@ -172,8 +196,8 @@ if __name__ == "__main__":
                 # session_id is set as an attribute after construction
                 args.session_id = session_id
 
-                # Run bot in background task
-                asyncio.create_task(bot(args))
+                # Run bot in background task with per-call log context and resource tracking
+                worker.submit(session_id, args)
 
                 return {"status": "started", "session_id": session_id}
 
@@ -181,6 +205,11 @@ if __name__ == "__main__":
                 logger.exception("Error starting bot locally")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @app.get("/worker/stats")
+        async def worker_stats():
+            """Active calls, admission budget usage and per-call resource breakdown."""
+            return worker.stats()
+
         @app.get("/health")
         async def health():
             return {"status": "healthy"}
@@ -9,9 +9,10 @@ from pipecat_flows.types import ActionConfig
 from backend.models.patient import get_async_patient_db
 from backend.sessions import get_async_session_db
 from backend.utils import normalize_sip_endpoint, parse_natural_date
+from handlers.state_writer import StateWriterMixin
 
 
-class DialinBaseFlow(ABC):
+class DialinBaseFlow(StateWriterMixin, ABC):
     ALLOWS_NEW_PATIENTS = False
     WORKFLOW_FLOWS: Dict[str, tuple] = {}
 
@@ -135,17 +136,6 @@ class DialinBaseFlow(ABC):
             return [{"type": "tts_say", "text": prompt}]
         return None
 
-    async def _try_db_update(self, patient_id: str, method: str, *args, error_msg: str = "DB update error"):
-        if not patient_id:
-            logger.warning(f"DB update skipped - no patient_id for {method}")
-            return
-        try:
-            db = get_async_patient_db()
-            logger.info(f"DB update: {method}({patient_id}, {args})")
-            await getattr(db, method)(patient_id, *args, self.organization_id)
-        except Exception as e:
-            logger.error(f"{error_msg}: {e}")
-
     # ==================== Shared Schemas ====================
 
     def _end_call_schema(self) -> FlowsFunctionSchema:
@@ -347,6 +337,7 @@ DOB: natural format (e.g., "March 22, 1978")""",
         if not staff_number:
             logger.warning("No staff transfer number configured")
             return
+        await self._flush_state("transfer")
         try:
             if self.pipeline:
                 self.pipeline.transfer_in_progress = True
@@ -573,6 +564,7 @@ Do NOT ask clarifying questions - just handle their response."""
         logger.info("Flow: Ending call")
         patient_id = flow_manager.state.get("patient_id")
         session_db = get_async_session_db()
+        await self._flush_state("call_end")
         try:
             # NOTE: Transcript is saved by transport event handlers (cleanup_and_cancel)
             # after the call actually ends, ensuring all messages are captured.
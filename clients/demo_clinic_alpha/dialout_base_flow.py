@@ -11,13 +11,14 @@ from pipecat_flows.types import ActionConfig
 from backend.models.patient import get_async_patient_db
 from backend.sessions import get_async_session_db
 from backend.utils import normalize_sip_endpoint
+from handlers.state_writer import StateWriterMixin
 
 
-class DialoutBaseFlow(ABC):
+class DialoutBaseFlow(StateWriterMixin, ABC):
     """Base class for outbound call flows (dial-out).
 
     Provides shared functionality for dial-out workflows:
-    - DB update helpers (_try_db_update, _record_field)
+    - DB update helpers (_record_field; _try_db_update from StateWriterMixin)
     - Transfer nodes and handlers
     - End call handling
     - State initialization patterns
@@ -74,9 +75,9 @@ class DialoutBaseFlow(ABC):
         """Register function handlers on the observer LLM."""
         pass
 
-    async def run_final_extraction(self, transcript, flow_manager):
-        """Run final extraction sweep at end of call."""
-        pass
+    def build_final_extraction_job(self, transcript, flow_manager) -> dict | None:
+        """Return a final_extraction post-call job payload, or None to skip the sweep."""
+        return None
 
     # ==================== State Initialization ====================
 
@@ -100,18 +101,6 @@ class DialoutBaseFlow(ABC):
 
     # ==================== DB Helpers ====================
 
-    async def _try_db_update(self, patient_id: str, method: str, *args, error_msg: str = "DB update error"):
-        """Generic DB update with error handling."""
-        if not patient_id:
-            logger.warning(f"DB update skipped - no patient_id for {method}")
-            return
-        try:
-            db = get_async_patient_db()
-            logger.info(f"DB update: {method}({patient_id}, {args})")
-            await getattr(db, method)(patient_id, *args, self.organization_id)
-        except Exception as e:
-            logger.error(f"{error_msg}: {e}")
-
     async def _record_field(self, field_name: str, value: Any, flow_manager: FlowManager) -> tuple[None, None]:
         """Record a single field to state and DB. Returns (None, None) to stay on current node."""
         patient_id = flow_manager.state.get("patient_id")
@@ -235,6 +224,7 @@ class DialoutBaseFlow(ABC):
         if not staff_number:
             logger.warning("No staff transfer number configured")
             return
+        await self._flush_state("transfer")
         try:
             if self.pipeline:
                 self.pipeline.transfer_in_progress = True
@@ -296,6 +286,7 @@ class DialoutBaseFlow(ABC):
         logger.info("[Flow] Call ended")
         patient_id = flow_manager.state.get("patient_id")
         session_db = get_async_session_db()
+        await self._flush_state("call_end")
 
         try:
             session_updates = {
@@ -1,7 +1,6 @@
 import json
 from typing import Any, Dict
 
-import openai
 from loguru import logger
 from pipecat.adapters.schemas.function_schema import FunctionSchema
 from pipecat.adapters.schemas.tools_schema import ToolsSchema
@@ -14,7 +13,9 @@ from pipecat_flows import (
     NodeConfig,
 )
 
+from backend.post_call_jobs import JobType
 from clients.demo_clinic_alpha.dialout_base_flow import DialoutBaseFlow
+from handlers.post_call import queue_post_call_jobs
 
 # ═══════════════════════════════════════════════════════════════════
 # SHARED NORMALIZATION RULES (used by both observer and conv LLM)
@@ -316,7 +317,7 @@ You listen to the full conversation and extract structured data from what the in
         async def _handle_extract(params):
             args = params.arguments
             patient_id = flow_manager.state.get("patient_id")
-            extracted = []
+            updates = {}
 
             for arg_name, state_key in OBSERVER_FIELD_MAP.items():
                 value = args.get(arg_name, "")
@@ -324,11 +325,11 @@ You listen to the full conversation and extract structured data from what the in
                     value = value.strip()
                 if value:
                     flow_manager.state[state_key] = value
-                    await flow._try_db_update(patient_id, "update_field", state_key, value)
-                    extracted.append(f"{state_key}={value}")
+                    updates[state_key] = value
 
-            if extracted:
-                logger.info(f"[Observer] Extracted: {', '.join(extracted)}")
+            if updates:
+                await flow._try_db_update(patient_id, "update_fields", updates)
+                logger.info(f"[Observer] Extracted: {', '.join(f'{k}={v}' for k, v in updates.items())}")
             else:
                 logger.debug("[Observer] No new data this turn")
 
@@ -339,21 +340,24 @@ You listen to the full conversation and extract structured data from what the in
 
         observer_llm.register_function("extract_eligibility_data", _handle_extract)
 
-    async def run_final_extraction(self, transcript, flow_manager):
-        """Run a final gpt-4o extraction sweep with full transcript before ending the call."""
+    def build_final_extraction_job(self, transcript, flow_manager) -> dict | None:
+        """Payload for a gpt-4o extraction sweep over the full transcript, run after the call."""
         if not transcript:
             logger.debug("[Observer] No transcript for final extraction")
-            return
+            return None
 
         state = flow_manager.state
+        patient_id = state.get("patient_id")
+        if not patient_id:
+            return None
 
         # Find fields still missing
         missing = [f for f in EXTRACTION_FIELDS if not state.get(f)]
         if not missing:
             logger.info("[Observer] Final extraction: all fields already populated")
-            return
+            return None
 
-        logger.info(f"[Observer] Final extraction: attempting to recover {len(missing)} missing fields: {missing}")
+        logger.info(f"[Observer] Final extraction queued for {len(missing)} missing fields: {missing}")
 
         # Build transcript text from the list of transcript entries
         if isinstance(transcript, list):
@@ -366,54 +370,13 @@ You listen to the full conversation and extract structured data from what the in
 
         current_state = {f: state.get(f) for f in EXTRACTION_FIELDS if state.get(f)}
 
-        try:
-            client = openai.AsyncOpenAI()
-
-            tools = [{
-                "type": "function",
-                "function": {
-                    "name": "extract_missing_data",
-                    "description": "Extract any missing eligibility data from the full transcript.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {f: {"type": "string"} for f in missing},
-                        "required": [],
-                    },
-                },
-            }]
-
-            response = await client.chat.completions.create(
-                model="gpt-4o",
-                temperature=0,
-                max_tokens=256,
-                messages=[
-                    {"role": "system", "content": f"Extract missing eligibility data from this call transcript.\n\nAlready extracted:\n{json.dumps(current_state, indent=2)}\n\n{NORMALIZATION_RULES}\n\n- ONLY extract reference_number if rep EXPLICITLY said it\n- NEVER use member ID as reference number"},
-                    {"role": "user", "content": transcript_text},
-                ],
-                tools=tools,
-                tool_choice={"type": "function", "function": {"name": "extract_missing_data"}},
-            )
-
-            tool_calls = response.choices[0].message.tool_calls
-            if tool_calls:
-                args = json.loads(tool_calls[0].function.arguments)
-                patient_id = state.get("patient_id")
-                recovered = []
-                for field, value in args.items():
-                    if isinstance(value, str):
-                        value = value.strip()
-                    if value and field in missing:
-                        state[field] = value
-                        await self._try_db_update(patient_id, "update_field", field, value)
-                        recovered.append(f"{field}={value}")
-
-                if recovered:
-                    logger.info(f"[Observer] Final extraction recovered: {', '.join(recovered)}")
-                else:
-                    logger.info("[Observer] Final extraction: no additional data found")
-
-        except Exception as e:
-            logger.error(f"[Observer] Final extraction failed: {e}")
+        return {
+            "patient_id": patient_id,
+            "fields": missing,
+            "model": "gpt-4o",
+            "system_prompt": f"Extract missing eligibility data from this call transcript.\n\nAlready extracted:\n{json.dumps(current_state, indent=2)}\n\n{NORMALIZATION_RULES}\n\n- ONLY extract reference_number if rep EXPLICITLY said it\n- NEVER use member ID as reference number",
+            "transcript": transcript_text,
+        }
 
     # ═══════════════════════════════════════════════════════════════════
     # FLOW NODES (conv LLM — 6 pure flow-control functions)
@@ -807,7 +770,7 @@ Every response in this node MUST include a call to end_call. This step is import
     # ═══════════════════════════════════════════════════════════════════
 
     async def _end_call_handler(self, args: Dict[str, Any], flow_manager: FlowManager) -> tuple[None, None]:
-        """End the call with a final extraction sweep."""
+        """End the call, queueing a final extraction sweep for the backend."""
         # Guard: Prevent multiple EndTaskFrame calls
         if flow_manager.state.get("_call_ended"):
             logger.debug("[Flow] end_call already called, ignoring duplicate")
@@ -815,10 +778,16 @@ Every response in this node MUST include a call to end_call. This step is import
 
         flow_manager.state["_call_ended"] = True
 
-        # Run final extraction before ending
+        # Final extraction runs in the backend post-call worker, not on the live call
         if hasattr(self, 'pipeline') and self.pipeline:
             transcript = getattr(self.pipeline, 'transcripts', [])
-            await self.run_final_extraction(transcript, flow_manager)
+            job = self.build_final_extraction_job(transcript, flow_manager)
+            if job:
+                # Flushes buffered fields first so the job reads the latest patient record
+                await queue_post_call_jobs(
+                    self.session_id, self.organization_id, [(JobType.FINAL_EXTRACTION, job)],
+                    state_writer=self.state_writer,
+                )
 
         # Call base class work directly (skips guard since we already set it)
         await self._end_call_work(flow_manager)
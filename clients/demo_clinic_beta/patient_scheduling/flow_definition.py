@@ -14,6 +14,7 @@ from pipecat_flows.types import ActionConfig
 from backend.models.patient import get_async_patient_db
 from backend.sessions import get_async_session_db
 from backend.utils import normalize_sip_endpoint, parse_natural_date, parse_natural_time
+from handlers.state_writer import StateWriterMixin
 
 
 class _MockFlowManager:
@@ -49,7 +50,7 @@ async def warmup_openai(call_data: dict = None):
     except Exception as e:
         logger.warning(f"OpenAI warmup failed (non-critical): {e}")
 
-class PatientSchedulingFlow:
+class PatientSchedulingFlow(StateWriterMixin):
     def __init__(
         self,
         call_data: Dict[str, Any],
@@ -419,6 +420,7 @@ If unclear or incomplete, ask to repeat. Don't guess.""",
         if not staff_number:
             logger.warning("No staff transfer number configured")
             return
+        await self._flush_state("transfer")
         try:
             if self.pipeline:
                 self.pipeline.transfer_in_progress = True
@@ -545,26 +547,18 @@ If unclear or incomplete, ask to repeat. Don't guess.""",
         logger.info(f"Flow: Patient info collected - {first_name} {last_name}, DOB: {raw_dob} → {date_of_birth}")
 
         # Save to database
-        try:
-            patient_id = self.call_data.get("patient_id")
-            if patient_id:
-                db = get_async_patient_db()
-                update_fields = {
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "patient_name": f"{last_name}, {first_name}",
-                    "phone_number": phone_number,
-                    "date_of_birth": date_of_birth,
-                    "email": email,
-                    "appointment_date": flow_manager.state.get("appointment_date"),
-                    "appointment_time": flow_manager.state.get("appointment_time"),
-                    "appointment_type": flow_manager.state.get("appointment_type"),
-                    "appointment_reason": flow_manager.state.get("appointment_reason"),
-                }
-                await db.update_patient(patient_id, update_fields, self.organization_id)
-                logger.info(f"Patient record saved to database: {patient_id}")
-        except Exception as e:
-            logger.error(f"Error saving patient info to database: {e}")
+        await self._try_db_update(self.call_data.get("patient_id"), "update_patient", {
+            "first_name": first_name,
+            "last_name": last_name,
+            "patient_name": f"{last_name}, {first_name}",
+            "phone_number": phone_number,
+            "date_of_birth": date_of_birth,
+            "email": email,
+            "appointment_date": flow_manager.state.get("appointment_date"),
+            "appointment_time": flow_manager.state.get("appointment_time"),
+            "appointment_type": flow_manager.state.get("appointment_type"),
+            "appointment_reason": flow_manager.state.get("appointment_reason"),
+        }, error_msg="Error saving patient info to database")
 
         return "Thank you! Let me confirm all the details.", self.create_confirmation_node()
 
@@ -590,33 +584,33 @@ If unclear or incomplete, ask to repeat. Don't guess.""",
         state = flow_manager.state
         logger.info(f"Flow: Booking appointment for {state.get('first_name')} {state.get('last_name')}")
 
-        try:
-            db = get_async_patient_db()
-            patient_id = self.call_data.get("patient_id")
-
-            if patient_id:
-                update_fields = {
-                    "first_name": state.get("first_name"),
-                    "last_name": state.get("last_name"),
-                    "patient_name": f"{state.get('last_name')}, {state.get('first_name')}",
-                    "phone_number": state.get("phone_number"),
-                    "date_of_birth": state.get("date_of_birth"),
-                    "email": state.get("email"),
-                    "appointment_date": state.get("appointment_date"),
-                    "appointment_time": state.get("appointment_time"),
-                    "appointment_type": state.get("appointment_type"),
-                    "appointment_reason": state.get("appointment_reason"),
-                    "call_status": "Completed",
-                }
-                await db.update_patient(patient_id, update_fields, self.organization_id)
-                logger.info(f"Patient record updated: {patient_id}")
-
+        patient_id = self.call_data.get("patient_id")
+        if not patient_id:
             return "Appointment booked successfully!", self.create_confirmation_node()
 
-        except Exception as e:
-            logger.error(f"Error booking appointment: {e}")
+        # Booking is a milestone: write it through and tell the caller if it did not land
+        booked = await self._try_db_update(patient_id, "update_patient", {
+            "first_name": state.get("first_name"),
+            "last_name": state.get("last_name"),
+            "patient_name": f"{state.get('last_name')}, {state.get('first_name')}",
+            "phone_number": state.get("phone_number"),
+            "date_of_birth": state.get("date_of_birth"),
+            "email": state.get("email"),
+            "appointment_date": state.get("appointment_date"),
+            "appointment_time": state.get("appointment_time"),
+            "appointment_type": state.get("appointment_type"),
+            "appointment_reason": state.get("appointment_reason"),
+            "call_status": "Completed",
+        }, error_msg="Error booking appointment")
+        booked = booked and await self._flush_state("booking")
+
+        if not booked:
+            logger.error(f"Error booking appointment for patient {patient_id}")
             return "I apologize, there was an issue. Let me try again.", self.create_confirmation_node()
 
+        logger.info(f"Patient record updated: {patient_id}")
+        return "Appointment booked successfully!", self.create_confirmation_node()
+
     async def _end_call_handler(
         self, args: Dict[str, Any], flow_manager: FlowManager
     ) -> tuple[None, NodeConfig]:
@@ -624,6 +618,7 @@ If unclear or incomplete, ask to repeat. Don't guess.""",
         patient_id = flow_manager.state.get("patient_id")
         session_db = get_async_session_db()
         logger.info("Call ended by flow - transitioning to end node")
+        await self._flush_state("call_end")
 
         try:
             # NOTE: Transcript is saved by transport event handlers (cleanup_and_cancel)
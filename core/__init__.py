@@ -1,5 +1,9 @@
+from .client_registry import ClientEntry, ClientRegistry, get_client_registry
 from .flow_loader import FlowLoader
 
 __all__ = [
-    'FlowLoader'
+    'ClientEntry',
+    'ClientRegistry',
+    'FlowLoader',
+    'get_client_registry',
 ]
\ No newline at end of file
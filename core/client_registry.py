@@ -0,0 +1,267 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import yaml
+from loguru import logger
+
+from core.flow_loader import FlowLoader
+
+CLIENTS_DIR = Path("clients")
+REQUIRED_SERVICES = ('stt', 'llm', 'tts', 'transport')
+
+# How often get() re-stats a client's files to pick up edits (seconds)
+RELOAD_CHECK_INTERVAL = float(os.getenv("CLIENT_REGISTRY_RELOAD_INTERVAL", "2.0"))
+
+
+def substitute_env_vars(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Substitute ${ENV_VAR} placeholders with environment variables."""
+    for key, value in config.items():
+        if isinstance(value, dict):
+            config[key] = substitute_env_vars(value)
+        elif isinstance(value, str) and value.startswith('${') and value.endswith('}'):
+            env_var_name = value[2:-1]
+            env_value = os.getenv(env_var_name)
+            if env_value is None:
+                raise ValueError(f"Required environment variable '{env_var_name}' is not set")
+            config[key] = env_value
+    return config
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze(): a mutable dict/list copy for code that builds services from config."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ClientEntry:
+    """Pre-resolved services config and flow class for one (org, workflow)."""
+    organization_slug: str
+    client_name: str
+    services_config: Mapping[str, Any]
+    flow_class: type
+    warmup_function: Optional[Callable]
+    mtimes: Tuple[float, ...]
+
+    @property
+    def call_type(self) -> str:
+        return self.services_config['call_type']
+
+
+class ClientRegistry:
+    """Process-wide cache of parsed services.yaml files and flow classes.
+
+    Scans clients/ once, validates every workflow and keeps immutable entries
+    keyed by (organization_slug, client_name). Entries are reloaded when
+    services.yaml or any module the flow is built from changes on disk: the
+    workflow's own .py files (flow_definition, schema, ...) and the org-level
+    base flows. Reloading re-imports all of those modules, so an edited base
+    flow is picked up too.
+    """
+
+    def __init__(self, clients_dir: Path = CLIENTS_DIR, reload_check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.clients_dir = clients_dir
+        self.reload_check_interval = reload_check_interval
+        self._entries: Dict[Tuple[str, str], ClientEntry] = {}
+        self._errors: Dict[Tuple[str, str], str] = {}
+        self._last_checked: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self) -> Dict[Tuple[str, str], str]:
+        """Scan clients/ and load every workflow. Returns {key: error} for invalid ones."""
+        with self._lock:
+            self._entries.clear()
+            self._errors.clear()
+            for services_path in sorted(self.clients_dir.glob("*/*/services.yaml")):
+                org_slug, client_name = services_path.parts[-3], services_path.parts[-2]
+                self._load_entry(org_slug, client_name)
+            self._loaded = True
+
+        logger.info(f"Client registry loaded {len(self._entries)} workflow(s)")
+        for (org_slug, client_name), err in self._errors.items():
+            logger.error(f"Client registry: {org_slug}/{client_name} invalid - {err}")
+        return dict(self._errors)
+
+    def get(self, organization_slug: str, client_name: str) -> ClientEntry:
+        """Return the entry for a workflow, reloading it if its files changed."""
+        if not self._loaded:
+            self.load()
+
+        key = (organization_slug, client_name)
+        entry = self._entries.get(key)
+
+        if entry is None or self._is_stale(key, entry):
+            with self._lock:
+                current = self._entries.get(key)
+                # Another thread may have reloaded it while we waited for the lock
+                if current is None or current is entry:
+                    entry = self._load_entry(organization_slug, client_name)
+                else:
+                    entry = current
+
+        if entry is None:
+            raise ValueError(
+                f"Client {organization_slug}/{client_name} unavailable: "
+                f"{self._errors.get(key, 'not found')}"
+            )
+        return entry
+
+    def entries(self, organization_slug: str = None) -> List[ClientEntry]:
+        if not self._loaded:
+            self.load()
+        return [
+            entry for (org_slug, _), entry in self._entries.items()
+            if organization_slug is None or org_slug == organization_slug
+        ]
+
+    def warmup_functions(self, organization_slug: str) -> List[Callable]:
+        """Warmup functions for every workflow in an organization."""
+        return [e.warmup_function for e in self.entries(organization_slug) if e.warmup_function]
+
+    def _paths(self, organization_slug: str, client_name: str) -> Tuple[Path, Path]:
+        client_path = self.clients_dir / organization_slug / client_name
+        return client_path / "services.yaml", client_path / "flow_definition.py"
+
+    def _source_files(self, organization_slug: str, client_name: str) -> List[Path]:
+        """services.yaml plus every module the flow class can import from its org."""
+        org_path = self.clients_dir / organization_slug
+        client_path = org_path / client_name
+        return [
+            *self._paths(organization_slug, client_name),
+            *sorted(client_path.glob("*.py")),
+            *sorted(org_path.glob("*.py")),
+        ]
+
+    def _current_mtimes(self, organization_slug: str, client_name: str) -> Optional[Tuple[float, ...]]:
+        try:
+            return tuple(p.stat().st_mtime for p in self._source_files(organization_slug, client_name))
+        except OSError:
+            return None
+
+    def _is_stale(self, key: Tuple[str, str], entry: ClientEntry) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_checked.get(key, 0.0) < self.reload_check_interval:
+                return False
+            self._last_checked[key] = now
+        return self._current_mtimes(*key) != entry.mtimes
+
+    def _workflow_modules(self, organization_slug: str, client_name: str) -> Dict[str, Any]:
+        """Loaded modules of the workflow package and the org-level base flows."""
+        package = f"clients.{organization_slug}.{client_name}"
+        org_modules = {
+            f"clients.{organization_slug}.{path.stem}"
+            for path in (self.clients_dir / organization_slug).glob("*.py")
+            if path.stem != "__init__"
+        }
+        return {
+            name: module for name, module in list(sys.modules.items())
+            if name == package or name.startswith(package + ".") or name in org_modules
+        }
+
+    def _import_flow_class(self, organization_slug: str, client_name: str, reload: bool):
+        """Import the workflow's flow class, re-reading its modules on reload.
+
+        A failed reload puts the previously loaded modules back, so sys.modules
+        is left as it was and other workflows importing them are unaffected.
+        """
+        previous_modules = self._workflow_modules(organization_slug, client_name) if reload else {}
+        for name in previous_modules:
+            del sys.modules[name]
+        try:
+            return FlowLoader(organization_slug, client_name).load_flow_class()
+        except BaseException:
+            if reload:
+                for name in self._workflow_modules(organization_slug, client_name):
+                    del sys.modules[name]
+                sys.modules.update(previous_modules)
+            raise
+
+    def _load_entry(self, organization_slug: str, client_name: str) -> Optional[ClientEntry]:
+        """Parse, validate and store one workflow. Caller must hold the lock.
+
+        If a reload fails, the last good entry stays in place and keeps serving
+        new calls; the error is recorded until the files are fixed.
+        """
+        key = (organization_slug, client_name)
+        previous = self._entries.get(key)
+        self._last_checked[key] = time.monotonic()
+
+        try:
+            mtimes = self._current_mtimes(organization_slug, client_name)
+            if mtimes is None:
+                raise FileNotFoundError("services.yaml or flow_definition.py not found")
+
+            services_path, _ = self._paths(organization_slug, client_name)
+            with open(services_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+
+            config = substitute_env_vars(config)
+            self._validate(config)
+
+            # Other workflows keep their already-built flow classes until they reload too
+            flow_class = self._import_flow_class(organization_slug, client_name, reload=previous is not None)
+            module = sys.modules[flow_class.__module__]
+        except Exception as e:
+            self._errors[key] = str(e)
+            if previous is not None:
+                logger.error(
+                    f"Client registry: reloading {organization_slug}/{client_name} failed, "
+                    f"keeping the last good version - {e}"
+                )
+            return previous
+
+        self._errors.pop(key, None)
+        if previous is not None:
+            logger.info(f"Client registry reloaded {organization_slug}/{client_name}")
+
+        entry = ClientEntry(
+            organization_slug=organization_slug,
+            client_name=client_name,
+            services_config=freeze(config),
+            flow_class=flow_class,
+            warmup_function=getattr(module, 'warmup_openai', None),
+            mtimes=mtimes,
+        )
+        self._entries[key] = entry
+        return entry
+
+    @staticmethod
+    def _validate(config: Dict[str, Any]) -> None:
+        if not config.get('call_type'):
+            raise ValueError("missing 'call_type'")
+        services = config.get('services')
+        if not isinstance(services, dict):
+            raise ValueError("missing 'services' section")
+        missing = [svc for svc in REQUIRED_SERVICES if svc not in services]
+        if missing:
+            raise ValueError(f"missing service(s): {', '.join(missing)}")
+
+
+_registry_instance: Optional[ClientRegistry] = None
+
+
+def get_client_registry() -> ClientRegistry:
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ClientRegistry()
+    return _registry_instance
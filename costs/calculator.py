@@ -20,6 +20,7 @@ SERVICE_CLASS_TO_PROVIDER = {
     "GroqLLMService": "groq",
     # TTS
     "CartesiaTTSService": "cartesia",
+    "CachedCartesiaTTSService": "cartesia",
     # STT
     "DeepgramFluxSTTService": "deepgram",
     # Telephony
@@ -96,25 +97,30 @@ class CostCalculator:
         """Return all rates for transparency display."""
         return self._rates
 
-    def _get_llm_rate(self, provider: str, model: str, rate_type: str) -> float:
-        """Look up LLM rate from pricing config."""
+    def _get_llm_rate(
+        self, provider: str, model: str, rate_type: str, default: Optional[float] = None
+    ) -> float:
+        """Look up LLM rate from pricing config. Returns default (or 0 with a warning) if unpriced."""
+        missing = default if default is not None else 0
         llm_rates = self._rates.get("llm", {})
         provider_rates = llm_rates.get(provider, {})
 
         # Try exact model match first
         if model in provider_rates and isinstance(provider_rates[model], dict):
-            return provider_rates[model].get(rate_type, 0)
+            return provider_rates[model].get(rate_type, missing)
 
         # Try base model match (strip date suffix like "-2024-07-18")
         base_model = model.split("-202")[0] if "-202" in model else model
         if base_model in provider_rates and isinstance(provider_rates[base_model], dict):
-            return provider_rates[base_model].get(rate_type, 0)
+            return provider_rates[base_model].get(rate_type, missing)
 
         # Try prefix match (model starts with a known rate_model)
         for rate_model, rates in provider_rates.items():
             if isinstance(rates, dict) and model.startswith(rate_model):
-                return rates.get(rate_type, 0)
+                return rates.get(rate_type, missing)
 
+        if default is not None:
+            return default
         logger.warning(f"No LLM rate found for {provider}/{model}/{rate_type}")
         return 0
 
@@ -146,7 +152,12 @@ class CostCalculator:
         return 0
 
     def calculate_llm_cost(
-        self, provider: str, model: str, prompt_tokens: int, completion_tokens: int
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
     ) -> CostResult:
         """
         Calculate LLM cost with full breakdown.
@@ -154,23 +165,32 @@ class CostCalculator:
         Args:
             provider: LLM provider (e.g., "openai", "groq")
             model: Model name (e.g., "gpt-4o", "llama-3.3-70b-versatile")
-            prompt_tokens: Number of input/prompt tokens
+            prompt_tokens: Number of input/prompt tokens (including cached)
             completion_tokens: Number of output/completion tokens
+            cached_tokens: Prompt tokens served from the provider's prompt cache,
+                billed at cached_input_per_1m_tokens when the model has one
 
         Returns:
             CostResult with cost, usage, rate, and formula
         """
         input_rate = self._get_llm_rate(provider, model, "input_per_1m_tokens")
         output_rate = self._get_llm_rate(provider, model, "output_per_1m_tokens")
+        cached_rate = input_rate
+        if cached_tokens > 0:
+            cached_rate = self._get_llm_rate(provider, model, "cached_input_per_1m_tokens", default=input_rate)
+        cached_tokens = min(cached_tokens, prompt_tokens)
+        uncached_tokens = prompt_tokens - cached_tokens
 
-        input_cost = (prompt_tokens / 1_000_000) * input_rate
+        input_cost = (uncached_tokens / 1_000_000) * input_rate + (cached_tokens / 1_000_000) * cached_rate
         output_cost = (completion_tokens / 1_000_000) * output_rate
         total_cost = input_cost + output_cost
 
         # Build human-readable formula
         formula_parts = []
-        if prompt_tokens > 0:
-            formula_parts.append(f"({prompt_tokens:,}÷1M×${input_rate})")
+        if uncached_tokens > 0:
+            formula_parts.append(f"({uncached_tokens:,}÷1M×${input_rate})")
+        if cached_tokens > 0:
+            formula_parts.append(f"({cached_tokens:,} cached÷1M×${cached_rate})")
         if completion_tokens > 0:
             formula_parts.append(f"({completion_tokens:,}÷1M×${output_rate})")
         formula = "+".join(formula_parts) if formula_parts else "0"
@@ -319,7 +339,7 @@ class CostCalculator:
         Calculate all costs for a session with full breakdown.
 
         Args:
-            llm_usage: Dict of {provider: {model: {prompt: N, completion: N}}}
+            llm_usage: Dict of {provider: {model: {prompt: N, completion: N, cached: N}}}
             tts_provider: TTS provider name
             tts_characters: Total TTS characters
             stt_provider: STT provider name
@@ -334,20 +354,25 @@ class CostCalculator:
         llm_cost = 0.0
         total_prompt = 0
         total_completion = 0
+        total_cached = 0
         models_breakdown = {}
 
         for provider, models in llm_usage.items():
             for model, tokens in models.items():
+                cached = tokens.get("cached", 0)
                 result = self.calculate_llm_cost(
-                    provider, model, tokens["prompt"], tokens["completion"]
+                    provider, model, tokens["prompt"], tokens["completion"], cached
                 )
                 llm_cost += result.cost_usd
                 total_prompt += tokens["prompt"]
                 total_completion += tokens["completion"]
+                total_cached += cached
                 models_breakdown[model] = {
                     "provider": provider,
                     "prompt_tokens": tokens["prompt"],
                     "completion_tokens": tokens["completion"],
+                    "cached_tokens": cached,
+                    "cache_hit_ratio": round(cached / tokens["prompt"], 3) if tokens["prompt"] else None,
                     "cost_usd": result.cost_usd,
                     "formula": result.formula,
                     "rate_unit": result.rate_unit,
@@ -386,6 +411,7 @@ class CostCalculator:
                 "llm": {
                     "prompt_tokens": total_prompt,
                     "completion_tokens": total_completion,
+                    "cached_tokens": total_cached,
                     "models": models_breakdown,
                 },
                 "tts": {
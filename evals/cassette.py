@@ -0,0 +1,433 @@
+"""Record/replay cassettes for LLM calls in evals.
+
+Eval runners call real LLMs for the bot, the simulated caller and the graders.
+With a cassette active, every request is keyed by a canonical hash of its
+parameters (model, messages, tools, sampling settings) and the response is
+stored, so a suite can be replayed offline, in seconds and with identical
+results.
+
+Modes (--cassette on the runners, or EVAL_CASSETTE):
+    off     live calls, nothing recorded (default)
+    record  live calls; the scenario's cassette is rewritten from scratch
+    replay  recorded responses only; a request not in the cassette raises CassetteMiss
+    hybrid  recorded responses where present; misses go live, are flagged and recorded
+
+Repeated identical requests (a simulator prompt sampled twice at temperature
+0.7) are stored in call order and replayed in the same order.
+
+Runners swap their SDK clients for the wrappers here and scope each scenario
+to its own cassette file:
+
+    @scenario_cassette(Path(__file__).parent / "cassettes")
+    async def run_scenario(scenario_id: str, ...): ...
+
+    client = openai_client()            # instead of AsyncOpenAI()
+    client = anthropic_client()         # instead of Anthropic(api_key=...)
+
+Live clients are created lazily, so replay needs no API keys. Cassettes also pin
+the date they were recorded on (pinned_today) for flows that put dates in prompts.
+
+Live calls are also where parallel runs (evals/parallel.py) meet provider rate
+limits: each provider has one process-wide limiter capping in-flight requests
+(EVAL_<PROVIDER>_MAX_IN_FLIGHT) and optionally pacing them (EVAL_<PROVIDER>_RPM),
+and wrappers built with the same arguments share one SDK client.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+MODES = ("off", "record", "replay", "hybrid")
+CASSETTE_VERSION = 1
+
+_mode = os.getenv("EVAL_CASSETTE", "off")
+_current: ContextVar[Optional["Cassette"]] = ContextVar("eval_cassette", default=None)
+_last_live_ms: ContextVar[Optional[float]] = ContextVar("eval_last_live_ms", default=None)
+
+
+class CassetteMiss(Exception):
+    """Replay mode hit a request that is not in the cassette."""
+
+
+def set_mode(mode: str) -> None:
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown cassette mode '{mode}' (expected one of {', '.join(MODES)})")
+    _mode = mode
+
+
+def get_mode() -> str:
+    return _mode
+
+
+def add_cassette_argument(parser) -> None:
+    parser.add_argument(
+        "--cassette", choices=MODES, default=_mode,
+        help="Record/replay LLM calls (default: off, or EVAL_CASSETTE)",
+    )
+
+
+def request_key(provider: str, params: Dict[str, Any]) -> str:
+    """Canonical hash of a request. Unset (None) parameters don't affect the key."""
+    canonical = {"provider": provider, **{k: v for k, v in params.items() if v is not None}}
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class Cassette:
+    """Recorded interactions for one scenario."""
+
+    def __init__(self, path: Path, mode: str):
+        self.path = Path(path)
+        self.mode = mode
+        self.today = date.today()
+        self.interactions: Dict[str, List[dict]] = {}
+        self._calls: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if mode in ("replay", "hybrid") and self.path.exists():
+            data = json.loads(self.path.read_text())
+            self.interactions = data.get("interactions", {})
+            if data.get("recorded_on"):
+                self.today = date.fromisoformat(data["recorded_on"])
+        elif mode == "replay":
+            raise CassetteMiss(f"No cassette at {self.path} - record it first with --cassette record")
+
+    def replay(self, provider: str, params: Dict[str, Any]) -> Tuple[str, Optional[dict]]:
+        """(key, recorded response) for this request, or (key, None) to call live."""
+        key = request_key(provider, params)
+        occurrence = self._calls.get(key, 0)
+        self._calls[key] = occurrence + 1
+        if self.mode == "record":
+            return key, None
+
+        recorded = self.interactions.get(key, [])
+        if occurrence < len(recorded):
+            self.hits += 1
+            return key, recorded[occurrence]["response"]
+
+        self.misses += 1
+        summary = f"{provider} {params.get('model')} (key {key[:12]}, call #{occurrence + 1})"
+        if self.mode == "replay":
+            raise CassetteMiss(f"Not in {self.path.name}: {summary}")
+        print(f"  [CASSETTE] Miss, calling live: {summary}")
+        return key, None
+
+    def store(self, key: str, provider: str, params: Dict[str, Any], response: dict) -> None:
+        self.interactions.setdefault(key, []).append({
+            "provider": provider,
+            "request": params,
+            "response": response,
+        })
+        self.recorded += 1
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CASSETTE_VERSION,
+            "recorded_on": self.today.isoformat(),
+            "interactions": self.interactions,
+        }
+        self.path.write_text(json.dumps(data, indent=1, sort_keys=True, ensure_ascii=False, default=str) + "\n")
+
+
+@contextmanager
+def use_cassette(path: Path) -> Iterator[Optional[Cassette]]:
+    """Scope LLM calls in this block (and tasks it starts) to the cassette at path."""
+    if _mode == "off":
+        yield None
+        return
+    cassette = Cassette(path, _mode)
+    token = _current.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _current.reset(token)
+        if cassette.recorded:
+            cassette.save()
+        print(
+            f"  [CASSETTE] {cassette.mode}: {cassette.hits} replayed, {cassette.misses} missed, "
+            f"{cassette.recorded} recorded ({cassette.path.name})"
+        )
+
+
+def scenario_cassette(cassettes_dir: Path):
+    """Decorate an async run_scenario(scenario_id, ...) to run under <cassettes_dir>/<scenario_id>.json."""
+    def decorator(run_scenario):
+        @functools.wraps(run_scenario)
+        async def wrapper(scenario_id: str, *args, **kwargs):
+            with use_cassette(Path(cassettes_dir) / f"{scenario_id}.json"):
+                return await run_scenario(scenario_id, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_cassette() -> Optional[Cassette]:
+    return _current.get()
+
+
+def last_live_latency_ms() -> Optional[float]:
+    """Provider time of the last wrapped call in this task; None if it was replayed.
+
+    Excludes time spent waiting for a provider limiter slot.
+    """
+    return _last_live_ms.get()
+
+
+def pinned_today() -> date:
+    """The active cassette's recording date, so date-dependent prompts replay unchanged."""
+    cassette = _current.get()
+    return cassette.today if cassette else date.today()
+
+
+# ==================== Provider limits ====================
+
+DEFAULT_MAX_IN_FLIGHT = {"openai": 16, "anthropic": 8, "groq": 8}
+
+
+class ProviderLimiter:
+    """Caps concurrent live calls to one provider and optionally paces them to a request rate.
+
+    Shared by every scenario in the process, so a parallel run stays inside the
+    account's limits however many scenarios are in flight. Async callers wait on
+    an asyncio semaphore, sync callers (graders in worker threads) on a thread one.
+    """
+
+    def __init__(self, provider: str, max_in_flight: int, rpm: float = 0):
+        self.provider = provider
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._thread_slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._async_loop = None
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._in_flight = 0
+        self.calls = 0
+        self.peak_in_flight = 0
+        self.wait_s = 0.0
+
+    def _pace(self) -> float:
+        """Reserve the next start slot under the RPM limit; seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+            return start - now
+
+    def _enter(self, waited: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.wait_s += waited
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_slots = asyncio.Semaphore(self.max_in_flight)
+            self._async_loop = loop
+        started = time.monotonic()
+        async with self._async_slots:
+            delay = self._pace()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._enter(time.monotonic() - started)
+            try:
+                yield
+            finally:
+                self._exit()
+
+    @contextmanager
+    def acquire_sync(self) -> Iterator[None]:
+        started = time.monotonic()
+        with self._thread_slots:
+            delay = self._pace()
+            if delay > 0:
+                time.sleep(delay)
+            self._enter(time.monotonic() - started)
+            try:
+                yield
+            finally:
+                self._exit()
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "rpm": round(60.0 / self.min_interval) if self.min_interval else None,
+            "calls": self.calls,
+            "peak_in_flight": self.peak_in_flight,
+            "wait_s": round(self.wait_s, 1),
+        }
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def provider_limiter(provider: str) -> ProviderLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            prefix = f"EVAL_{provider.upper()}"
+            limiter = ProviderLimiter(
+                provider,
+                max_in_flight=int(os.getenv(f"{prefix}_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT.get(provider, 8))),
+                rpm=float(os.getenv(f"{prefix}_RPM", "0")),
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+
+def limiter_stats() -> Dict[str, dict]:
+    """Per-provider live call stats for providers used so far."""
+    return {name: limiter.stats() for name, limiter in sorted(_limiters.items())}
+
+
+# ==================== Client wrappers ====================
+
+_live_clients: Dict[Tuple[str, str], Any] = {}
+_live_clients_lock = threading.Lock()
+
+
+def _shared_client(kwargs: Dict[str, Any], factory: Callable[[], Any]) -> Any:
+    """One SDK client per client type and constructor arguments, shared by all wrappers."""
+    key = (factory.__qualname__, json.dumps(kwargs, sort_keys=True, default=str))
+    with _live_clients_lock:
+        client = _live_clients.get(key)
+        if client is None:
+            client = factory()
+            _live_clients[key] = client
+        return client
+
+
+class _Endpoint:
+    """One SDK create() method (chat.completions / messages) behind the active cassette."""
+
+    def __init__(
+        self,
+        provider: str,
+        factory: Callable[[], Any],
+        path: str,
+        response_type: Callable[[], type],
+        client_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self._provider = provider
+        self._factory = factory
+        self._path = path
+        self._response_type = response_type
+        self._client_kwargs = client_kwargs or {}
+
+    def _live_create(self):
+        target = _shared_client(self._client_kwargs, self._factory)
+        for attr in self._path.split("."):
+            target = getattr(target, attr)
+        return target
+
+    def _lookup(self, params: Dict[str, Any]):
+        cassette = _current.get()
+        if cassette is None:
+            return None, None, None
+        key, recorded = cassette.replay(self._provider, params)
+        if recorded is not None:
+            return cassette, key, self._response_type().model_validate(recorded)
+        return cassette, key, None
+
+    def _store(self, cassette: Optional[Cassette], key: Optional[str], params: Dict[str, Any], response):
+        if cassette is not None:
+            cassette.store(key, self._provider, params, response.model_dump(mode="json"))
+        return response
+
+
+class _AsyncEndpoint(_Endpoint):
+    async def create(self, **params):
+        cassette, key, replayed = self._lookup(params)
+        if replayed is not None:
+            _last_live_ms.set(None)
+            return replayed
+        async with provider_limiter(self._provider).acquire():
+            started = time.perf_counter()
+            response = await self._live_create()(**params)
+            _last_live_ms.set((time.perf_counter() - started) * 1000)
+        return self._store(cassette, key, params, response)
+
+
+class _SyncEndpoint(_Endpoint):
+    def create(self, **params):
+        cassette, key, replayed = self._lookup(params)
+        if replayed is not None:
+            _last_live_ms.set(None)
+            return replayed
+        with provider_limiter(self._provider).acquire_sync():
+            started = time.perf_counter()
+            response = self._live_create()(**params)
+            _last_live_ms.set((time.perf_counter() - started) * 1000)
+        return self._store(cassette, key, params, response)
+
+
+def _openai_response_type():
+    from openai.types.chat import ChatCompletion
+    return ChatCompletion
+
+
+def _anthropic_response_type():
+    from anthropic.types import Message
+    return Message
+
+
+def _groq_response_type():
+    from groq.types.chat import ChatCompletion
+    return ChatCompletion
+
+
+def openai_client(**kwargs) -> SimpleNamespace:
+    """Stand-in for AsyncOpenAI(**kwargs): supports chat.completions.create."""
+    def factory():
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(**kwargs)
+    endpoint = _AsyncEndpoint("openai", factory, "chat.completions.create", _openai_response_type, kwargs)
+    return SimpleNamespace(chat=SimpleNamespace(completions=endpoint))
+
+
+def anthropic_client(**kwargs) -> SimpleNamespace:
+    """Stand-in for Anthropic(**kwargs): supports messages.create."""
+    def factory():
+        from anthropic import Anthropic
+        return Anthropic(**kwargs)
+    endpoint = _SyncEndpoint("anthropic", factory, "messages.create", _anthropic_response_type, kwargs)
+    return SimpleNamespace(messages=endpoint)
+
+
+def async_anthropic_client(**kwargs) -> SimpleNamespace:
+    """Stand-in for AsyncAnthropic(**kwargs): supports messages.create."""
+    def factory():
+        from anthropic import AsyncAnthropic
+        return AsyncAnthropic(**kwargs)
+    endpoint = _AsyncEndpoint("anthropic", factory, "messages.create", _anthropic_response_type, kwargs)
+    return SimpleNamespace(messages=endpoint)
+
+
+def groq_client(**kwargs) -> SimpleNamespace:
+    """Stand-in for groq.Groq(**kwargs): supports chat.completions.create."""
+    def factory():
+        import groq
+        return groq.Groq(**kwargs)
+    endpoint = _SyncEndpoint("groq", factory, "chat.completions.create", _groq_response_type, kwargs)
+    return SimpleNamespace(chat=SimpleNamespace(completions=endpoint))
@@ -5,78 +5,48 @@ Usage:
     python run.py                           # Run default scenario (first in list)
     python run.py --scenario <id>           # Run specific scenario
     python run.py --all                     # Run all scenarios
+    python run.py --all -j 16               # Run all scenarios, 16 at a time (default 8)
     python run.py --list                    # List available scenarios
     python run.py --sync-dataset            # Sync scenarios to Langfuse dataset
+    python run.py --all --cassette record   # Record LLM calls to cassettes/<scenario_id>.json
+    python run.py --all --cassette replay   # Replay them offline (hybrid: live on a miss)
 
 Results are stored locally in results/<scenario_id>/ and traces are pushed to Langfuse.
 """
 import argparse
 import asyncio
+import functools
 import json
-import os
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from statistics import median
 from time import perf_counter
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 import yaml
-from anthropic import Anthropic
 from langfuse import Langfuse, observe
-from openai import AsyncOpenAI
 
 from clients.demo_clinic_alpha.eligibility_verification.flow_definition import (
     EligibilityVerificationFlow,
 )
-from evals.context import EvalContextManager
+from evals.cassette import (
+    add_cassette_argument,
+    openai_client,
+    scenario_cassette,
+    set_mode,
+)
 from evals.db import ORG_ID_STR
 from evals.fixtures import TestDB
-
-
-@dataclass
-class LatencyMetrics:
-    llm_latencies_ms: list[float] = field(default_factory=list)
-    turn_latencies_ms: list[float] = field(default_factory=list)
-    conversation_start: float = 0.0
-    conversation_end: float = 0.0
-
-    @property
-    def total_duration_ms(self) -> float:
-        return (self.conversation_end - self.conversation_start) * 1000 if self.conversation_start else 0.0
-
-    @property
-    def llm_median_ms(self) -> float:
-        return median(self.llm_latencies_ms) if self.llm_latencies_ms else 0.0
-
-    @property
-    def llm_p95_ms(self) -> float:
-        if not self.llm_latencies_ms:
-            return 0.0
-        sorted_lat = sorted(self.llm_latencies_ms)
-        return sorted_lat[min(int(len(sorted_lat) * 0.95), len(sorted_lat) - 1)]
-
-    @property
-    def llm_max_ms(self) -> float:
-        return max(self.llm_latencies_ms) if self.llm_latencies_ms else 0.0
-
-    def to_dict(self) -> dict:
-        return {
-            "total_duration_ms": round(self.total_duration_ms, 2),
-            "llm_calls": {
-                "count": len(self.llm_latencies_ms),
-                "median_ms": round(self.llm_median_ms, 2),
-                "p95_ms": round(self.llm_p95_ms, 2),
-                "max_ms": round(self.llm_max_ms, 2),
-            },
-            "turns": {
-                "count": len(self.turn_latencies_ms),
-                "median_ms": round(median(self.turn_latencies_ms), 2) if self.turn_latencies_ms else 0.0,
-            },
-        }
-
+from evals.flow_runner import FlowRunner
+from evals.grading import get_grader
+from evals.latency import record_latency
+from evals.parallel import (
+    DEFAULT_CONCURRENCY,
+    add_parallel_arguments,
+    run_suite,
+)
 
 # Cached pricing from variable_costs.yaml
 _LLM_PRICING: dict | None = None
@@ -139,16 +109,13 @@ SIMULATOR_MODEL = "gpt-4o-mini"
 # === LANGFUSE CLIENT ===
 langfuse = Langfuse()
 
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_alpha/eligibility_verification"
+
 
 # === GRADERS ===
-def _call_grader(prompt: str) -> str:
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=50,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.content[0].text.strip()
+async def _call_grader(prompt: str, rubric: str) -> str:
+    return await get_grader().grade(prompt, rubric=f"{SUITE}/{rubric}")
 
 
 def _format_conversation(conversation: list[dict]) -> str:
@@ -273,7 +240,7 @@ def grade_captured_state(final_state: dict, expected_state: dict) -> dict:
     return {"pass": True, "reason": "PASS: Captured state correct"}
 
 
-def grade_conversation_quality(conv_text: str) -> dict:
+async def grade_conversation_quality(conv_text: str) -> dict:
     prompt = f"""Grade this conversation's STYLE (not logic). Check ONLY:
 
 CONVERSATION:
@@ -289,7 +256,7 @@ DO NOT judge the conversation logic or what questions the bot asks.
 
 Reply exactly: PASS: <5 words> or FAIL: <5 words>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "conversation_quality")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
@@ -413,7 +380,7 @@ def grade_function_calls(
     return {"pass": True, "reason": f"PASS: {len(checks)} function checks passed"}
 
 
-def grade_golden_response(bot_response: str, expected_info: str) -> dict:
+async def grade_golden_response(bot_response: str, expected_info: str) -> dict:
     """Grade whether a bot response communicates the expected information."""
     prompt = f"""Does this bot response communicate the expected information?
 
@@ -421,25 +388,25 @@ BOT RESPONSE: "{bot_response}"
 EXPECTED INFO: "{expected_info}"
 
 Reply: PASS: <reason> or FAIL: <what's missing>"""
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "golden_response")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_all_golden_responses(conversation: list[dict], golden_text: list[dict]) -> dict:
+async def grade_all_golden_responses(conversation: list[dict], golden_text: list[dict]) -> dict:
     """Grade all golden response expectations against the conversation."""
     if not golden_text:
         return {"pass": True, "reason": "No golden responses defined", "checks": []}
 
-    checks = []
-    for golden in golden_text:
+    async def check(golden: dict) -> dict:
         turn = golden.get("turn")
         expected = golden.get("info")
         bot_msgs = [m for m in conversation if m.get("turn") == turn and m.get("role") == "assistant"]
         if not bot_msgs:
-            checks.append({"turn": turn, "pass": False, "reason": "No bot response at turn"})
-            continue
-        result = grade_golden_response(bot_msgs[0].get("content", ""), expected)
-        checks.append({"turn": turn, **result})
+            return {"turn": turn, "pass": False, "reason": "No bot response at turn"}
+        result = await grade_golden_response(bot_msgs[0].get("content", ""), expected)
+        return {"turn": turn, **result}
+
+    checks = list(await asyncio.gather(*(check(golden) for golden in golden_text)))
 
     failures = [c for c in checks if not c["pass"]]
     return {
@@ -449,7 +416,7 @@ def grade_all_golden_responses(conversation: list[dict], golden_text: list[dict]
     }
 
 
-def grade_scenario(
+async def grade_scenario(
     conversation: list[dict],
     function_calls: list[dict],
     final_state: dict,
@@ -469,8 +436,12 @@ def grade_scenario(
     # Skip quality check for transfer scenarios (conversation doesn't end normally)
     if expected_node in ("transfer_pending", "transfer_initiated", "transfer_failed"):
         quality = {"pass": True, "reason": "PASS: Skipped for transfer scenario"}
+        golden_check = await grade_all_golden_responses(conversation, golden_text or [])
     else:
-        quality = grade_conversation_quality(conv_text)
+        quality, golden_check = await asyncio.gather(
+            grade_conversation_quality(conv_text),
+            grade_all_golden_responses(conversation, golden_text or []),
+        )
     functions = grade_function_calls(
         function_calls, expected_data,
         expected_functions, forbidden_functions,
@@ -478,7 +449,6 @@ def grade_scenario(
     node_reached = grade_node_reached(final_node, expected_node)
     state_check = grade_captured_state(final_state, expected_db_state or {})
     phrases_check = grade_forbidden_phrases(conversation, forbidden_phrases or [])
-    golden_check = grade_all_golden_responses(conversation, golden_text or [])
 
     all_passed = all([
         data_accuracy["pass"],
@@ -548,31 +518,13 @@ def list_scenarios() -> None:
         print(f"  {s['id']:<30} [{s['target_node']}]")
 
 
-# === MOCKS ===
-class MockFlowManager:
-    def __init__(self):
-        self.state = {}
-
-
-class MockPipeline:
-    transcripts = []
-    transfer_in_progress = False
-
-
-class MockTransport:
-    def __init__(self):
-        self.transfers: list[dict] = []
-
-    async def sip_call_transfer(self, config):
-        self.transfers.append(config)
-        print(f"\n  [TRANSFER] → {config.get('toEndPoint')}\n")
-        return None  # None = success
-
-
 # === FLOW RUNNER ===
-class FlowRunner:
+class EligibilityVerificationRunner(FlowRunner):
     """Runs the eligibility verification flow with patient data from scenario."""
 
+    PRINT_CONTEXT = True
+    END_CALL_FUNCTIONS = ("end_call", "end_conversation", "hangup")
+
     def __init__(
         self,
         llm_config: dict,
@@ -582,244 +534,30 @@ class FlowRunner:
         organization_id: str,
         verbose: bool = False,
     ):
-        self.mock_flow_manager = MockFlowManager()
-        self.mock_pipeline = MockPipeline()
-        self.mock_transport = MockTransport()
-        self.llm_config = llm_config
-        self.verbose = verbose
-
+        super().__init__(llm_config, verbose=verbose)
+        self.token_usage = TokenUsage(
+            main_model=llm_config["model"],
+            simulator_model=SIMULATOR_MODEL,
+        )
         self.flow = EligibilityVerificationFlow(
             call_data=patient_data,
             session_id=session_id,
-            flow_manager=self.mock_flow_manager,
-            main_llm=None,
-            context_aggregator=None,
-            transport=self.mock_transport,
-            pipeline=self.mock_pipeline,
             organization_id=organization_id,
-            cold_transfer_config=cold_transfer_config,
+            **self.flow_mocks(cold_transfer_config),
         )
-
         # Initialize flow state with patient data
         self.flow._init_flow_state()
-
         # Start with greeting node (unified for with/without IVR)
-        self.current_node = self.flow.create_greeting_node()
-        self.current_node_name = self.current_node.get("name", "greeting")
-        self.context = EvalContextManager()
-        self.context.set_node(self.current_node)
-        self.function_calls = []  # Track all function calls
-        self.done = False
-        self.end_call_invoked = False  # Track if end_call was called
-        self.latency_metrics = LatencyMetrics()
-        self.token_usage = TokenUsage(
-            main_model=llm_config["model"],
-            simulator_model=SIMULATOR_MODEL,
-        )
+        self.start(self.flow.create_greeting_node())
 
-    def get_tools(self) -> list[dict]:
-        functions = self.current_node.get("functions") or []
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": f.name,
-                    "description": f.description or "",
-                    "parameters": {
-                        "type": "object",
-                        "properties": f.properties or {},
-                        "required": f.required or [],
-                    },
-                },
-            }
-            for f in functions
-        ]
-
-    @observe(as_type="generation")
-    async def _call_llm(self, messages: list[dict], tools: list[dict] | None, node_name: str):
-        """Make LLM call - decorated for Langfuse tracing."""
-        client = AsyncOpenAI()
-        start_time = perf_counter()
-        response = await client.chat.completions.create(
-            model=self.llm_config["model"],
-            messages=messages,
-            tools=tools,
-            tool_choice="auto" if tools else None,
-            temperature=self.llm_config["temperature"],
-            max_tokens=self.llm_config["max_tokens"],
-        )
-        # Track latency
-        self.latency_metrics.llm_latencies_ms.append((perf_counter() - start_time) * 1000)
-        # Track tokens
+    def _on_llm_response(self, response) -> None:
         if response.usage:
             self.token_usage.main_llm_prompt += response.usage.prompt_tokens
             self.token_usage.main_llm_completion += response.usage.completion_tokens
-        return response
-
-    @observe(as_type="tool")
-    async def _execute_handler(self, func_name: str, func_args: dict, handler):
-        """Execute flow handler - decorated for Langfuse tracing."""
-        result, next_node = await handler(func_args, self.mock_flow_manager)
-        return result, next_node
-
-    def _print_llm_context(self, messages: list[dict], tools: list[dict] | None, node_name: str, turn: int):
-        """Print what's being sent to the LLM for debugging."""
-        print(f"\n  {'─'*60}")
-        print(f"  LLM CONTEXT (turn {turn}, node: {node_name})")
-        print(f"  {'─'*60}")
-
-        if self.verbose:
-            # Full context output (matches production logs format)
-            for i, msg in enumerate(messages):
-                print(f"  [{i}] {json.dumps(msg, indent=2)}")
-        else:
-            # Truncated output for normal runs
-            for i, msg in enumerate(messages):
-                role = msg.get("role", "?")
-                content = msg.get("content", "")
-                # Truncate long system messages
-                if role == "system" and len(content) > 200:
-                    content = content[:200] + "..."
-                # Show tool calls if present
-                if msg.get("tool_calls"):
-                    tc = msg["tool_calls"][0]
-                    print(f"  [{i}] {role}: (tool_call: {tc['function']['name']})")
-                elif role == "tool":
-                    print(f"  [{i}] {role}: {content[:100]}")
-                else:
-                    print(f"  [{i}] {role}: {content[:150]}{'...' if len(content) > 150 else ''}")
-
-        if tools:
-            tool_names = [t["function"]["name"] for t in tools]
-            print(f"  TOOLS: {tool_names}")
-        print(f"  {'─'*60}\n")
 
     @observe(name="monica_turn")
     async def process_message(self, user_message: str, turn_number: int) -> str:
-        if user_message:
-            self.context.add_user_message(user_message)
-
-        all_content = []
-        last_func_call = None  # Track last (func_name, args_json) to prevent loops
-        respond_immediately_count = 0  # Allow up to 3 respond_immediately continuations per turn
-        MAX_RESPOND_IMMEDIATELY = 3
-
-        while not self.done:
-            messages = self.context.get_messages()
-            functions = self.current_node.get("functions") or []
-            tools = self.get_tools() if functions else None
-            node_name = self.current_node.get("name", "unknown")
-
-            self._print_llm_context(messages, tools, node_name, turn_number)
-
-            response = await self._call_llm(messages, tools, node_name)
-            msg = response.choices[0].message
-
-            if msg.tool_calls:
-                tool_call = msg.tool_calls[0]
-                func_name = tool_call.function.name
-
-                try:
-                    func_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError as e:
-                    print(f"    ⚠ Malformed JSON from LLM: {tool_call.function.arguments[:100]}...")
-                    print(f"    Error: {e}")
-                    # Record the failure and continue without executing the function
-                    self.function_calls.append({
-                        "turn": turn_number,
-                        "node": node_name,
-                        "function": func_name,
-                        "args": {"_error": f"Malformed JSON: {str(e)}"},
-                    })
-                    break
-
-                # Deduplication: prevent infinite loops from repeated identical calls
-                current_func_call = (func_name, tool_call.function.arguments)
-                if current_func_call == last_func_call:
-                    print(f"    ⚠ Loop detected: {func_name} called with same args twice in a row, breaking")
-                    break
-                last_func_call = current_func_call
-
-                # Track function call
-                self.function_calls.append({
-                    "turn": turn_number,
-                    "node": node_name,
-                    "function": func_name,
-                    "args": func_args,
-                })
-                print(f"    → {func_name}({json.dumps(func_args)})")
-
-                self.context.add_tool_call({
-                    "content": msg.content,
-                    "tool_calls": [{
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": func_name,
-                            "arguments": tool_call.function.arguments
-                        }
-                    }]
-                })
-
-                handler = next(f.handler for f in functions if f.name == func_name)
-                result, next_node = await self._execute_handler(func_name, func_args, handler)
-
-                self.context.add_tool_result(tool_call.id, result)
-
-                if result:
-                    all_content.append(result)
-
-                # Check if this function ends the conversation (even without a next_node)
-                if func_name in ("end_call", "end_conversation", "hangup"):
-                    self.done = True
-                    self.end_call_invoked = True
-                    break
-
-                if next_node:
-                    self.current_node = next_node
-                    self.current_node_name = next_node.get("name", "unknown")
-                    self.context.set_node(next_node)
-                    # Process pre_actions on the new node (e.g., tts_say, function)
-                    pre_actions = self.current_node.get("pre_actions") or []
-                    for action in pre_actions:
-                        action_type = action.get("type") if isinstance(action, dict) else getattr(action, "type", None)
-
-                        if action_type == "tts_say":
-                            text = action.get("text", "") if isinstance(action, dict) else getattr(action, "text", "")
-                            if text:
-                                all_content.append(text)
-                                self.context.add_assistant_message(text)
-
-                        elif action_type == "function":
-                            handler = action.get("handler") if isinstance(action, dict) else getattr(action, "handler", None)
-                            if handler:
-                                try:
-                                    await handler(action, self.mock_flow_manager)
-                                    print(f"    [PRE_ACTION] Executed: {handler.__name__}")
-                                except Exception as e:
-                                    print(f"    [PRE_ACTION] Error: {e}")
-
-                    # Check if this node ends the conversation
-                    result_node_name = next_node.get("name")
-                    post_actions = next_node.get("post_actions") or []
-                    ends_conversation = (
-                        result_node_name == "end" or
-                        any(a.get("type") == "end_conversation" for a in post_actions)
-                    )
-                    if ends_conversation:
-                        self.done = True
-                        break
-                    if self.current_node.get("respond_immediately") and respond_immediately_count < MAX_RESPOND_IMMEDIATELY:
-                        respond_immediately_count += 1
-                        continue
-
-            if msg.content:
-                all_content.append(msg.content)
-                self.context.add_assistant_message(msg.content)
-
-            break
-
-        return " ".join(all_content)
+        return await super().process_message(user_message, turn_number)
 
 
 @observe(as_type="generation", name="insurance_simulator")
@@ -846,7 +584,7 @@ Stay in character. Be natural and conversational."""
         ],
     ]
 
-    client = AsyncOpenAI()
+    client = openai_client()
     response = await client.chat.completions.create(
         model=SIMULATOR_MODEL,
         messages=messages,
@@ -873,7 +611,7 @@ async def run_simulation(
     """Run a single eligibility verification simulation for a scenario."""
     insurance_rep = scenario["insurance_rep"]
     persona = scenario["persona"]
-    runner = FlowRunner(
+    runner = EligibilityVerificationRunner(
         llm_config=llm_config,
         cold_transfer_config=cold_transfer_config,
         patient_data=seeded_patient,
@@ -1068,6 +806,7 @@ def sync_dataset_to_langfuse() -> None:
     print("View at: https://cloud.langfuse.com/datasets")
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
     """Run a single scenario and save results."""
     scenario = get_scenario(scenario_id)
@@ -1097,8 +836,9 @@ async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
             scenario, llm_config, cold_transfer_config,
             seeded_patient, session_id, verbose=verbose
         )
+        record_latency(SUITE, scenario_id, result["latency"])
 
-        grade = grade_scenario(
+        grade = await grade_scenario(
             conversation=result["conversation"],
             function_calls=result["function_calls"],
             final_state=result["final_state"],
@@ -1148,37 +888,11 @@ async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
         print("  [CLEANUP] Removed test patient and session")
 
 
-async def run_all_scenarios(verbose: bool = False) -> list[dict]:
-    """Run all scenarios sequentially."""
-    config = load_scenarios()
-    results = []
-
-    for scenario in config["scenarios"]:
-        print(f"\n{'#'*70}")
-        print(f"# Running: {scenario['id']}")
-        print(f"{'#'*70}")
-
-        result = await run_scenario(scenario["id"], verbose=verbose)
-        results.append(result)
-
-    # Summary
-    passed = [r for r in results if r["grade"]["pass"]]
-    failed = [r for r in results if not r["grade"]["pass"]]
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY: {len(passed)}/{len(results)} passed")
-    print(f"{'='*70}")
-
-    if failed:
-        print("\nFAILED:")
-        for r in failed:
-            print(f"  - {r['scenario_id']}: {r['grade']['reason']}")
-
-    # Cost summary
-    total_cost = sum(r.get("cost", {}).get("total_cost_usd", 0) for r in results)
-    print(f"\nTOTAL COST: ${total_cost:.4f}")
-
-    return results
+async def run_all_scenarios(verbose: bool = False, concurrency: int = DEFAULT_CONCURRENCY) -> list[dict]:
+    """Run all scenarios, `concurrency` at a time."""
+    return await run_suite(
+        SUITE, load_scenarios()["scenarios"], functools.partial(run_scenario, verbose=verbose), concurrency
+    )
 
 
 async def main():
@@ -1188,8 +902,11 @@ async def main():
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
     parser.add_argument("--sync-dataset", action="store_true", help="Sync scenarios to Langfuse dataset")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print full LLM context for debugging")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
 
     if args.list:
         list_scenarios()
@@ -1200,7 +917,7 @@ async def main():
         return
 
     if args.all:
-        await run_all_scenarios(verbose=args.verbose)
+        await run_all_scenarios(verbose=args.verbose, concurrency=args.concurrency)
         return
 
     if args.scenario:
@@ -4,12 +4,20 @@ Eligibility Verification Triage Classification Evaluation Runner
 Tests 3-way call classification (CONVERSATION/IVR/VOICEMAIL) using the EligibilityVerificationFlow
 triage configuration. Scenarios test insurance company greeting patterns.
 
+Like the bot, the local pre-classifier (pipeline/triage_prefilter.py) runs first
+when triage.local_prefilter is on, and only utterances it defers reach the LLM.
+These scenarios are held out from its training data (evals/triage/train_prefilter.py).
+
 Usage:
     python run.py                           # Run default scenario (first in list)
     python run.py --scenario <id>           # Run specific scenario
     python run.py --all                     # Run all scenarios
+    python run.py --all -j 16               # Run all scenarios, 16 at a time (default 8)
+    python run.py --all --no-prefilter      # Classifier LLM only, skipping the local pre-classifier
     python run.py --list                    # List available scenarios
     python run.py --sync-dataset            # Sync scenarios to Langfuse dataset
+    python run.py --all --cassette record   # Record LLM calls to cassettes/<scenario_id>.json
+    python run.py --all --cassette replay   # Replay them offline (hybrid: live on a miss)
 
 Results are stored locally in results/<scenario_id>/ and traces are pushed to Langfuse.
 """
@@ -31,8 +39,15 @@ from langfuse import Langfuse, observe
 from clients.demo_clinic_alpha.eligibility_verification.flow_definition import (
     EligibilityVerificationFlow,
 )
+from evals.cassette import add_cassette_argument, groq_client, scenario_cassette, set_mode
+from evals.parallel import (
+    DEFAULT_CONCURRENCY,
+    add_parallel_arguments,
+    run_suite,
+)
 from evals.triage import get_scenario, load_scenarios
 from pipeline.pipeline_factory import PipelineFactory
+from pipeline.triage_prefilter import TriagePreFilter
 
 # === LANGFUSE CLIENT ===
 langfuse = Langfuse()
@@ -40,11 +55,16 @@ langfuse = Langfuse()
 
 # === CONSTANTS ===
 SCENARIOS_PATH = Path(__file__).parent / "scenarios.yaml"
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_alpha/eligibility_verification/triage/classification"
 CLASSIFIER_PROMPT = EligibilityVerificationFlow.TRIAGE_CLASSIFIER_PROMPT
 
 # Load production LLM config from services.yaml
 _services_config = PipelineFactory.load_services_config("demo_clinic_alpha", "eligibility_verification")
 CLASSIFIER_LLM_CONFIG = _services_config["services"]["classifier_llm"]
+LOCAL_PREFILTER = _services_config.get("triage", {}).get("local_prefilter", True)
+
+_prefilter = TriagePreFilter() if LOCAL_PREFILTER else None
 
 
 # === GRADING ===
@@ -79,16 +99,15 @@ class ClassifierRunner:
     @observe(as_type="generation", name="classifier_llm")
     async def classify(self, utterance: str) -> str:
         """Classify a single utterance using production config."""
-        import groq
-
         messages = [
             {"role": "system", "content": self.classifier_prompt},
             {"role": "user", "content": utterance}
         ]
 
-        client = groq.Groq(api_key=self.llm_config["api_key"])
+        client = groq_client(api_key=self.llm_config["api_key"])
 
-        response = client.chat.completions.create(
+        response = await asyncio.to_thread(
+            client.chat.completions.create,
             model=self.llm_config["model"],
             messages=messages,
             temperature=self.llm_config.get("temperature", 0),
@@ -102,7 +121,8 @@ class ClassifierRunner:
 async def run_simulation(scenario: dict, classifier_prompt: str) -> dict:
     """Run classification for a single scenario.
 
-    Tests the production classifier prompt + LLM to verify correct classification.
+    Tests the production pre-classifier + classifier prompt + LLM to verify
+    correct classification.
     """
     utterance = scenario["utterance"]
     expected = scenario["expected_classification"]
@@ -114,17 +134,30 @@ async def run_simulation(scenario: dict, classifier_prompt: str) -> dict:
 
     print(f"UTTERANCE: {utterance}\n")
 
-    # Get LLM classification using production config
-    runner = ClassifierRunner(classifier_prompt)
-    actual = await runner.classify(utterance)
+    # Local pre-classifier first, as in TriagePreClassifier; the LLM only sees deferred utterances
+    decision = _prefilter.classify(utterance) if _prefilter else None
+    if decision and decision.label:
+        actual = decision.label
+        source = "local"
+        print(f"LOCAL DECISION: {decision.label} ({decision.source}, confidence={decision.confidence:.2f})")
+    else:
+        runner = ClassifierRunner(classifier_prompt)
+        actual = await runner.classify(utterance)
+        source = "llm"
 
-    print(f"CLASSIFICATION: {actual}\n")
+    print(f"CLASSIFICATION: {actual} ({source})\n")
 
     return {
         "scenario_id": scenario["id"],
         "utterance": utterance,
         "expected_classification": expected,
         "actual_classification": actual,
+        "decision_source": source,
+        "prefilter": {
+            "label": decision.label,
+            "confidence": round(decision.confidence, 4),
+            "source": decision.source,
+        } if decision else None,
     }
 
 
@@ -141,7 +174,7 @@ def save_result(result: dict, trace_id: str, grade: dict) -> Path:
     with open(txt_file, "w") as f:
         f.write(f"SCENARIO: {result['scenario_id']}\n")
         f.write(f"EXPECTED: {result['expected_classification']}\n")
-        f.write(f"ACTUAL: {result['actual_classification']}\n")
+        f.write(f"ACTUAL: {result['actual_classification']} ({result['decision_source']})\n")
         f.write(f"{'='*60}\n\n")
         f.write(f"UTTERANCE:\n{result['utterance']}\n\n")
         f.write(f"{'='*60}\n")
@@ -159,6 +192,8 @@ def save_result(result: dict, trace_id: str, grade: dict) -> Path:
         },
         "output": {
             "actual_classification": result["actual_classification"],
+            "decision_source": result["decision_source"],
+            "prefilter": result["prefilter"],
         },
         "grade": grade,
         "notes": "",
@@ -206,6 +241,7 @@ def sync_dataset_to_langfuse() -> None:
     print(f"\nDataset synced to Langfuse: {dataset_name}")
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str) -> dict:
     """Run a single scenario and save results."""
     config = load_scenarios(SCENARIOS_PATH)
@@ -234,30 +270,16 @@ async def run_scenario(scenario_id: str) -> dict:
     return {**result, "grade": grade}
 
 
-async def run_all_scenarios() -> list[dict]:
-    """Run all scenarios sequentially."""
-    config = load_scenarios(SCENARIOS_PATH)
-    results = []
-
-    for scenario in config["scenarios"]:
-        print(f"\n{'#'*70}")
-        print(f"# Running: {scenario['id']}")
-        print(f"{'#'*70}")
-
-        result = await run_scenario(scenario["id"])
-        results.append(result)
-
-    passed = [r for r in results if r["grade"]["pass"]]
-    failed = [r for r in results if not r["grade"]["pass"]]
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY: {len(passed)}/{len(results)} passed")
-    print(f"{'='*70}")
+async def run_all_scenarios(concurrency: int = DEFAULT_CONCURRENCY) -> list[dict]:
+    """Run all scenarios, `concurrency` at a time."""
+    results = await run_suite(
+        SUITE, load_scenarios(SCENARIOS_PATH)["scenarios"], run_scenario, concurrency, lock_key=None
+    )
 
-    if failed:
-        print("\nFAILED:")
-        for r in failed:
-            print(f"  - {r['scenario_id']}: {r['grade']['reason']}")
+    local = [r for r in results if r.get("decision_source") == "local"]
+    if local:
+        local_passed = sum(1 for r in local if r["grade"]["pass"])
+        print(f"\nLOCAL PRE-CLASSIFIER: decided {len(local)}/{len(results)}, {local_passed}/{len(local)} correct")
 
     return results
 
@@ -268,8 +290,16 @@ async def main():
     parser.add_argument("--all", "-a", action="store_true", help="Run all scenarios")
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
     parser.add_argument("--sync-dataset", action="store_true", help="Sync scenarios to Langfuse dataset")
+    parser.add_argument("--no-prefilter", action="store_true", help="Skip the local pre-classifier (LLM only)")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
+
+    if args.no_prefilter:
+        global _prefilter
+        _prefilter = None
 
     if args.list:
         list_scenarios_formatted()
@@ -280,7 +310,7 @@ async def main():
         return
 
     if args.all:
-        await run_all_scenarios()
+        await run_all_scenarios(concurrency=args.concurrency)
         return
 
     if args.scenario:
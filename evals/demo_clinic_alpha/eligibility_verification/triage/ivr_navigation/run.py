@@ -8,8 +8,11 @@ Usage:
     python run.py                           # Run default scenario (first in list)
     python run.py --scenario <id>           # Run specific scenario
     python run.py --all                     # Run all scenarios
+    python run.py --all -j 16               # Run all scenarios, 16 at a time (default 8)
     python run.py --list                    # List available scenarios
     python run.py --sync-dataset            # Sync scenarios to Langfuse dataset
+    python run.py --all --cassette record   # Record LLM calls to cassettes/<scenario_id>.json
+    python run.py --all --cassette replay   # Replay them offline (hybrid: live on a miss)
 
 Results are stored locally in results/<scenario_id>/ and traces are pushed to Langfuse.
 """
@@ -28,11 +31,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from langfuse import Langfuse, observe
-from openai import AsyncOpenAI
 
 from clients.demo_clinic_alpha.eligibility_verification.flow_definition import (
     EligibilityVerificationFlow,
 )
+from evals.cassette import add_cassette_argument, openai_client, scenario_cassette, set_mode
+from evals.parallel import (
+    DEFAULT_CONCURRENCY,
+    add_parallel_arguments,
+    run_suite,
+)
 from evals.triage import (
     get_scenario,
     grade_dtmf_sequence,
@@ -56,6 +64,8 @@ langfuse = Langfuse()
 
 # === CONSTANTS ===
 SCENARIOS_PATH = Path(__file__).parent / "scenarios.yaml"
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_alpha/eligibility_verification/triage/ivr_navigation"
 
 # Test patient data for IVR navigation evals
 TEST_PATIENT_DATA = {
@@ -176,7 +186,7 @@ class NavigationRunner:
         ]
 
         # Call OpenAI (same as production)
-        client = AsyncOpenAI()
+        client = openai_client()
         response = await client.chat.completions.create(
             model=self.llm_config.get("model", "gpt-4o"),
             messages=messages,
@@ -376,6 +386,7 @@ def sync_dataset_to_langfuse() -> None:
     print(f"\nDataset synced to Langfuse: {dataset_name}")
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str) -> dict:
     """Run a single scenario and save results."""
     config = load_scenarios(SCENARIOS_PATH)
@@ -403,32 +414,9 @@ async def run_scenario(scenario_id: str) -> dict:
     return {**result, "grade": grade}
 
 
-async def run_all_scenarios() -> list[dict]:
-    """Run all scenarios sequentially."""
-    config = load_scenarios(SCENARIOS_PATH)
-    results = []
-
-    for scenario in config["scenarios"]:
-        print(f"\n{'#'*70}")
-        print(f"# Running: {scenario['id']}")
-        print(f"{'#'*70}")
-
-        result = await run_scenario(scenario["id"])
-        results.append(result)
-
-    passed = [r for r in results if r["grade"]["pass"]]
-    failed = [r for r in results if not r["grade"]["pass"]]
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY: {len(passed)}/{len(results)} passed")
-    print(f"{'='*70}")
-
-    if failed:
-        print("\nFAILED:")
-        for r in failed:
-            print(f"  - {r['scenario_id']}: {r['grade']['reason']}")
-
-    return results
+async def run_all_scenarios(concurrency: int = DEFAULT_CONCURRENCY) -> list[dict]:
+    """Run all scenarios, `concurrency` at a time."""
+    return await run_suite(SUITE, load_scenarios(SCENARIOS_PATH)["scenarios"], run_scenario, concurrency, lock_key=None)
 
 
 async def main():
@@ -437,8 +425,11 @@ async def main():
     parser.add_argument("--all", "-a", action="store_true", help="Run all scenarios")
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
     parser.add_argument("--sync-dataset", action="store_true", help="Sync scenarios to Langfuse dataset")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
 
     if args.list:
         list_scenarios_formatted()
@@ -449,7 +440,7 @@ async def main():
         return
 
     if args.all:
-        await run_all_scenarios()
+        await run_all_scenarios(concurrency=args.concurrency)
         return
 
     if args.scenario:
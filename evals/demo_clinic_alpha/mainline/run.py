@@ -5,15 +5,17 @@ Usage:
     python run.py                           # Run default scenario (first in list)
     python run.py --scenario <id>           # Run specific scenario
     python run.py --all                     # Run all scenarios
+    python run.py --all -j 16               # Run all scenarios, 16 at a time (default 8)
     python run.py --list                    # List available scenarios
     python run.py --sync-dataset            # Sync scenarios to Langfuse dataset
+    python run.py --all --cassette record   # Record LLM calls to cassettes/<scenario_id>.json
+    python run.py --all --cassette replay   # Replay them offline (hybrid: live on a miss)
 
 Results are stored locally in results/<scenario_id>/ and traces are pushed to Langfuse.
 """
 import argparse
 import asyncio
 import json
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -21,29 +23,37 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 import yaml
-from anthropic import Anthropic
 from langfuse import Langfuse, observe
-from openai import AsyncOpenAI
 
 from clients.demo_clinic_alpha.mainline.flow_definition import MainlineFlow
 from clients.demo_clinic_alpha.mainline.schema import WORKFLOW_SCHEMA
-from evals.context import EvalContextManager
+from evals.cassette import (
+    add_cassette_argument,
+    openai_client,
+    scenario_cassette,
+    set_mode,
+)
 from evals.db import ORG_ID_STR, get_patient_db
+from evals.flow_runner import FlowRunner
+from evals.grading import get_grader
+from evals.latency import record_latency
+from evals.parallel import (
+    DEFAULT_CONCURRENCY,
+    add_parallel_arguments,
+    run_suite,
+)
 
 # === LANGFUSE CLIENT ===
 langfuse = Langfuse()
 
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_alpha/mainline"
+
 
 # === LLM GRADERS ===
-def _call_grader(prompt: str) -> str:
+async def _call_grader(prompt: str, rubric: str) -> str:
     """Call the grader LLM with a prompt."""
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=50,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.content[0].text.strip()
+    return await get_grader().grade(prompt, rubric=f"{SUITE}/{rubric}")
 
 
 def _format_conversation(conversation: list[dict]) -> str:
@@ -54,7 +64,7 @@ def _format_conversation(conversation: list[dict]) -> str:
     ])
 
 
-def grade_routing(conv_text: str, expected_problem: str, calls_text: str, final_state: dict) -> dict:
+async def grade_routing(conv_text: str, expected_problem: str, calls_text: str, final_state: dict) -> dict:
     """Grade whether the bot routed correctly based on caller intent."""
     routed_to = final_state.get("routed_to", "Unknown")
     call_reason = final_state.get("call_reason", "")
@@ -99,11 +109,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "routing")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_conversation_quality(conv_text: str, calls_text: str = "") -> dict:
+async def grade_conversation_quality(conv_text: str, calls_text: str = "") -> dict:
     """Grade conversational quality - natural, efficient, professional."""
     prompt = f"""Grade this conversation's QUALITY. Be STRICT about these issues:
 
@@ -132,11 +142,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "conversation_quality")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_function_calls(calls_text: str, final_state: dict) -> dict:
+async def grade_function_calls(calls_text: str, final_state: dict) -> dict:
     """Grade function call correctness - right functions at right times."""
     prompt = f"""Grade whether the bot called functions correctly for a MAINLINE RECEPTIONIST.
 
@@ -165,11 +175,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "function_calls")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict = None) -> dict:
+async def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict = None) -> dict:
     """
     Run all graders and combine results. ALL must pass for overall pass.
     Returns: {"pass": bool, "reason": str, "details": {...}}
@@ -183,9 +193,11 @@ def grade_scenario(conversation: list[dict], expected_problem: str, function_cal
     final_state = final_state or {}
 
     # Run all graders
-    routing = grade_routing(conv_text, expected_problem, calls_text, final_state)
-    quality = grade_conversation_quality(conv_text, calls_text)
-    functions = grade_function_calls(calls_text, final_state)
+    routing, quality, functions = await asyncio.gather(
+        grade_routing(conv_text, expected_problem, calls_text, final_state),
+        grade_conversation_quality(conv_text, calls_text),
+        grade_function_calls(calls_text, final_state),
+    )
 
     # All must pass
     all_passed = routing["pass"] and quality["pass"] and functions["pass"]
@@ -241,227 +253,40 @@ def list_scenarios() -> None:
         print(f"    Expected: {s['expected_problem']}\n")
 
 
-# === MOCKS ===
-class MockFlowManager:
-    def __init__(self):
-        self.state = {}
-
-
-class MockPipeline:
-    transcripts = []
-    transfer_in_progress = False
-
-
-class MockTransport:
-    async def sip_call_transfer(self, config):
-        print(f"\n  [SIP TRANSFER] → {config.get('toEndPoint')}\n")
-
-
 # === FLOW RUNNER ===
-class FlowRunner:
+class MainlineRunner(FlowRunner):
+    PRINT_CONTEXT = True
+
     def __init__(self, llm_config: dict, cold_transfer_config: dict, practice_info: dict):
-        self.mock_flow_manager = MockFlowManager()
-        self.mock_pipeline = MockPipeline()
-        self.mock_transport = MockTransport()
-        self.llm_config = llm_config
+        super().__init__(llm_config)
+        self.handed_off_to = None  # Track workflow handoffs
 
         # Build call_data with practice_info from schema
         call_data = {
             "organization_name": "Demo Clinic Alpha",
             "practice_info": practice_info,
         }
-
         self.flow = MainlineFlow(
             call_data=call_data,
             session_id="eval-session",
-            flow_manager=self.mock_flow_manager,
-            main_llm=None,
-            context_aggregator=None,
-            transport=self.mock_transport,
-            pipeline=self.mock_pipeline,
-            cold_transfer_config=cold_transfer_config,
+            **self.flow_mocks(cold_transfer_config),
         )
+        self.start(self.flow.create_greeting_node())
 
-        self.current_node = self.flow.create_greeting_node()
-        self.context = EvalContextManager()
-        self.context.set_node(self.current_node)
-        self.function_calls = []  # Track all function calls
-        self.done = False
-        self.handed_off_to = None  # Track workflow handoffs
+    def _tool_call_content(self, msg):
+        # Don't include content when there's a tool call and respond_immediately
+        # This prevents spurious "I'll connect you" messages from handoff nodes
+        return msg.content if not self.current_node.get("respond_immediately") else None
 
-    def get_tools(self) -> list[dict]:
-        functions = self.current_node.get("functions") or []
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": f.name,
-                    "description": f.description or "",
-                    "parameters": {
-                        "type": "object",
-                        "properties": f.properties or {},
-                        "required": f.required or [],
-                    },
-                },
-            }
-            for f in functions
-        ]
-
-    @observe(as_type="generation")
-    async def _call_llm(self, messages: list[dict], tools: list[dict] | None, node_name: str):
-        """Make LLM call - decorated for Langfuse tracing."""
-        client = AsyncOpenAI()
-        response = await client.chat.completions.create(
-            model=self.llm_config["model"],
-            messages=messages,
-            tools=tools,
-            tool_choice="auto" if tools else None,
-            temperature=self.llm_config["temperature"],
-            max_tokens=self.llm_config["max_tokens"],
-        )
-        return response
-
-    @observe(as_type="tool")
-    async def _execute_handler(self, func_name: str, func_args: dict, handler):
-        """Execute flow handler - decorated for Langfuse tracing."""
-        result, next_node = await handler(func_args, self.mock_flow_manager)
-        return result, next_node
-
-    def _print_llm_context(self, messages: list[dict], tools: list[dict] | None, node_name: str, turn: int):
-        """Print what's being sent to the LLM for debugging."""
-        print(f"\n  {'─'*60}")
-        print(f"  LLM CONTEXT (turn {turn}, node: {node_name})")
-        print(f"  {'─'*60}")
-        for i, msg in enumerate(messages):
-            role = msg.get("role", "?")
-            content = msg.get("content", "")
-            # Truncate long system messages
-            if role == "system" and len(content) > 200:
-                content = content[:200] + "..."
-            # Show tool calls if present
-            if msg.get("tool_calls"):
-                tc = msg["tool_calls"][0]
-                print(f"  [{i}] {role}: (tool_call: {tc['function']['name']})")
-            elif role == "tool":
-                print(f"  [{i}] {role}: {content[:100]}")
-            else:
-                print(f"  [{i}] {role}: {content[:150]}{'...' if len(content) > 150 else ''}")
-        if tools:
-            tool_names = [t["function"]["name"] for t in tools]
-            print(f"  TOOLS: {tool_names}")
-        print(f"  {'─'*60}\n")
+    def _on_function_result(self, func_name: str, func_args: dict, next_node):
+        # Continue with the new workflow's node instead of stopping
+        if func_name == "route_to_workflow" and next_node:
+            self.handed_off_to = func_args.get("workflow", "unknown")
+            print(f"\n  [HANDOFF] → {self.handed_off_to} workflow\n")
 
     @observe(name="monica_turn")
     async def process_message(self, user_message: str, turn_number: int) -> str:
-        if user_message:
-            self.context.add_user_message(user_message)
-
-        all_content = []
-
-        while not self.done:
-            messages = self.context.get_messages()
-            functions = self.current_node.get("functions") or []
-            tools = self.get_tools() if functions else None
-            node_name = self.current_node.get("name", "unknown")
-
-            self._print_llm_context(messages, tools, node_name, turn_number)
-
-            response = await self._call_llm(messages, tools, node_name)
-            msg = response.choices[0].message
-
-            if msg.tool_calls:
-                tool_call = msg.tool_calls[0]
-                func_name = tool_call.function.name
-
-                try:
-                    func_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError as e:
-                    print(f"    ⚠ Malformed JSON from LLM: {tool_call.function.arguments[:100]}...")
-                    print(f"    Error: {e}")
-                    # Record the failure and continue without executing the function
-                    self.function_calls.append({
-                        "turn": turn_number,
-                        "node": node_name,
-                        "function": func_name,
-                        "args": {"_error": f"Malformed JSON: {str(e)}"},
-                    })
-                    break
-
-                # Track function call
-                self.function_calls.append({
-                    "turn": turn_number,
-                    "node": node_name,
-                    "function": func_name,
-                    "args": func_args,
-                })
-                print(f"    → {func_name}({json.dumps(func_args)})")
-
-                # Don't include content when there's a tool call and respond_immediately
-                # This prevents spurious "I'll connect you" messages from handoff nodes
-                include_content = msg.content if not self.current_node.get("respond_immediately") else None
-
-                self.context.add_tool_call({
-                    "content": include_content,
-                    "tool_calls": [{
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": func_name,
-                            "arguments": tool_call.function.arguments
-                        }
-                    }]
-                })
-
-                handler = next(f.handler for f in functions if f.name == func_name)
-                result, next_node = await self._execute_handler(func_name, func_args, handler)
-
-                self.context.add_tool_result(tool_call.id, result)
-
-                if result:
-                    all_content.append(result)
-
-                if next_node:
-                    next_node_name = next_node.get("name", "unknown")
-
-                    # Check if this is a handoff to another flow
-                    if func_name == "route_to_workflow":
-                        workflow = func_args.get("workflow", "unknown")
-                        self.handed_off_to = workflow
-                        print(f"\n  [HANDOFF] → {workflow} workflow\n")
-                        # Continue with the new workflow's node instead of stopping
-
-                    self.current_node = next_node
-                    self.context.set_node(next_node)
-
-                    # Process pre_actions on the new node (e.g., tts_say)
-                    pre_actions = self.current_node.get("pre_actions") or []
-                    for action in pre_actions:
-                        if action.get("type") == "tts_say":
-                            pre_action_text = action.get("text", "")
-                            if pre_action_text:
-                                all_content.append(pre_action_text)
-                                self.context.add_assistant_message(pre_action_text)
-
-                    # Check if this node ends the conversation
-                    post_actions = next_node.get("post_actions") or []
-                    ends_conversation = (
-                        next_node_name == "end" or
-                        next_node_name == "transfer_initiated" or
-                        any(a.get("type") == "end_conversation" for a in post_actions)
-                    )
-                    if ends_conversation:
-                        self.done = True
-                        break
-                    if self.current_node.get("respond_immediately"):
-                        continue
-
-            if msg.content:
-                all_content.append(msg.content)
-                self.context.add_assistant_message(msg.content)
-
-            break
-
-        return " ".join(all_content)
+        return await super().process_message(user_message, turn_number)
 
 
 @observe(as_type="generation", name="caller_simulator")
@@ -490,7 +315,7 @@ Stay in character. Be natural and conversational."""
         ],
     ]
 
-    client = AsyncOpenAI()
+    client = openai_client()
     response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
@@ -524,7 +349,7 @@ async def run_simulation(
     else:
         print(f"  [DB] Patient not found for {caller_phone}")
 
-    runner = FlowRunner(llm_config, cold_transfer_config, practice_info)
+    runner = MainlineRunner(llm_config, cold_transfer_config, practice_info)
 
     # Bot greeting
     pre_actions = runner.current_node.get("pre_actions") or []
@@ -582,6 +407,7 @@ async def run_simulation(
         "function_calls": runner.function_calls,
         "final_state": final_state,
         "turns": turn,
+        "latency": runner.latency_metrics.to_dict(),
     }
 
 
@@ -680,6 +506,7 @@ def sync_dataset_to_langfuse() -> None:
     print("View at: https://cloud.langfuse.com/datasets")
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str) -> dict:
     """Run a single scenario and save results."""
     scenario = get_scenario(scenario_id)
@@ -697,9 +524,10 @@ async def run_scenario(scenario_id: str) -> dict:
 
     # Run simulation (trace is created by @observe decorator)
     result = await run_simulation(scenario, llm_config, cold_transfer_config, practice_info)
+    record_latency(SUITE, scenario_id, result["latency"])
 
     # Grade the result (3 graders: routing, quality, functions)
-    grade = grade_scenario(
+    grade = await grade_scenario(
         result["conversation"],
         result["expected_problem"],
         result["function_calls"],
@@ -724,33 +552,9 @@ async def run_scenario(scenario_id: str) -> dict:
     return {**result, "grade": grade}
 
 
-async def run_all_scenarios() -> list[dict]:
-    """Run all scenarios sequentially."""
-    config = load_scenarios()
-    results = []
-
-    for scenario in config["scenarios"]:
-        print(f"\n{'#'*70}")
-        print(f"# Running: {scenario['id']}")
-        print(f"{'#'*70}")
-
-        result = await run_scenario(scenario["id"])
-        results.append(result)
-
-    # Summary
-    passed = [r for r in results if r["grade"]["pass"]]
-    failed = [r for r in results if not r["grade"]["pass"]]
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY: {len(passed)}/{len(results)} passed")
-    print(f"{'='*70}")
-
-    if failed:
-        print("\nFAILED:")
-        for r in failed:
-            print(f"  - {r['scenario_id']}: {r['grade']['reason']}")
-
-    return results
+async def run_all_scenarios(concurrency: int = DEFAULT_CONCURRENCY) -> list[dict]:
+    """Run all scenarios, `concurrency` at a time."""
+    return await run_suite(SUITE, load_scenarios()["scenarios"], run_scenario, concurrency)
 
 
 async def main():
@@ -759,8 +563,11 @@ async def main():
     parser.add_argument("--all", "-a", action="store_true", help="Run all scenarios")
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
     parser.add_argument("--sync-dataset", action="store_true", help="Sync scenarios to Langfuse dataset")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
 
     if args.list:
         list_scenarios()
@@ -771,7 +578,7 @@ async def main():
         return
 
     if args.all:
-        await run_all_scenarios()
+        await run_all_scenarios(concurrency=args.concurrency)
         return
 
     if args.scenario:
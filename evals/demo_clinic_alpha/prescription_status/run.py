@@ -5,8 +5,11 @@ Usage:
     python run.py                           # Run default scenario (first in list)
     python run.py --scenario <id>           # Run specific scenario
     python run.py --all                     # Run all scenarios
+    python run.py --all -j 16               # Run all scenarios, 16 at a time (default 8)
     python run.py --list                    # List available scenarios
     python run.py --sync-dataset            # Sync scenarios to Langfuse dataset
+    python run.py --all --cassette record   # Record LLM calls to cassettes/<scenario_id>.json
+    python run.py --all --cassette replay   # Replay them offline (hybrid: live on a miss)
 
 Patient data lives in the test database (alfons_test), same as production.
 Scenarios reference patients by phone_number.
@@ -16,8 +19,8 @@ Results are stored locally in results/<scenario_id>/ and traces are pushed to La
 
 import argparse
 import asyncio
+import functools
 import json
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -25,30 +28,38 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 import yaml
-from anthropic import Anthropic
 from langfuse import Langfuse, observe
-from openai import AsyncOpenAI
 
 from clients.demo_clinic_alpha.prescription_status.flow_definition import PrescriptionStatusFlow
-from evals.context import EvalContextManager
+from evals.cassette import (
+    add_cassette_argument,
+    openai_client,
+    scenario_cassette,
+    set_mode,
+)
 from evals.db import ORG_ID_STR
 from evals.fixtures import TestDB
+from evals.flow_runner import FlowRunner
+from evals.grading import get_grader
+from evals.latency import record_latency
+from evals.parallel import (
+    DEFAULT_CONCURRENCY,
+    add_parallel_arguments,
+    run_suite,
+)
 from pipeline.safety_processors import SAFETY_CLASSIFICATION_PROMPT
 
 # === LANGFUSE CLIENT ===
 langfuse = Langfuse()
 
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_alpha/prescription_status"
+
 
 # === LLM GRADERS ===
-def _call_grader(prompt: str) -> str:
+async def _call_grader(prompt: str, rubric: str) -> str:
     """Call the grader LLM with a prompt."""
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=50,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.content[0].text.strip()
+    return await get_grader().grade(prompt, rubric=f"{SUITE}/{rubric}")
 
 
 def _format_conversation(conversation: list[dict]) -> str:
@@ -59,7 +70,7 @@ def _format_conversation(conversation: list[dict]) -> str:
     ])
 
 
-def grade_hipaa_compliance(conv_text: str, expected_problem: str, calls_text: str, final_state: dict, patient: dict) -> dict:
+async def grade_hipaa_compliance(conv_text: str, expected_problem: str, calls_text: str, final_state: dict, patient: dict) -> dict:
     """Grade HIPAA compliance - identity verification before sharing prescription info."""
     identity_verified = final_state.get("identity_verified", False)
 
@@ -115,11 +126,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "hipaa_compliance")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_conversation_quality(conv_text: str, final_state: dict) -> dict:
+async def grade_conversation_quality(conv_text: str, final_state: dict) -> dict:
     """Grade conversational quality - natural, empathetic, professional."""
     identity_verified = final_state.get("identity_verified", False)
 
@@ -150,11 +161,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "conversation_quality")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_function_calls(calls_text: str, conv_text: str, final_state: dict, patient: dict) -> dict:
+async def grade_function_calls(calls_text: str, conv_text: str, final_state: dict, patient: dict) -> dict:
     """Grade function call correctness - right functions at right times."""
     refill_status = patient.get("refill_status", "")
     refills_remaining = patient.get("refills_remaining", 0)
@@ -211,7 +222,7 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "function_calls")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
@@ -276,7 +287,7 @@ def grade_db_state(db_state: dict, expected_db_state: dict) -> dict:
     return {"pass": True, "reason": "PASS: DB state correct"}
 
 
-def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict, patient: dict, final_node: str, expected_node: str, db_state: dict = None, expected_db_state: dict = None, safety_events: list = None, expected_safety: str = None) -> dict:
+async def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict, patient: dict, final_node: str, expected_node: str, db_state: dict = None, expected_db_state: dict = None, safety_events: list = None, expected_safety: str = None) -> dict:
     """
     Run all graders and combine results. ALL must pass for overall pass.
     Returns: {"pass": bool, "reason": str, "details": {...}}
@@ -290,9 +301,11 @@ def grade_scenario(conversation: list[dict], expected_problem: str, function_cal
     final_state = final_state or {}
 
     # Run all graders
-    hipaa = grade_hipaa_compliance(conv_text, expected_problem, calls_text, final_state, patient)
-    quality = grade_conversation_quality(conv_text, final_state)
-    functions = grade_function_calls(calls_text, conv_text, final_state, patient)
+    hipaa, quality, functions = await asyncio.gather(
+        grade_hipaa_compliance(conv_text, expected_problem, calls_text, final_state, patient),
+        grade_conversation_quality(conv_text, final_state),
+        grade_function_calls(calls_text, conv_text, final_state, patient),
+    )
     node_reached = grade_node_reached(final_node, expected_node)
     db_check = grade_db_state(db_state or {}, expected_db_state or {})
     safety_check = grade_safety_detection(safety_events or [], expected_safety)
@@ -340,7 +353,7 @@ EMERGENCY_MESSAGE = "If this is an emergency, please hang up and dial 911."
 async def check_safety_classification(text: str) -> str:
     """Simulate safety pipeline classification using same prompt as production."""
     try:
-        client = AsyncOpenAI()
+        client = openai_client()
         response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
@@ -412,232 +425,21 @@ def list_scenarios() -> None:
         print()
 
 
-# === MOCKS ===
-class MockFlowManager:
-    def __init__(self):
-        self.state = {}
-
-
-class MockTask:
-    async def queue_frames(self, frames):
-        pass  # No-op in simulation
-
-
-class MockPipeline:
-    transcripts = []
-    transfer_in_progress = False
-    task = MockTask()
-
-
-class MockTransport:
-    async def sip_call_transfer(self, config):
-        print(f"\n  [SIP TRANSFER] → {config.get('toEndPoint')}\n")
-        return None  # No error = transfer succeeded
-
-
 # === FLOW RUNNER ===
-class FlowRunner:
-    def __init__(self, call_data: dict, llm_config: dict, session_id: str, cold_transfer_config: dict, handoff_context: str = None, verbose: bool = False):
-        self.mock_flow_manager = MockFlowManager()
-        self.mock_pipeline = MockPipeline()
-        self.mock_transport = MockTransport()
-        self.llm_config = llm_config
-        self.call_data = call_data
-        self.session_id = session_id
-        self.handoff_context = handoff_context
-        self.verbose = verbose
-
+class PrescriptionStatusRunner(FlowRunner):
+    def __init__(self, call_data: dict, llm_config: dict, session_id: str, cold_transfer_config: dict, verbose: bool = False):
+        super().__init__(llm_config, verbose=verbose)
         self.flow = PrescriptionStatusFlow(
             call_data=call_data,
             session_id=session_id,
-            flow_manager=self.mock_flow_manager,
-            main_llm=None,
-            context_aggregator=None,
-            transport=self.mock_transport,
-            pipeline=self.mock_pipeline,
             organization_id=ORG_ID_STR,
-            cold_transfer_config=cold_transfer_config,
+            **self.flow_mocks(cold_transfer_config),
         )
-
-        # Use handoff_entry node if context provided (simulates mainline handoff)
-        # Otherwise use greeting node (normal call start)
-        if handoff_context:
-            self.current_node = self.flow.create_handoff_entry_node(context=handoff_context)
-            self.current_node_name = "handoff_entry"
-        else:
-            self.current_node = self.flow.create_greeting_node()
-            self.current_node_name = "greeting"
-
-        self.context = EvalContextManager()
-        self.context.set_node(self.current_node)
-        self.function_calls = []
-        self.done = False
-
-    def get_tools(self) -> list[dict]:
-        functions = self.current_node.get("functions") or []
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": f.name,
-                    "description": f.description or "",
-                    "parameters": {
-                        "type": "object",
-                        "properties": f.properties or {},
-                        "required": f.required or [],
-                    },
-                },
-            }
-            for f in functions
-        ]
-
-    @observe(as_type="generation")
-    async def _call_llm(self, messages: list[dict], tools: list[dict] | None, node_name: str):
-        """Make LLM call - decorated for Langfuse tracing."""
-        client = AsyncOpenAI()
-        response = await client.chat.completions.create(
-            model=self.llm_config["model"],
-            messages=messages,
-            tools=tools if tools else None,
-            tool_choice="auto" if tools else None,
-            temperature=self.llm_config["temperature"],
-            max_tokens=self.llm_config["max_tokens"],
-        )
-        return response
-
-    @observe(as_type="tool")
-    async def _execute_handler(self, func_name: str, func_args: dict, handler):
-        """Execute flow handler - decorated for Langfuse tracing."""
-        result, next_node = await handler(func_args, self.mock_flow_manager)
-        return result, next_node
-
-    def _print_llm_context(self, messages: list[dict], tools: list[dict] | None, node_name: str, turn: int):
-        """Print what's being sent to the LLM for debugging."""
-        print(f"\n  {'─'*60}")
-        print(f"  LLM CONTEXT (turn {turn}, node: {node_name})")
-        print(f"  {'─'*60}")
-        for i, msg in enumerate(messages):
-            role = msg.get("role", "?")
-            content = msg.get("content", "")
-            if role == "system" and len(content) > 200:
-                content = content[:200] + "..."
-            if msg.get("tool_calls"):
-                tc = msg["tool_calls"][0]
-                print(f"  [{i}] {role}: (tool_call: {tc['function']['name']})")
-            elif role == "tool":
-                print(f"  [{i}] {role}: {content[:100]}")
-            else:
-                print(f"  [{i}] {role}: {content[:150]}{'...' if len(content) > 150 else ''}")
-        if tools:
-            tool_names = [t["function"]["name"] for t in tools]
-            print(f"  TOOLS: {tool_names}")
-        print(f"  {'─'*60}\n")
+        self.start(self.flow.create_greeting_node())
 
     @observe(name="jamie_turn")
     async def process_message(self, user_message: str, turn_number: int) -> str:
-        if user_message:
-            self.context.add_user_message(user_message)
-
-        all_content = []
-
-        while not self.done:
-            messages = self.context.get_messages()
-            functions = self.current_node.get("functions") or []
-            tools = self.get_tools() if functions else None
-            node_name = self.current_node.get("name", "unknown")
-
-            if self.verbose:
-                self._print_llm_context(messages, tools, node_name, turn_number)
-
-            response = await self._call_llm(messages, tools, node_name)
-            msg = response.choices[0].message
-
-            if msg.tool_calls:
-                tool_call = msg.tool_calls[0]
-                func_name = tool_call.function.name
-
-                try:
-                    func_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError as e:
-                    print(f"    ⚠ Malformed JSON from LLM: {tool_call.function.arguments[:100]}...")
-                    print(f"    Error: {e}")
-                    self.function_calls.append({
-                        "turn": turn_number,
-                        "node": node_name,
-                        "function": func_name,
-                        "args": {"_error": f"Malformed JSON: {str(e)}"},
-                    })
-                    break
-
-                self.function_calls.append({
-                    "turn": turn_number,
-                    "node": node_name,
-                    "function": func_name,
-                    "args": func_args,
-                })
-                print(f"    → {func_name}({json.dumps(func_args)})")
-
-                self.context.add_tool_call({
-                    "content": msg.content,
-                    "tool_calls": [{
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": func_name,
-                            "arguments": tool_call.function.arguments
-                        }
-                    }]
-                })
-
-                handler = next(f.handler for f in functions if f.name == func_name)
-                result, next_node = await self._execute_handler(func_name, func_args, handler)
-
-                self.context.add_tool_result(tool_call.id, result)
-
-                if result:
-                    all_content.append(result)
-
-                if next_node:
-                    next_node_name = next_node.get("name", "unknown")
-
-                    self.current_node = next_node
-                    self.current_node_name = next_node_name
-                    self.context.set_node(next_node)
-
-                    pre_actions = self.current_node.get("pre_actions") or []
-                    for action in pre_actions:
-                        if action.get("type") == "tts_say":
-                            pre_action_text = action.get("text", "")
-                            if pre_action_text:
-                                all_content.append(pre_action_text)
-                                self.context.add_assistant_message(pre_action_text)
-
-                    post_actions = next_node.get("post_actions") or []
-                    for action in post_actions:
-                        if action.get("type") == "tts_say":
-                            post_action_text = action.get("text", "")
-                            if post_action_text:
-                                all_content.append(post_action_text)
-                                self.context.add_assistant_message(post_action_text)
-
-                    ends_conversation = (
-                        next_node_name == "end" or
-                        next_node_name == "transfer_initiated" or
-                        any(a.get("type") == "end_conversation" for a in post_actions)
-                    )
-                    if ends_conversation:
-                        self.done = True
-                        break
-                    if self.current_node.get("respond_immediately"):
-                        continue
-
-            if msg.content:
-                all_content.append(msg.content)
-                self.context.add_assistant_message(msg.content)
-
-            break
-
-        return " ".join(all_content)
+        return await super().process_message(user_message, turn_number)
 
 
 @observe(as_type="generation", name="caller_simulator")
@@ -672,7 +474,7 @@ Stay in character. Be natural and conversational. Keep responses brief (1-2 sent
         ],
     ]
 
-    client = AsyncOpenAI()
+    client = openai_client()
     response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
@@ -701,7 +503,10 @@ async def run_simulation(
         "session_id": session_id,
     }
 
-    runner = FlowRunner(call_data, llm_config, session_id, cold_transfer_config, handoff_context=handoff_context, verbose=verbose)
+    runner = PrescriptionStatusRunner(call_data, llm_config, session_id, cold_transfer_config, verbose=verbose)
+    if handoff_context:
+        # Simulates a mainline handoff: start at the node the flow routes the context to
+        runner.start(await runner.flow.create_handoff_entry_node(context=handoff_context))
 
     print(f"\n{'='*70}")
     print(f"SCENARIO: {scenario['id']}")
@@ -789,6 +594,7 @@ async def run_simulation(
         "patient": seeded_patient,
         "turns": turn,
         "safety_events": safety_events,
+        "latency": runner.latency_metrics.to_dict(),
     }
 
 
@@ -901,6 +707,7 @@ def sync_dataset_to_langfuse() -> None:
 
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
     """Run a single scenario and save results."""
     scenario = get_scenario(scenario_id)
@@ -927,12 +734,13 @@ async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
     try:
         # Run simulation (trace is created by @observe decorator)
         result = await run_simulation(scenario, llm_config, cold_transfer_config, seeded_patient, session_id, verbose=verbose)
+        record_latency(SUITE, scenario_id, result["latency"])
 
         db_state = await test_db.get_patient_state(patient_id)
         print(f"  [DB STATE] {db_state}")
 
         # Grade the result (6 graders: hipaa, quality, functions, node_reached, db_state, safety)
-        grade = grade_scenario(
+        grade = await grade_scenario(
             result["conversation"],
             result["expected_problem"],
             result["function_calls"],
@@ -968,33 +776,11 @@ async def run_scenario(scenario_id: str, verbose: bool = False) -> dict:
         print("  [CLEANUP] Removed test patient and session")
 
 
-async def run_all_scenarios(verbose: bool = False) -> list[dict]:
-    """Run all scenarios sequentially."""
-    config = load_scenarios()
-    results = []
-
-    for scenario in config["scenarios"]:
-        print(f"\n{'#'*70}")
-        print(f"# Running: {scenario['id']}")
-        print(f"{'#'*70}")
-
-        result = await run_scenario(scenario["id"], verbose=verbose)
-        results.append(result)
-
-    # Summary
-    passed = [r for r in results if r["grade"]["pass"]]
-    failed = [r for r in results if not r["grade"]["pass"]]
-
-    print(f"\n{'='*70}")
-    print(f"SUMMARY: {len(passed)}/{len(results)} passed")
-    print(f"{'='*70}")
-
-    if failed:
-        print("\nFAILED:")
-        for r in failed:
-            print(f"  - {r['scenario_id']}: {r['grade']['reason']}")
-
-    return results
+async def run_all_scenarios(verbose: bool = False, concurrency: int = DEFAULT_CONCURRENCY) -> list[dict]:
+    """Run all scenarios, `concurrency` at a time."""
+    return await run_suite(
+        SUITE, load_scenarios()["scenarios"], functools.partial(run_scenario, verbose=verbose), concurrency
+    )
 
 
 async def main():
@@ -1004,8 +790,11 @@ async def main():
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
     parser.add_argument("--sync-dataset", action="store_true", help="Sync scenarios to Langfuse dataset")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print full LLM context for debugging")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
 
     if args.list:
         list_scenarios()
@@ -1016,7 +805,7 @@ async def main():
         return
 
     if args.all:
-        await run_all_scenarios(verbose=args.verbose)
+        await run_all_scenarios(verbose=args.verbose, concurrency=args.concurrency)
         return
 
     if args.scenario:
@@ -1,7 +1,6 @@
 import argparse
 import asyncio
 import json
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -9,23 +8,27 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 import yaml
-from anthropic import Anthropic
 from langfuse import Langfuse, observe
-from openai import AsyncOpenAI
 
 from clients.demo_clinic_beta.patient_scheduling.flow_definition import PatientSchedulingFlow
+from evals.cassette import (
+    add_cassette_argument,
+    openai_client,
+    scenario_cassette,
+    set_mode,
+)
+from evals.flow_runner import FlowRunner
+from evals.grading import get_grader
+from evals.latency import record_latency
 
 langfuse = Langfuse()
 
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+SUITE = "demo_clinic_beta/patient_scheduling"
 
-def _call_grader(prompt: str) -> str:
-    client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    response = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=50,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.content[0].text.strip()
+
+async def _call_grader(prompt: str, rubric: str) -> str:
+    return await get_grader().grade(prompt, rubric=f"{SUITE}/{rubric}")
 
 
 def _format_conversation(conversation: list[dict]) -> str:
@@ -35,7 +38,7 @@ def _format_conversation(conversation: list[dict]) -> str:
     ])
 
 
-def grade_goal(conv_text: str, expected_problem: str, calls_text: str) -> dict:
+async def grade_goal(conv_text: str, expected_problem: str, calls_text: str) -> dict:
     prompt = f"""Grade this patient intake conversation. Be STRICT.
 
 EXPECTED PROBLEM TO CHECK FOR:
@@ -57,11 +60,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "goal")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_conversation_quality(conv_text: str) -> dict:
+async def grade_conversation_quality(conv_text: str) -> dict:
     prompt = f"""Grade this conversation's QUALITY. Be STRICT about these issues:
 
 CONVERSATION:
@@ -80,11 +83,11 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "conversation_quality")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_function_calls(calls_text: str, final_state: dict) -> dict:
+async def grade_function_calls(calls_text: str, final_state: dict) -> dict:
     prompt = f"""Grade whether the bot called functions correctly.
 
 FUNCTION CALLS:
@@ -104,20 +107,22 @@ PASS: <5 words why ok>
 or
 FAIL: <5 words what went wrong>"""
 
-    result = _call_grader(prompt)
+    result = await _call_grader(prompt, "function_calls")
     return {"pass": result.upper().startswith("PASS"), "reason": result}
 
 
-def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict = None) -> dict:
+async def grade_scenario(conversation: list[dict], expected_problem: str, function_calls: list[dict], final_state: dict = None) -> dict:
     conv_text = _format_conversation(conversation)
     calls_text = "\n".join([
         f"Turn {fc['turn']}: {fc['function']}({json.dumps(fc['args'])})"
         for fc in function_calls
     ]) or "No function calls"
 
-    goal = grade_goal(conv_text, expected_problem, calls_text)
-    quality = grade_conversation_quality(conv_text)
-    functions = grade_function_calls(calls_text, final_state or {})
+    goal, quality, functions = await asyncio.gather(
+        grade_goal(conv_text, expected_problem, calls_text),
+        grade_conversation_quality(conv_text),
+        grade_function_calls(calls_text, final_state or {}),
+    )
 
     all_passed = goal["pass"] and quality["pass"] and functions["pass"]
 
@@ -160,184 +165,19 @@ def list_scenarios() -> None:
         print(f"    Expected: {s['expected_problem']}\n")
 
 
-class MockFlowManager:
-    def __init__(self):
-        self.state = {}
-
-
-class MockPipeline:
-    transcripts = []
-    transfer_in_progress = False
-
-
-class MockTransport:
-    async def sip_call_transfer(self, config):
-        print(f"\n  [TRANSFER] → {config.get('toEndPoint')}\n")
-
-
-class FlowRunner:
+class PatientSchedulingRunner(FlowRunner):
     def __init__(self, llm_config: dict, cold_transfer_config: dict):
-        self.mock_flow_manager = MockFlowManager()
-        self.mock_pipeline = MockPipeline()
-        self.mock_transport = MockTransport()
-        self.llm_config = llm_config
-
+        super().__init__(llm_config)
         self.flow = PatientSchedulingFlow(
             call_data={"organization_name": "Demo Clinic Beta"},
-            flow_manager=self.mock_flow_manager,
-            main_llm=None,
-            context_aggregator=None,
-            transport=self.mock_transport,
-            pipeline=self.mock_pipeline,
-            cold_transfer_config=cold_transfer_config,
+            session_id="eval-session",
+            **self.flow_mocks(cold_transfer_config),
         )
-
-        self.current_node = self.flow.create_greeting_node()
-        self.conversation_history = []
-        self.function_calls = []
-        self.done = False
-
-    def get_prompts(self) -> list[dict]:
-        messages = []
-        role_msgs = self.current_node.get("role_messages") or []
-        task_msgs = self.current_node.get("task_messages") or []
-        messages.extend(role_msgs)
-        messages.extend(task_msgs)
-        return messages
-
-    def get_tools(self) -> list[dict]:
-        functions = self.current_node.get("functions") or []
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": f.name,
-                    "description": f.description or "",
-                    "parameters": {
-                        "type": "object",
-                        "properties": f.properties or {},
-                        "required": f.required or [],
-                    },
-                },
-            }
-            for f in functions
-        ]
-
-    @observe(as_type="generation")
-    async def _call_llm(self, messages: list[dict], tools: list[dict] | None, node_name: str):
-        client = AsyncOpenAI()
-        response = await client.chat.completions.create(
-            model=self.llm_config["model"],
-            messages=messages,
-            tools=tools,
-            tool_choice="auto" if tools else None,
-            temperature=self.llm_config["temperature"],
-            max_tokens=self.llm_config["max_tokens"],
-        )
-        return response
-
-    @observe(as_type="tool")
-    async def _execute_handler(self, func_name: str, func_args: dict, handler):
-        result, next_node = await handler(func_args, self.mock_flow_manager)
-        return result, next_node
+        self.start(self.flow.create_greeting_node())
 
     @observe(name="monica_turn")
     async def process_message(self, user_message: str, turn_number: int) -> str:
-        if user_message:
-            self.conversation_history.append({"role": "user", "content": user_message})
-
-        all_content = []
-
-        while not self.done:
-            messages = self.get_prompts() + self.conversation_history
-            functions = self.current_node.get("functions") or []
-            tools = self.get_tools() if functions else None
-            node_name = self.current_node.get("name", "unknown")
-
-            response = await self._call_llm(messages, tools, node_name)
-            msg = response.choices[0].message
-
-            if msg.tool_calls:
-                tool_call = msg.tool_calls[0]
-                func_name = tool_call.function.name
-
-                try:
-                    func_args = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError as e:
-                    print(f"    ⚠ Malformed JSON from LLM: {tool_call.function.arguments[:100]}...")
-                    self.function_calls.append({
-                        "turn": turn_number,
-                        "node": node_name,
-                        "function": func_name,
-                        "args": {"_error": f"Malformed JSON: {str(e)}"},
-                    })
-                    break
-
-                self.function_calls.append({
-                    "turn": turn_number,
-                    "node": node_name,
-                    "function": func_name,
-                    "args": func_args,
-                })
-                print(f"    → {func_name}({json.dumps(func_args)})")
-
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": msg.content,
-                    "tool_calls": [{
-                        "id": tool_call.id,
-                        "type": "function",
-                        "function": {
-                            "name": func_name,
-                            "arguments": tool_call.function.arguments
-                        }
-                    }]
-                })
-
-                handler = next(f.handler for f in functions if f.name == func_name)
-                result, next_node = await self._execute_handler(func_name, func_args, handler)
-
-                self.conversation_history.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": result or "OK"
-                })
-
-                if result:
-                    all_content.append(result)
-
-                if next_node:
-                    self.current_node = next_node
-                    pre_actions = self.current_node.get("pre_actions") or []
-                    for action in pre_actions:
-                        if action.get("type") == "tts_say":
-                            pre_action_text = action.get("text", "")
-                            if pre_action_text:
-                                all_content.append(pre_action_text)
-                                self.conversation_history.append({
-                                    "role": "assistant",
-                                    "content": pre_action_text
-                                })
-
-                    result_node_name = next_node.get("name")
-                    post_actions = next_node.get("post_actions") or []
-                    ends_conversation = (
-                        result_node_name == "end" or
-                        any(a.get("type") == "end_conversation" for a in post_actions)
-                    )
-                    if ends_conversation:
-                        self.done = True
-                        break
-                    if self.current_node.get("respond_immediately"):
-                        continue
-
-            if msg.content:
-                all_content.append(msg.content)
-                self.conversation_history.append({"role": "assistant", "content": msg.content})
-
-            break
-
-        return " ".join(all_content)
+        return await super().process_message(user_message, turn_number)
 
 
 @observe(as_type="generation", name="patient_simulator")
@@ -366,7 +206,7 @@ Stay in character. Be natural and conversational."""
         ],
     ]
 
-    client = AsyncOpenAI()
+    client = openai_client()
     response = await client.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
@@ -382,7 +222,7 @@ async def run_simulation(scenario: dict, llm_config: dict, cold_transfer_config:
     patient = scenario["patient"]
     persona = scenario["persona"]
 
-    runner = FlowRunner(llm_config, cold_transfer_config)
+    runner = PatientSchedulingRunner(llm_config, cold_transfer_config)
 
     pre_actions = runner.current_node.get("pre_actions") or []
     greeting = pre_actions[0].get("text", "") if pre_actions else ""
@@ -429,6 +269,7 @@ async def run_simulation(scenario: dict, llm_config: dict, cold_transfer_config:
         "function_calls": runner.function_calls,
         "final_state": final_state,
         "turns": turn,
+        "latency": runner.latency_metrics.to_dict(),
     }
 
 
@@ -474,6 +315,7 @@ def save_result(result: dict, trace_id: str, grade: dict) -> Path:
     return result_file
 
 
+@scenario_cassette(CASSETTES_DIR)
 async def run_scenario(scenario_id: str) -> dict:
     scenario = get_scenario(scenario_id)
 
@@ -485,8 +327,9 @@ async def run_scenario(scenario_id: str) -> dict:
     cold_transfer_config = services.get("cold_transfer", {})
 
     result = await run_simulation(scenario, llm_config, cold_transfer_config)
+    record_latency(SUITE, scenario_id, result["latency"])
 
-    grade = grade_scenario(
+    grade = await grade_scenario(
         result["conversation"],
         result["expected_problem"],
         result["function_calls"],
@@ -511,8 +354,10 @@ async def main():
     parser = argparse.ArgumentParser(description="Patient Scheduling Flow Evaluation")
     parser.add_argument("--scenario", "-s", help="Run specific scenario by ID")
     parser.add_argument("--list", "-l", action="store_true", help="List available scenarios")
+    add_cassette_argument(parser)
 
     args = parser.parse_args()
+    set_mode(args.cassette)
 
     if args.list:
         list_scenarios()
@@ -0,0 +1,312 @@
+"""Text-mode flow driver shared by the eval suites.
+
+FlowRunner plays a workflow's nodes against the bot LLM without a pipeline:
+each turn it sends the node's context and tools, runs the chosen function
+handler, follows the returned node and applies its actions, the way
+pipecat-flows does in a call. Transport, pipeline and flow manager are mocks.
+
+A suite subclasses it to build its flow, then decorates process_message with
+its own Langfuse span name:
+
+    class LabResultsRunner(FlowRunner):
+        def __init__(self, call_data, llm_config, session_id, cold_transfer_config, verbose=False):
+            super().__init__(llm_config, verbose=verbose)
+            self.flow = LabResultsFlow(call_data=call_data, session_id=session_id,
+                                       **self.flow_mocks(cold_transfer_config))
+            self.start(self.flow.create_greeting_node())
+
+        @observe(name="jamie_turn")
+        async def process_message(self, user_message, turn_number):
+            return await super().process_message(user_message, turn_number)
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from langfuse import observe
+
+from evals.cassette import openai_client
+from evals.context import EvalContextManager
+from evals.latency import LatencyMetrics
+
+# Transition chains (respond_immediately nodes) allowed within one caller turn
+MAX_RESPOND_IMMEDIATELY = 3
+
+
+# ==================== Mocks ====================
+
+class MockFlowManager:
+    def __init__(self):
+        self.state = {}
+
+
+class MockTask:
+    async def queue_frames(self, frames):
+        pass  # No-op in simulation
+
+
+class MockPipeline:
+    def __init__(self):
+        self.transcripts = []
+        self.transfer_in_progress = False
+        self.task = MockTask()
+
+
+class MockTransport:
+    def __init__(self):
+        self.transfers: List[dict] = []
+
+    async def sip_call_transfer(self, config):
+        self.transfers.append(config)
+        print(f"\n  [TRANSFER] → {config.get('toEndPoint')}\n")
+        return None  # None = success
+
+
+# ==================== Runner ====================
+
+class FlowRunner:
+    """Runs a flow turn by turn against the bot LLM. Subclasses build self.flow and call start()."""
+
+    # Print the LLM context on every call, not only with verbose
+    PRINT_CONTEXT = False
+    # Functions that end the call even when they return no next node
+    END_CALL_FUNCTIONS: Tuple[str, ...] = ()
+
+    def __init__(self, llm_config: dict, verbose: bool = False):
+        self.llm_config = llm_config
+        self.verbose = verbose
+        self.mock_flow_manager = MockFlowManager()
+        self.mock_pipeline = MockPipeline()
+        self.mock_transport = MockTransport()
+        self.flow: Any = None
+        self.current_node: Optional[dict] = None
+        self.current_node_name: Optional[str] = None
+        self.context = EvalContextManager()
+        self.function_calls: List[dict] = []
+        self.done = False
+        self.end_call_invoked = False
+        self.latency_metrics = LatencyMetrics()
+
+    def flow_mocks(self, cold_transfer_config: Optional[dict]) -> Dict[str, Any]:
+        """Constructor arguments every flow class takes, pointing at this runner's mocks."""
+        return {
+            "flow_manager": self.mock_flow_manager,
+            "main_llm": None,
+            "context_aggregator": None,
+            "transport": self.mock_transport,
+            "pipeline": self.mock_pipeline,
+            "cold_transfer_config": cold_transfer_config,
+        }
+
+    def start(self, node: dict) -> None:
+        """Enter the first node of the call."""
+        self._set_node(node)
+
+    def _set_node(self, node: dict) -> None:
+        self.current_node = node
+        self.current_node_name = node.get("name", "unknown")
+        self.context.set_node(node)
+
+    def get_tools(self) -> list[dict]:
+        functions = self.current_node.get("functions") or []
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": f.name,
+                    "description": f.description or "",
+                    "parameters": {
+                        "type": "object",
+                        "properties": f.properties or {},
+                        "required": f.required or [],
+                    },
+                },
+            }
+            for f in functions
+        ]
+
+    # ==================== Hooks ====================
+
+    def _on_llm_response(self, response) -> None:
+        """Called with every bot LLM response (token accounting)."""
+
+    def _tool_call_content(self, msg) -> Optional[str]:
+        """Assistant text kept in context alongside a tool call."""
+        return msg.content
+
+    def _on_function_result(self, func_name: str, func_args: dict, next_node: Optional[dict]) -> None:
+        """Called after a function handler ran, before its next node is entered."""
+
+    # ==================== LLM & handlers ====================
+
+    @observe(as_type="generation")
+    async def _call_llm(self, messages: list[dict], tools: list[dict] | None, node_name: str):
+        """Make LLM call - decorated for Langfuse tracing."""
+        client = openai_client()
+        response = await client.chat.completions.create(
+            model=self.llm_config["model"],
+            messages=messages,
+            tools=tools,
+            tool_choice="auto" if tools else None,
+            temperature=self.llm_config["temperature"],
+            max_tokens=self.llm_config["max_tokens"],
+        )
+        self.latency_metrics.record_llm_call()
+        self._on_llm_response(response)
+        return response
+
+    @observe(as_type="tool")
+    async def _execute_handler(self, func_name: str, func_args: dict, handler):
+        """Execute flow handler - decorated for Langfuse tracing."""
+        result, next_node = await handler(func_args, self.mock_flow_manager)
+        return result, next_node
+
+    def _print_llm_context(self, messages: list[dict], tools: list[dict] | None, node_name: str, turn: int):
+        """Print what's being sent to the LLM: full JSON with verbose, truncated otherwise."""
+        print(f"\n  {'─'*60}")
+        print(f"  LLM CONTEXT (turn {turn}, node: {node_name})")
+        print(f"  {'─'*60}")
+
+        for i, msg in enumerate(messages):
+            if self.verbose:
+                print(f"  [{i}] {json.dumps(msg, indent=2)}")
+                continue
+            role = msg.get("role", "?")
+            content = msg.get("content", "")
+            if role == "system" and len(content) > 200:
+                content = content[:200] + "..."
+            if msg.get("tool_calls"):
+                tc = msg["tool_calls"][0]
+                print(f"  [{i}] {role}: (tool_call: {tc['function']['name']})")
+            elif role == "tool":
+                print(f"  [{i}] {role}: {content[:100]}")
+            else:
+                print(f"  [{i}] {role}: {content[:150]}{'...' if len(content) > 150 else ''}")
+
+        if tools:
+            tool_names = [t["function"]["name"] for t in tools]
+            print(f"  TOOLS: {tool_names}")
+        print(f"  {'─'*60}\n")
+
+    async def _run_actions(self, actions: list, spoken: list[str]) -> None:
+        """Apply a node's tts_say and function actions; spoken text is appended to `spoken`."""
+        for action in actions:
+            action_type = action.get("type")
+            if action_type == "tts_say":
+                text = action.get("text", "")
+                if text:
+                    spoken.append(text)
+                    self.context.add_assistant_message(text)
+            elif action_type == "function" and callable(action.get("handler")):
+                handler = action["handler"]
+                try:
+                    await handler(action, self.mock_flow_manager)
+                    print(f"    [ACTION] Executed: {handler.__name__}")
+                except Exception as e:
+                    print(f"    [ACTION] {handler.__name__} failed: {e}")
+
+    # ==================== Turn ====================
+
+    async def process_message(self, user_message: str, turn_number: int) -> str:
+        """Feed one caller message and return everything the bot says in response."""
+        if user_message:
+            self.context.add_user_message(user_message)
+
+        all_content = []
+        last_func_call = None  # (name, raw args) of the previous call, to break loops
+        respond_immediately_count = 0
+
+        while not self.done:
+            messages = self.context.get_messages()
+            functions = self.current_node.get("functions") or []
+            tools = self.get_tools() if functions else None
+            node_name = self.current_node.get("name", "unknown")
+
+            if self.verbose or self.PRINT_CONTEXT:
+                self._print_llm_context(messages, tools, node_name, turn_number)
+
+            response = await self._call_llm(messages, tools, node_name)
+            msg = response.choices[0].message
+
+            if msg.tool_calls:
+                tool_call = msg.tool_calls[0]
+                func_name = tool_call.function.name
+
+                try:
+                    func_args = json.loads(tool_call.function.arguments)
+                except json.JSONDecodeError as e:
+                    print(f"    ⚠ Malformed JSON from LLM: {tool_call.function.arguments[:100]}...")
+                    print(f"    Error: {e}")
+                    self.function_calls.append({
+                        "turn": turn_number,
+                        "node": node_name,
+                        "function": func_name,
+                        "args": {"_error": f"Malformed JSON: {str(e)}"},
+                    })
+                    break
+
+                current_func_call = (func_name, tool_call.function.arguments)
+                if current_func_call == last_func_call:
+                    print(f"    ⚠ Loop detected: {func_name} called with same args twice in a row, breaking")
+                    break
+                last_func_call = current_func_call
+
+                self.function_calls.append({
+                    "turn": turn_number,
+                    "node": node_name,
+                    "function": func_name,
+                    "args": func_args,
+                })
+                print(f"    → {func_name}({json.dumps(func_args)})")
+
+                self.context.add_tool_call({
+                    "content": self._tool_call_content(msg),
+                    "tool_calls": [{
+                        "id": tool_call.id,
+                        "type": "function",
+                        "function": {
+                            "name": func_name,
+                            "arguments": tool_call.function.arguments
+                        }
+                    }]
+                })
+
+                handler = next(f.handler for f in functions if f.name == func_name)
+                result, next_node = await self._execute_handler(func_name, func_args, handler)
+
+                self.context.add_tool_result(tool_call.id, result)
+
+                if result:
+                    all_content.append(result)
+
+                self._on_function_result(func_name, func_args, next_node)
+
+                if func_name in self.END_CALL_FUNCTIONS:
+                    self.done = True
+                    self.end_call_invoked = True
+                    break
+
+                if next_node:
+                    self._set_node(next_node)
+                    await self._run_actions(next_node.get("pre_actions") or [], all_content)
+                    post_actions = next_node.get("post_actions") or []
+                    await self._run_actions(post_actions, all_content)
+
+                    ends_conversation = (
+                        self.current_node_name in ("end", "transfer_initiated") or
+                        any(a.get("type") == "end_conversation" for a in post_actions)
+                    )
+                    if ends_conversation:
+                        self.done = True
+                        break
+                    if self.current_node.get("respond_immediately") and respond_immediately_count < MAX_RESPOND_IMMEDIATELY:
+                        respond_immediately_count += 1
+                        continue
+
+            if msg.content:
+                all_content.append(msg.content)
+                self.context.add_assistant_message(msg.content)
+
+            break
+
+        return " ".join(all_content)
@@ -0,0 +1,218 @@
+"""Cached, concurrent LLM grading for the eval runners.
+
+Rubric graders send one prompt (rubric text plus the formatted conversation and
+function calls) and get back a one-line PASS/FAIL verdict. The verdict depends
+only on that prompt, so it is stored in a local SQLite cache keyed by rubric,
+rubric version, grader model and a hash of the prompt. Re-running a suite whose
+bot output didn't change makes no grader calls.
+
+    verdict = await get_grader().grade(prompt, rubric="lab_results/quality")
+
+- Rewording a rubric or a changed conversation changes the prompt, so it is
+  graded again. Bump RUBRIC_VERSION to regrade everything, e.g. after changing
+  the grader model's settings or how verdicts are read.
+- Grader calls from all scenarios in the process share EVAL_GRADER_CONCURRENCY
+  slots, on top of the provider limits in evals/cassette.py.
+- EVAL_GRADER_CACHE sets the store (default evals/.cache/grader_verdicts.sqlite);
+  "off" disables it. With --cassette record the cache is written but not read,
+  so every grader call lands in the cassette.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from evals.cassette import async_anthropic_client, get_mode
+
+GRADER_MODEL = "claude-sonnet-4-20250514"
+GRADER_MAX_TOKENS = 50
+RUBRIC_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / ".cache" / "grader_verdicts.sqlite"
+GRADER_CONCURRENCY = int(os.getenv("EVAL_GRADER_CONCURRENCY", "8"))
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+def verdict_key(rubric: str, model: str, max_tokens: int, prompt: str) -> str:
+    payload = f"{rubric}\0{RUBRIC_VERSION}\0{model}\0{max_tokens}\0{prompt_hash(prompt)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class VerdictCache:
+    """SQLite store of grader verdicts, shared by concurrent scenarios and shard processes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                rubric TEXT NOT NULL,
+                rubric_version INTEGER NOT NULL,
+                model TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT verdict FROM verdicts WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, rubric: str, model: str, prompt_sha: str, verdict: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, rubric, RUBRIC_VERSION, model, prompt_sha, verdict, datetime.now(timezone.utc).isoformat()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Grader:
+    """Async grader LLM behind the verdict cache, with bounded concurrency."""
+
+    def __init__(
+        self,
+        cache: Optional[VerdictCache] = None,
+        model: str = GRADER_MODEL,
+        max_tokens: int = GRADER_MAX_TOKENS,
+        concurrency: int = GRADER_CONCURRENCY,
+    ):
+        self.cache = cache
+        self.model = model
+        self.max_tokens = max_tokens
+        self.concurrency = max(1, concurrency)
+        self.client = async_anthropic_client(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.cache_hits = 0
+        self.shared = 0
+        self.grader_calls = 0
+        self.by_rubric: Dict[str, Dict[str, int]] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if self.cache is None or get_mode() == "record":
+            return None
+        try:
+            return self.cache.get(key)
+        except sqlite3.Error as e:
+            print(f"  [GRADER] Cache read failed, grading live: {e}")
+            return None
+
+    def _cache_put(self, key: str, rubric: str, prompt: str, verdict: str) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(key, rubric, self.model, prompt_hash(prompt), verdict)
+        except sqlite3.Error as e:
+            print(f"  [GRADER] Cache write failed: {e}")
+
+    async def grade(self, prompt: str, rubric: str) -> str:
+        """Verdict text for a rubric prompt, from the cache when possible.
+
+        Identical prompts already in flight (the same golden line in two
+        scenarios) share one call, except when recording cassettes.
+        """
+        counts = self.by_rubric.setdefault(rubric, {"cache_hits": 0, "shared": 0, "grader_calls": 0})
+        key = verdict_key(rubric, self.model, self.max_tokens, prompt)
+        verdict = self._cache_get(key)
+        if verdict is not None:
+            self.cache_hits += 1
+            counts["cache_hits"] += 1
+            return verdict
+
+        pending = self._in_flight.get(key) if get_mode() != "record" else None
+        if pending is not None:
+            self.shared += 1
+            counts["shared"] += 1
+            return await asyncio.shield(pending)
+
+        task = asyncio.ensure_future(self._call(key, rubric, prompt))
+        self._in_flight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+
+    async def _call(self, key: str, rubric: str, prompt: str) -> str:
+        async with self._semaphore():
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        verdict = response.content[0].text.strip()
+        self.grader_calls += 1
+        self.by_rubric[rubric]["grader_calls"] += 1
+        self._cache_put(key, rubric, prompt, verdict)
+        return verdict
+
+    def stats(self) -> dict:
+        total = self.cache_hits + self.shared + self.grader_calls
+        return {
+            "verdicts": total,
+            "cache_hits": self.cache_hits,
+            "shared": self.shared,
+            "grader_calls": self.grader_calls,
+            "hit_rate": round(self.cache_hits / total, 3) if total else None,
+            "cache": str(self.cache.path) if self.cache else None,
+            "by_rubric": self.by_rubric,
+        }
+
+    def summary_line(self) -> str:
+        stats = self.stats()
+        if not stats["verdicts"]:
+            return "GRADER: no LLM verdicts"
+        line = (
+            f"GRADER: {stats['verdicts']} verdicts, {stats['cache_hits']} cached "
+            f"({stats['hit_rate']:.0%}), {stats['grader_calls']} grader calls"
+        )
+        if stats["shared"]:
+            line += f", {stats['shared']} shared with an identical call in flight"
+        if self.cache is None:
+            line += " (cache off)"
+        return line
+
+
+_grader: Optional[Grader] = None
+
+
+def get_grader() -> Grader:
+    global _grader
+    if _grader is None:
+        cache_setting = os.getenv("EVAL_GRADER_CACHE", str(DEFAULT_CACHE_PATH))
+        cache = None
+        if cache_setting.lower() != "off":
+            try:
+                cache = VerdictCache(Path(cache_setting))
+            except (sqlite3.Error, OSError) as e:
+                print(f"[GRADER] Verdict cache unavailable ({e}), grading without it")
+        _grader = Grader(cache=cache)
+    return _grader
@@ -0,0 +1,378 @@
+"""
+Latency Regression Tracking - per-call bot LLM latency stored by git SHA and workflow
+
+Eval runners time every bot LLM call (LatencyMetrics) and record the samples
+here after each scenario. Samples are keyed by the checked-out commit (with a
+"-dirty" suffix for uncommitted changes) and the workflow, so a prompt or model
+change can be compared against a pinned baseline commit.
+
+Usage:
+    python evals/latency.py list                        # Stored commits per workflow, p50/p95
+    python evals/latency.py baseline                    # Pin the current commit as baseline (all workflows with samples)
+    python evals/latency.py baseline --sha 1a2b3c4d5e6f --workflow demo_clinic_alpha/lab_results
+    python evals/latency.py compare                     # Current commit vs baseline; exit 1 on regression
+    python evals/latency.py compare --candidate <sha> --min-delta-ms 150
+
+Eval LLM calls are not streamed, so a call's provider time is its time to first
+byte. Only live calls count: cassette replays and time spent waiting for a
+provider limiter slot are excluded. Compare runs made at similar concurrency.
+
+A regression is a p50 or p95 increase that is significant under a one-sided
+bootstrap test (95%) and at least --min-delta-ms (default 100ms) large.
+Samples from repeated runs at the same commit are pooled.
+
+Store: evals/.cache/latency.sqlite (EVAL_LATENCY_STORE).
+"""
+import argparse
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from evals.cassette import last_live_latency_ms
+
+DEFAULT_STORE_PATH = Path(__file__).parent / ".cache" / "latency.sqlite"
+TTFB_METRIC = "ttfb_ms"
+QUANTILES = {"p50": 0.50, "p95": 0.95}
+
+MIN_SAMPLES = 20
+DEFAULT_MIN_DELTA_MS = 100.0
+CONFIDENCE = 0.95
+BOOTSTRAP_ITERATIONS = 2000
+
+
+def quantile(values: list[float], q: float) -> float:
+    """Linear-interpolated quantile of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+@dataclass
+class LatencyMetrics:
+    llm_latencies_ms: list[float] = field(default_factory=list)
+    turn_latencies_ms: list[float] = field(default_factory=list)
+    conversation_start: float = 0.0
+    conversation_end: float = 0.0
+
+    def record_llm_call(self) -> None:
+        """Add the bot LLM call that just returned, unless it was replayed from a cassette."""
+        latency_ms = last_live_latency_ms()
+        if latency_ms is not None:
+            self.llm_latencies_ms.append(latency_ms)
+
+    @property
+    def total_duration_ms(self) -> float:
+        return (self.conversation_end - self.conversation_start) * 1000 if self.conversation_start else 0.0
+
+    @property
+    def llm_median_ms(self) -> float:
+        return median(self.llm_latencies_ms) if self.llm_latencies_ms else 0.0
+
+    @property
+    def llm_p95_ms(self) -> float:
+        if not self.llm_latencies_ms:
+            return 0.0
+        sorted_lat = sorted(self.llm_latencies_ms)
+        return sorted_lat[min(int(len(sorted_lat) * 0.95), len(sorted_lat) - 1)]
+
+    @property
+    def llm_max_ms(self) -> float:
+        return max(self.llm_latencies_ms) if self.llm_latencies_ms else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "total_duration_ms": round(self.total_duration_ms, 2),
+            "llm_calls": {
+                "count": len(self.llm_latencies_ms),
+                "median_ms": round(self.llm_median_ms, 2),
+                "p95_ms": round(self.llm_p95_ms, 2),
+                "max_ms": round(self.llm_max_ms, 2),
+                "samples_ms": [round(ms, 1) for ms in self.llm_latencies_ms],
+            },
+            "turns": {
+                "count": len(self.turn_latencies_ms),
+                "median_ms": round(median(self.turn_latencies_ms), 2) if self.turn_latencies_ms else 0.0,
+            },
+        }
+
+
+# ==================== Store ====================
+
+_git_sha: Optional[str] = None
+
+
+def current_git_sha() -> str:
+    """Short HEAD SHA, suffixed "-dirty" when tracked files have uncommitted changes."""
+    global _git_sha
+    if _git_sha is None:
+        repo = Path(__file__).parent.parent
+        try:
+            sha = subprocess.run(
+                ["git", "rev-parse", "--short=12", "HEAD"],
+                cwd=repo, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            dirty = subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=repo, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            _git_sha = f"{sha}-dirty" if dirty else sha
+        except (OSError, subprocess.CalledProcessError):
+            _git_sha = "unknown"
+    return _git_sha
+
+
+class LatencyStore:
+    """SQLite store of latency samples and pinned baselines."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS samples (
+                git_sha TEXT NOT NULL,
+                workflow TEXT NOT NULL,
+                scenario_id TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value_ms REAL NOT NULL,
+                run_id TEXT NOT NULL,
+                recorded_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS samples_lookup ON samples (workflow, metric, git_sha);
+            CREATE TABLE IF NOT EXISTS baselines (
+                workflow TEXT PRIMARY KEY,
+                git_sha TEXT NOT NULL,
+                pinned_at TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}"
+
+    def add(self, git_sha: str, workflow: str, scenario_id: str, metric: str, values: list[float]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(git_sha, workflow, scenario_id, metric, value, self.run_id, now) for value in values],
+            )
+            self._conn.commit()
+
+    def samples(self, workflow: str, git_sha: str, metric: str = TTFB_METRIC) -> list[float]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT value_ms FROM samples WHERE workflow = ? AND git_sha = ? AND metric = ?",
+                (workflow, git_sha, metric),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def workflows(self, git_sha: Optional[str] = None) -> list[str]:
+        query, params = "SELECT DISTINCT workflow FROM samples", ()
+        if git_sha:
+            query, params = query + " WHERE git_sha = ?", (git_sha,)
+        with self._lock:
+            return sorted(row[0] for row in self._conn.execute(query, params).fetchall())
+
+    def commits(self, metric: str = TTFB_METRIC) -> list[tuple]:
+        """(workflow, git_sha, runs, last_recorded_at) for every stored commit."""
+        with self._lock:
+            return self._conn.execute(
+                """SELECT workflow, git_sha, COUNT(DISTINCT run_id), MAX(recorded_at) FROM samples
+                   WHERE metric = ? GROUP BY workflow, git_sha ORDER BY workflow, MAX(recorded_at)""",
+                (metric,),
+            ).fetchall()
+
+    def pin_baseline(self, workflow: str, git_sha: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO baselines VALUES (?, ?, ?)",
+                (workflow, git_sha, datetime.now(timezone.utc).isoformat()),
+            )
+            self._conn.commit()
+
+    def baseline(self, workflow: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT git_sha FROM baselines WHERE workflow = ?", (workflow,)).fetchone()
+        return row[0] if row else None
+
+
+_store: Optional[LatencyStore] = None
+
+
+def get_latency_store() -> LatencyStore:
+    global _store
+    if _store is None:
+        _store = LatencyStore(Path(os.getenv("EVAL_LATENCY_STORE", str(DEFAULT_STORE_PATH))))
+    return _store
+
+
+def record_latency(workflow: str, scenario_id: str, latency: dict) -> None:
+    """Persist a scenario's bot LLM call latencies (result["latency"]) under the current commit."""
+    samples = (latency or {}).get("llm_calls", {}).get("samples_ms") or []
+    if not samples:
+        return
+    try:
+        get_latency_store().add(current_git_sha(), workflow, scenario_id, TTFB_METRIC, samples)
+    except (sqlite3.Error, OSError) as e:
+        print(f"  [LATENCY] Could not store samples: {e}")
+
+
+# ==================== Comparison ====================
+
+@dataclass
+class QuantileComparison:
+    name: str
+    baseline_ms: float
+    candidate_ms: float
+    delta_ms: float
+    lower_ms: float  # One-sided lower confidence bound on delta_ms
+    regression: bool
+
+
+def compare_quantile(
+    baseline: list[float],
+    candidate: list[float],
+    name: str,
+    q: float,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+    iterations: int = BOOTSTRAP_ITERATIONS,
+    seed: int = 0,
+) -> QuantileComparison:
+    """Bootstrap the candidate-minus-baseline quantile difference.
+
+    Regression when the one-sided lower bound is above zero (the increase is
+    significant) and the observed increase is at least min_delta_ms.
+    """
+    rng = random.Random(seed)
+    deltas = sorted(
+        quantile(rng.choices(candidate, k=len(candidate)), q) - quantile(rng.choices(baseline, k=len(baseline)), q)
+        for _ in range(iterations)
+    )
+    lower = deltas[int((1 - CONFIDENCE) * iterations)]
+    base_q, cand_q = quantile(baseline, q), quantile(candidate, q)
+    delta = cand_q - base_q
+    return QuantileComparison(name, base_q, cand_q, delta, lower, lower > 0 and delta >= min_delta_ms)
+
+
+def compare_workflow(
+    store: LatencyStore,
+    workflow: str,
+    candidate_sha: str,
+    baseline_sha: Optional[str] = None,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> Optional[bool]:
+    """Print the comparison for one workflow. True on regression, None if it couldn't be tested."""
+    baseline_sha = baseline_sha or store.baseline(workflow)
+    if not baseline_sha:
+        print(f"  {workflow}: no baseline pinned (python evals/latency.py baseline)")
+        return None
+    baseline = store.samples(workflow, baseline_sha)
+    candidate = store.samples(workflow, candidate_sha)
+    header = f"  {workflow}: {baseline_sha} ({len(baseline)} calls) -> {candidate_sha} ({len(candidate)} calls)"
+    if len(baseline) < MIN_SAMPLES or len(candidate) < MIN_SAMPLES:
+        print(f"{header}\n    not enough samples (need {MIN_SAMPLES} on each side)")
+        return None
+
+    print(header)
+    regression = False
+    for name, q in QUANTILES.items():
+        result = compare_quantile(baseline, candidate, name, q, min_delta_ms)
+        status = "REGRESSION" if result.regression else "ok"
+        print(
+            f"    {name} TTFB: {result.baseline_ms:7.0f}ms -> {result.candidate_ms:7.0f}ms  "
+            f"({result.delta_ms:+.0f}ms, {CONFIDENCE:.0%} lower bound {result.lower_ms:+.0f}ms)  {status}"
+        )
+        regression = regression or result.regression
+    return regression
+
+
+def compare_latency(
+    workflows: Optional[list[str]] = None,
+    candidate_sha: Optional[str] = None,
+    baseline_sha: Optional[str] = None,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> bool:
+    """Compare workflows with candidate samples against their baselines. True if any regressed."""
+    store = get_latency_store()
+    candidate_sha = candidate_sha or current_git_sha()
+    workflows = workflows or store.workflows(candidate_sha)
+    print(f"\nLATENCY vs baseline (candidate {candidate_sha}):")
+    if not workflows:
+        print("  no samples recorded for this commit")
+        return False
+    results = [compare_workflow(store, w, candidate_sha, baseline_sha, min_delta_ms) for w in workflows]
+    return any(results)
+
+
+# ==================== CLI ====================
+
+def list_commits() -> None:
+    store = get_latency_store()
+    current = current_git_sha()
+    for workflow, git_sha, runs, last in store.commits():
+        samples = store.samples(workflow, git_sha)
+        marks = [label for label, on in (("baseline", store.baseline(workflow) == git_sha), ("current", git_sha == current)) if on]
+        print(
+            f"  {workflow:<45} {git_sha:<18} {runs:>3} run(s) {len(samples):>5} calls  "
+            f"p50 {quantile(samples, 0.5):6.0f}ms  p95 {quantile(samples, 0.95):6.0f}ms  "
+            f"{last[:16]}  {' '.join(marks)}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Eval latency baselines and regression checks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List stored commits per workflow")
+
+    pin = sub.add_parser("baseline", help="Pin a commit as the baseline")
+    pin.add_argument("--sha", help="Commit to pin (default: current)")
+    pin.add_argument("--workflow", action="append", help="Workflow to pin (default: all with samples at the commit)")
+
+    compare = sub.add_parser("compare", help="Compare a commit against the baseline")
+    compare.add_argument("--candidate", help="Candidate commit (default: current)")
+    compare.add_argument("--baseline", help="Baseline commit (default: pinned baseline per workflow)")
+    compare.add_argument("--workflow", action="append", help="Workflow to compare (default: all with candidate samples)")
+    compare.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="Smallest increase that counts")
+
+    args = parser.parse_args()
+    store = get_latency_store()
+
+    if args.command == "list":
+        list_commits()
+        return 0
+
+    if args.command == "baseline":
+        git_sha = args.sha or current_git_sha()
+        workflows = args.workflow or store.workflows(git_sha)
+        if not workflows:
+            print(f"No samples recorded for {git_sha}")
+            return 1
+        for workflow in workflows:
+            store.pin_baseline(workflow, git_sha)
+            print(f"  {workflow}: baseline {git_sha} ({len(store.samples(workflow, git_sha))} calls)")
+        return 0
+
+    regressed = compare_latency(args.workflow, args.candidate, args.baseline, args.min_delta_ms)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+ParallelPipeline Fan-out Micro-benchmark
+
+Measures per-frame cost of a side branch on the input path, the way
+SafetyMonitor / TriageDetector / the observer branch sit in production:
+
+    none      - no side branch (floor)
+    parallel  - ParallelPipeline([], side_branch): every frame enters the branch
+    filtered  - FilteredParallelPipeline([], subscribe(side_branch, TranscriptionFrame))
+
+Frames are 20ms InputAudioRawFrames (50/s per call) with a TranscriptionFrame
+every --transcript-every frames.
+
+Usage:
+    python evals/loadtest/fanout_bench.py
+    python evals/loadtest/fanout_bench.py --frames 50000 --depth 6
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from loguru import logger
+from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame, TranscriptionFrame
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline.filtered_parallel_pipeline import FilteredParallelPipeline, subscribe
+
+AUDIO_CHUNK = bytes(640)  # 20ms of 16kHz mono s16le
+
+
+class _Tap(FrameProcessor):
+    """Pass-through stand-in for a side-branch processor."""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class _Clock(FrameProcessor):
+    """Timestamps the first audio frame and the EndFrame at the pipeline tail."""
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+        self.last = None
+        self.frames = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, (InputAudioRawFrame, TranscriptionFrame)):
+            self.frames += 1
+            if self.first is None:
+                self.first = (time.perf_counter(), time.process_time())
+        elif isinstance(frame, EndFrame):
+            self.last = (time.perf_counter(), time.process_time())
+        await self.push_frame(frame, direction)
+
+
+def _side_branch(depth: int) -> list:
+    return [_Tap() for _ in range(depth)]
+
+
+LAYOUTS = {
+    "none": lambda depth: [],
+    "parallel": lambda depth: [ParallelPipeline([], _side_branch(depth))],
+    "filtered": lambda depth: [
+        FilteredParallelPipeline([], subscribe(_side_branch(depth), TranscriptionFrame))
+    ],
+}
+
+
+def _frames(count: int, transcript_every: int) -> list:
+    frames = []
+    for i in range(count):
+        if transcript_every and i % transcript_every == 0:
+            frames.append(TranscriptionFrame(text="hello", user_id="caller", timestamp=""))
+        frames.append(InputAudioRawFrame(audio=AUDIO_CHUNK, sample_rate=16000, num_channels=1))
+    return frames
+
+
+async def run_layout(layout: str, args) -> dict:
+    clock = _Clock()
+    task = PipelineTask(Pipeline([*LAYOUTS[layout](args.depth), clock]), idle_timeout_secs=None)
+    await task.queue_frames(_frames(args.frames, args.transcript_every) + [EndFrame()])
+    await PipelineRunner(handle_sigint=False).run(task)
+
+    wall = clock.last[0] - clock.first[0]
+    cpu = clock.last[1] - clock.first[1]
+    return {
+        "frames": clock.frames,
+        "wall_us_per_frame": wall / clock.frames * 1e6,
+        "cpu_us_per_frame": cpu / clock.frames * 1e6,
+    }
+
+
+async def run_bench(args) -> dict:
+    results = {}
+    for layout in LAYOUTS:
+        runs = [await run_layout(layout, args) for _ in range(args.repeat)]
+        results[layout] = min(runs, key=lambda r: r["cpu_us_per_frame"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame overhead of ParallelPipeline side branches")
+    parser.add_argument("--frames", type=int, default=20000, help="Audio frames per run")
+    parser.add_argument("--depth", type=int, default=3, help="Processors in the side branch")
+    parser.add_argument("--transcript-every", type=int, default=100, help="One TranscriptionFrame per N audio frames")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per layout (best is reported)")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    results = asyncio.run(run_bench(args))
+    floor = results["none"]["cpu_us_per_frame"]
+    print(f"\n{args.frames} audio frames, side branch depth {args.depth}")
+    for layout, r in results.items():
+        print(
+            f"  {layout:<9} {r['cpu_us_per_frame']:7.1f} us CPU/frame  {r['wall_us_per_frame']:7.1f} us wall/frame  "
+            f"(+{r['cpu_us_per_frame'] - floor:.1f} us over no branch)"
+        )
+
+
+if __name__ == "__main__":
+    main()
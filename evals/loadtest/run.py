@@ -0,0 +1,277 @@
+"""
+Offline Load Test
+
+Runs N concurrent simulated calls through the real call path (CallSession ->
+PipelineFactory.build -> flows, triage, observers) with the stand-ins from
+evals/loadtest/stubs.py, so no network, API keys or MongoDB are needed.
+
+Usage:
+    python evals/loadtest/run.py --calls 50
+    python evals/loadtest/run.py --calls 200 --ramp-secs 20 --timeline dialin_long
+    python evals/loadtest/run.py --workflow demo_clinic_alpha/eligibility_verification --timeline dialout_human
+    python evals/loadtest/run.py --calls 100 --json results/loadtest.json
+
+Reports CPU per call, event-loop lag, memory growth and voice-to-voice
+percentiles (caller end-of-speech to first bot audio), plus the per-component
+percentiles from LangfuseLatencyObserver merged across calls.
+
+Safety monitors, the output validator and the IVR human detector call Groq
+directly rather than through ServiceFactory, so they are disabled here.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import yaml
+from loguru import logger
+
+from backend.latency_histogram import COMPONENTS, LatencyHistogram
+from core.client_registry import CLIENTS_DIR, get_client_registry, thaw
+from evals.loadtest.stubs import StubServiceFactory
+from pipeline.session import CallSession
+
+TIMELINES_PATH = Path(__file__).parent / "timelines.yaml"
+LOADTEST_ORG_ID = "000000000000000000000001"
+LAG_SAMPLE_SECS = 0.05
+
+CALL_DATA = {
+    "patient_name": "Jane Doe",
+    "date_of_birth": "1980-03-03",
+    "insurance_company_name": "Acme Health",
+    "insurance_member_id": "ABC123456",
+    "insurance_phone": "+15555550100",
+    "provider_name": "Dr. Smith",
+    "provider_npi": "1234567890",
+    "facility_name": "Demo Clinic",
+    "organization_name": "Demo Clinic",
+    "cpt_code": "99213",
+    "date_of_service": "2026-01-15",
+}
+
+
+class LoadTestSession(CallSession):
+    """CallSession with stub services and no persistence."""
+
+    def __init__(self, factory: StubServiceFactory, services_config: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.service_factory = factory
+        self.services_config = services_config
+        # Mark as queued so transport handlers skip the post-call queue
+        self.post_call_queued = True
+
+    async def _warmup_all_flows(self):
+        pass
+
+    async def _save_session_data(self) -> None:
+        pass
+
+
+def _set_placeholder_env():
+    """Fill ${VAR} references in services.yaml so the registry loads without real keys."""
+    for services_path in CLIENTS_DIR.glob("*/*/services.yaml"):
+        for name in re.findall(r"\$\{(\w+)\}", services_path.read_text()):
+            os.environ.setdefault(name, "loadtest")
+
+
+def _offline_services_config(services_config) -> dict:
+    config = thaw(services_config)
+    config.pop("safety_monitors", None)
+    classifier = config["services"].get("classifier_llm")
+    if classifier:
+        classifier["provider"] = "loadtest"  # IVRHumanDetector is only built for groq
+    return config
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        # ru_maxrss: peak, KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+async def _monitor_loop_lag(histogram: LatencyHistogram, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_SECS)
+        histogram.record((time.perf_counter() - started - LAG_SAMPLE_SECS) * 1000)
+
+
+async def run_call(index: int, entry, services_config: dict, timeline: dict, args) -> dict:
+    factory = StubServiceFactory(
+        timeline["turns"],
+        entry.call_type,
+        llm_ttfb_ms=args.llm_ttfb_ms,
+        tts_ttfb_ms=args.tts_ttfb_ms,
+        stt_finalize_ms=args.stt_finalize_ms,
+    )
+    session = LoadTestSession(
+        factory,
+        services_config,
+        client_name=entry.client_name,
+        session_id=f"loadtest-{index}-{uuid.uuid4().hex[:8]}",
+        patient_id=None,
+        call_data=dict(CALL_DATA),
+        phone_number="+15555550123",
+        organization_id=LOADTEST_ORG_ID,
+        organization_slug=entry.organization_slug,
+        call_type=entry.call_type,
+    )
+    started = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(
+            session.run("https://loadtest.invalid/room", "token", f"loadtest-{index}"),
+            timeout=args.call_timeout,
+        )
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.exception(f"Load test call {index} failed")
+
+    stats = factory.stats
+    return {
+        "index": index,
+        "seconds": time.perf_counter() - started,
+        "completed": stats.finished.is_set() and error is None,
+        "error": error,
+        "turns_spoken": stats.turns_spoken,
+        "bot_responses": stats.bot_responses,
+        "v2v_ms": stats.v2v_ms,
+        "histograms": session.latency_observer.get_histograms() if session.latency_observer else {},
+    }
+
+
+async def run_load(args) -> dict:
+    _set_placeholder_env()
+    organization_slug, client_name = args.workflow.split("/", 1)
+    entry = get_client_registry().get(organization_slug, client_name)
+
+    with open(TIMELINES_PATH) as f:
+        timelines = yaml.safe_load(f)["timelines"]
+    timeline = timelines[args.timeline]
+    if timeline["call_type"] != entry.call_type:
+        raise SystemExit(
+            f"Timeline {args.timeline} is {timeline['call_type']} but {args.workflow} is {entry.call_type}"
+        )
+    services_config = _offline_services_config(entry.services_config)
+
+    loop_lag = LatencyHistogram()
+    stop_monitor = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_loop_lag(loop_lag, stop_monitor))
+
+    rss_before = _rss_mb()
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    async def staggered(index: int):
+        if args.ramp_secs:
+            await asyncio.sleep(args.ramp_secs * index / args.calls)
+        return await run_call(index, entry, services_config, timeline, args)
+
+    results = await asyncio.gather(*(staggered(i) for i in range(args.calls)))
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    rss_after = _rss_mb()
+    stop_monitor.set()
+    await monitor
+
+    v2v = LatencyHistogram()
+    components = {name: LatencyHistogram() for name in COMPONENTS}
+    for result in results:
+        for value in result["v2v_ms"]:
+            v2v.record(value)
+        for name, stored in result["histograms"].items():
+            components[name].merge(LatencyHistogram.from_dict(stored))
+
+    call_seconds = sum(r["seconds"] for r in results)
+    return {
+        "workflow": args.workflow,
+        "timeline": args.timeline,
+        "calls": args.calls,
+        "completed": sum(r["completed"] for r in results),
+        "errors": sorted({r["error"] for r in results if r["error"]}),
+        "wall_seconds": round(wall, 2),
+        "cpu_seconds": round(cpu, 2),
+        "cpu_ms_per_call": round(cpu / args.calls * 1000, 1),
+        "cpu_percent_per_call": round(cpu / call_seconds * 100, 3) if call_seconds else None,
+        "rss_mb_before": round(rss_before, 1),
+        "rss_mb_after": round(rss_after, 1),
+        "rss_mb_growth_per_call": round((rss_after - rss_before) / args.calls, 3),
+        "loop_lag_ms": loop_lag.summary(),
+        "v2v_ms": v2v.summary(),
+        "components_ms": {name: h.summary() for name, h in components.items() if h.count},
+    }
+
+
+def print_report(report: dict):
+    print(f"\n{report['workflow']} x {report['calls']} calls ({report['timeline']})")
+    print(f"  completed:  {report['completed']}/{report['calls']} in {report['wall_seconds']}s wall")
+    for error in report["errors"]:
+        print(f"  error:      {error}")
+    print(
+        f"  CPU:        {report['cpu_seconds']}s total, {report['cpu_ms_per_call']}ms/call, "
+        f"{report['cpu_percent_per_call']}% of one core per live call"
+    )
+    print(
+        f"  memory:     {report['rss_mb_before']} -> {report['rss_mb_after']} MB RSS "
+        f"({report['rss_mb_growth_per_call']} MB/call)"
+    )
+
+    def line(label: str, summary: dict):
+        print(
+            f"  {label:<11} p50 {summary['p50_ms']}  p90 {summary['p90_ms']}  "
+            f"p95 {summary['p95_ms']}  p99 {summary['p99_ms']}  max {summary['max_ms']} ms "
+            f"(n={summary['count']})"
+        )
+
+    line("loop lag:", report["loop_lag_ms"])
+    if report["v2v_ms"]["count"]:
+        line("V2V:", report["v2v_ms"])
+    for name, summary in report["components_ms"].items():
+        line(f"{name}:", summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test with stub services")
+    parser.add_argument("--workflow", "-w", default="demo_clinic_alpha/patient_scheduling",
+                        help="organization_slug/client_name")
+    parser.add_argument("--timeline", "-t", default="dialin_short", help="Timeline from timelines.yaml")
+    parser.add_argument("--calls", "-n", type=int, default=20, help="Concurrent calls")
+    parser.add_argument("--ramp-secs", type=float, default=5.0, help="Spread call starts over this many seconds")
+    parser.add_argument("--llm-ttfb-ms", type=float, default=350)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=150)
+    parser.add_argument("--stt-finalize-ms", type=float, default=250)
+    parser.add_argument("--call-timeout", type=float, default=180, help="Per-call timeout (seconds)")
+    parser.add_argument("--json", help="Also write the report to this path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Keep pipeline INFO logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="WARNING")
+
+    report = asyncio.run(run_load(args))
+    print_report(report)
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Offline stand-ins for the Daily transport, Deepgram STT, LLMs and Cartesia TTS.
+
+StubServiceFactory has the same interface as services.service_factory.ServiceFactory,
+so PipelineFactory.build assembles the real pipeline (aggregators, triage,
+flows, observers) around services that never touch the network:
+
+- FakeTransport: pumps 20ms silent input audio, "plays" output audio in real
+  time (Bot{Started,Stopped}SpeakingFrame) and fires the Daily events the call
+  handlers listen to (joined, dial-out answered, participant left).
+- ScriptedSTT: plays a caller timeline - speaks a turn once the bot has
+  finished its response, then emits the transcript after a finalization delay.
+- DeterministicLLM: streams canned replies with a fixed TTFB and token pace.
+- SyntheticTTS: returns silence sized to the text after a fixed TTFB.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterruptionFrame,
+    LLMTextFrame,
+    OutputAudioRawFrame,
+    StartFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.openai.llm import OpenAILLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_transport import BaseTransport
+from pipecat.utils.time import time_now_iso8601
+
+INPUT_SAMPLE_RATE = 16000
+AUDIO_CHUNK_SECS = 0.02
+TTS_CHUNK_SECS = 0.1
+WORDS_PER_SECOND = 2.8  # Synthetic speech rate
+RESPONSE_TIMEOUT_SECS = 10.0  # Caller speaks anyway if the bot stays silent this long
+
+DEFAULT_REPLIES = (
+    "Thanks for calling. Could you give me your full name and date of birth, please?",
+    "Got it, thank you. Let me pull that up for you. One moment.",
+    "I see the record here. Is there anything else I can help you with today?",
+    "Perfect. I've made a note of that. Have a great day.",
+)
+
+
+class CallStats:
+    """Per-call timing collected by the stand-ins."""
+
+    def __init__(self):
+        self.speech_ended_at: Optional[float] = None
+        self.v2v_ms: List[float] = []
+        self.bot_responses = 0
+        self.turns_spoken = 0
+        self.finished = asyncio.Event()
+
+    def bot_started(self) -> None:
+        # Voice-to-voice as the caller hears it: end of their speech to first bot audio
+        if self.speech_ended_at is not None:
+            self.v2v_ms.append((time.perf_counter() - self.speech_ended_at) * 1000)
+            self.speech_ended_at = None
+        self.bot_responses += 1
+
+
+# ==================== Transport ====================
+
+
+class FakeInputTransport(FrameProcessor):
+    """Pushes silent caller audio at real-time pace, like a Daily input."""
+
+    def __init__(self, on_start: Callable, **kwargs):
+        super().__init__(**kwargs)
+        self._on_start = on_start
+        self._pump_task: Optional[asyncio.Task] = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            await self.push_frame(frame, direction)
+            self._pump_task = self.create_task(self._pump_audio())
+            self.create_task(self._on_start())
+            return
+        if isinstance(frame, (EndFrame, CancelFrame)) and self._pump_task:
+            await self.cancel_task(self._pump_task)
+            self._pump_task = None
+        await self.push_frame(frame, direction)
+
+    async def _pump_audio(self):
+        silence = bytes(int(INPUT_SAMPLE_RATE * AUDIO_CHUNK_SECS) * 2)
+        while True:
+            await self.push_frame(
+                InputAudioRawFrame(audio=silence, sample_rate=INPUT_SAMPLE_RATE, num_channels=1)
+            )
+            await asyncio.sleep(AUDIO_CHUNK_SECS)
+
+
+class FakeOutputTransport(FrameProcessor):
+    """Consumes bot audio and reports bot speaking state as it would be played."""
+
+    def __init__(self, stats: CallStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+        self._speaking_until = 0.0
+        self._speaking = False
+        self._stop_task: Optional[asyncio.Task] = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, OutputAudioRawFrame) and direction == FrameDirection.DOWNSTREAM:
+            await self._play(frame)
+            return
+        if isinstance(frame, InterruptionFrame):
+            await self._stop_speaking()
+        await self.push_frame(frame, direction)
+
+    async def _play(self, frame: OutputAudioRawFrame):
+        duration = len(frame.audio) / (frame.sample_rate * frame.num_channels * 2)
+        now = time.monotonic()
+        self._speaking_until = max(self._speaking_until, now) + duration
+        if not self._speaking:
+            self._speaking = True
+            self._stats.bot_started()
+            await self.push_frame(BotStartedSpeakingFrame())
+            await self.push_frame(BotStartedSpeakingFrame(), FrameDirection.UPSTREAM)
+        if self._stop_task is None:
+            self._stop_task = self.create_task(self._stop_when_played())
+
+    async def _stop_when_played(self):
+        while (remaining := self._speaking_until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+        self._stop_task = None
+        await self._stop_speaking()
+
+    async def _stop_speaking(self):
+        if self._stop_task is not None:
+            await self.cancel_task(self._stop_task)
+            self._stop_task = None
+        self._speaking_until = 0.0
+        if self._speaking:
+            self._speaking = False
+            await self.push_frame(BotStoppedSpeakingFrame())
+            await self.push_frame(BotStoppedSpeakingFrame(), FrameDirection.UPSTREAM)
+
+
+class FakeTransport(BaseTransport):
+    """Daily transport stand-in: no room, no SIP, same event names."""
+
+    def __init__(self, stats: CallStats, call_type: str, answer_delay: float = 0.5):
+        super().__init__()
+        self._stats = stats
+        self._call_type = call_type
+        self._answer_delay = answer_delay
+        self._room_name = "loadtest"  # Transcript saving reads this (skipped offline)
+        self._input = FakeInputTransport(self.connect, name="FakeInputTransport")
+        self._tasks = set()
+        self._output = FakeOutputTransport(stats, name="FakeOutputTransport")
+        for event in (
+            "on_joined",
+            "on_first_participant_joined",
+            "on_client_disconnected",
+            "on_participant_left",
+            "on_dialin_error",
+            "on_dialout_answered",
+            "on_dialout_error",
+            "on_dialout_stopped",
+        ):
+            self._register_event_handler(event)
+
+    def input(self) -> FrameProcessor:
+        return self._input
+
+    def output(self) -> FrameProcessor:
+        return self._output
+
+    async def connect(self):
+        """Simulate joining the room once the pipeline starts (dial-out dials from on_joined)."""
+        if self._call_type == "dial-in":
+            await self._call_event_handler("on_first_participant_joined", {"id": "caller"})
+        else:
+            await self._call_event_handler("on_joined", {})
+
+    async def hang_up(self):
+        """Caller hangs up after the last scripted turn."""
+        if self._call_type == "dial-in":
+            await self._call_event_handler("on_client_disconnected", {"id": "caller"})
+        else:
+            await self._call_event_handler("on_participant_left", {"id": "caller"}, {})
+
+    async def start_dialout(self, settings: Dict[str, Any]):
+        async def answer():
+            await asyncio.sleep(self._answer_delay)
+            await self._call_event_handler("on_dialout_answered", {"phoneNumber": settings.get("phoneNumber")})
+        task = asyncio.create_task(answer())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def capture_participant_transcription(self, participant_id: str):
+        pass
+
+    async def sip_call_transfer(self, settings: Dict[str, Any]):
+        return None
+
+
+# ==================== STT ====================
+
+
+class ScriptedSTT(STTService):
+    """Plays a caller timeline instead of transcribing audio.
+
+    Each turn: {"say": str, "pause_ms": int, "speech_ms": int (optional),
+    "wait_for_bot": bool (default True)}. After the last turn the caller waits
+    for the bot's reply and hangs up via on_finished.
+    """
+
+    def __init__(
+        self,
+        timeline: List[Dict[str, Any]],
+        stats: CallStats,
+        finalize_ms: float = 250,
+        on_finished: Optional[Callable] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._timeline = timeline
+        self._stats = stats
+        self._finalize_secs = finalize_ms / 1000
+        self._on_finished = on_finished
+        self._bot_idle = asyncio.Event()
+        self._bot_responded = asyncio.Event()
+        self._script_task: Optional[asyncio.Task] = None
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        yield None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame) and self._script_task is None:
+            self._bot_idle.set()
+            self._script_task = self.create_task(self._play_script())
+        elif isinstance(frame, BotStartedSpeakingFrame):
+            self._bot_idle.clear()
+            self._bot_responded.set()
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            self._bot_idle.set()
+        elif isinstance(frame, (EndFrame, CancelFrame)) and self._script_task:
+            await self.cancel_task(self._script_task)
+            self._script_task = None
+
+    async def _wait_for_bot(self):
+        try:
+            await asyncio.wait_for(self._bot_responded.wait(), timeout=RESPONSE_TIMEOUT_SECS)
+            await self._bot_idle.wait()
+        except asyncio.TimeoutError:
+            pass
+
+    async def _play_script(self):
+        for turn in self._timeline:
+            if turn.get("wait_for_bot", True):
+                await self._wait_for_bot()
+            await asyncio.sleep(turn.get("pause_ms", 600) / 1000)
+
+            text = turn["say"]
+            speech_secs = turn.get("speech_ms", len(text.split()) / WORDS_PER_SECOND * 1000) / 1000
+            self._bot_responded.clear()
+            await self.push_frame(UserStartedSpeakingFrame())
+            await asyncio.sleep(speech_secs)
+            self._stats.speech_ended_at = time.perf_counter()
+            self._stats.turns_spoken += 1
+            await asyncio.sleep(self._finalize_secs)
+            await self.push_frame(TranscriptionFrame(text, "caller", time_now_iso8601()))
+            await self.push_frame(UserStoppedSpeakingFrame())
+
+        await self._wait_for_bot()
+        self._stats.finished.set()
+        if self._on_finished:
+            await self._on_finished()
+
+
+# ==================== LLM ====================
+
+
+class DeterministicLLM(OpenAILLMService):
+    """OpenAI-compatible LLM that streams canned replies (keeps flows' OpenAI adapter)."""
+
+    def __init__(self, replies=DEFAULT_REPLIES, ttfb_ms: float = 350, token_ms: float = 15, **kwargs):
+        super().__init__(api_key="loadtest", model="loadtest", **kwargs)
+        self._replies = itertools.cycle(replies)
+        self._ttfb_secs = ttfb_ms / 1000
+        self._token_secs = token_ms / 1000
+
+    async def _process_context(self, context):
+        await self.start_ttfb_metrics()
+        await asyncio.sleep(self._ttfb_secs)
+        await self.stop_ttfb_metrics()
+        for token in next(self._replies).split(" "):
+            await self.push_frame(LLMTextFrame(token + " "))
+            await asyncio.sleep(self._token_secs)
+
+
+# ==================== TTS ====================
+
+
+class SyntheticTTS(TTSService):
+    """Returns silence sized to the text at WORDS_PER_SECOND after a fixed TTFB."""
+
+    def __init__(self, ttfb_ms: float = 150, **kwargs):
+        super().__init__(aggregate_sentences=True, **kwargs)
+        self._ttfb_secs = ttfb_ms / 1000
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def run_tts(self, text: str, *args) -> AsyncGenerator[Frame, None]:
+        await self.start_ttfb_metrics()
+        yield TTSStartedFrame()
+        await asyncio.sleep(self._ttfb_secs)
+        await self.stop_ttfb_metrics()
+
+        duration = max(len(text.split()), 1) / WORDS_PER_SECOND
+        chunk = bytes(int(self.sample_rate * TTS_CHUNK_SECS) * 2)
+        for _ in range(max(1, round(duration / TTS_CHUNK_SECS))):
+            yield TTSAudioRawFrame(audio=chunk, sample_rate=self.sample_rate, num_channels=1)
+        yield TTSStoppedFrame()
+
+
+# ==================== Factory ====================
+
+
+class StubServiceFactory:
+    """ServiceFactory stand-in for one simulated call."""
+
+    def __init__(
+        self,
+        timeline: List[Dict[str, Any]],
+        call_type: str,
+        llm_ttfb_ms: float = 350,
+        tts_ttfb_ms: float = 150,
+        stt_finalize_ms: float = 250,
+        classifier_label: str = "CONVERSATION",
+    ):
+        self.stats = CallStats()
+        self.timeline = timeline
+        self.call_type = call_type
+        self.llm_ttfb_ms = llm_ttfb_ms
+        self.tts_ttfb_ms = tts_ttfb_ms
+        self.stt_finalize_ms = stt_finalize_ms
+        self.classifier_label = classifier_label
+        self.transport: Optional[FakeTransport] = None
+
+    def create_transport(self, config, room_url, room_token, room_name, dialin_settings=None) -> FakeTransport:
+        self.transport = FakeTransport(self.stats, self.call_type)
+        return self.transport
+
+    def create_stt(self, config) -> ScriptedSTT:
+        return ScriptedSTT(
+            self.timeline,
+            self.stats,
+            finalize_ms=self.stt_finalize_ms,
+            on_finished=lambda: self.transport.hang_up(),
+        )
+
+    def create_llm(self, config, is_classifier: bool = False) -> DeterministicLLM:
+        if is_classifier:
+            return DeterministicLLM(replies=(self.classifier_label,), ttfb_ms=120, token_ms=0)
+        return DeterministicLLM(ttfb_ms=self.llm_ttfb_ms)
+
+    def create_tts(self, config, phrases=()) -> SyntheticTTS:
+        return SyntheticTTS(ttfb_ms=self.tts_ttfb_ms)
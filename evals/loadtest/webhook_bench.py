@@ -0,0 +1,175 @@
+"""Local webhook receiver and delivery throughput benchmark.
+
+LocalWebhookReceiver is an in-process HTTP endpoint that records deliveries,
+verifies signatures and can inject failures and latency, so delivery code can
+be exercised without an external service. Running the module compares the old
+per-delivery ClientSession against the pooled WebhookSender:
+
+    python evals/loadtest/webhook_bench.py --deliveries 2000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import aiohttp
+from aiohttp import web
+
+from backend.webhook_delivery import WebhookSender, signed_headers
+
+BENCH_SECRET = "bench-secret"
+
+
+class LocalWebhookReceiver:
+    """In-process webhook endpoint for tests and benchmarks."""
+
+    def __init__(self, secret: str = BENCH_SECRET, fail_rate: float = 0.0, latency_ms: float = 0.0):
+        self.secret = secret
+        self.fail_rate = fail_rate
+        self.latency_ms = latency_ms
+        self.received: List[dict] = []
+        self.bad_signatures = 0
+        self.failures_injected = 0
+        self.peak_concurrency = 0
+        self._concurrency = 0
+        self._sockets = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    @property
+    def connections(self) -> int:
+        """Distinct client sockets seen (new TCP connections)."""
+        return len(self._sockets)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self._sockets.add(request.transport.get_extra_info("peername"))
+        self._concurrency += 1
+        self.peak_concurrency = max(self.peak_concurrency, self._concurrency)
+        try:
+            body = await request.read()
+            expected = "sha256=" + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, request.headers.get("X-Webhook-Signature", "")):
+                self.bad_signatures += 1
+                return web.Response(status=401)
+            if self.latency_ms:
+                await asyncio.sleep(self.latency_ms / 1000)
+            if self.fail_rate and random.random() < self.fail_rate:
+                self.failures_injected += 1
+                return web.Response(status=503)
+            self.received.append({"event": request.headers.get("X-Webhook-Event"), "body": json.loads(body)})
+            return web.Response(status=204)
+        finally:
+            self._concurrency -= 1
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/webhook", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}/webhook"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "LocalWebhookReceiver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+
+def _signed_request(index: int):
+    timestamp = datetime.now(timezone.utc).isoformat()
+    body = json.dumps(
+        {"event": "call.completed", "timestamp": timestamp, "data": {"session_id": f"bench-{index}"}}
+    ).encode()
+    return body, signed_headers("call.completed", timestamp, body, BENCH_SECRET)
+
+
+async def _send_unpooled(url: str, index: int) -> bool:
+    """The previous delivery path: a new ClientSession (and connection) per delivery."""
+    body, headers = _signed_request(index)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, data=body, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                return resp.status < 400
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False
+
+
+async def _send_pooled(sender: WebhookSender, url: str, index: int) -> bool:
+    body, headers = _signed_request(index)
+    return (await sender.send(url, body, headers)).success
+
+
+async def _run(mode: str, deliveries: int, concurrency: int, latency_ms: float) -> dict:
+    sender = WebhookSender(per_endpoint_concurrency=concurrency, max_connections=concurrency)
+    gate = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async with LocalWebhookReceiver(latency_ms=latency_ms) as receiver:
+        async def one(index: int) -> bool:
+            async with gate:
+                started = time.perf_counter()
+                if mode == "pooled":
+                    ok = await _send_pooled(sender, receiver.url, index)
+                else:
+                    ok = await _send_unpooled(receiver.url, index)
+                latencies.append((time.perf_counter() - started) * 1000)
+                return ok
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(deliveries)))
+        elapsed = time.perf_counter() - started
+        await sender.close()
+
+        latencies.sort()
+        return {
+            "mode": mode,
+            "delivered": sum(results),
+            "seconds": elapsed,
+            "per_second": deliveries / elapsed,
+            "connections": receiver.connections,
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Webhook delivery throughput benchmark")
+    parser.add_argument("--deliveries", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent deliveries to the endpoint")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated receiver latency")
+    args = parser.parse_args()
+
+    print(f"{args.deliveries} deliveries, concurrency {args.concurrency}, receiver latency {args.latency_ms}ms")
+    for mode in ("unpooled", "pooled"):
+        r = asyncio.run(_run(mode, args.deliveries, args.concurrency, args.latency_ms))
+        print(
+            f"  {r['mode']:<9} {r['delivered']}/{args.deliveries} ok in {r['seconds']:.2f}s "
+            f"({r['per_second']:.0f}/s), {r['connections']} connections, "
+            f"p50 {r['p50_ms']:.1f}ms, p95 {r['p95_ms']:.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
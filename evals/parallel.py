@@ -0,0 +1,367 @@
+"""Concurrent scenario execution shared by the eval runners.
+
+Each workflow's run.py keeps its own FlowRunner and grading; this module runs
+their run_scenario coroutines side by side in one event loop:
+
+    outcomes = await run_scenarios(
+        [ScenarioJob("alpha/lab_results", s["id"], run_scenario, patient_lock_key(s)) for s in scenarios],
+        concurrency=8,
+    )
+
+- At most `concurrency` scenarios are in flight; LLM calls are additionally
+  capped per provider by the limiters in evals/cassette.py.
+- Scenarios with the same lock key (seeded patient phone number) never overlap,
+  since seeding a patient clears any other record with that number.
+- With more than one scenario in flight, each scenario's stdout and log output
+  goes to its own log file and the terminal gets one progress line per finished
+  scenario. With concurrency 1 output streams live as before. Loguru handlers
+  the runner configured are left alone; run_suite() and run_all call
+  configure_terminal_logging() so concurrent runs keep the terminal to warnings.
+- A scenario that raises is reported as a failure with the error as its reason
+  instead of aborting the run.
+
+evals/run_all.py uses the same engine across every suite and writes run files
+(one per shard) that can be merged with --merge.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from evals.grading import get_grader
+
+DEFAULT_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
+RUNS_DIR = Path(__file__).parent / "results"
+
+_scenario_output: ContextVar[Optional[io.TextIOBase]] = ContextVar("eval_scenario_output", default=None)
+
+
+@dataclass
+class ScenarioJob:
+    suite: str
+    scenario_id: str
+    run: Callable[[str], Awaitable[dict]]
+    lock_key: Optional[str] = None
+
+
+@dataclass
+class ScenarioOutcome:
+    suite: str
+    scenario_id: str
+    result: dict
+    duration_s: float
+    error: Optional[str] = None
+    log_file: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return bool(self.result.get("grade", {}).get("pass"))
+
+    @property
+    def cost_usd(self) -> float:
+        return (self.result.get("cost") or {}).get("total_cost_usd", 0) or 0
+
+    def record(self) -> dict:
+        """Compact entry for a run file."""
+        return {
+            "suite": self.suite,
+            "scenario_id": self.scenario_id,
+            "pass": self.passed,
+            "reason": self.result.get("grade", {}).get("reason", ""),
+            "duration_s": round(self.duration_s, 1),
+            "cost_usd": round(self.cost_usd, 6),
+            "error": self.error,
+            "log_file": self.log_file,
+        }
+
+
+def configure_terminal_logging(concurrency: int) -> None:
+    """Entry-point setup: with scenarios running concurrently, log warnings and up
+    to the terminal (LOGURU_LEVEL overrides). Scenario log files still get everything."""
+    if concurrency > 1:
+        logger.remove()
+        logger.add(sys.stderr, level=os.getenv("LOGURU_LEVEL", "WARNING"))
+
+
+def add_parallel_arguments(parser) -> None:
+    parser.add_argument(
+        "--concurrency", "-j", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Scenarios to run at once (default: {DEFAULT_CONCURRENCY}, or EVAL_CONCURRENCY)",
+    )
+
+
+def patient_lock_key(scenario: dict) -> Optional[str]:
+    """Scenarios seeding the same phone number must not run at the same time."""
+    phone = (scenario.get("patient") or {}).get("phone_number")
+    digits = "".join(c for c in str(phone or "") if c.isdigit())
+    return f"phone:{digits}" if digits else None
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'i/n' (1-based) -> (i, n)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}' (expected i/n, e.g. 2/4)")
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}': index must be between 1 and {count}")
+    return index, count
+
+
+def select_shard(jobs: Sequence[ScenarioJob], index: int, count: int) -> List[ScenarioJob]:
+    """Every count-th job starting at index, so each shard gets a mix of suites.
+
+    Jobs sharing a lock key go to the shard of the first of them; locks only
+    hold within one process.
+    """
+    anchors: Dict[str, int] = {}
+    selected = []
+    for position, job in enumerate(jobs):
+        anchor = anchors.setdefault(job.lock_key, position) if job.lock_key else position
+        if anchor % count == index - 1:
+            selected.append(job)
+    return selected
+
+
+# ==================== Output routing ====================
+
+class _RoutedStream(io.TextIOBase):
+    """sys.stdout / loguru sink: writes from inside a scenario go to its log, the rest to the terminal."""
+
+    def __init__(self, terminal):
+        self.terminal = terminal
+
+    def _target(self):
+        return _scenario_output.get() or self.terminal
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    @property
+    def encoding(self):
+        return getattr(self.terminal, "encoding", "utf-8")
+
+
+def _in_scenario(record) -> bool:
+    return _scenario_output.get() is not None
+
+
+@contextmanager
+def _routed_output() -> Iterator[io.TextIOBase]:
+    """Route stdout and loguru through the per-scenario context; yields the real terminal.
+
+    Log records from inside a scenario are added to its log file. Only the sink
+    added here is removed on exit, so the runner's own handlers are untouched.
+    """
+    terminal = sys.stdout
+    sys.stdout = _RoutedStream(terminal)
+    handler_id = logger.add(
+        _RoutedStream(sys.stderr), level=os.getenv("LOGURU_LEVEL", "DEBUG"), filter=_in_scenario,
+    )
+    try:
+        yield terminal
+    finally:
+        sys.stdout = terminal
+        logger.remove(handler_id)
+
+
+# ==================== Engine ====================
+
+def _error_result(scenario_id: str, exc: BaseException) -> dict:
+    return {
+        "scenario_id": scenario_id,
+        "grade": {"pass": False, "reason": f"error: {type(exc).__name__}: {exc}", "details": {}},
+    }
+
+
+async def run_scenarios(
+    jobs: Sequence[ScenarioJob],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    log_dir: Optional[Path] = None,
+) -> List[ScenarioOutcome]:
+    """Run jobs concurrently; outcomes are returned in job order."""
+    concurrency = max(1, min(concurrency, len(jobs) or 1))
+    routed = concurrency > 1
+    log_dir = Path(log_dir or RUNS_DIR / "logs" / datetime.now().strftime("%Y-%m-%d_%H%M%S"))
+
+    slots = asyncio.Semaphore(concurrency)
+    locks: Dict[str, asyncio.Lock] = {}
+    outcomes: List[Optional[ScenarioOutcome]] = [None] * len(jobs)
+    done = 0
+    run_started = time.monotonic()
+    width = len(str(len(jobs)))
+
+    def progress(outcome: ScenarioOutcome, terminal) -> None:
+        status = "PASS" if outcome.passed else ("ERROR" if outcome.error else "FAIL")
+        line = (
+            f"[{done:>{width}}/{len(jobs)}] {status:<5} {outcome.suite}::{outcome.scenario_id}"
+            f"  {outcome.duration_s:.1f}s"
+        )
+        if outcome.cost_usd:
+            line += f"  ${outcome.cost_usd:.4f}"
+        if not outcome.passed:
+            line += f"\n      {outcome.result['grade'].get('reason', '')}"
+            if outcome.log_file:
+                line += f"\n      log: {outcome.log_file}"
+        print(line, file=terminal, flush=True)
+
+    async def run_one(position: int, job: ScenarioJob, terminal) -> None:
+        nonlocal done
+        lock = locks.setdefault(job.lock_key, asyncio.Lock()) if job.lock_key else nullcontext()
+        async with lock, slots:
+            buffer = io.StringIO() if routed else None
+            token = _scenario_output.set(buffer)
+            started = time.monotonic()
+            error = None
+            try:
+                if not routed:
+                    print(f"\n{'#'*70}\n# Running: {job.suite}::{job.scenario_id}\n{'#'*70}")
+                result = await job.run(job.scenario_id)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                traceback.print_exc(file=buffer or sys.stderr)
+                result = _error_result(job.scenario_id, exc)
+            finally:
+                _scenario_output.reset(token)
+            duration = time.monotonic() - started
+
+        log_file = None
+        if buffer is not None:
+            path = log_dir / job.suite.replace("/", "__") / f"{job.scenario_id}.log"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(buffer.getvalue())
+            log_file = str(path)
+
+        outcome = ScenarioOutcome(job.suite, job.scenario_id, result, duration, error, log_file)
+        outcomes[position] = outcome
+        done += 1
+        progress(outcome, terminal)
+
+    if routed:
+        with _routed_output() as terminal:
+            print(f"Running {len(jobs)} scenario(s), {concurrency} at a time (logs: {log_dir})", file=terminal)
+            await asyncio.gather(*(run_one(i, job, terminal) for i, job in enumerate(jobs)))
+    else:
+        await asyncio.gather(*(run_one(i, job, sys.stdout) for i, job in enumerate(jobs)))
+
+    elapsed = time.monotonic() - run_started
+    serial = sum(o.duration_s for o in outcomes)
+    print(f"\nRan {len(jobs)} scenario(s) in {elapsed:.1f}s ({serial:.1f}s of scenario time)")
+    print(get_grader().summary_line())
+    return outcomes
+
+
+async def run_suite(
+    suite: str,
+    scenarios: Sequence[dict],
+    run: Callable[[str], Awaitable[dict]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    lock_key: Optional[Callable[[dict], Optional[str]]] = patient_lock_key,
+) -> List[dict]:
+    """A suite's --all: run its scenarios, print the summary and return their results."""
+    configure_terminal_logging(concurrency)
+    jobs = [
+        ScenarioJob(suite, scenario["id"], run, lock_key(scenario) if lock_key else None)
+        for scenario in scenarios
+    ]
+    outcomes = await run_scenarios(jobs, concurrency=concurrency)
+    print_summary([outcome.record() for outcome in outcomes])
+    return [outcome.result for outcome in outcomes]
+
+
+# ==================== Run files ====================
+
+def summarize(records: Sequence[dict]) -> dict:
+    passed = sum(1 for r in records if r["pass"])
+    return {
+        "total": len(records),
+        "passed": passed,
+        "failed": len(records) - passed,
+        "errors": sum(1 for r in records if r.get("error")),
+        "cost_usd": round(sum(r.get("cost_usd") or 0 for r in records), 4),
+        "scenario_time_s": round(sum(r.get("duration_s") or 0 for r in records), 1),
+    }
+
+
+def write_run_file(
+    outcomes: Sequence[ScenarioOutcome],
+    started_at: datetime,
+    elapsed_s: float,
+    shard: Optional[Tuple[int, int]] = None,
+    meta: Optional[dict] = None,
+    runs_dir: Path = RUNS_DIR,
+) -> Path:
+    """Write one run's outcomes to <runs_dir>/<timestamp>[.shard-i-of-n].json."""
+    records = [o.record() for o in outcomes]
+    name = started_at.strftime("%Y-%m-%d_%H%M%S")
+    if shard:
+        name += f".shard-{shard[0]}-of-{shard[1]}"
+    data = {
+        "started_at": started_at.isoformat(),
+        "elapsed_s": round(elapsed_s, 1),
+        "shards": [f"{shard[0]}/{shard[1]}"] if shard else None,
+        **(meta or {}),
+        "summary": summarize(records),
+        "scenarios": records,
+    }
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    path = runs_dir / f"{name}.json"
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+def merge_run_files(paths: Sequence[Path], output: Optional[Path] = None) -> Path:
+    """Combine shard run files into one. Elapsed time is the slowest shard's."""
+    runs = [json.loads(Path(p).read_text()) for p in paths]
+    if not runs:
+        raise ValueError("No run files to merge")
+    records = sorted(
+        (r for run in runs for r in run["scenarios"]),
+        key=lambda r: (r["suite"], r["scenario_id"]),
+    )
+    shards = sorted(s for run in runs for s in (run.get("shards") or []))
+    data = {
+        **{k: v for k, v in runs[0].items() if k not in ("scenarios", "summary")},
+        "started_at": min(run["started_at"] for run in runs),
+        "elapsed_s": max(run["elapsed_s"] for run in runs),
+        "shards": shards or None,
+        "merged_from": [str(p) for p in paths],
+        "summary": summarize(records),
+        "scenarios": records,
+    }
+    if output is None:
+        output = Path(paths[0]).parent / (datetime.fromisoformat(data["started_at"]).strftime("%Y-%m-%d_%H%M%S") + ".merged.json")
+    output.write_text(json.dumps(data, indent=2) + "\n")
+    return output
+
+
+def print_summary(records: Sequence[dict]) -> None:
+    summary = summarize(records)
+    print(f"\n{'='*70}")
+    print(f"SUMMARY: {summary['passed']}/{summary['total']} passed")
+    print(f"{'='*70}")
+    failed = [r for r in records if not r["pass"]]
+    if failed:
+        print("\nFAILED:")
+        for r in failed:
+            print(f"  - {r['suite']}::{r['scenario_id']}: {r['reason']}")
+    if summary["cost_usd"]:
+        print(f"\nTOTAL COST: ${summary['cost_usd']:.4f}")
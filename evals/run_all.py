@@ -0,0 +1,173 @@
+"""
+Full Regression Run - every eval suite in one process, scenarios interleaved
+
+Usage:
+    python evals/run_all.py                             # All suites, 8 scenarios at a time
+    python evals/run_all.py -j 24                       # 24 at a time
+    python evals/run_all.py --suite lab_results         # Only suites whose name contains "lab_results"
+    python evals/run_all.py --cassette replay -j 32     # Offline pass from recorded cassettes
+    python evals/run_all.py --shard 2/4                 # This machine's quarter of the scenarios
+    python evals/run_all.py --merge evals/results/*.shard-*  # Combine shard run files into one
+    python evals/run_all.py --list                      # List suites and scenario counts
+
+Each run writes evals/results/<timestamp>[.shard-i-of-n].json (pass/fail, reason,
+duration and cost per scenario) and one log per scenario under
+evals/results/logs/<timestamp>/. The suites still save their own results and
+cassettes as when run individually.
+
+Bot LLM latencies are stored per commit (evals/latency.py). Suites with a pinned
+baseline are compared after the run, and a significant p50/p95 regression fails
+it like a failed scenario.
+
+Provider limits apply across all suites: EVAL_OPENAI_MAX_IN_FLIGHT,
+EVAL_ANTHROPIC_MAX_IN_FLIGHT, EVAL_GROQ_MAX_IN_FLIGHT, and optional *_RPM pacing.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+
+from evals.cassette import add_cassette_argument, get_mode, limiter_stats, set_mode
+from evals.grading import get_grader
+from evals.latency import compare_latency, current_git_sha, get_latency_store
+from evals.parallel import (
+    ScenarioJob,
+    add_parallel_arguments,
+    configure_terminal_logging,
+    merge_run_files,
+    parse_shard,
+    patient_lock_key,
+    print_summary,
+    run_scenarios,
+    select_shard,
+    write_run_file,
+)
+
+SUITES = [
+    "evals.demo_clinic_alpha.eligibility_verification.run",
+    "evals.demo_clinic_alpha.eligibility_verification.triage.classification.run",
+    "evals.demo_clinic_alpha.eligibility_verification.triage.ivr_navigation.run",
+    "evals.demo_clinic_alpha.lab_results.run",
+    "evals.demo_clinic_alpha.mainline.run",
+    "evals.demo_clinic_alpha.patient_scheduling.run",
+    "evals.demo_clinic_alpha.prescription_status.run",
+    "evals.demo_clinic_beta.patient_scheduling.run",
+]
+
+
+def suite_name(module_path: str) -> str:
+    return module_path.removeprefix("evals.").removesuffix(".run").replace(".", "/")
+
+
+def load_suite_scenarios(module_path: str) -> list[dict]:
+    path = Path(__file__).parent.parent.joinpath(*module_path.split(".")[:-1]) / "scenarios.yaml"
+    with open(path) as f:
+        return yaml.safe_load(f).get("scenarios") or []
+
+
+def load_jobs(suite_filter: list[str]) -> list[ScenarioJob]:
+    """Import the selected suites and build one job per scenario."""
+    jobs = []
+    for module_path in SUITES:
+        name = suite_name(module_path)
+        if suite_filter and not any(f in name for f in suite_filter):
+            continue
+        module = importlib.import_module(module_path)
+        jobs.extend(
+            ScenarioJob(module.SUITE, scenario["id"], module.run_scenario, patient_lock_key(scenario))
+            for scenario in load_suite_scenarios(module_path)
+        )
+    return jobs
+
+
+def list_suites() -> None:
+    for module_path in SUITES:
+        print(f"  {suite_name(module_path):<65} {len(load_suite_scenarios(module_path)):>3} scenarios")
+
+
+async def run(args) -> int:
+    shard = parse_shard(args.shard) if args.shard else None
+    jobs = load_jobs(args.suite)
+    if shard:
+        jobs = select_shard(jobs, *shard)
+    if not jobs:
+        print("No scenarios selected")
+        return 1
+
+    started_at = datetime.now()
+    run_started = time.monotonic()
+    outcomes = await run_scenarios(
+        jobs,
+        concurrency=args.concurrency,
+        log_dir=Path(__file__).parent / "results" / "logs" / started_at.strftime("%Y-%m-%d_%H%M%S"),
+    )
+    elapsed = time.monotonic() - run_started
+
+    records = [o.record() for o in outcomes]
+    print_summary(records)
+    for provider, stats in limiter_stats().items():
+        print(
+            f"  [{provider}] {stats['calls']} live calls, peak {stats['peak_in_flight']}/{stats['max_in_flight']} "
+            f"in flight, {stats['wait_s']}s waiting for a slot"
+        )
+
+    # Latency vs pinned baselines (replayed calls record no samples)
+    latency_regressed = False
+    suites = sorted({job.suite for job in jobs})
+    with_baseline = [suite for suite in suites if get_latency_store().baseline(suite)]
+    if with_baseline and get_mode() != "replay":
+        latency_regressed = compare_latency(with_baseline)
+
+    run_file = write_run_file(
+        outcomes, started_at, elapsed, shard=shard,
+        meta={
+            "concurrency": args.concurrency,
+            "cassette": get_mode(),
+            "suites": suites,
+            "git_sha": current_git_sha(),
+            "latency_regression": latency_regressed,
+            "providers": limiter_stats(),
+            "grader": get_grader().stats(),
+        },
+    )
+    print(f"\nRun file: {run_file}")
+    return 0 if all(r["pass"] for r in records) and not latency_regressed else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run all eval suites concurrently")
+    parser.add_argument("--suite", action="append", default=[], help="Only suites whose name contains this (repeatable)")
+    parser.add_argument("--shard", help="Run shard i of n (e.g. 2/4); merge the run files with --merge")
+    parser.add_argument("--merge", nargs="+", type=Path, metavar="RUN_FILE", help="Merge shard run files and exit")
+    parser.add_argument("--list", "-l", action="store_true", help="List suites and scenario counts")
+    add_cassette_argument(parser)
+    add_parallel_arguments(parser)
+
+    args = parser.parse_args()
+    set_mode(args.cassette)
+
+    if args.list:
+        list_suites()
+        return 0
+
+    if args.merge:
+        merged = merge_run_files(args.merge)
+        records = json.loads(merged.read_text())["scenarios"]
+        print_summary(records)
+        print(f"\nMerged run file: {merged}")
+        return 0 if all(r["pass"] for r in records) else 1
+
+    configure_terminal_logging(args.concurrency)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Safety evaluations."""
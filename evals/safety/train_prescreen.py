@@ -0,0 +1,91 @@
+"""
+Train the local safety pre-screen from labeled caller utterances.
+
+Source: safety/screening/scenarios.yaml (utterance -> EMERGENCY / STAFF_REQUEST / OK)
+
+Writes pipeline/safety_prescreen_model.json (shipped with the bot) and prints
+leave-one-out recall (risk utterances escalated to the safety LLM) and
+screening rate (benign utterances decided locally, i.e. LLM calls saved).
+
+Usage:
+    python evals/safety/train_prescreen.py
+    python evals/safety/train_prescreen.py --dry-run   # evaluate only
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import yaml
+
+from pipeline.safety_prescreen import (
+    MODEL_LABELS,
+    MODEL_PATH,
+    OK,
+    RISK,
+    SafetyPreScreen,
+)
+from pipeline.triage_prefilter import NaiveBayesTriageModel
+
+SCENARIOS_PATH = Path(__file__).parent / "screening" / "scenarios.yaml"
+
+
+def load_examples() -> list[tuple[str, str]]:
+    """Return (utterance, expected) pairs."""
+    with open(SCENARIOS_PATH) as f:
+        return [(s["utterance"], s["expected"].upper()) for s in yaml.safe_load(f).get("scenarios", [])]
+
+
+def to_model_examples(examples: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    return [(text, OK if expected == OK else RISK) for text, expected in examples]
+
+
+def leave_one_out(examples: list[tuple[str, str]]) -> bool:
+    """Print recall and screening rate. False if any risk utterance was screened out."""
+    model_examples = to_model_examples(examples)
+    risk_total = risk_escalated = ok_total = ok_screened = 0
+    reasons: dict[str, int] = {}
+
+    for i, (text, expected) in enumerate(examples):
+        train = model_examples[:i] + model_examples[i + 1:]
+        result = SafetyPreScreen(NaiveBayesTriageModel.train(train, labels=MODEL_LABELS)).screen(text)
+        reasons[result.reason] = reasons.get(result.reason, 0) + 1
+
+        if expected == OK:
+            ok_total += 1
+            ok_screened += not result.escalate
+        else:
+            risk_total += 1
+            risk_escalated += result.escalate
+            if not result.escalate:
+                print(f"  MISS expected={expected} risk={result.risk:.2f}: {text[:70]}")
+
+    total = len(examples)
+    print(f"\nLeave-one-out on {total} utterances:")
+    print(f"  recall:          {risk_escalated}/{risk_total} risk utterances escalated "
+          f"({risk_escalated / risk_total:.0%})")
+    print(f"  screened out:    {ok_screened}/{ok_total} benign utterances ({ok_screened / ok_total:.0%})")
+    print(f"  LLM calls:       {total - ok_screened - (risk_total - risk_escalated)}/{total}")
+    print(f"  by reason:       {', '.join(f'{k}={v}' for k, v in sorted(reasons.items()))}")
+    return risk_escalated == risk_total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train safety pre-screen")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without writing the model")
+    args = parser.parse_args()
+
+    examples = load_examples()
+    print(f"Loaded {len(examples)} labeled utterances")
+
+    full_recall = leave_one_out(examples)
+
+    if not args.dry_run:
+        NaiveBayesTriageModel.train(to_model_examples(examples), labels=MODEL_LABELS).save(MODEL_PATH)
+        print(f"\nModel written to {MODEL_PATH}")
+    return 0 if full_recall else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
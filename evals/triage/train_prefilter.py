@@ -0,0 +1,108 @@
+"""
+Train the local triage pre-classifier.
+
+Training sources (all workflows under evals/):
+- triage/prefilter_training.yaml: label -> utterances written for training
+- triage/ivr_navigation/scenarios.yaml: menu_prompt -> IVR (status:completed -> CONVERSATION)
+
+The triage/classification scenarios are held out: they are never trained on,
+and the rules + model are scored against them here and in the classification
+eval, which runs the pre-classifier ahead of the LLM like the bot does.
+
+Writes pipeline/triage_prefilter_model.json (shipped with the bot) and prints
+coverage/precision on the held-out classification scenarios.
+
+Usage:
+    python evals/triage/train_prefilter.py
+    python evals/triage/train_prefilter.py --dry-run   # evaluate only
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import yaml
+
+from pipeline.triage_prefilter import (
+    CONVERSATION,
+    IVR,
+    LABELS,
+    MODEL_PATH,
+    NaiveBayesTriageModel,
+    TriagePreFilter,
+)
+
+EVALS_DIR = Path(__file__).parent.parent
+TRAINING_PATH = Path(__file__).parent / "prefilter_training.yaml"
+
+
+def load_training_examples() -> list[tuple[str, str]]:
+    """Training (text, label) pairs: the training corpus plus IVR navigation prompts."""
+    with open(TRAINING_PATH) as f:
+        corpus = yaml.safe_load(f)
+    examples = [(text, label) for label in LABELS for text in corpus.get(label) or []]
+
+    for path in sorted(EVALS_DIR.glob("**/triage/ivr_navigation/scenarios.yaml")):
+        with open(path) as f:
+            for s in yaml.safe_load(f).get("scenarios", []):
+                for step in s.get("steps", []):
+                    label = CONVERSATION if step.get("expected_action") == "status:completed" else IVR
+                    examples.append((step["menu_prompt"], label))
+    return examples
+
+
+def load_held_out_examples() -> list[tuple[str, str]]:
+    """Classification scenarios as (text, label); never used for training."""
+    held_out = []
+    for path in sorted(EVALS_DIR.glob("**/triage/classification/scenarios.yaml")):
+        with open(path) as f:
+            for s in yaml.safe_load(f).get("scenarios", []):
+                held_out.append((s["utterance"], s["expected_classification"].upper()))
+    return held_out
+
+
+def evaluate(prefilter: TriagePreFilter, held_out: list[tuple[str, str]]) -> None:
+    decided = correct = 0
+    for text, expected in held_out:
+        decision = prefilter.classify(text)
+        if decision.label is None:
+            continue
+        decided += 1
+        if decision.label == expected:
+            correct += 1
+        else:
+            print(f"  MISS [{decision.source}] expected={expected} got={decision.label} "
+                  f"({decision.confidence:.2f}): {text[:70]}")
+
+    total = len(held_out)
+    print(f"\nHeld-out classification scenarios: {total}")
+    print(f"  decided locally: {decided}/{total} ({decided / total:.0%}), rest deferred to LLM")
+    if decided:
+        print(f"  precision:       {correct}/{decided} ({correct / decided:.0%})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train triage pre-classifier")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without writing the model")
+    args = parser.parse_args()
+
+    training = load_training_examples()
+    held_out = load_held_out_examples()
+    overlap = {text for text, _ in training} & {text for text, _ in held_out}
+    if overlap:
+        print(f"Held-out scenarios found in the training data, remove them: {sorted(overlap)}")
+        return 1
+    print(f"Loaded {len(training)} training examples, {len(held_out)} held-out classification scenarios")
+
+    model = NaiveBayesTriageModel.train(training)
+    evaluate(TriagePreFilter(model), held_out)
+
+    if not args.dry_run:
+        model.save(MODEL_PATH)
+        print(f"\nModel written to {MODEL_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,11 +59,14 @@ api.interceptors.response.use(
   }
 );
 
-// GET /patients - Fetch all patients, optionally filtered by workflow
-export const getPatients = async (workflow?: string): Promise<Patient[]> => {
-  const params = workflow ? { workflow } : {};
+// GET /patients - Fetch one page of patients (newest first), optionally filtered by workflow.
+// Pass the previous page's next_cursor to fetch the page after it.
+export const getPatients = async (workflow?: string, cursor?: string): Promise<PatientsResponse> => {
+  const params: Record<string, string> = {};
+  if (workflow) params.workflow = workflow;
+  if (cursor) params.cursor = cursor;
   const response = await api.get<PatientsResponse>('/patients', { params });
-  return response.data.patients;
+  return response.data;
 };
 
 // GET /patients/:id - Fetch single patient by ObjectID
@@ -94,13 +97,14 @@ export const updatePatient = async (patientId: string, patientData: Record<strin
   await api.put(`/patients/${patientId}`, patientData);
 };
 
-// GET /sessions - Fetch sessions, optionally filtered by workflow or patient
-export const getSessions = async (workflow?: string, patientId?: string): Promise<Session[]> => {
+// GET /sessions - Fetch one page of sessions (newest first), optionally filtered by workflow or patient
+export const getSessions = async (workflow?: string, patientId?: string, cursor?: string): Promise<SessionsResponse> => {
   const params: Record<string, string> = {};
   if (workflow) params.workflow = workflow;
   if (patientId) params.patient_id = patientId;
+  if (cursor) params.cursor = cursor;
   const response = await api.get<SessionsResponse>('/sessions', { params });
-  return response.data.sessions;
+  return response.data;
 };
 
 // GET /sessions/:id - Fetch single session
@@ -122,9 +126,10 @@ export const getCallTranscript = async (sessionId: string): Promise<{ messages:
   return { messages: (response.data.transcripts || []) as TranscriptMessage[] };
 };
 
-// Get call history for a patient
+// Get the most recent page of call history for a patient
 export const getPatientCallHistory = async (patientId: string): Promise<Session[]> => {
-  return getSessions(undefined, patientId);
+  const data = await getSessions(undefined, patientId);
+  return data.sessions;
 };
 
 // POST /start-call - Start a call for a patient
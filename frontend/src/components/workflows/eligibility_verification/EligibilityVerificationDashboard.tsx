@@ -10,18 +10,24 @@ import { WorkflowLayout } from '../shared/WorkflowLayout';
 export function EligibilityVerificationDashboard() {
   const navigate = useNavigate();
   const [patients, setPatients] = useState<Patient[]>([]);
+  const [totalCount, setTotalCount] = useState(0);
+  const [hasMore, setHasMore] = useState(false);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     getPatients('eligibility_verification')
-      .then(setPatients)
+      .then((data) => {
+        setPatients(data.patients);
+        setTotalCount(data.total_count);
+        setHasMore(!!data.next_cursor);
+      })
       .catch(console.error)
       .finally(() => setLoading(false));
   }, []);
 
   // Eligibility verification specific metrics
   const metrics = {
-    total: patients.length,
+    total: totalCount,
     pending: patients.filter(p => p.prior_auth_status === 'Pending').length,
     approved: patients.filter(p => p.prior_auth_status === 'Approved').length,
     denied: patients.filter(p => p.prior_auth_status === 'Denied').length,
@@ -52,6 +58,12 @@ export function EligibilityVerificationDashboard() {
       }
     >
       <div className="space-y-6">
+        {hasMore && (
+          <p className="text-sm text-muted-foreground">
+            Breakdowns based on the {patients.length} most recent patients
+          </p>
+        )}
+
         {/* Metrics Grid */}
         <div className="grid gap-4 md:grid-cols-5">
           <Card>
@@ -64,7 +64,9 @@ export function EligibilityVerificationPatientList() {
   const { getWorkflowSchema } = useOrganization();
   const schema = getWorkflowSchema('eligibility_verification');
   const [patients, setPatients] = useState<Patient[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   // Sheet states
@@ -85,7 +87,8 @@ export function EligibilityVerificationPatientList() {
       setLoading(true);
       setError(null);
       const data = await getPatients('eligibility_verification');
-      setPatients(data);
+      setPatients(data.patients);
+      setNextCursor(data.next_cursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load patients');
       console.error('Error loading patients:', err);
@@ -94,6 +97,21 @@ export function EligibilityVerificationPatientList() {
     }
   }, []);
 
+  const loadMorePatients = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const data = await getPatients('eligibility_verification', nextCursor);
+      setPatients(prev => [...prev, ...data.patients]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      toast.error('Failed to load more patients');
+      console.error('Error loading more patients:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadPatients();
   }, [loadPatients]);
@@ -418,6 +436,9 @@ export function EligibilityVerificationPatientList() {
           onEditPatient={handleEditPatient}
           onStartCall={handleStartCallSingle}
           onDeletePatient={handleDeletePatientSingle}
+          hasMore={!!nextCursor}
+          loadingMore={loadingMore}
+          onLoadMore={loadMorePatients}
         />
       </div>
 
@@ -6,6 +6,7 @@ import { TranscriptViewer } from '../shared/TranscriptViewer';
 import { WorkflowLayout } from '../shared/WorkflowLayout';
 import { Session, TranscriptMessage } from '@/types';
 import { useSessions } from '@/hooks/useSessions';
+import { getSession } from '@/api';
 import { formatDatetime } from '@/lib/utils';
 import {
   Table,
@@ -27,19 +28,22 @@ import { RefreshCw } from 'lucide-react';
 const WORKFLOW = 'mainline';
 
 export function MainlineCallList() {
-  const { data: sessions = [], isLoading, error, refetch } = useSessions(WORKFLOW);
+  const {
+    data: sessions = [], isLoading, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage,
+  } = useSessions(WORKFLOW);
   const [detailSheetOpen, setDetailSheetOpen] = useState(false);
   const [selectedSession, setSelectedSession] = useState<Session | null>(null);
   const [transcript, setTranscript] = useState<TranscriptMessage[]>([]);
 
-  const handleViewSession = (session: Session) => {
+  const handleViewSession = async (session: Session) => {
     setSelectedSession(session);
-    if (session.call_transcript?.messages) {
-      setTranscript(session.call_transcript.messages);
-    } else {
-      setTranscript([]);
-    }
+    setTranscript([]);
     setDetailSheetOpen(true);
+    // List responses omit transcripts - load the full session for the sheet
+    const sessionData = await getSession(session.session_id).catch(() => null);
+    if (sessionData?.call_transcript?.messages) {
+      setTranscript(sessionData.call_transcript.messages);
+    }
   };
 
   if (error) {
@@ -68,7 +72,7 @@ export function MainlineCallList() {
     >
       <div className="space-y-4">
         <p className="text-muted-foreground">
-          {sessions.length} call(s)
+          {sessions.length} call(s){hasNextPage ? ' loaded' : ''}
         </p>
 
         <div className="rounded-md border">
@@ -113,6 +117,14 @@ export function MainlineCallList() {
             </TableBody>
           </Table>
         </div>
+
+        {hasNextPage && (
+          <div className="flex justify-center">
+            <Button variant="outline" size="sm" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+              {isFetchingNextPage ? 'Loading...' : 'Load more calls'}
+            </Button>
+          </div>
+        )}
       </div>
 
       <Sheet open={detailSheetOpen} onOpenChange={setDetailSheetOpen}>
@@ -10,15 +10,17 @@ const WORKFLOW = 'mainline';
 
 export function MainlineDashboard() {
   const navigate = useNavigate();
-  const { data: patients = [], isLoading } = useQuery({
+  const { data, isLoading } = useQuery({
     queryKey: ['patients', WORKFLOW],
     queryFn: () => getPatients(WORKFLOW),
   });
+  const patients = data?.patients ?? [];
+  const hasMore = !!data?.next_cursor;
 
   // Calculate metrics based on call data
   const today = new Date().toISOString().split('T')[0];
   const metrics = {
-    total: patients.length,
+    total: data?.total_count ?? 0,
     completed: patients.filter(p => p.call_status === 'Completed').length,
     transferred: patients.filter(p => p.routed_to && p.routed_to !== 'Answered Directly').length,
     answeredDirectly: patients.filter(p => p.routed_to === 'Answered Directly' || (!p.routed_to && p.call_status === 'Completed')).length,
@@ -46,6 +48,12 @@ export function MainlineDashboard() {
       }
     >
       <div className="space-y-6">
+        {hasMore && (
+          <p className="text-sm text-muted-foreground">
+            Breakdowns based on the {patients.length} most recent calls
+          </p>
+        )}
+
         {/* Metrics Grid */}
         <div className="grid gap-4 md:grid-cols-6">
           <Card>
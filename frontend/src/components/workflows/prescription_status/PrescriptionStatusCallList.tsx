@@ -4,7 +4,6 @@ import { SessionTable } from '../shared/SessionTable';
 import { SessionDetailSheet } from '../shared/SessionDetailSheet';
 import { WorkflowLayout } from '../shared/WorkflowLayout';
 import { Session } from '@/types';
-import { getSession } from '@/api';
 import { useSessions, useDeleteSession, useDeleteSessions } from '@/hooks/useSessions';
 import { RefreshCw } from 'lucide-react';
 import { toast } from 'sonner';
@@ -31,7 +30,9 @@ const PRESCRIPTION_STATUS_FIELDS = [
 ];
 
 export function PrescriptionStatusCallList() {
-  const { data: sessions = [], isLoading, error, refetch } = useSessions(WORKFLOW);
+  const {
+    data: sessions = [], isLoading, error, refetch, hasNextPage, fetchNextPage, isFetchingNextPage,
+  } = useSessions(WORKFLOW);
   const deleteSessionMutation = useDeleteSession(WORKFLOW);
   const deleteSessionsMutation = useDeleteSessions(WORKFLOW);
 
@@ -41,14 +42,9 @@ export function PrescriptionStatusCallList() {
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [sessionToDelete, setSessionToDelete] = useState<Session | null>(null);
 
-  const handleViewSession = async (session: Session) => {
-    try {
-      const sessionData = await getSession(session.session_id);
-      setSelectedSession(sessionData);
-      setDetailSheetOpen(true);
-    } catch {
-      toast.error('Failed to load call details');
-    }
+  const handleViewSession = (session: Session) => {
+    setSelectedSession(session);
+    setDetailSheetOpen(true);
   };
 
   const handleDeleteSessionSingle = (session: Session) => {
@@ -110,6 +106,9 @@ export function PrescriptionStatusCallList() {
           onViewSession={handleViewSession}
           onDeleteSession={handleDeleteSessionSingle}
           onDeleteSessions={handleDeleteSessions}
+          hasMore={hasNextPage}
+          loadingMore={isFetchingNextPage}
+          onLoadMore={() => fetchNextPage()}
         />
       </div>
 
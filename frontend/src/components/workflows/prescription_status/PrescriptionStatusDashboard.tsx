@@ -9,7 +9,7 @@ const WORKFLOW = 'prescription_status';
 
 export function PrescriptionStatusDashboard() {
   const navigate = useNavigate();
-  const { data: sessions = [], isLoading } = useSessions(WORKFLOW);
+  const { data: sessions = [], isLoading, hasNextPage } = useSessions(WORKFLOW);
 
   // Calculate metrics based on session status
   const today = new Date().toISOString().split('T')[0];
@@ -41,6 +41,12 @@ export function PrescriptionStatusDashboard() {
       }
     >
       <div className="space-y-6">
+        {hasNextPage && (
+          <p className="text-sm text-muted-foreground">
+            Based on the {sessions.length} most recent calls
+          </p>
+        )}
+
         {/* Metrics Grid */}
         <div className="grid gap-4 md:grid-cols-6">
           <Card>
@@ -54,6 +54,9 @@ interface DynamicTableProps {
   onEditPatient?: (patient: Patient) => void;
   onStartCall?: (patient: Patient) => void;
   onDeletePatient?: (patient: Patient) => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 // Format value based on field type
@@ -120,6 +123,9 @@ export function DynamicTable({
   onEditPatient,
   onStartCall,
   onDeletePatient,
+  hasMore,
+  loadingMore,
+  onLoadMore,
 }: DynamicTableProps) {
   const hasRowActions = onViewPatient || onEditPatient || onStartCall || onDeletePatient;
   const breakpoint = useBreakpoint();
@@ -600,6 +606,15 @@ export function DynamicTable({
         </div>
       </div>
 
+      {/* More patients on the server - fetch the next page */}
+      {hasMore && onLoadMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" size="sm" onClick={onLoadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more patients'}
+          </Button>
+        </div>
+      )}
+
       {/* Delete Confirmation Dialog */}
       <AlertDialog open={showDeleteDialog} onOpenChange={setShowDeleteDialog}>
         <AlertDialogContent>
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Session, Patient, TranscriptMessage } from '@/types';
-import { getPatient } from '@/api';
+import { getPatient, getSession } from '@/api';
 import { formatDatetime } from '@/lib/utils';
 import { TranscriptViewer } from './TranscriptViewer';
 import { Badge } from '@/components/ui/badge';
@@ -121,21 +121,22 @@ export function SessionDetailSheet({
       .finally(() => setPatientLoading(false));
   }, [session?.patient_id]);
 
-  // Parse transcript from session
+  // List responses omit transcripts - load the full session for the sheet
   useEffect(() => {
-    if (!session?.call_transcript) {
-      setTranscript([]);
-      return;
-    }
+    setTranscript([]);
+    if (!open || !session?.session_id) return;
 
-    try {
-      const data = session.call_transcript;
-      const messages = data.messages || [];
-      setTranscript(Array.isArray(messages) ? messages : []);
-    } catch {
-      setTranscript([]);
-    }
-  }, [session?.call_transcript]);
+    let cancelled = false;
+    getSession(session.session_id)
+      .then((data) => {
+        const messages = data?.call_transcript?.messages;
+        if (!cancelled && Array.isArray(messages)) setTranscript(messages);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [open, session?.session_id]);
 
   if (!session) return null;
 
@@ -46,6 +46,9 @@ interface SessionTableProps {
   onViewSession?: (session: Session) => void;
   onDeleteSession?: (session: Session) => void;
   onDeleteSessions?: (sessions: Session[]) => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 // Format phone number for display
@@ -117,6 +120,9 @@ export function SessionTable({
   onViewSession,
   onDeleteSession,
   onDeleteSessions,
+  hasMore,
+  loadingMore,
+  onLoadMore,
 }: SessionTableProps) {
   const hasRowActions = onViewSession || onDeleteSession;
   const breakpoint = useBreakpoint();
@@ -532,6 +538,15 @@ export function SessionTable({
         </div>
       </div>
 
+      {/* More sessions on the server - fetch the next page */}
+      {hasMore && onLoadMore && (
+        <div className="flex justify-center">
+          <Button variant="outline" size="sm" onClick={onLoadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more calls'}
+          </Button>
+        </div>
+      )}
+
       {/* Delete Confirmation Dialog */}
       <AlertDialog open={showDeleteDialog} onOpenChange={setShowDeleteDialog}>
         <AlertDialogContent>
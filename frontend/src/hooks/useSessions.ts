@@ -1,17 +1,19 @@
-import { useQuery, useQueryClient, useMutation } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useQueryClient, useMutation } from '@tanstack/react-query';
 import { getSessions, getSession, deleteSession } from '@/api';
-import { Session } from '@/types';
 
+// Loads one page of sessions at a time; call fetchNextPage() to load more
 export function useSessions(workflow: string) {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: ['sessions', workflow],
-    queryFn: () => getSessions(workflow),
+    queryFn: ({ pageParam }) => getSessions(workflow, undefined, pageParam),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    select: (data) => data.pages.flatMap(page => page.sessions),
 
-    // Dynamic polling: only when active sessions exist
+    // Dynamic polling: only when active sessions exist on a loaded page
     refetchInterval: (query) => {
-      const sessions = query.state.data as Session[] | undefined;
-      const hasActive = sessions?.some(
-        s => s.status === 'starting' || s.status === 'running'
+      const hasActive = query.state.data?.pages.some(page =>
+        page.sessions.some(s => s.status === 'starting' || s.status === 'running')
       );
       return hasActive ? 3000 : false;
     },
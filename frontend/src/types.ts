@@ -57,8 +57,7 @@ export interface Organization {
 export interface PatientsResponse {
   patients: Patient[];
   total_count: number;
-  skip: number;
-  limit: number;
+  next_cursor: string | null;
 }
 
 export interface PatientResponse {
@@ -90,10 +89,12 @@ export interface BulkAddResponse {
   status: string;
   success_count: number;
   failed_count: number;
+  duplicate_count?: number;
   errors?: Array<{
     row: number;
     patient_name?: string;
     error: string;
+    duplicate?: boolean;
   }>;
   message: string;
 }
@@ -136,6 +137,7 @@ export interface Session {
 export interface SessionsResponse {
   sessions: Session[];
   total_count: number;
+  next_cursor: string | null;
 }
 
 // Authentication types
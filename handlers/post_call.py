@@ -0,0 +1,100 @@
+"""Hand end-of-call work to the backend's post-call job queue.
+
+The bot gathers what only it knows (transcript, usage summary, latency
+metrics, the room name) into job payloads, queues them in one write and
+exits. Saving to the session, deleting the Daily recordings and the
+eligibility final extraction run in the API process (backend/post_call_jobs.py).
+If the queue is unreachable the jobs run here instead, once, as before.
+"""
+
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from backend.post_call_jobs import JobType, enqueue_post_call_jobs, run_jobs_inline
+from services.client_pool import get_shared_aiohttp_session
+
+if TYPE_CHECKING:
+    from handlers.state_writer import CallStateWriter
+
+
+async def queue_post_call_jobs(
+    session_id: str,
+    organization_id: Optional[str],
+    jobs: Iterable[Tuple[str, dict]],
+    state_writer: Optional["CallStateWriter"] = None,
+) -> bool:
+    """Queue jobs for the backend worker; run them inline if that fails. True if queued.
+
+    Patient fields still buffered in state_writer are written first, so a job
+    that reads the patient (final_extraction) sees them.
+    """
+    jobs = list(jobs)
+    if state_writer is not None:
+        await state_writer.flush("post_call")
+    if await enqueue_post_call_jobs(session_id, organization_id, jobs):
+        return True
+    logger.warning(f"Post-call queue unavailable, running {len(jobs)} job(s) in the bot")
+    await run_jobs_inline(session_id, organization_id, jobs, http=get_shared_aiohttp_session())
+    return False
+
+
+def _usage_data(pipeline) -> Optional[dict]:
+    observer = getattr(pipeline, 'usage_observer', None)
+    if not observer:
+        logger.warning(f"No usage observer for session {pipeline.session_id}, costs not tracked")
+        return None
+    observer.mark_call_ended()
+    costs = observer.get_usage_summary()
+    logger.info(f"Usage costs: ${costs.get('total_cost_usd', 0):.4f}")
+    return {
+        "usage": costs.get("usage"),
+        "costs": costs.get("costs"),
+        "total_cost_usd": costs.get("total_cost_usd"),
+    }
+
+
+def _latency_data(pipeline) -> Optional[dict]:
+    """Per-call latency percentiles and mergeable histograms."""
+    observer = getattr(pipeline, 'latency_observer', None)
+    if not observer:
+        return None
+    metrics = observer.get_metrics()
+    if not metrics.get("turn_count"):
+        return None
+    latency = {k: v for k, v in metrics.items() if k != "turns"}
+    output_validator = getattr(getattr(pipeline, 'components', None), 'output_validator', None)
+    if output_validator:
+        latency["output_validation"] = output_validator.get_stats()
+    return latency
+
+
+async def save_call_data(pipeline) -> None:
+    """Queue the transcript, usage and latency for the session (once per call)."""
+    if getattr(pipeline, 'post_call_queued', False):
+        logger.debug("Post-call data already queued, skipping")
+        return
+    pipeline.post_call_queued = True
+
+    payload = {"patient_id": pipeline.patient_id}
+    if pipeline.transcripts:
+        payload["transcript"] = {
+            "messages": pipeline.transcripts,
+            "message_count": len(pipeline.transcripts),
+        }
+    try:
+        payload["usage"] = _usage_data(pipeline)
+    except Exception:
+        logger.exception(f"Error collecting usage costs for session {pipeline.session_id}")
+    try:
+        payload["latency"] = _latency_data(pipeline)
+    except Exception:
+        logger.exception(f"Error collecting latency metrics for session {pipeline.session_id}")
+    room_name = getattr(getattr(pipeline, 'transport', None), '_room_name', None)
+    if room_name:
+        payload["room_name"] = room_name
+
+    await queue_post_call_jobs(
+        pipeline.session_id, pipeline.organization_id, [(JobType.SAVE_CALL_DATA, payload)],
+        state_writer=getattr(pipeline, 'state_writer', None),
+    )
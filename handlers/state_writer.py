@@ -0,0 +1,169 @@
+"""Write-behind buffer for patient record updates made during a call.
+
+Flows used to write every extracted field with its own update_one, which put
+Mongo round trips on the conversational hot path (the eligibility observer can
+extract 20+ fields in one turn). CallStateWriter buffers field updates per
+patient, coalesces them into a single $set per flush window and flushes
+immediately on milestones (transfer, call end). CallSession closes the writer
+in _save_session_data, so every buffered field is written (or logged as
+dropped) before the session is considered saved. Flows get their DB update
+helpers from StateWriterMixin.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from backend.models.patient import get_async_patient_db
+from backend.utils import mask_id
+
+FLUSH_INTERVAL = float(os.getenv("CALL_STATE_FLUSH_INTERVAL", "2.0"))
+MAX_FLUSH_ATTEMPTS = 3
+
+# AsyncPatientRecord methods that are plain $set updates and can be buffered
+BUFFERED_DB_METHODS = ("update_field", "update_fields", "update_patient")
+
+
+class CallStateWriter:
+    """Per-call write-behind buffer for patient field updates."""
+
+    def __init__(self, organization_id: Optional[str], flush_interval: float = FLUSH_INTERVAL):
+        self.organization_id = organization_id
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Dict[str, int] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self.fields_buffered = 0
+        self.writes = 0
+
+    def update(self, patient_id: str, fields: Dict[str, Any]) -> None:
+        """Buffer fields for a patient. Later values for the same field win."""
+        if not patient_id:
+            logger.warning(f"[StateWriter] Update skipped - no patient_id for {sorted(fields)}")
+            return
+        if not fields:
+            return
+        self._pending.setdefault(patient_id, {}).update(fields)
+        self.fields_buffered += len(fields)
+        self._schedule(0 if self._closed else self.flush_interval)
+
+    def set(self, patient_id: str, field: str, value: Any) -> None:
+        self.update(patient_id, {field: value})
+
+    def buffer(self, method: str, patient_id: str, *args) -> bool:
+        """Buffer an AsyncPatientRecord update call made by a flow.
+
+        Returns False for methods that are not plain $set updates; the caller
+        must run those against the DB itself.
+        """
+        if method not in BUFFERED_DB_METHODS:
+            return False
+        fields = {args[0]: args[1]} if method == "update_field" else dict(args[0])
+        logger.debug(f"[StateWriter] Buffered {method} for patient {mask_id(patient_id)}: {sorted(fields)}")
+        self.update(patient_id, fields)
+        return True
+
+    @property
+    def pending_fields(self) -> int:
+        return sum(len(fields) for fields in self._pending.values())
+
+    def _schedule(self, delay: float) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Detach before writing so a milestone flush never cancels a write in flight
+        self._flush_task = None
+        await self.flush("interval")
+
+    async def flush(self, reason: str = "milestone") -> bool:
+        """Write all buffered fields now. Returns False if any patient write failed."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()  # Still sleeping - this flush covers it
+            self._flush_task = None
+
+        ok = True
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            for patient_id, fields in pending.items():
+                if await self._write(patient_id, fields):
+                    self._attempts.pop(patient_id, None)
+                    logger.debug(f"[StateWriter] Flushed {len(fields)} field(s) ({reason})")
+                    continue
+
+                ok = False
+                attempts = self._attempts.get(patient_id, 0) + 1
+                if attempts >= MAX_FLUSH_ATTEMPTS:
+                    self._attempts.pop(patient_id, None)
+                    logger.error(
+                        f"[StateWriter] Dropping {len(fields)} field(s) for patient {mask_id(patient_id)} "
+                        f"after {attempts} failed writes: {sorted(fields)}"
+                    )
+                    continue
+                self._attempts[patient_id] = attempts
+                # Fields buffered while the write was in flight are newer - keep them on top
+                self._pending[patient_id] = {**fields, **self._pending.get(patient_id, {})}
+
+        if self._pending and not self._closed:
+            self._schedule(self.flush_interval)
+        return ok
+
+    async def _write(self, patient_id: str, fields: Dict[str, Any]) -> bool:
+        try:
+            self.writes += 1
+            # update_patient adds updated_at to the dict it is given
+            return await get_async_patient_db().update_patient(patient_id, dict(fields), self.organization_id)
+        except Exception as e:
+            logger.error(f"[StateWriter] Write failed for patient {mask_id(patient_id)}: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Flush everything still buffered, retrying failed writes. Call once at session end."""
+        self._closed = True
+        # Always flush once: takes the lock, so an interval write in flight finishes first
+        await self.flush("call_end")
+        for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+            if not self._pending:
+                break
+            await self.flush("call_end")
+        if self.fields_buffered:
+            logger.info(
+                f"[StateWriter] {self.fields_buffered} field update(s) written in {self.writes} write(s)"
+            )
+
+
+class StateWriterMixin:
+    """DB update helpers for call flows; plain $set updates go through the flow's CallStateWriter.
+
+    The flow must set organization_id. CallSession assigns state_writer; while it
+    is None (evals) every update is written through.
+    """
+
+    organization_id: Optional[str] = None
+    state_writer: Optional[CallStateWriter] = None
+
+    async def _try_db_update(self, patient_id: str, method: str, *args, error_msg: str = "DB update error") -> bool:
+        """Buffer or run an AsyncPatientRecord update. Returns False if it failed."""
+        if not patient_id:
+            logger.warning(f"DB update skipped - no patient_id for {method}")
+            return False
+        if self.state_writer and self.state_writer.buffer(method, patient_id, *args):
+            return True
+        try:
+            db = get_async_patient_db()
+            logger.info(f"DB update: {method}({patient_id}, {args})")
+            return bool(await getattr(db, method)(patient_id, *args, self.organization_id))
+        except Exception as e:
+            logger.error(f"{error_msg}: {e}")
+            return False
+
+    async def _flush_state(self, reason: str) -> bool:
+        """Write buffered patient fields now (transfer, call end). Returns False if a write failed."""
+        if self.state_writer:
+            return await self.state_writer.flush(reason)
+        return True
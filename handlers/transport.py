@@ -7,8 +7,7 @@ from pipecat.frames.frames import EndFrame
 
 from backend.constants import CallStatus
 from backend.models.patient import get_async_patient_db
-from backend.sessions import get_async_session_db
-from handlers.transcript import save_transcript_to_db
+from handlers.post_call import save_call_data
 
 DIALOUT_MAX_RETRIES = 3
 DIALOUT_BASE_DELAY = 1.0  # Base delay in seconds for exponential backoff
@@ -76,38 +75,8 @@ async def update_status_if_not_terminal(pipeline, new_status: CallStatus):
         logger.error(f"Error updating status: {e}")
 
 
-async def save_usage_costs(pipeline):
-    """Save usage and cost data to session."""
-    if hasattr(pipeline, 'usage_saved') and pipeline.usage_saved:
-        logger.debug("Usage already saved, skipping")
-        return
-    if not hasattr(pipeline, 'usage_observer') or not pipeline.usage_observer:
-        logger.warning(f"No usage observer for session {pipeline.session_id}, costs not tracked")
-        return
-    try:
-        pipeline.usage_observer.mark_call_ended()
-        costs = pipeline.usage_observer.get_usage_summary()
-        success = await get_async_session_db().update_session(
-            pipeline.session_id,
-            {
-                "usage": costs.get("usage"),
-                "costs": costs.get("costs"),
-                "total_cost_usd": costs.get("total_cost_usd")
-            },
-            pipeline.organization_id
-        )
-        if success:
-            pipeline.usage_saved = True
-            logger.info(f"Usage costs saved: ${costs.get('total_cost_usd', 0):.4f}")
-        else:
-            logger.error(f"Failed to save usage costs for session {pipeline.session_id}")
-    except Exception:
-        logger.exception(f"Error saving usage costs for session {pipeline.session_id}")
-
-
 async def cleanup_and_cancel(pipeline):
-    await save_transcript_to_db(pipeline)
-    await save_usage_costs(pipeline)
+    await save_call_data(pipeline)
     if pipeline.task:
         await pipeline.task.cancel()
         logger.info("Pipeline cancelled")
@@ -167,7 +136,7 @@ def setup_dialin_handlers(pipeline):
             await get_async_patient_db().update_call_status(
                 pipeline.patient_id, CallStatus.COMPLETED.value, pipeline.organization_id
             )
-        await save_transcript_to_db(pipeline)
+        await save_call_data(pipeline)
         await pipeline.task.queue_frames([EndFrame()])
 
     @pipeline.transport.event_handler("on_dialout_error")
@@ -209,7 +178,7 @@ def setup_dialout_handlers(pipeline):
                 await get_async_patient_db().update_call_status(
                     pipeline.patient_id, CallStatus.SUPERVISOR_DIALED.value, pipeline.organization_id
                 )
-            await save_transcript_to_db(pipeline)
+            await save_call_data(pipeline)
             await pipeline.task.queue_frames([EndFrame()])
         else:
             dialout_manager.mark_connected()
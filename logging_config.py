@@ -126,6 +126,8 @@ def setup_logging(debug: bool = None, trace: bool = None):
         level = "INFO"
 
     logger.remove()
+    # Multi-call workers bind call_id per call (logger.contextualize); "-" outside a call
+    logger.configure(extra={"call_id": "-"})
 
     if env != "local":
         logger.add(
@@ -141,7 +143,7 @@ def setup_logging(debug: bool = None, trace: bool = None):
         logger.add(
             sys.stderr,
             level=level,
-            format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
+            format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <magenta>{extra[call_id]}</magenta> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
             filter=_should_suppress,
         )
 
@@ -1,5 +1,6 @@
+from observers.frame_dispatcher import FrameDispatcher
 from observers.latency_observer import LangfuseLatencyObserver
 from observers.llm_context_observer import LLMContextObserver
 from observers.usage_observer import UsageObserver
 
-__all__ = ["LangfuseLatencyObserver", "LLMContextObserver", "UsageObserver"]
+__all__ = ["FrameDispatcher", "LangfuseLatencyObserver", "LLMContextObserver", "UsageObserver"]
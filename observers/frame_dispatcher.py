@@ -0,0 +1,165 @@
+"""
+Shared, type-indexed frame dispatcher for pipeline observers.
+
+Pipecat calls every observer's on_push_frame for every frame on every
+processor hop. Instead of each observer running its own isinstance chain and
+keeping an ever-growing set of seen frame IDs, the session registers a single
+FrameDispatcher and observers subscribe handlers to the frame types they care
+about:
+
+    dispatcher.subscribe(MetricsFrame, self._on_metrics)
+    dispatcher.subscribe(LLMContextFrame, self._on_context, direction=None, dedupe=False)
+
+An uninteresting frame costs one dict lookup. A handler with dedupe=True sees
+each frame once (its first downstream push). Deduplication uses a fixed-size
+ring of recent frame IDs, and only interesting frames go into the ring, so
+memory stays flat however long the call runs.
+
+The dispatcher also measures its own cost and logs it at the end of the call.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+from pipecat.frames.frames import CancelFrame, EndFrame
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.processors.frame_processor import FrameDirection
+
+# Recent frame IDs remembered for deduplication. Duplicate pushes of one frame
+# happen within a few hops, so a small window is plenty.
+DEDUP_WINDOW = 1024
+
+FrameHandler = Callable[[FramePushed], None]
+
+
+class FrameIdWindow:
+    """Fixed-size set of the most recently seen frame IDs."""
+
+    __slots__ = ("_ids", "_order")
+
+    def __init__(self, size: int = DEDUP_WINDOW):
+        self._ids: set = set()
+        self._order: deque = deque(maxlen=size)
+
+    def first_seen(self, frame_id: int) -> bool:
+        """True the first time an ID is seen (while it is still in the window)."""
+        if frame_id in self._ids:
+            return False
+        if len(self._order) == self._order.maxlen:
+            self._ids.discard(self._order[0])
+        self._order.append(frame_id)
+        self._ids.add(frame_id)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class _Subscription:
+    __slots__ = ("frame_type", "handler", "direction", "dedupe")
+
+    def __init__(self, frame_type, handler: FrameHandler, direction: Optional[FrameDirection], dedupe: bool):
+        self.frame_type = frame_type
+        self.handler = handler
+        self.direction = direction
+        self.dedupe = dedupe
+
+
+class FrameDispatcher(BaseObserver):
+    """Routes pushed frames to subscribed handlers by frame type."""
+
+    def __init__(self, dedup_window: int = DEDUP_WINDOW):
+        super().__init__()
+        self._subscriptions: List[_Subscription] = []
+        # Concrete frame type -> (dedupe handlers, every-hop handlers), resolved lazily
+        self._routes: Dict[type, Tuple[Tuple[_Subscription, ...], Tuple[_Subscription, ...]]] = {}
+        self._seen = FrameIdWindow(dedup_window)
+
+        self._frames_observed = 0
+        self._frames_dispatched = 0
+        self._handler_calls = 0
+        self._handler_errors = 0
+        self._overhead_ns = 0
+        self._stats_logged = False
+
+    def subscribe(
+        self,
+        frame_type: Union[type, Tuple[type, ...]],
+        handler: FrameHandler,
+        *,
+        direction: Optional[FrameDirection] = FrameDirection.DOWNSTREAM,
+        dedupe: bool = True,
+    ) -> None:
+        """Call handler(data) for pushes of frame_type (and subclasses).
+
+        Args:
+            frame_type: Frame class (or tuple of classes) to receive
+            handler: Synchronous callable taking the FramePushed event
+            direction: Only this direction, or None for both
+            dedupe: Only the first push of each frame (per dispatcher)
+        """
+        self._subscriptions.append(_Subscription(frame_type, handler, direction, dedupe))
+        self._routes.clear()
+
+    def _route(self, frame_type: type):
+        matching = [s for s in self._subscriptions if issubclass(frame_type, s.frame_type)]
+        route = (
+            tuple(s for s in matching if s.dedupe),
+            tuple(s for s in matching if not s.dedupe),
+        )
+        self._routes[frame_type] = route
+        return route
+
+    async def on_push_frame(self, data: FramePushed):
+        started = time.perf_counter_ns()
+        self._frames_observed += 1
+
+        frame = data.frame
+        route = self._routes.get(type(frame)) or self._route(type(frame))
+        dedupe_subs, every_hop_subs = route
+        if dedupe_subs or every_hop_subs:
+            self._frames_dispatched += 1
+            self._dispatch(data, every_hop_subs)
+            if dedupe_subs and data.direction == FrameDirection.DOWNSTREAM and self._seen.first_seen(frame.id):
+                self._dispatch(data, dedupe_subs)
+
+        if isinstance(frame, (EndFrame, CancelFrame)):
+            self._log_stats()
+        self._overhead_ns += time.perf_counter_ns() - started
+
+    def _dispatch(self, data: FramePushed, subscriptions: Tuple[_Subscription, ...]):
+        for sub in subscriptions:
+            if sub.direction is not None and sub.direction != data.direction:
+                continue
+            self._handler_calls += 1
+            try:
+                sub.handler(data)
+            except Exception as e:
+                self._handler_errors += 1
+                logger.warning(f"[Observers] {getattr(sub.handler, '__qualname__', sub.handler)} failed: {e}")
+
+    def get_stats(self) -> dict:
+        """Own overhead: frames seen/dispatched and mean cost per observed frame."""
+        observed = self._frames_observed
+        return {
+            "frames_observed": observed,
+            "frames_dispatched": self._frames_dispatched,
+            "handler_calls": self._handler_calls,
+            "handler_errors": self._handler_errors,
+            "overhead_us_per_frame": round(self._overhead_ns / observed / 1000, 2) if observed else None,
+            "overhead_ms_total": round(self._overhead_ns / 1e6, 1),
+            "dedup_window_size": len(self._seen),
+        }
+
+    def _log_stats(self):
+        if self._stats_logged:
+            return
+        self._stats_logged = True
+        stats = self.get_stats()
+        logger.info(
+            f"[Observers] {stats['frames_observed']} pushes, {stats['frames_dispatched']} dispatched, "
+            f"{stats['handler_calls']} handler calls | "
+            f"{stats['overhead_us_per_frame']}us/push, {stats['overhead_ms_total']}ms total"
+        )
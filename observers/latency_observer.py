@@ -3,8 +3,16 @@ Latency observer for measuring voice-to-voice response time with granular compon
 
 Tracks per-turn latency with component timing:
 - V2V (Voice-to-Voice): Time from user stopped speaking to bot started speaking
-- LLM TTFB: Time to first LLM token
+- LLM TTFB: Time to first token of the conversation LLM
+- Side LLM TTFB: Time to first token of side-branch LLMs (triage classifier,
+  observer), recorded per component and kept out of the turn breakdown
 - TTS TTFB: Time from TTS request to first audio byte
+- Triage: Time from the classifier's first token to the triage decision
+- Speculation: Hit rate and first-token time saved by speculative LLM runs
+
+V2V, STT, LLM TTFB and TTS TTFB are also recorded in mergeable histograms
+(backend.latency_histogram) so the session keeps p50/p90/p95/p99 and the
+metrics API can merge them per workflow.
 
 Example output:
 [Latency] Turn 1 | V2V: 1450ms | LLM TTFB: 350ms | TTS TTFB: 120ms
@@ -13,7 +21,7 @@ Example output:
 import time
 from dataclasses import dataclass
 from statistics import mean
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 from pipecat.frames.frames import (
@@ -28,8 +36,15 @@ from pipecat.frames.frames import (
     UserStoppedSpeakingFrame,
 )
 from pipecat.metrics.metrics import TTFBMetricsData
-from pipecat.observers.base_observer import BaseObserver, FramePushed
-from pipecat.processors.frame_processor import FrameDirection
+from pipecat.observers.base_observer import FramePushed
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
+
+from backend.latency_histogram import COMPONENTS, LatencyHistogram
+from observers.frame_dispatcher import FrameDispatcher
+from pipeline.speculative_llm import SpeculationMetricsData, SpeculationOutcome
+from pipeline.triage_processors import TriageDecisionMetricsData
 
 # OpenTelemetry imports - optional
 try:
@@ -68,18 +83,29 @@ class TurnMetrics:
         return int(seconds * 1000) if seconds > 0 else 0
 
 
-class LangfuseLatencyObserver(BaseObserver):
+class LangfuseLatencyObserver:
     """Observer that measures voice-to-voice latency per turn.
 
     V2V = time from user stopped speaking to bot started speaking
 
     Also captures LLM TTFB and TTS TTFB from Pipecat's built-in metrics.
+    LLM metrics are attributed by service instance: only the conversation LLM
+    (llms["llm"]) counts toward the turn's LLM TTFB, other LLMs are recorded
+    under their own component names. Receives frames through a FrameDispatcher
+    (see register()).
     """
 
-    def __init__(self, session_id: str):
-        super().__init__()
+    def __init__(self, session_id: str, llms: Optional[Dict[str, Any]] = None):
+        """Initialize the observer.
+
+        Args:
+            session_id: Session the metrics belong to
+            llms: LLM services by component name (ConversationComponents.named_llms());
+                "llm" is the conversation LLM
+        """
         self._session_id = session_id
-        self._processed_frames: set = set()
+        self._llm_components = {id(llm): name for name, llm in (llms or {}).items()}
+        self._llm_names = {getattr(llm, "name", None): name for name, llm in (llms or {}).items()}
         self._turn_count: int = 0
 
         # Current turn tracking
@@ -90,6 +116,19 @@ class LangfuseLatencyObserver(BaseObserver):
         self._pending_llm_ttfb: float = 0
         self._pending_tts_ttfb: float = 0
 
+        # Per-component latency distributions (milliseconds)
+        self._histograms = {name: LatencyHistogram() for name in COMPONENTS}
+        self._side_llm_ttfb: Dict[str, LatencyHistogram] = {}
+
+        # Triage decision timing (one per call)
+        self._triage: Optional[TriageDecisionMetricsData] = None
+
+        # Speculative LLM outcomes on eager end-of-turn
+        self._speculation_outcomes: Dict[str, int] = {}
+        self._speculation_saved = LatencyHistogram()
+        self._speculation_lost = LatencyHistogram()  # Turns speculation made slower
+        self._speculation_net_ms = 0.0
+
         # Prevent duplicate summary logs (multiple EndFrames can trigger _record_summary)
         self._summary_logged: bool = False
 
@@ -101,71 +140,156 @@ class LangfuseLatencyObserver(BaseObserver):
             except Exception as e:
                 logger.warning(f"Latency tracer init failed, local logging only: {e}")
 
-    async def on_push_frame(self, data: FramePushed):
-        """Process frames to track V2V latency."""
-        if data.direction != FrameDirection.DOWNSTREAM:
-            return
-
-        if data.frame.id in self._processed_frames:
-            return
-        self._processed_frames.add(data.frame.id)
-
-        if isinstance(data.frame, UserStartedSpeakingFrame):
-            # New turn starting
-            self._turn_count += 1
-            self._current_turn = TurnMetrics(turn_number=self._turn_count)
-            self._pending_llm_ttfb = 0
-            self._pending_tts_ttfb = 0
-
-        elif isinstance(data.frame, UserStoppedSpeakingFrame):
-            # User finished speaking - start V2V timer
-            if self._current_turn:
-                self._current_turn.user_stop_time = time.time()
-
-        elif isinstance(data.frame, TranscriptionFrame):
-            # Final transcription received - STT is done
-            if self._current_turn and self._current_turn.user_stop_time > 0:
-                now = time.time()
-                self._current_turn.transcription_time = now
-                self._current_turn.stt_finalization = now - self._current_turn.user_stop_time
-
-        elif isinstance(data.frame, LLMFullResponseStartFrame):
-            # LLM started processing
-            if self._current_turn:
-                now = time.time()
-                self._current_turn.llm_start_time = now
-                if self._current_turn.transcription_time > 0:
-                    self._current_turn.pipeline_to_llm = now - self._current_turn.transcription_time
-
-        elif isinstance(data.frame, MetricsFrame):
-            # Capture TTFB metrics
-            self._process_metrics(data.frame)
-
-        elif isinstance(data.frame, BotStartedSpeakingFrame):
-            # Bot started speaking - calculate V2V
-            self._handle_bot_started()
-
-        elif isinstance(data.frame, BotStoppedSpeakingFrame):
-            # Bot finished speaking
-            if self._current_turn:
-                self._current_turn.bot_stop_time = time.time()
-                self._all_turns.append(self._current_turn)
-
-        elif isinstance(data.frame, (EndFrame, CancelFrame)):
-            self._record_summary()
-
-    def _process_metrics(self, frame: MetricsFrame):
-        """Extract TTFB metrics from Pipecat's MetricsFrame."""
+    def register(self, dispatcher: FrameDispatcher):
+        """Subscribe to the frames this observer measures (first downstream push of each)."""
+        dispatcher.subscribe(UserStartedSpeakingFrame, self._on_user_started)
+        dispatcher.subscribe(UserStoppedSpeakingFrame, self._on_user_stopped)
+        dispatcher.subscribe(TranscriptionFrame, self._on_transcription)
+        dispatcher.subscribe(LLMFullResponseStartFrame, self._on_llm_started)
+        dispatcher.subscribe(MetricsFrame, self._on_metrics)
+        dispatcher.subscribe(BotStartedSpeakingFrame, self._on_bot_started)
+        dispatcher.subscribe(BotStoppedSpeakingFrame, self._on_bot_stopped)
+        dispatcher.subscribe((EndFrame, CancelFrame), self._on_end)
+
+    def _on_user_started(self, data: FramePushed):
+        # New turn starting
+        self._turn_count += 1
+        self._current_turn = TurnMetrics(turn_number=self._turn_count)
+        self._pending_llm_ttfb = 0
+        self._pending_tts_ttfb = 0
+
+    def _on_user_stopped(self, data: FramePushed):
+        # User finished speaking - start V2V timer
+        if self._current_turn:
+            self._current_turn.user_stop_time = time.time()
+
+    def _on_transcription(self, data: FramePushed):
+        # Final transcription received - STT is done
+        if self._current_turn and self._current_turn.user_stop_time > 0:
+            now = time.time()
+            self._current_turn.transcription_time = now
+            self._current_turn.stt_finalization = now - self._current_turn.user_stop_time
+
+    def _on_llm_started(self, data: FramePushed):
+        # LLM started processing
+        if self._current_turn:
+            now = time.time()
+            self._current_turn.llm_start_time = now
+            if self._current_turn.transcription_time > 0:
+                self._current_turn.pipeline_to_llm = now - self._current_turn.transcription_time
+
+    def _on_metrics(self, data: FramePushed):
+        # Capture TTFB metrics
+        self._process_metrics(data.frame, data.source)
+
+    def _on_bot_started(self, data: FramePushed):
+        # Bot started speaking - calculate V2V
+        self._handle_bot_started()
+
+    def _on_bot_stopped(self, data: FramePushed):
+        # Bot finished speaking
+        if self._current_turn:
+            self._current_turn.bot_stop_time = time.time()
+            self._all_turns.append(self._current_turn)
+
+    def _on_end(self, data: FramePushed):
+        self._record_summary()
+
+    def _component(self, source, processor_name: str) -> Optional[str]:
+        """Map the processor that reported a metric to a component name.
+
+        "llm" is only the conversation LLM; other LLMs map to their registered
+        name (e.g. "classifier_llm") or, if unregistered, their processor name.
+        """
+        component = self._llm_components.get(id(source)) or self._llm_names.get(processor_name)
+        if component:
+            return component
+        if isinstance(source, LLMService):
+            # Without a registered conversation LLM, keep the old type-based attribution
+            return processor_name if self._llm_components else "llm"
+        if isinstance(source, TTSService):
+            return "tts"
+        if isinstance(source, STTService):
+            return "stt"
+        # Metrics forwarded by a non-service processor: fall back to the name
+        processor = processor_name.lower()
+        if not self._llm_components and ("llm" in processor or "openai" in processor or "groq" in processor):
+            return "llm"
+        if "tts" in processor or "cartesia" in processor or "elevenlabs" in processor:
+            return "tts"
+        return None
+
+    def _process_metrics(self, frame: MetricsFrame, source=None):
+        """Extract TTFB and triage decision metrics from Pipecat's MetricsFrame."""
         for metric in frame.data:
+            if isinstance(metric, TriageDecisionMetricsData):
+                self._handle_triage_decision(metric)
+                continue
+            if isinstance(metric, SpeculationMetricsData):
+                self._speculation_outcomes[metric.outcome] = self._speculation_outcomes.get(metric.outcome, 0) + 1
+                self._speculation_net_ms += metric.value
+                if metric.value < 0:
+                    self._speculation_lost.record(-metric.value)
+                elif metric.outcome == SpeculationOutcome.HIT:
+                    self._speculation_saved.record(metric.value)
+                continue
             if not isinstance(metric, TTFBMetricsData):
                 continue
 
-            processor = metric.processor.lower()
-
-            if "llm" in processor or "openai" in processor or "groq" in processor:
+            component = self._component(source, metric.processor)
+            if component == "llm":
                 self._pending_llm_ttfb = metric.value
-            elif "tts" in processor or "cartesia" in processor or "elevenlabs" in processor:
+            elif component == "tts":
                 self._pending_tts_ttfb = metric.value
+            elif component and component != "stt":
+                self._side_llm_ttfb.setdefault(component, LatencyHistogram()).record(metric.value * 1000)
+
+    def _handle_triage_decision(self, metric: TriageDecisionMetricsData):
+        """Log and send first-token-to-decision timing for the triage classifier."""
+        self._triage = metric
+        decision_ms = int(metric.value * 1000)
+        saved_ms = int(metric.saved_ms)
+        logger.info(
+            f"[Latency] Triage {metric.classification} ({metric.source}) | "
+            f"First token to decision: {decision_ms}ms | Saved: {saved_ms}ms"
+        )
+
+        if not self._tracer:
+            return
+        try:
+            with self._tracer.start_as_current_span("latency.triage") as span:
+                span.set_attribute("latency.triage_decision_ms", decision_ms)
+                span.set_attribute("latency.triage_saved_ms", saved_ms)
+                span.set_attribute("latency.triage_source", metric.source)
+                span.set_attribute("latency.triage_classification", metric.classification)
+                span.set_attribute("langfuse.session.id", self._session_id)
+        except Exception as e:
+            logger.debug(f"LangfuseLatencyObserver: failed to send triage metrics: {e}")
+
+    def _triage_metrics(self) -> Optional[dict]:
+        if not self._triage:
+            return None
+        return {
+            "classification": self._triage.classification,
+            "source": self._triage.source,
+            "decision_ms": int(self._triage.value * 1000),
+            "saved_ms": int(self._triage.saved_ms),
+        }
+
+    def _speculation_metrics(self) -> Optional[dict]:
+        attempts = sum(self._speculation_outcomes.values())
+        if not attempts:
+            return None
+        hits = self._speculation_outcomes.get(SpeculationOutcome.HIT, 0)
+        return {
+            "attempts": attempts,
+            "hits": hits,
+            "hit_rate": round(hits / attempts, 3),
+            "outcomes": dict(self._speculation_outcomes),
+            "saved_ms": self._speculation_saved.summary() if self._speculation_saved.count else None,
+            "lost_ms": self._speculation_lost.summary() if self._speculation_lost.count else None,
+            "net_saved_ms": round(self._speculation_net_ms),
+        }
 
     def _handle_bot_started(self):
         """Calculate V2V when bot starts speaking."""
@@ -179,6 +303,7 @@ class LangfuseLatencyObserver(BaseObserver):
         # Assign pending TTFB values
         self._current_turn.llm_ttfb = self._pending_llm_ttfb
         self._current_turn.tts_ttfb = self._pending_tts_ttfb
+        self._record_histograms(self._current_turn)
 
         # Log turn latency
         self._log_turn(self._current_turn)
@@ -186,6 +311,28 @@ class LangfuseLatencyObserver(BaseObserver):
         # Send to Langfuse
         self._send_turn_to_langfuse(self._current_turn)
 
+    def _record_histograms(self, turn: TurnMetrics):
+        for name, seconds in (
+            ("v2v", turn.v2v_latency),
+            ("stt", turn.stt_finalization),
+            ("llm_ttfb", turn.llm_ttfb),
+            ("tts_ttfb", turn.tts_ttfb),
+        ):
+            if seconds > 0:
+                self._histograms[name].record(seconds * 1000)
+
+    def get_percentiles(self) -> dict:
+        """p50/p90/p95/p99 (plus count/mean/min/max) per component, in ms."""
+        return {name: h.summary() for name, h in self._histograms.items() if h.count}
+
+    def get_side_llm_percentiles(self) -> dict:
+        """TTFB percentiles (ms) of side-branch LLMs, per component."""
+        return {name: h.summary() for name, h in self._side_llm_ttfb.items() if h.count}
+
+    def get_histograms(self) -> dict:
+        """Serialized histograms for storage on the session (mergeable across calls)."""
+        return {name: h.to_dict() for name, h in self._histograms.items() if h.count}
+
     def _log_turn(self, turn: TurnMetrics):
         """Log turn latency breakdown."""
         parts = [f"V2V: {turn.format_ms(turn.v2v_latency)}ms"]
@@ -265,6 +412,31 @@ class LangfuseLatencyObserver(BaseObserver):
         if parts:
             logger.info(f"[Component Averages] {' | '.join(parts)}")
 
+        percentiles = self.get_percentiles()
+        tails = [
+            f"{name} p50/p95/p99: {p['p50_ms']}/{p['p95_ms']}/{p['p99_ms']}ms"
+            for name, p in percentiles.items()
+        ]
+        if tails:
+            logger.info(f"[Latency Percentiles] {' | '.join(tails)}")
+
+        side = [
+            f"{name} TTFB p50/p95: {p['p50_ms']}/{p['p95_ms']}ms"
+            for name, p in self.get_side_llm_percentiles().items()
+        ]
+        if side:
+            logger.info(f"[Side LLM Latency] {' | '.join(side)}")
+
+        speculation = self._speculation_metrics()
+        if speculation:
+            saved = speculation["saved_ms"] or {}
+            logger.info(
+                f"[Speculation] {speculation['hits']}/{speculation['attempts']} hits "
+                f"({speculation['hit_rate']:.0%}) | Saved p50: {saved.get('p50_ms')}ms | "
+                f"Net: {speculation['net_saved_ms']:+d}ms | "
+                f"Outcomes: {speculation['outcomes']}"
+            )
+
         # Send to Langfuse
         if self._tracer:
             try:
@@ -279,6 +451,9 @@ class LangfuseLatencyObserver(BaseObserver):
                     if tts_ttfb_times:
                         tts_avg = int(mean(tts_ttfb_times) * 1000)
                         span.set_attribute("latency.tts_ttfb_avg_ms", tts_avg)
+                    for name, p in percentiles.items():
+                        for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms"):
+                            span.set_attribute(f"latency.{name}_{key}", p[key])
                     span.set_attribute("langfuse.session.id", self._session_id)
             except Exception as e:
                 logger.debug(f"LangfuseLatencyObserver: failed to send summary metrics: {e}")
@@ -286,22 +461,37 @@ class LangfuseLatencyObserver(BaseObserver):
     def get_metrics(self) -> dict:
         """Get metrics as dictionary."""
         if not self._all_turns:
-            return {"turn_count": 0, "v2v_avg_ms": None}
+            return {
+                "turn_count": 0,
+                "v2v_avg_ms": None,
+                "triage": self._triage_metrics(),
+                "speculation": self._speculation_metrics(),
+            }
 
         v2v_times = [t.v2v_latency for t in self._all_turns if t.v2v_latency > 0]
         llm_ttfb_times = [t.llm_ttfb for t in self._all_turns if t.llm_ttfb > 0]
         tts_ttfb_times = [t.tts_ttfb for t in self._all_turns if t.tts_ttfb > 0]
 
         if not v2v_times:
-            return {"turn_count": 0, "v2v_avg_ms": None}
+            return {
+                "turn_count": 0,
+                "v2v_avg_ms": None,
+                "triage": self._triage_metrics(),
+                "speculation": self._speculation_metrics(),
+            }
 
         return {
             "turn_count": len(v2v_times),
+            "triage": self._triage_metrics(),
+            "speculation": self._speculation_metrics(),
             "v2v_avg_ms": int(mean(v2v_times) * 1000),
             "v2v_min_ms": int(min(v2v_times) * 1000),
             "v2v_max_ms": int(max(v2v_times) * 1000),
             "llm_ttfb_avg_ms": int(mean(llm_ttfb_times) * 1000) if llm_ttfb_times else None,
             "tts_ttfb_avg_ms": int(mean(tts_ttfb_times) * 1000) if tts_ttfb_times else None,
+            "percentiles": self.get_percentiles(),
+            "side_llm_ttfb": self.get_side_llm_percentiles(),
+            "histograms": self.get_histograms(),
             "turns": [
                 {
                     "turn": t.turn_number,
@@ -5,17 +5,16 @@ from typing import List
 
 from loguru import logger
 from pipecat.frames.frames import FunctionCallInProgressFrame, LLMContextFrame
-from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.observers.base_observer import FramePushed
 from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContextFrame
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.llm_service import LLMService
 
+from observers.frame_dispatcher import FrameDispatcher
 
-class LLMContextObserver(BaseObserver):
-    """Logs LLM context in readable multi-line format."""
 
-    def __init__(self):
-        super().__init__()
+class LLMContextObserver:
+    """Logs LLM context in readable multi-line format (via a FrameDispatcher)."""
 
     def _format_messages(self, messages: List[dict]) -> List[str]:
         lines = []
@@ -28,26 +27,30 @@ class LLMContextObserver(BaseObserver):
                 lines.append(f"\n  [{role}] {content}")
         return lines
 
-    async def on_push_frame(self, data: FramePushed):
+    def register(self, dispatcher: FrameDispatcher):
+        """Subscribe to context and function-call frames on every hop, both directions."""
+        dispatcher.subscribe(
+            (LLMContextFrame, OpenAILLMContextFrame), self._on_context, direction=None, dedupe=False
+        )
+        dispatcher.subscribe(FunctionCallInProgressFrame, self._on_function_call, direction=None, dedupe=False)
+
+    def _on_context(self, data: FramePushed):
         dst = data.destination
         frame = data.frame
-
         if not isinstance(dst, LLMService):
             return
 
-        if isinstance(frame, (LLMContextFrame, OpenAILLMContextFrame)):
-            messages = (
-                frame.context.messages
-                if isinstance(frame, OpenAILLMContextFrame)
-                else frame.context.get_messages()
-            )
-
-            lines = [f"[LLM] {dst} context ({len(messages)} messages):"]
-            lines.extend(self._format_messages(messages))
-            logger.debug('\n'.join(lines))
-
-        elif (
-            isinstance(frame, FunctionCallInProgressFrame)
-            and data.direction != FrameDirection.DOWNSTREAM
-        ):
+        messages = (
+            frame.context.messages
+            if isinstance(frame, OpenAILLMContextFrame)
+            else frame.context.get_messages()
+        )
+
+        lines = [f"[LLM] {dst} context ({len(messages)} messages):"]
+        lines.extend(self._format_messages(messages))
+        logger.debug('\n'.join(lines))
+
+    def _on_function_call(self, data: FramePushed):
+        if isinstance(data.destination, LLMService) and data.direction != FrameDirection.DOWNSTREAM:
+            frame = data.frame
             logger.debug(f"[LLM] Function call: {frame.function_name}({frame.arguments})")
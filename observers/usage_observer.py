@@ -7,6 +7,7 @@ Uses CostCalculator for all cost calculations.
 """
 
 import time
+from collections import OrderedDict
 from typing import Optional
 
 from loguru import logger
@@ -18,14 +19,18 @@ from pipecat.frames.frames import (
     UserStoppedSpeakingFrame,
 )
 from pipecat.metrics.metrics import LLMUsageMetricsData, TTSUsageMetricsData
-from pipecat.observers.base_observer import BaseObserver, FramePushed
-from pipecat.processors.frame_processor import FrameDirection
+from pipecat.observers.base_observer import FramePushed
 
 from costs.calculator import SERVICE_CLASS_TO_PROVIDER, CostCalculator
+from observers.frame_dispatcher import FrameDispatcher
 
 
-class UsageObserver(BaseObserver):
-    """Tracks LLM, TTS, STT, and telephony usage per session for cost calculation."""
+class UsageObserver:
+    """Tracks LLM, TTS, STT, and telephony usage per session for cost calculation.
+
+    Receives frames through a FrameDispatcher (see register()), which also
+    deduplicates MetricsFrames pushed across several processor hops.
+    """
 
     # Time window for content-based deduplication (seconds)
     _DEDUP_WINDOW = 0.5
@@ -37,12 +42,13 @@ class UsageObserver(BaseObserver):
         stt_provider: str,
         telephony_provider: str,
     ):
-        super().__init__()
         self._session_id = session_id
         self._calculator = CostCalculator()
 
         # LLM usage - dynamic from metrics (supports multiple providers per session)
-        self._llm_usage: dict = {}  # {provider: {model: {prompt: N, completion: N}}}
+        self._llm_usage: dict = {}  # {provider: {model: {prompt: N, completion: N, cached: N}}}
+        # Prompt cache hits per LLM processor (e.g. the observer LLM vs the main LLM on one model)
+        self._prompt_cache: dict = {}  # {processor: {prompt: N, cached: N}}
 
         # TTS/STT/Telephony - single provider per session, passed at init
         self._tts_characters: int = 0
@@ -58,40 +64,33 @@ class UsageObserver(BaseObserver):
 
         self._transfer_count: int = 0
 
-        # Deduplication: track processed frame IDs to avoid duplicate metrics
-        self._processed_frame_ids: set = set()
-
         # Content-based deduplication for metrics (handles duplicate frames with different IDs)
-        # Maps content tuple -> timestamp of last occurrence
-        self._recent_metrics: dict = {}
+        # Maps content tuple -> timestamp of last occurrence, oldest first
+        self._recent_metrics: OrderedDict = OrderedDict()
 
         # Prevent duplicate summary logs (multiple EndFrames can trigger _log_summary)
         self._summary_logged: bool = False
 
-    async def on_push_frame(self, data: FramePushed):
-        """Process frames to track usage."""
-        if data.direction != FrameDirection.DOWNSTREAM:
-            return
+    def register(self, dispatcher: FrameDispatcher):
+        """Subscribe to usage-bearing frames (first downstream push of each)."""
+        dispatcher.subscribe(MetricsFrame, self._on_metrics)
+        dispatcher.subscribe(UserStartedSpeakingFrame, self._on_user_started)
+        dispatcher.subscribe(UserStoppedSpeakingFrame, self._on_user_stopped)
+        dispatcher.subscribe((EndFrame, CancelFrame), self._on_end)
 
-        frame = data.frame
+    def _on_metrics(self, data: FramePushed):
+        self._process_metrics(data.frame)
 
-        if isinstance(frame, MetricsFrame):
-            # Deduplicate: skip frames we've already processed
-            if frame.id in self._processed_frame_ids:
-                return
-            self._processed_frame_ids.add(frame.id)
-            self._process_metrics(frame)
+    def _on_user_started(self, data: FramePushed):
+        self._user_speaking_start = time.time()
 
-        elif isinstance(frame, UserStartedSpeakingFrame):
-            self._user_speaking_start = time.time()
-
-        elif isinstance(frame, UserStoppedSpeakingFrame):
-            if self._user_speaking_start:
-                self._stt_seconds += time.time() - self._user_speaking_start
-                self._user_speaking_start = None
+    def _on_user_stopped(self, data: FramePushed):
+        if self._user_speaking_start:
+            self._stt_seconds += time.time() - self._user_speaking_start
+            self._user_speaking_start = None
 
-        elif isinstance(frame, (EndFrame, CancelFrame)):
-            self._log_summary()
+    def _on_end(self, data: FramePushed):
+        self._log_summary()
 
     def _process_metrics(self, frame: MetricsFrame):
         """Extract LLM and TTS usage from MetricsFrame."""
@@ -104,9 +103,15 @@ class UsageObserver(BaseObserver):
     def _is_duplicate_metric(self, content_key: tuple) -> bool:
         """Check if this metric was seen recently (within DEDUP_WINDOW). Updates tracking."""
         now = time.time()
+        # Expire entries outside the window so the map stays small on long calls
+        while self._recent_metrics:
+            oldest_key, seen_at = next(iter(self._recent_metrics.items()))
+            if now - seen_at < self._DEDUP_WINDOW:
+                break
+            del self._recent_metrics[oldest_key]
+
         if content_key in self._recent_metrics:
-            if now - self._recent_metrics[content_key] < self._DEDUP_WINDOW:
-                return True
+            return True
         self._recent_metrics[content_key] = now
         return False
 
@@ -118,6 +123,8 @@ class UsageObserver(BaseObserver):
         provider = SERVICE_CLASS_TO_PROVIDER.get(class_name, class_name.lower())
         model = metric.model or "unknown"
         tokens = metric.value
+        # Prompt tokens served from the provider's prompt cache (OpenAI cached_tokens)
+        cached = getattr(tokens, "cache_read_input_tokens", None) or 0
 
         # Content-based deduplication: skip if we've seen identical metrics recently
         content_key = ("llm", provider, model, tokens.prompt_tokens, tokens.completion_tokens)
@@ -127,12 +134,20 @@ class UsageObserver(BaseObserver):
         if provider not in self._llm_usage:
             self._llm_usage[provider] = {}
         if model not in self._llm_usage[provider]:
-            self._llm_usage[provider][model] = {"prompt": 0, "completion": 0}
+            self._llm_usage[provider][model] = {"prompt": 0, "completion": 0, "cached": 0}
 
         self._llm_usage[provider][model]["prompt"] += tokens.prompt_tokens
         self._llm_usage[provider][model]["completion"] += tokens.completion_tokens
+        self._llm_usage[provider][model]["cached"] += cached
 
-        logger.debug(f"[Usage] LLM: {provider}/{model} +{tokens.prompt_tokens}/{tokens.completion_tokens}")
+        processor_cache = self._prompt_cache.setdefault(processor, {"prompt": 0, "cached": 0})
+        processor_cache["prompt"] += tokens.prompt_tokens
+        processor_cache["cached"] += cached
+
+        logger.debug(
+            f"[Usage] LLM: {provider}/{model} +{tokens.prompt_tokens}/{tokens.completion_tokens}"
+            f"{f' ({cached} cached)' if cached else ''}"
+        )
 
     def _record_tts(self, metric: TTSUsageMetricsData):
         """Record TTS character usage."""
@@ -173,7 +188,7 @@ class UsageObserver(BaseObserver):
         self._finalize_in_progress_speech()
 
         # Delegate to CostCalculator for all calculations
-        return self._calculator.calculate_session_costs(
+        costs = self._calculator.calculate_session_costs(
             llm_usage=self._llm_usage,
             tts_provider=self._tts_provider,
             tts_characters=self._tts_characters,
@@ -183,6 +198,19 @@ class UsageObserver(BaseObserver):
             telephony_seconds=self._telephony_seconds,
             transfer_count=self._transfer_count,
         )
+        costs["usage"]["llm"]["prompt_cache"] = self.get_prompt_cache_stats()
+        return costs
+
+    def get_prompt_cache_stats(self) -> dict:
+        """Cached share of prompt tokens per LLM processor."""
+        return {
+            processor: {
+                "prompt_tokens": counts["prompt"],
+                "cached_tokens": counts["cached"],
+                "cache_hit_ratio": round(counts["cached"] / counts["prompt"], 3) if counts["prompt"] else None,
+            }
+            for processor, counts in self._prompt_cache.items()
+        }
 
     def _log_summary(self):
         """Log usage summary at end of session."""
@@ -195,7 +223,8 @@ class UsageObserver(BaseObserver):
 
         logger.info(
             f"[Usage] Session: {self._session_id} | "
-            f"LLM: {usage['llm']['prompt_tokens']}/{usage['llm']['completion_tokens']} tokens | "
+            f"LLM: {usage['llm']['prompt_tokens']}/{usage['llm']['completion_tokens']} tokens "
+            f"({usage['llm']['cached_tokens']} cached) | "
             f"TTS: {usage['tts']['characters']} chars | "
             f"STT: {usage['stt']['seconds']}s | "
             f"Call: {usage['telephony']['seconds']}s | "
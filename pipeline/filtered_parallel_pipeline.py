@@ -0,0 +1,138 @@
+"""ParallelPipeline with per-branch frame-type subscriptions.
+
+ParallelPipeline copies every frame into every branch. The side branches in
+this repo (safety classifier, triage classifier, observer) only act on
+transcriptions and speaking events, yet each input audio frame (50/s) and each
+BotSpeakingFrame walked through all of their processors before being dropped
+or deduplicated. Here each branch declares what it subscribes to and the
+fan-out only hands a frame to branches that want it. The main branch still
+sees every frame in the original order.
+
+    FilteredParallelPipeline(
+        conv_processors,                                  # everything
+        subscribe(observer_processors, TranscriptionFrame, SystemFrame,
+                  exclude=HIGH_RATE_FRAMES),
+    )
+
+Lifecycle frames (start/end/cancel/interruption) always reach every branch,
+so branch processors start, stop and reset exactly as before.
+
+Routing queues frames straight into ParallelPipeline's private per-branch
+pipelines, so it only runs on pipecat versions whose ParallelPipeline layout
+has been checked (PIPECAT_VERIFIED_VERSIONS). On any other version it logs a
+warning once and falls back to the plain fan-out.
+"""
+
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from pipecat.frames.frames import (
+    BotSpeakingFrame,
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterruptionFrame,
+    MetricsFrame,
+    StartFrame,
+    StopFrame,
+    UserSpeakingFrame,
+)
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+# Delivered to every branch regardless of subscription
+LIFECYCLE_FRAMES = (StartFrame, EndFrame, StopFrame, CancelFrame, InterruptionFrame)
+
+# System frames emitted many times per second that side branches never act on
+HIGH_RATE_FRAMES = (InputAudioRawFrame, UserSpeakingFrame, BotSpeakingFrame, MetricsFrame)
+
+# pipecat releases whose ParallelPipeline fans out via self._pipelines and whose
+# process_frame adds nothing but the Start/End/Cancel barrier
+PIPECAT_VERIFIED_VERSIONS = ("0.0.101",)
+
+_routing_warned = False
+
+
+def _installed_pipecat_version() -> Optional[str]:
+    try:
+        return version("pipecat-ai")
+    except PackageNotFoundError:
+        return None
+
+
+ROUTING_SUPPORTED = _installed_pipecat_version() in PIPECAT_VERIFIED_VERSIONS
+
+
+@dataclass(frozen=True)
+class Branch:
+    """Processors of one parallel branch and the frame types it subscribes to."""
+
+    processors: Sequence[FrameProcessor]
+    types: Tuple[type, ...] = (Frame,)
+    exclude: Tuple[type, ...] = ()
+
+    def wants(self, frame_type: type) -> bool:
+        if issubclass(frame_type, LIFECYCLE_FRAMES):
+            return True
+        return issubclass(frame_type, self.types) and not issubclass(frame_type, self.exclude)
+
+
+def subscribe(processors: Sequence[FrameProcessor], *types: type, exclude: Tuple[type, ...] = ()) -> Branch:
+    """Branch that only receives frames of the given types (minus `exclude`)."""
+    return Branch(list(processors), types or (Frame,), exclude)
+
+
+class FilteredParallelPipeline(ParallelPipeline):
+    """ParallelPipeline whose branches may be subscribe()d to a subset of frames.
+
+    Plain lists subscribe to everything, so FilteredParallelPipeline(a, b)
+    behaves exactly like ParallelPipeline(a, b).
+    """
+
+    def __init__(self, *branches):
+        specs = [b if isinstance(b, Branch) else Branch(list(b)) for b in branches]
+        super().__init__(*[list(spec.processors) for spec in specs])
+        self._branch_specs = specs
+        self._routes: Dict[type, Tuple[bool, ...]] = {}
+        self.frames_skipped = 0  # Branch deliveries avoided
+
+    def _route(self, frame_type: type) -> Tuple[bool, ...]:
+        route = self._routes.get(frame_type)
+        if route is None:
+            route = tuple(spec.wants(frame_type) for spec in self._branch_specs)
+            self._routes[frame_type] = route
+        return route
+
+    def _branch_inputs(self) -> Optional[List[FrameProcessor]]:
+        """Per-branch pipelines ParallelPipeline queues frames into, or None if unverified."""
+        inputs = getattr(self, "_pipelines", None) if ROUTING_SUPPORTED else None
+        if inputs is None or len(inputs) != len(self._branch_specs):
+            global _routing_warned
+            if not _routing_warned:
+                _routing_warned = True
+                logger.warning(
+                    f"{self}: ParallelPipeline layout not verified for pipecat "
+                    f"{_installed_pipecat_version()} (verified: {', '.join(PIPECAT_VERIFIED_VERSIONS)}), "
+                    f"delivering all frames to all branches"
+                )
+            return None
+        return inputs
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        route = self._route(type(frame))
+        inputs = None if all(route) else self._branch_inputs()
+        if inputs is None:
+            await super().process_frame(frame, direction)
+            return
+
+        # ParallelPipeline.process_frame only adds lifecycle handling, and
+        # lifecycle frames always take the full fan-out above.
+        await super(ParallelPipeline, self).process_frame(frame, direction)
+        for branch_input, wanted in zip(inputs, route):
+            if wanted:
+                await branch_input.queue_frame(frame, direction)
+            else:
+                self.frames_skipped += 1
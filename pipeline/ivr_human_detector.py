@@ -1,13 +1,18 @@
 """IVR Human Detector - detects when a human answers during IVR navigation."""
 
 import asyncio
-from typing import Optional
+import re
+import time
+from collections import deque
+from typing import List, Optional
 
 from loguru import logger
 from pipecat.frames.frames import Frame, TranscriptionFrame
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from pipeline.triage_prefilter import IVR, VOICEMAIL, TriagePreFilter
 from pipeline.triage_processors import TriageClassification
+from services.client_pool import close_client, create_groq_client
 
 CLASSIFIER_PROMPT = """Classify this phone call transcription as IVR or human.
 
@@ -27,6 +32,15 @@ CRITICAL: Generic hold messages like "Thank you for your patience" or "A represe
 
 Output EXACTLY one word: CONVERSATION or IVR"""
 
+# Transcript text carried over from superseded requests, most recent kept
+MAX_PENDING_CHARS = 400
+# Hold-loop lines already classified as IVR, skipped when they repeat
+REPEAT_MEMORY = 32
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^\w]+", " ", text.lower()).strip()
+
 
 class IVRHumanDetector(FrameProcessor):
     """Detects when a human answers during IVR navigation.
@@ -34,6 +48,12 @@ class IVRHumanDetector(FrameProcessor):
     Uses direct Groq API calls to classify transcriptions.
     Emits on_human_detected event when human speech is detected.
 
+    Classification is single-flight: a new transcription cancels the request
+    in flight and classifies the text both cover, so answers can't arrive out
+    of order. Lines the local triage pre-filter recognizes as IVR/voicemail
+    ("press 1 for...", "your call is important to us") and repeats of lines
+    already classified IVR are skipped without an LLM request.
+
     Uses debouncing to handle fragmented transcriptions: waits for 300ms
     of silence after detecting human speech before triggering completion.
     Any new transcription resets the timer.
@@ -51,9 +71,24 @@ class IVRHumanDetector(FrameProcessor):
         self._accumulated_text = ""
         self._register_event_handler("on_human_detected")
 
+        self._inflight: Optional[asyncio.Task] = None
+        self._generation = 0
+        self._pending_text = ""
+        self._ivr_lines: deque = deque(maxlen=REPEAT_MEMORY)
+        self._prefilter = TriagePreFilter()
+
+        # Per-call stats
+        self._activated_at: Optional[float] = None
+        self.requests = 0
+        self.cancelled = 0
+        self.prefilter_skips = 0
+        self.repeat_skips = 0
+        self.failures = 0
+        self.decision_latency_ms: List[float] = []
+        self.time_to_human_ms: Optional[float] = None
+
         try:
-            from groq import AsyncGroq
-            self._client = AsyncGroq(api_key=api_key)
+            self._client = create_groq_client(api_key, http2=True)
         except ImportError:
             logger.warning("[IVRHumanDetector] groq package not installed")
             self._client = None
@@ -63,15 +98,17 @@ class IVRHumanDetector(FrameProcessor):
         self._active = True
         self._human_detected = False
         self._accumulated_text = ""
+        self._pending_text = ""
+        self._activated_at = time.perf_counter()
         logger.info("[IVRHumanDetector] Activated")
 
-    def deactivate(self) -> None:
+    async def deactivate(self) -> None:
         """Stop monitoring."""
         self._active = False
         self._human_detected = False
-        if self._trigger_task and not self._trigger_task.done():
-            self._trigger_task.cancel()
-        self._trigger_task = None
+        await self._cancel_inflight()
+        self._pending_text = ""
+        await self._cancel_trigger()
         logger.info("[IVRHumanDetector] Deactivated")
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
@@ -84,14 +121,60 @@ class IVRHumanDetector(FrameProcessor):
                 # If human already detected, reset debounce timer on any new transcription
                 if self._human_detected:
                     self._accumulated_text += " " + text
-                    self._reset_trigger_timer()
+                    await self._reset_trigger_timer()
                 else:
-                    self.create_task(self._classify(text))
+                    await self._submit(text)
+
+    # ==================== Classification ====================
+
+    async def _submit(self, text: str):
+        """Classify the text heard since the last decision, superseding any request in flight."""
+        received_at = time.perf_counter()
+        self._pending_text = f"{self._pending_text} {text}".strip()[-MAX_PENDING_CHARS:]
+        key = _normalize(self._pending_text)
+
+        if key in self._ivr_lines:
+            self.repeat_skips += 1
+            await self._settle_ivr()
+            logger.debug(f"[IVRHumanDetector] Repeated IVR line, skipped: '{text[:40]}'")
+            return
+
+        decision = self._prefilter.classify(self._pending_text)
+        if decision.label in (IVR, VOICEMAIL):
+            self.prefilter_skips += 1
+            self._remember_ivr(key)
+            await self._settle_ivr()
+            logger.debug(f"[IVRHumanDetector] '{text[:40]}' → {decision.label} (local, {decision.source})")
+            return
+
+        await self._cancel_inflight()
+        self._generation += 1
+        self._inflight = self.create_task(self._classify(self._pending_text, self._generation, received_at))
+
+    async def _cancel_inflight(self):
+        inflight, self._inflight = self._inflight, None
+        if inflight and not inflight.done():
+            self.cancelled += 1
+            await self.cancel_task(inflight)
+
+    async def _cancel_trigger(self):
+        trigger, self._trigger_task = self._trigger_task, None
+        if trigger and not trigger.done():
+            await self.cancel_task(trigger)
 
-    def _reset_trigger_timer(self):
+    async def _settle_ivr(self):
+        """Pending text is IVR: drop it and any request still classifying it."""
+        await self._cancel_inflight()
+        self._generation += 1
+        self._pending_text = ""
+
+    def _remember_ivr(self, key: str):
+        if key and key not in self._ivr_lines:
+            self._ivr_lines.append(key)
+
+    async def _reset_trigger_timer(self):
         """Reset the debounce timer - called when new transcription arrives."""
-        if self._trigger_task and not self._trigger_task.done():
-            self._trigger_task.cancel()
+        await self._cancel_trigger()
         self._trigger_task = self.create_task(self._delayed_trigger())
         logger.debug(f"[IVRHumanDetector] Debounce reset, accumulated: '{self._accumulated_text[:50]}...'")
 
@@ -101,16 +184,21 @@ class IVRHumanDetector(FrameProcessor):
             await asyncio.sleep(self.DEBOUNCE_DELAY)
             if self._active and self._human_detected:
                 logger.info(f"[IVRHumanDetector] Human confirmed: '{self._accumulated_text[:60]}'")
-                self.deactivate()
+                if self._activated_at is not None:
+                    self.time_to_human_ms = (time.perf_counter() - self._activated_at) * 1000
+                # This task is finishing on its own; deactivate() must not cancel it
+                self._trigger_task = None
+                await self.deactivate()
                 await self._call_event_handler("on_human_detected", self._accumulated_text.strip())
         except asyncio.CancelledError:
             pass  # Timer was reset by new transcription
 
-    async def _classify(self, text: str):
+    async def _classify(self, text: str, generation: int, received_at: float):
         """Classify transcription and start debounce timer if human detected."""
         if not self._active or not self._client:
             return
 
+        self.requests += 1
         try:
             response = await asyncio.wait_for(
                 self._client.chat.completions.create(
@@ -124,16 +212,61 @@ class IVRHumanDetector(FrameProcessor):
                 ),
                 timeout=self.CLASSIFICATION_TIMEOUT
             )
-            result = response.choices[0].message.content.strip().upper()
-            logger.debug(f"[IVRHumanDetector] '{text[:40]}' → {result}")
-
-            if result == TriageClassification.CONVERSATION:
-                logger.info(f"[IVRHumanDetector] Human detected, starting debounce: '{text[:50]}'")
-                self._human_detected = True
-                self._accumulated_text = text
-                self._reset_trigger_timer()
-
         except asyncio.TimeoutError:
+            self.failures += 1
             logger.warning("[IVRHumanDetector] Classification timeout")
+            return
         except Exception as e:
+            self.failures += 1
             logger.warning(f"[IVRHumanDetector] Classification failed: {e}")
+            return
+
+        # A newer transcription superseded this request while it was completing
+        if generation != self._generation or not self._active:
+            return
+        self._inflight = None
+        self.decision_latency_ms.append((time.perf_counter() - received_at) * 1000)
+
+        result = response.choices[0].message.content.strip().upper()
+        logger.debug(f"[IVRHumanDetector] '{text[:40]}' → {result}")
+
+        if result == TriageClassification.CONVERSATION:
+            logger.info(f"[IVRHumanDetector] Human detected, starting debounce: '{text[:50]}'")
+            self._human_detected = True
+            self._accumulated_text = text
+            self._pending_text = ""
+            await self._reset_trigger_timer()
+        else:
+            self._remember_ivr(_normalize(text))
+            self._pending_text = ""
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> dict:
+        """Request volume and decision latency for this call."""
+        latencies = sorted(self.decision_latency_ms)
+        return {
+            "requests": self.requests,
+            "cancelled": self.cancelled,
+            "prefilter_skips": self.prefilter_skips,
+            "repeat_skips": self.repeat_skips,
+            "failures": self.failures,
+            "decision_latency_p50_ms": round(latencies[len(latencies) // 2]) if latencies else None,
+            "decision_latency_max_ms": round(latencies[-1]) if latencies else None,
+            "time_to_human_ms": round(self.time_to_human_ms) if self.time_to_human_ms is not None else None,
+        }
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._cancel_inflight()
+        await self._cancel_trigger()
+        await close_client(self._client)
+        self._client = None
+        stats = self.get_stats()
+        if stats["requests"] or stats["prefilter_skips"] or stats["repeat_skips"]:
+            logger.info(
+                f"[IVRHumanDetector] {stats['requests']} LLM requests ({stats['cancelled']} cancelled, "
+                f"{stats['failures']} failed), {stats['prefilter_skips']} pre-filtered, "
+                f"{stats['repeat_skips']} repeats skipped | decision p50 {stats['decision_latency_p50_ms']}ms, "
+                f"max {stats['decision_latency_max_ms']}ms, human after {stats['time_to_human_ms']}ms"
+            )
@@ -5,15 +5,20 @@ TranscriptionFrame for user speech and TTSTextFrame for bot speech
 injected by ConsumerProcessor) and extracts structured data each turn.
 It never produces audible output — NullFilter at the branch terminus
 blocks everything except system frames.
+
+The branch is subscribe()d at the ParallelPipeline fan-out to transcriptions
+and low-rate system frames, so FlowManager frames (LLMSetToolsFrame,
+LLMMessagesUpdateFrame, LLMRunFrame) and per-chunk audio never enter it. A
+FrameFilter at its head keeps FlowManager frames out even when routing is off.
 """
 
 import json
-from collections import deque
 
 from loguru import logger
 from pipecat.frames.frames import (
     Frame,
     LLMContextFrame,
+    SystemFrame,
     TranscriptionFrame,
     TTSTextFrame,
     UserStartedSpeakingFrame,
@@ -24,16 +29,38 @@ from pipecat.processors.filters.frame_filter import FrameFilter
 from pipecat.processors.filters.null_filter import NullFilter
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from pipeline.filtered_parallel_pipeline import HIGH_RATE_FRAMES, Branch, subscribe
+
+# The turn window only slides in steps of this many turns, so the prompt
+# prefix stays identical between slides and provider prompt caching can hit
+WINDOW_SLIDE_STEP = 6
+
+_TURN = "turn"
+_STATE = "state"
+
+
+def _state_json(state: dict) -> str:
+    return json.dumps(state, indent=2, sort_keys=True, default=str) if state else "{}"
+
 
 class ObserverContextManager(FrameProcessor):
     """Builds rolling-window LLM context from both sides of a conversation.
 
     Accumulates bot speech (TTSTextFrame from ConsumerProcessor) and user
-    speech (TranscriptionFrame) into a deque of recent turns.  On each
-    UserStoppedSpeakingFrame, constructs a fresh LLMContext with:
-      - system prompt  (role description + normalization rules + current state JSON)
-      - recent turns   (assistant / user message pairs)
-    and pushes an LLMContextFrame downstream to the observer LLM.
+    speech (TranscriptionFrame) into a window of recent turns.  On each
+    UserStoppedSpeakingFrame, pushes an LLMContextFrame downstream to the
+    observer LLM, laid out so consecutive requests share a long prefix:
+      - system prompt   (role description + normalization rules + extraction
+                         fields; identical for the whole call)
+      - state snapshot  (extracted data at the start of the window; changes
+                         only when the window slides)
+      - recent turns    (assistant / user messages, append-only, with a short
+                         state update inserted whenever extraction changed
+                         the state since the previous request)
+
+    The window grows to window_size + WINDOW_SLIDE_STEP turns and then drops
+    the oldest turns at once, folding their state updates into a new
+    snapshot, rather than sliding (and changing the prefix) every turn.
     """
 
     def __init__(
@@ -46,15 +73,28 @@ class ObserverContextManager(FrameProcessor):
         window_size: int = 10,
     ):
         super().__init__()
-        self._system_prompt = system_prompt
         self._tools = tools
         self._tool_choice = tool_choice
         self._flow_ref = flow_ref  # strong ref to flow; only reads flow_manager.state
         self._extraction_fields = extraction_fields or []
-        self._recent_turns: deque = deque(maxlen=window_size)
+        self._system_prompt = self._static_prompt(system_prompt)
+        self._window_size = window_size
+        self._window: list[tuple[str, dict]] = []  # (_TURN | _STATE, message)
+        self._snapshot: dict = {}  # State at the start of the window
+        self._sent_state: dict = {}  # State as of the last context pushed
         self._current_turn_text = ""
         self._current_assistant_text = ""
 
+    def _static_prompt(self, system_prompt: str) -> str:
+        fields = "\n".join(f"- {field}" for field in self._extraction_fields)
+        return (
+            f"{system_prompt}\n\n"
+            f"# Extraction Fields\n{fields or '(any)'}\n\n"
+            f"# Currently Extracted Data\n"
+            f"The next message holds the data extracted so far. Later \"Extracted data updated\" "
+            f"messages in the conversation override those values."
+        )
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
@@ -67,9 +107,7 @@ class ObserverContextManager(FrameProcessor):
         if isinstance(frame, UserStartedSpeakingFrame):
             # Flush any pending assistant text as an assistant turn
             if self._current_assistant_text.strip():
-                self._recent_turns.append(
-                    {"role": "assistant", "content": self._current_assistant_text.strip()}
-                )
+                self._append_turn("assistant", self._current_assistant_text.strip())
                 self._current_assistant_text = ""
             await self.push_frame(frame, direction)
             return
@@ -82,9 +120,8 @@ class ObserverContextManager(FrameProcessor):
         if isinstance(frame, UserStoppedSpeakingFrame):
             # Flush user text as a user turn
             if self._current_turn_text.strip():
-                self._recent_turns.append(
-                    {"role": "user", "content": self._current_turn_text.strip()}
-                )
+                self._append_state_update()
+                self._append_turn("user", self._current_turn_text.strip())
                 self._current_turn_text = ""
                 await self._build_and_push_context()
             await self.push_frame(frame, direction)
@@ -93,9 +130,10 @@ class ObserverContextManager(FrameProcessor):
         # All other frames pass through
         await self.push_frame(frame, direction)
 
-    async def _build_and_push_context(self):
-        """Build fresh LLMContext with state + rolling window and push downstream."""
-        # Get current state from flow_manager
+    # ==================== Window ====================
+
+    def _read_state(self) -> dict:
+        """Extracted fields currently set in flow_manager.state."""
         state_dict = {}
         if self._flow_ref and hasattr(self._flow_ref, "flow_manager") and self._flow_ref.flow_manager:
             fm_state = self._flow_ref.flow_manager.state
@@ -103,18 +141,49 @@ class ObserverContextManager(FrameProcessor):
                 val = fm_state.get(field)
                 if val:
                     state_dict[field] = val
+        return state_dict
+
+    def _append_turn(self, role: str, content: str):
+        self._window.append((_TURN, {"role": role, "content": content}))
+
+    def _append_state_update(self):
+        """Record fields extracted (or cleared) since the last context as a delta message."""
+        state = self._read_state()
+        delta = {k: v for k, v in state.items() if self._sent_state.get(k) != v}
+        delta.update({k: None for k in self._sent_state if k not in state})
+        self._sent_state = state
+        if delta:
+            self._window.append((_STATE, {
+                "role": "system",
+                "content": f"Extracted data updated:\n```json\n{_state_json(delta)}\n```",
+            }))
+
+    def _slide_window(self):
+        """Once the window overflows by a full step, drop the oldest turns in one go."""
+        turns = sum(1 for kind, _ in self._window if kind == _TURN)
+        if turns < self._window_size + WINDOW_SLIDE_STEP:
+            return
+        to_drop = turns - self._window_size
+        kept = []
+        for kind, message in self._window:
+            if kind == _TURN and to_drop:
+                to_drop -= 1
+            elif kind == _TURN:
+                kept.append((kind, message))
+        # Updates in the remaining window are folded into the new snapshot
+        self._window = kept
+        self._snapshot = dict(self._sent_state)
+        logger.debug(f"[Observer] Window slid to {len(kept)} turns, prompt prefix rebased")
 
-        state_json = json.dumps(state_dict, indent=2) if state_dict else "{}"
-
-        system_content = (
-            f"{self._system_prompt}\n\n"
-            f"# Currently Extracted Data\n"
-            f"```json\n{state_json}\n```"
-        )
+    async def _build_and_push_context(self):
+        """Build LLMContext (static prompt, snapshot, window) and push downstream."""
+        self._slide_window()
 
-        messages = [{"role": "system", "content": system_content}]
-        for turn in self._recent_turns:
-            messages.append({"role": turn["role"], "content": turn["content"]})
+        messages = [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "system", "content": f"```json\n{_state_json(self._snapshot)}\n```"},
+        ]
+        messages.extend(dict(message) for _, message in self._window)
 
         context = LLMContext(
             messages=messages,
@@ -122,27 +191,36 @@ class ObserverContextManager(FrameProcessor):
             tool_choice=self._tool_choice,
         )
 
-        logger.debug(f"[Observer] Pushing context with {len(self._recent_turns)} turns, {len(state_dict)} extracted fields")
+        logger.debug(
+            f"[Observer] Pushing context with {len(self._window)} window messages, "
+            f"{len(self._sent_state)} extracted fields"
+        )
         await self.push_frame(LLMContextFrame(context=context))
 
 
-def create_observer_branch(observer_context_manager, observer_llm, bot_speech_consumer):
-    """Create the observer pipeline branch processors list.
+def create_observer_branch(observer_context_manager, observer_llm, bot_speech_consumer) -> Branch:
+    """Create the observer pipeline branch for FilteredParallelPipeline.
 
     Layout:
         FrameFilter(TranscriptionFrame) → ConsumerProcessor → ObserverContextManager → observer_llm → NullFilter
 
-    FrameFilter blocks FlowManager frames (LLMSetToolsFrame, LLMMessagesUpdateFrame,
-    LLMRunFrame) while allowing TranscriptionFrame and SystemFrames through.
-    ConsumerProcessor is placed AFTER the filter so its injected TTSTextFrames
-    bypass the filter.
+    Subscribed to TranscriptionFrame (the only non-system frame needed) and
+    system frames such as UserStarted/StoppedSpeakingFrame, minus high-rate
+    audio/speaking frames. The FrameFilter still blocks FlowManager frames
+    (LLMSetToolsFrame, LLMMessagesUpdateFrame, LLMRunFrame) when routing is
+    off on an unverified pipecat version and the fan-out falls back to
+    sending every frame. ConsumerProcessor is placed after the filter so its
+    injected TTSTextFrames bypass it.
     """
-    return [
-        # TranscriptionFrame is the only non-system frame needed.
-        # UserStarted/StoppedSpeakingFrame are SystemFrames and pass through automatically.
-        FrameFilter(types=(TranscriptionFrame,)),
-        bot_speech_consumer,
-        observer_context_manager,
-        observer_llm,
-        NullFilter(),
-    ]
+    return subscribe(
+        [
+            FrameFilter(types=(TranscriptionFrame,)),
+            bot_speech_consumer,
+            observer_context_manager,
+            observer_llm,
+            NullFilter(),
+        ],
+        TranscriptionFrame,
+        SystemFrame,
+        exclude=HIGH_RATE_FRAMES,
+    )
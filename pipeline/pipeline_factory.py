@@ -1,12 +1,10 @@
-import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 import yaml
 from loguru import logger
 from pipecat.audio.vad.vad_analyzer import VADParams
 from pipecat.frames.frames import TTSTextFrame
-from pipecat.pipeline.parallel_pipeline import ParallelPipeline
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.task import PipelineParams
 from pipecat.processors.aggregators.llm_context import LLMContext
@@ -20,15 +18,18 @@ from pipecat.processors.producer_processor import ProducerProcessor
 from pipecat.turns.mute import FirstSpeechUserMuteStrategy
 from pipecat.turns.user_turn_strategies import ExternalUserTurnStrategies
 
-from core.flow_loader import FlowLoader
+from core.client_registry import get_client_registry, substitute_env_vars, thaw
+from pipeline.filtered_parallel_pipeline import FilteredParallelPipeline
 from pipeline.ivr_human_detector import IVRHumanDetector
 from pipeline.ivr_navigation_processor import IVRNavigationProcessor
 from pipeline.observer import ObserverContextManager, create_observer_branch
 from pipeline.safety_processors import OutputValidator, SafetyMonitor
+from pipeline.speculative_llm import SpeculativeLLMProcessor
 from pipeline.transcript_logger import TranscriptLogger
 from pipeline.triage_detector import TriageDetector
 from pipeline.types import ConversationComponents
 from services.service_factory import ServiceFactory
+from services.tts_cache import workflow_phrases
 
 
 async def _is_tts_text_frame(frame):
@@ -43,33 +44,44 @@ class PipelineFactory:
         client_name: str,
         session_data: Dict[str, Any],
         room_config: Dict[str, str],
-        dialin_settings: Dict[str, str] = None
+        dialin_settings: Dict[str, str] = None,
+        service_factory: type = ServiceFactory,
+        services_config: Mapping[str, Any] = None,
     ) -> tuple:
+        """Build the call pipeline.
+
+        service_factory and services_config replace the real service
+        constructors and the registry's services.yaml (offline load tests).
+        """
         organization_slug = session_data.get('organization_slug')
-        services_config = PipelineFactory.load_services_config(organization_slug, client_name)
+        client_entry = get_client_registry().get(organization_slug, client_name)
+        if services_config is None:
+            services_config = client_entry.services_config
+        # Registry configs are frozen; services (pydantic params, keyterm lists...) get plain dicts/lists
+        services_config = thaw(services_config)
 
         call_type = services_config.get('call_type')
         if not call_type:
             raise ValueError(f"Missing 'call_type' in services.yaml for {client_name}")
 
         # Create services directly
-        transport = ServiceFactory.create_transport(
+        transport = service_factory.create_transport(
             services_config['services']['transport'],
             room_config['room_url'],
             room_config['room_token'],
             room_config['room_name'],
             dialin_settings
         )
-        stt = ServiceFactory.create_stt(services_config['services']['stt'])
-        tts = ServiceFactory.create_tts(services_config['services']['tts'])
+        stt = service_factory.create_stt(services_config['services']['stt'])
+        tts = service_factory.create_tts(services_config['services']['tts'], workflow_phrases(services_config))
 
         # Create main LLM
         llm_config = services_config['services']['llm']
-        main_llm = ServiceFactory.create_llm(llm_config)
+        main_llm = service_factory.create_llm(llm_config)
 
         classifier_llm_config = services_config['services'].get('classifier_llm')
         if classifier_llm_config:
-            classifier_llm = ServiceFactory.create_llm(classifier_llm_config, is_classifier=True)
+            classifier_llm = service_factory.create_llm(classifier_llm_config, is_classifier=True)
         else:
             classifier_llm = None
             logger.info("classifier_llm not configured - triage detection disabled")
@@ -78,7 +90,7 @@ class PipelineFactory:
         observer_llm_config = services_config['services'].get('observer_llm')
         observer_llm = None
         if observer_llm_config:
-            observer_llm = ServiceFactory.create_llm(observer_llm_config)
+            observer_llm = service_factory.create_llm(observer_llm_config)
             logger.info("Observer LLM created for silent data extraction")
 
         components = PipelineFactory._create_conversation_components(
@@ -91,6 +103,7 @@ class PipelineFactory:
             classifier_llm=classifier_llm,
             call_type=call_type,
             services_config=services_config,
+            flow_class=client_entry.flow_class,
             observer_llm=observer_llm,
         )
 
@@ -100,28 +113,17 @@ class PipelineFactory:
 
     @staticmethod
     def load_services_config(organization_slug: str, client_name: str) -> Dict[str, Any]:
-        """Load and parse services.yaml for a client."""
+        """Load and parse services.yaml for a client (uncached, mutable copy).
+
+        Live calls read the pre-resolved config from the client registry instead.
+        """
         client_path = Path(f"clients/{organization_slug}/{client_name}")
         services_path = client_path / "services.yaml"
 
         with open(services_path, 'r') as f:
             config = yaml.safe_load(f)
 
-        return PipelineFactory._substitute_env_vars(config)
-
-    @staticmethod
-    def _substitute_env_vars(config: Dict[str, Any]) -> Dict[str, Any]:
-        """Substitute ${ENV_VAR} placeholders with environment variables."""
-        for key, value in config.items():
-            if isinstance(value, dict):
-                config[key] = PipelineFactory._substitute_env_vars(value)
-            elif isinstance(value, str) and value.startswith('${') and value.endswith('}'):
-                env_var_name = value[2:-1]
-                env_value = os.getenv(env_var_name)
-                if env_value is None:
-                    raise ValueError(f"Required environment variable '{env_var_name}' is not set")
-                config[key] = env_value
-        return config
+        return substitute_env_vars(config)
 
     @staticmethod
     def _create_conversation_components(
@@ -133,7 +135,8 @@ class PipelineFactory:
         main_llm: Any,
         classifier_llm: Any,
         call_type: str,
-        services_config: Dict[str, Any],
+        services_config: Mapping[str, Any],
+        flow_class: type,
         observer_llm: Any = None,
     ) -> ConversationComponents:
         """Create flow and conversation components."""
@@ -149,10 +152,7 @@ class PipelineFactory:
             )
         )
 
-        organization_slug = session_data.get('organization_slug')
         organization_id = session_data.get('organization_id')
-        flow_loader = FlowLoader(organization_slug, client_name)
-        FlowClass = flow_loader.load_flow_class()
 
         flow_kwargs = {
             'call_data': session_data['call_data'],
@@ -168,7 +168,7 @@ class PipelineFactory:
         if cold_transfer_config:
             flow_kwargs['cold_transfer_config'] = cold_transfer_config
 
-        flow = FlowClass(**flow_kwargs)
+        flow = flow_class(**flow_kwargs)
 
         triage_detector = None
         ivr_processor = None
@@ -184,6 +184,7 @@ class PipelineFactory:
                     classifier_llm=classifier_llm,
                     classifier_prompt=flow_triage_config['classifier_prompt'],
                     voicemail_response_delay=triage_config.get('voicemail_response_delay', 2.0),
+                    local_prefilter=triage_config.get('local_prefilter', True),
                 )
 
                 ivr_processor = IVRNavigationProcessor(
@@ -209,7 +210,8 @@ class PipelineFactory:
             try:
                 safety_monitor = SafetyMonitor(
                     api_key=safety_llm_config['api_key'],
-                    model=safety_llm_config.get('model', 'meta-llama/llama-guard-4-12b')
+                    model=safety_llm_config.get('model', 'meta-llama/llama-guard-4-12b'),
+                    local_prescreen=safety_config.get('local_prescreen', True),
                 )
             except Exception as e:
                 logger.warning(f"SafetyMonitor init failed, continuing without: {e}")
@@ -221,7 +223,10 @@ class PipelineFactory:
             try:
                 output_validator = OutputValidator(
                     api_key=safety_llm_config['api_key'],
-                    model=safety_llm_config.get('model', 'meta-llama/llama-guard-4-12b')
+                    model=safety_llm_config.get('model', 'meta-llama/llama-guard-4-12b'),
+                    hold_back_ms=safety_config['output_validator'].get(
+                        'hold_back_ms', OutputValidator.DEFAULT_HOLD_BACK_MS
+                    ),
                 )
             except Exception as e:
                 logger.warning(f"OutputValidator init failed, continuing without: {e}")
@@ -253,6 +258,20 @@ class PipelineFactory:
                 )
                 logger.info("Observer pipeline branch configured")
 
+        # Speculative generation on Flux eager end-of-turn (dial-in conversations only;
+        # dial-out turns are gated by triage/IVR until a human is on the line)
+        speculative_llm = None
+        llm_config = services_config['services'].get('llm', {})
+        stt_config = services_config['services'].get('stt', {})
+        if (
+            call_type == "dial-in"
+            and llm_config.get('speculative', True)
+            and stt_config.get('eager_eot_threshold') is not None
+        ):
+            processor = SpeculativeLLMProcessor(llm=main_llm, context=context)
+            if processor.attach(stt):
+                speculative_llm = processor
+
         return ConversationComponents(
             transport=transport,
             stt=stt,
@@ -273,6 +292,7 @@ class PipelineFactory:
             observer_llm=observer_llm,
             observer_context_manager=observer_context_manager,
             bot_speech_producer=bot_speech_producer,
+            speculative_llm=speculative_llm,
         )
 
     @staticmethod
@@ -290,10 +310,10 @@ class PipelineFactory:
             pre_processors.append(components.ivr_human_detector)
 
         # Build conversational processors (shared between observer and flat pipeline)
-        conv_processors = [
-            components.context_aggregator.user(),
-            components.active_llm,
-        ]
+        conv_processors = [components.context_aggregator.user()]
+        if components.speculative_llm:
+            conv_processors.append(components.speculative_llm)
+        conv_processors.append(components.active_llm)
         if components.ivr_processor:
             conv_processors.append(components.ivr_processor)
         if components.output_validator:
@@ -325,9 +345,9 @@ class PipelineFactory:
                 bot_speech_consumer,
             )
 
-            parallel = ParallelPipeline(conv_branch, observer_branch)
+            parallel = FilteredParallelPipeline(conv_branch, observer_branch)
             processors = pre_processors + [parallel, components.transport.output()]
-            logger.info("Pipeline assembled with ParallelPipeline (conv + observer)")
+            logger.info("Pipeline assembled with FilteredParallelPipeline (conv + observer)")
         else:
             # Flat pipeline (backward compatible)
             processors = pre_processors + conv_processors + [components.transport.output()]
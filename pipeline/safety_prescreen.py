@@ -0,0 +1,112 @@
+"""Local pre-screen for the safety input classifier - risk lexicons plus a small Naive Bayes model.
+
+Runs in front of the safety LLM (see SafetyInputClassifier in
+safety_processors.py). Nearly every caller utterance is routine scheduling,
+lab, pharmacy or insurance talk; those are screened out locally and only
+utterances with a risk signal are escalated to the LLM, which still makes
+the EMERGENCY / STAFF_REQUEST / OK call.
+
+Screening is recall-first: any lexicon hit escalates, the model escalates
+anything it rates as likely risky, and an utterance the model has no
+vocabulary for is escalated rather than guessed. Without a model file nothing is screened out.
+
+Kept free of pipecat imports so the eval trainer can import it:
+    python evals/safety/train_prescreen.py
+"""
+
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pipeline.triage_prefilter import NaiveBayesTriageModel
+
+EMERGENCY = "EMERGENCY"
+STAFF_REQUEST = "STAFF_REQUEST"
+OK = "OK"
+
+# Model labels: EMERGENCY and STAFF_REQUEST examples both train RISK
+RISK = "RISK"
+MODEL_LABELS = (RISK, OK)
+
+MODEL_PATH = Path(__file__).parent / "safety_prescreen_model.json"
+
+# Escalate when the model gives RISK at least this probability. The model is a
+# backstop for risk phrasing the lexicons miss; lexicon hits always escalate.
+MODEL_RISK_THRESHOLD = 0.5
+
+LEXICONS: Dict[str, List[re.Pattern]] = {
+    EMERGENCY: [re.compile(p, re.IGNORECASE) for p in (
+        r"\b(?:chest|heart)\b",
+        r"\b(?:breath\w*|chok\w*|suffocat\w*|air)\b",
+        r"\bbleed\w*\b",
+        r"\bblood\b(?!\s*(?:test|work|draw|panel|type|results?)\b)",
+        r"\b(?:stroke|seizure|overdos\w*|convuls\w*|unconscious|unresponsive|not responding)\b",
+        r"\b(?:pass(?:ed|ing)? out|faint\w*|collaps\w*|fell|fall(?:en)?)\b",
+        r"\b(?:emergency|911|ambulance|paramedics?)\b",
+        r"\b(?:dying|die|dead|kill\w*|suicid\w*|end (?:it|my life)|(?:hurt|harm)(?:ing)? myself)\b",
+        r"\bdon'?t want to (?:live|be here)\b",
+        r"\b(?:pain\w*|hurts?|headache|unbearable|excruciating)\b",
+        r"\b(?:numb(?:ness)?|slurr\w*|drooping|paraly\w*)\b",
+        r"\bcan'?t (?:feel|move|stand|see|speak|talk|wake|get up)\b",
+        r"\b(?:not|isn'?t|won'?t) (?:waking|wake)\b",
+        r"\b(?:swell\w*|allergic reaction|anaphyla\w*|hives)\b",
+        r"\b(?:dizz\w*|spinning|confused|shaking|sweating|racing|panic\w*|vomit\w*)\b",
+        r"\b(?:help me|need help|please help|help right now)\b",
+    )],
+    STAFF_REQUEST: [re.compile(p, re.IGNORECASE) for p in (
+        r"\b(?:person|human|people|live agent)\b",
+        r"\b(?:someone|somebody|anyone|anybody) (?:else|from|who|at|there|on)\b",
+        r"\b(?:talk|speak)(?:ing)? (?:to|with)\b",
+        r"\b(?:transfer\w*|connect (?:me|us)|put (?:me|someone) (?:through|on)|call me back)\b",
+        r"\b(?:representative|operator|agent|supervisor|manager|nurse|staff|receptionist|front desk)\b",
+        r"\b(?:robot|machine|bot|automated|computer)\b",
+    )],
+}
+
+
+@dataclass
+class ScreenResult:
+    """Outcome of the local pre-screen. escalate=False means no LLM call is needed."""
+    escalate: bool
+    reason: str  # "lexicon", "model", "unknown", "no_model" or "screened"
+    signal: Optional[str] = None  # Lexicon label that matched, if any
+    risk: float = 0.0
+    latency_ms: float = 0.0
+
+
+def match_lexicons(text: str) -> Optional[str]:
+    """First lexicon label with a matching pattern, or None."""
+    for label, patterns in LEXICONS.items():
+        if any(pattern.search(text) for pattern in patterns):
+            return label
+    return None
+
+
+class SafetyPreScreen:
+    """Decides whether an utterance needs the safety LLM."""
+
+    def __init__(self, model: Optional[NaiveBayesTriageModel] = None):
+        self.model = model if model is not None else NaiveBayesTriageModel.load(MODEL_PATH)
+
+    def screen(self, text: str) -> ScreenResult:
+        start = time.perf_counter()
+        result = self._screen(text.strip())
+        result.latency_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def _screen(self, text: str) -> ScreenResult:
+        signal = match_lexicons(text)
+        if signal:
+            return ScreenResult(True, "lexicon", signal=signal)
+        if self.model is None:
+            return ScreenResult(True, "no_model")
+
+        label, confidence = self.model.predict(text)
+        if label is None:
+            return ScreenResult(True, "unknown")
+        risk = confidence if label == RISK else 1.0 - confidence
+        if risk >= MODEL_RISK_THRESHOLD:
+            return ScreenResult(True, "model", risk=risk)
+        return ScreenResult(False, "screened", risk=risk)
@@ -1,17 +1,25 @@
 import asyncio
+import re
+import time
+from typing import List, Optional
 
 from loguru import logger
 from pipecat.frames.frames import (
     Frame,
+    InterruptionFrame,
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMTextFrame,
-    StartInterruptionFrame,
+    SystemFrame,
     TranscriptionFrame,
 )
-from pipecat.pipeline.parallel_pipeline import ParallelPipeline
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from backend.latency_histogram import LatencyHistogram
+from pipeline.filtered_parallel_pipeline import FilteredParallelPipeline, subscribe
+from pipeline.safety_prescreen import SafetyPreScreen
+from services.client_pool import close_client, create_groq_client
+
 # Prompts
 SAFETY_CLASSIFICATION_PROMPT = """Classify user input for safety.
 
@@ -75,43 +83,217 @@ class SafetyClassifier(FrameProcessor):
             logger.debug(f"SafetyClassifier: unexpected response '{response}'")
 
 
+class _Segment:
+    """Frames held back together: one sentence of LLM text, or a pass-through frame."""
+
+    __slots__ = ("frames", "text", "context", "validation", "closed_at", "released")
+
+    def __init__(self, frames: Optional[List[Frame]] = None):
+        self.frames: List[Frame] = frames or []
+        self.text = ""
+        self.context = ""  # Response text up to and including this sentence
+        self.validation: Optional[asyncio.Task] = None
+        self.closed_at: Optional[float] = None
+        self.released = False
+
+
 class OutputValidator(FrameProcessor):
-    """Validates LLM output for safety with graceful degradation.
+    """Validates LLM output for safety, sentence by sentence, ahead of TTS.
+
+    LLM text is cut into sentences (or long clauses) as it streams. Each one
+    is sent to the guard model as soon as it is complete, together with the
+    response so far, and held back until its verdict arrives or hold_back_ms
+    passes, whichever comes first. Validation of the next sentence overlaps
+    with TTS of the previous one, so normally only the first sentence of a
+    response waits on the guard model. hold_back_ms=0 opts out: sentences go
+    to TTS right away and only a late-verdict interruption remains.
+
+    An UNSAFE verdict for a held sentence drops it and the rest of the
+    response before they are spoken. A verdict that arrives after the
+    hold-back window already released the sentence interrupts the bot.
 
     On API errors or timeouts, enters degraded mode and skips validation
     rather than blocking the conversation.
     """
 
     VALIDATION_TIMEOUT = 5.0  # seconds
-
-    def __init__(self, api_key: str, model: str = "meta-llama/llama-guard-4-12b"):
+    DEFAULT_HOLD_BACK_MS = 400
+    MIN_SEGMENT_CHARS = 20
+    MAX_CLAUSE_CHARS = 80  # Long segments are also cut at a comma
+    MAX_CONTEXT_CHARS = 1500
+
+    _SENTENCE_END = re.compile(r"[.!?;:\n][\"')\]]*\s*$")
+    _CLAUSE_END = re.compile(r",\s*$")
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "meta-llama/llama-guard-4-12b",
+        hold_back_ms: Optional[float] = DEFAULT_HOLD_BACK_MS,
+    ):
+        """hold_back_ms: longest a sentence waits for its verdict; 0 never waits, None waits for every verdict."""
         super().__init__()
         self._client = None
         self._model = model
-        self._buffer = ""
+        self._hold_back = hold_back_ms / 1000 if hold_back_ms is not None else None
         self._degraded = False
         self._register_event_handler("on_unsafe_output")
 
+        self._segment: Optional[_Segment] = None  # Sentence still receiving text
+        self._response_text = ""
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._held = 0  # Segments queued or being released
+        self._releaser: Optional[asyncio.Task] = None
+        self._validations: set = set()
+
+        # Per-call stats
+        self.validation_ms = LatencyHistogram()
+        self.hold_ms = LatencyHistogram()
+        self.segments = 0
+        self.blocked = 0
+        self.late_unsafe = 0
+        self.released_before_verdict = 0
+
         try:
-            from groq import AsyncGroq
-            self._client = AsyncGroq(api_key=api_key)
+            self._client = create_groq_client(api_key)
         except Exception as e:
             logger.warning(f"OutputValidator: Groq init failed, degraded mode: {e}")
             self._degraded = True
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
-        await self.push_frame(frame, direction)
 
-        if isinstance(frame, LLMTextFrame):
-            self._buffer += frame.text
-        elif isinstance(frame, LLMFullResponseEndFrame) and self._buffer:
-            asyncio.create_task(self._validate(self._buffer))
-            self._buffer = ""
+        if direction == FrameDirection.UPSTREAM or isinstance(frame, SystemFrame):
+            if isinstance(frame, InterruptionFrame):
+                self._reset()
+            await self.push_frame(frame, direction)
+            return
+
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._response_text = ""
+
+        if isinstance(frame, LLMTextFrame) and not self._degraded:
+            if self._segment is None:
+                self._segment = _Segment()
+            self._segment.frames.append(frame)
+            self._segment.text += frame.text
+            if self._segment_complete(self._segment.text):
+                self._close_segment()
+            return
 
-    async def _validate(self, text: str):
+        self._close_segment()
+        if self._held:
+            self._enqueue(_Segment([frame]))
+        else:
+            await self.push_frame(frame, direction)
+
+    # ==================== Segmenting ====================
+
+    def _segment_complete(self, text: str) -> bool:
+        length = len(text.strip())
+        if length < self.MIN_SEGMENT_CHARS:
+            return False
+        if self._SENTENCE_END.search(text):
+            return True
+        return length >= self.MAX_CLAUSE_CHARS and bool(self._CLAUSE_END.search(text))
+
+    def _close_segment(self):
+        """Start validating the open sentence and queue it for release."""
+        segment, self._segment = self._segment, None
+        if segment is None:
+            return
+        self.segments += 1
+        self._response_text += segment.text
+        segment.closed_at = time.perf_counter()
+        segment.context = self._response_text.strip()[-self.MAX_CONTEXT_CHARS:]
+        if not self._degraded and self._client is not None:
+            segment.validation = self.create_task(self._validate_segment(segment))
+            self._validations.add(segment.validation)
+            segment.validation.add_done_callback(self._validations.discard)
+        self._enqueue(segment)
+
+    def _enqueue(self, segment: _Segment):
+        self._held += 1
+        self._queue.put_nowait(segment)
+        if self._releaser is None or self._releaser.done():
+            self._releaser = self.create_task(self._release_loop(self._queue))
+
+    # ==================== Release ====================
+
+    async def _release_loop(self, queue: asyncio.Queue):
+        blocked = False
+        while True:
+            segment = await queue.get()
+            try:
+                if segment.validation and blocked:
+                    segment.validation.cancel()
+                elif segment.validation:
+                    safe = await self._await_verdict(segment)
+                    if safe is False:
+                        # Nothing of this sentence was spoken; the handler speaks a replacement
+                        blocked = True
+                        self.blocked += 1
+                        logger.warning("OutputValidator: UNSAFE sentence held back, dropping rest of response")
+                        await self._call_event_handler("on_unsafe_output", segment.context)
+
+                segment.released = True
+                for frame in segment.frames:
+                    if isinstance(frame, LLMFullResponseStartFrame):
+                        blocked = False
+                    if blocked and isinstance(frame, LLMTextFrame):
+                        continue
+                    await self.push_frame(frame)
+            finally:
+                if queue is self._queue:  # Not reset by an interruption meanwhile
+                    self._held -= 1
+
+    async def _await_verdict(self, segment: _Segment) -> Optional[bool]:
+        """Wait until the hold-back window since the sentence closed. None if released without a verdict."""
+        timeout = None
+        if self._hold_back is not None:
+            timeout = max(0.0, self._hold_back - (time.perf_counter() - segment.closed_at))
+        done, _ = await asyncio.wait({segment.validation}, timeout=timeout)
+        self.hold_ms.record((time.perf_counter() - segment.closed_at) * 1000)
+        if not done:
+            self.released_before_verdict += 1
+            return None
+        task = segment.validation
+        if task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
+    def _reset(self):
+        """Interruption: drop everything held back and stop pending validations."""
+        if self._releaser and not self._releaser.done():
+            self._releaser.cancel()
+        self._releaser = None
+        for task in list(self._validations):
+            task.cancel()
+        self._segment = None
+        self._queue = asyncio.Queue()
+        self._held = 0
+
+    # ==================== Validation ====================
+
+    async def _validate_segment(self, segment: _Segment) -> Optional[bool]:
+        started = time.perf_counter()
+        safe = await self._validate(segment.context)
+        if safe is not None:
+            self.validation_ms.record((time.perf_counter() - started) * 1000)
+        if safe is False and segment.released:
+            # Verdict came after the hold-back window; the sentence is already with TTS
+            self.late_unsafe += 1
+            logger.warning("OutputValidator: UNSAFE detected after release, interrupting")
+            # The interruption resets this processor; keep this task out of the reset
+            self._validations.discard(asyncio.current_task())
+            await self.push_interruption_task_frame_and_wait()
+            await self._call_event_handler("on_unsafe_output", segment.context)
+        return safe
+
+    async def _validate(self, text: str) -> Optional[bool]:
+        """True if safe, False if unsafe, None when validation is unavailable."""
         if self._degraded or self._client is None:
-            return  # Skip validation in degraded mode
+            return None  # Skip validation in degraded mode
 
         try:
             response = await asyncio.wait_for(
@@ -125,15 +307,47 @@ class OutputValidator(FrameProcessor):
                 ),
                 timeout=self.VALIDATION_TIMEOUT
             )
-            if "UNSAFE" in response.choices[0].message.content.upper():
-                logger.warning("OutputValidator: UNSAFE detected")
-                await self.push_frame(StartInterruptionFrame(), FrameDirection.UPSTREAM)
-                await self._call_event_handler("on_unsafe_output", text)
+            return "UNSAFE" not in response.choices[0].message.content.upper()
         except asyncio.TimeoutError:
             logger.warning("OutputValidator: timeout, skipping validation")
         except Exception as e:
             logger.warning(f"OutputValidator: API error, entering degraded mode: {e}")
             self._degraded = True
+        return None
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> dict:
+        """Validation latency and hold-back histograms plus verdict counts for this call."""
+        return {
+            "segments": self.segments,
+            "blocked": self.blocked,
+            "late_unsafe": self.late_unsafe,
+            "released_before_verdict": self.released_before_verdict,
+            "validation_ms": self.validation_ms.summary() if self.validation_ms.count else None,
+            "hold_ms": self.hold_ms.summary() if self.hold_ms.count else None,
+            "histograms": {
+                name: h.to_dict()
+                for name, h in (("validation", self.validation_ms), ("hold", self.hold_ms))
+                if h.count
+            },
+        }
+
+    async def cleanup(self):
+        await super().cleanup()
+        self._reset()
+        await close_client(self._client)
+        self._client = None
+        if self.segments:
+            stats = self.get_stats()
+            validation = stats["validation_ms"] or {}
+            hold = stats["hold_ms"] or {}
+            logger.info(
+                f"OutputValidator: {self.segments} sentences, {self.blocked} blocked, "
+                f"{self.late_unsafe} unsafe after release, {self.released_before_verdict} released on timeout | "
+                f"validation p50 {validation.get('p50_ms')}ms p95 {validation.get('p95_ms')}ms, "
+                f"hold p50 {hold.get('p50_ms')}ms p95 {hold.get('p95_ms')}ms"
+            )
 
 
 class SafetyInputClassifier(FrameProcessor):
@@ -142,22 +356,44 @@ class SafetyInputClassifier(FrameProcessor):
     Uses direct API calls instead of pipecat's LLM service to avoid tool calling issues
     with models like Llama Guard that don't support function calling.
 
+    With local_prescreen, each transcription first goes through SafetyPreScreen
+    (risk lexicons + small local model) and only utterances with a risk signal
+    reach the LLM. At most MAX_INFLIGHT_CHECKS requests run at once; utterances
+    escalated while all slots are busy are coalesced into the next request.
+
     On API errors or timeouts, enters degraded mode and skips classification
     rather than blocking the conversation.
     """
 
     CLASSIFICATION_TIMEOUT = 5.0  # seconds
-
-    def __init__(self, api_key: str, model: str = "meta-llama/llama-guard-4-12b"):
+    MAX_INFLIGHT_CHECKS = 2
+    MAX_BACKLOG_CHARS = 1000
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "meta-llama/llama-guard-4-12b",
+        local_prescreen: bool = True,
+    ):
         super().__init__()
         self._client = None
         self._model = model
         self._buffer = ""
         self._degraded = False
+        self._prescreen = SafetyPreScreen() if local_prescreen else None
+        self._inflight = 0
+        self._backlog: List[str] = []
+
+        # Per-call stats
+        self.transcriptions = 0
+        self.screened = 0
+        self.escalations = {}  # reason -> count
+        self.llm_calls = 0
+        self.coalesced = 0
+        self.peak_inflight = 0
 
         try:
-            from groq import AsyncGroq
-            self._client = AsyncGroq(api_key=api_key)
+            self._client = create_groq_client(api_key)
         except Exception as e:
             logger.warning(f"SafetyClassifier: Groq init failed, degraded mode: {e}")
             self._degraded = True
@@ -170,7 +406,60 @@ class SafetyInputClassifier(FrameProcessor):
 
         # Classify transcription text asynchronously (skip if degraded)
         if isinstance(frame, TranscriptionFrame) and frame.text and not self._degraded:
-            asyncio.create_task(self._classify(frame.text))
+            self.transcriptions += 1
+            reason = "no_prescreen"
+            if self._prescreen:
+                result = self._prescreen.screen(frame.text)
+                if not result.escalate:
+                    self.screened += 1
+                    return
+                reason = result.reason
+            self.escalations[reason] = self.escalations.get(reason, 0) + 1
+            self._escalate(frame.text)
+
+    def _escalate(self, text: str):
+        if self._inflight >= self.MAX_INFLIGHT_CHECKS:
+            self._backlog.append(text)
+            self.coalesced += 1
+            return
+        self._inflight += 1
+        self.peak_inflight = max(self.peak_inflight, self._inflight)
+        self.create_task(self._check(text))
+
+    async def _check(self, text: str):
+        try:
+            self.llm_calls += 1
+            await self._classify(text)
+        finally:
+            self._inflight -= 1
+        if self._backlog and not self._degraded:
+            backlog = " ".join(self._backlog)[-self.MAX_BACKLOG_CHARS:]
+            self._backlog.clear()
+            self._escalate(backlog)
+
+    def get_stats(self) -> dict:
+        """Screening hit rate and LLM request volume for this call."""
+        return {
+            "transcriptions": self.transcriptions,
+            "screened": self.screened,
+            "screen_rate": round(self.screened / self.transcriptions, 3) if self.transcriptions else None,
+            "escalations": dict(self.escalations),
+            "llm_calls": self.llm_calls,
+            "coalesced": self.coalesced,
+            "peak_inflight": self.peak_inflight,
+        }
+
+    async def cleanup(self):
+        await super().cleanup()
+        await close_client(self._client)
+        self._client = None
+        if self.transcriptions:
+            stats = self.get_stats()
+            logger.info(
+                f"SafetyInputClassifier: {stats['screened']}/{stats['transcriptions']} screened locally "
+                f"({stats['screen_rate']:.0%}), {stats['llm_calls']} LLM calls, "
+                f"{stats['coalesced']} coalesced, escalations {stats['escalations']}"
+            )
 
     async def _classify(self, text: str):
         if self._degraded or self._client is None:
@@ -201,23 +490,32 @@ class SafetyInputClassifier(FrameProcessor):
             self._degraded = True
 
 
-class SafetyMonitor(ParallelPipeline):
+class SafetyMonitor(FilteredParallelPipeline):
     """Parallel pipeline that classifies user input for emergencies/staff requests.
 
     Uses direct Groq client to avoid tool calling issues with safety models.
     Gracefully degrades if safety services are unavailable.
     """
 
-    def __init__(self, *, api_key: str, model: str = "meta-llama/llama-guard-4-12b"):
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        model: str = "meta-llama/llama-guard-4-12b",
+        local_prescreen: bool = True,
+    ):
         self._degraded = False
 
         try:
-            self._input_classifier = SafetyInputClassifier(api_key=api_key, model=model)
+            self._input_classifier = SafetyInputClassifier(
+                api_key=api_key, model=model, local_prescreen=local_prescreen
+            )
             self._safety_classifier = SafetyClassifier()
 
+            # Only transcriptions are classified; other frames skip the classifier branch
             super().__init__(
                 [],
-                [self._input_classifier, self._safety_classifier],
+                subscribe([self._input_classifier, self._safety_classifier], TranscriptionFrame),
             )
         except Exception as e:
             logger.warning(f"SafetyMonitor: init failed, running in degraded mode: {e}")
@@ -232,6 +530,10 @@ class SafetyMonitor(ParallelPipeline):
         """Check if SafetyMonitor is running in degraded mode."""
         return self._degraded
 
+    def get_stats(self) -> Optional[dict]:
+        """Screening stats of the input classifier (None when degraded)."""
+        return self._input_classifier.get_stats() if self._input_classifier else None
+
     def add_event_handler(self, event_name: str, handler):
         if self._degraded:
             logger.debug(f"SafetyMonitor: ignoring event handler '{event_name}' in degraded mode")
@@ -7,7 +7,7 @@ from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat_flows import FlowManager
 
-from core.flow_loader import discover_warmup_functions
+from core.client_registry import get_client_registry
 from costs.calculator import get_provider_name
 from handlers import (
     setup_output_validator_handlers,
@@ -15,11 +15,12 @@ from handlers import (
     setup_transcript_handler,
     setup_transport_handlers,
 )
-from handlers.transcript import save_transcript_to_db
-from handlers.transport import save_usage_costs
+from handlers.post_call import save_call_data
+from handlers.state_writer import CallStateWriter
 from handlers.triage import setup_triage_handlers
-from observers import LangfuseLatencyObserver, LLMContextObserver, UsageObserver
+from observers import FrameDispatcher, LangfuseLatencyObserver, LLMContextObserver, UsageObserver
 from pipeline.pipeline_factory import PipelineFactory
+from services.service_factory import ServiceFactory
 
 try:
     from pipecat_whisker import WhiskerObserver
@@ -31,6 +32,10 @@ except ImportError:
 class CallSession:
     """Orchestrates a voice call session - builds pipeline, manages flow, handles events."""
 
+    # Overridden by the offline load-test harness (evals/loadtest)
+    service_factory = ServiceFactory
+    services_config = None  # None: use the client registry's services.yaml
+
     def __init__(
         self,
         client_name: str,
@@ -70,9 +75,9 @@ class CallSession:
         self.context_aggregator = None
 
         self.transcripts = []
+        self.state_writer = CallStateWriter(organization_id)
         self.transfer_in_progress = False
-        self.transcript_saved = False
-        self.usage_saved = False
+        self.post_call_queued = False
 
     def _build_session_data(self) -> dict:
         """Build session data dict for pipeline factory."""
@@ -88,7 +93,7 @@ class CallSession:
 
     async def _warmup_all_flows(self):
         """Warm up OpenAI prompt cache for all flows in the organization."""
-        warmup_functions = discover_warmup_functions(self.organization_slug)
+        warmup_functions = get_client_registry().warmup_functions(self.organization_slug)
         if not warmup_functions:
             logger.debug(f"No warmup functions found for {self.organization_slug}")
             return
@@ -111,13 +116,17 @@ class CallSession:
         Gracefully handles observer creation failures - continues without
         failed observers rather than crashing the call.
         """
-        observers = []
+        # Latency, usage and debug context observers share one type-indexed dispatcher
+        self.frame_dispatcher = FrameDispatcher()
+        observers = [self.frame_dispatcher]
 
         # Latency observer - graceful degradation
         self.latency_observer = None
         try:
-            self.latency_observer = LangfuseLatencyObserver(session_id=self.session_id)
-            observers.append(self.latency_observer)
+            self.latency_observer = LangfuseLatencyObserver(
+                session_id=self.session_id, llms=self.components.named_llms()
+            )
+            self.latency_observer.register(self.frame_dispatcher)
         except Exception as e:
             logger.warning(f"LatencyObserver creation failed, continuing without: {e}")
 
@@ -135,14 +144,14 @@ class CallSession:
                 stt_provider=stt_provider,
                 telephony_provider=telephony_provider,
             )
-            observers.append(self.usage_observer)
+            self.usage_observer.register(self.frame_dispatcher)
         except Exception as e:
             logger.warning(f"UsageObserver creation failed, continuing without usage tracking: {e}")
 
         # LLM context observer - debug mode only
         if self.debug_mode:
             try:
-                observers.append(LLMContextObserver())
+                LLMContextObserver().register(self.frame_dispatcher)
             except Exception as e:
                 logger.warning(f"LLMContextObserver creation failed: {e}")
 
@@ -197,6 +206,7 @@ class CallSession:
         self.flow.context_aggregator = self.context_aggregator
         self.flow.transport = self.transport
         self.flow.pipeline = self
+        self.flow.state_writer = self.state_writer
 
         if hasattr(self.flow, '_init_flow_state'):
             self.flow._init_flow_state()
@@ -236,15 +246,15 @@ class CallSession:
             )
 
     async def _save_session_data(self) -> None:
-        """Save transcript and usage after pipeline completes."""
+        """Flush buffered patient fields, then queue transcript, usage and latency for the backend."""
         try:
-            await save_transcript_to_db(self)
+            await self.state_writer.close()
         except Exception:
-            logger.exception("Error saving transcript")
+            logger.exception("Error flushing call state")
         try:
-            await save_usage_costs(self)
+            await save_call_data(self)
         except Exception:
-            logger.exception("Error saving usage costs")
+            logger.exception("Error queueing post-call data")
 
     async def _execute_pipeline(self) -> None:
         """Run the pipeline and handle completion."""
@@ -267,7 +277,8 @@ class CallSession:
         room_config = {'room_url': room_url, 'room_token': room_token, 'room_name': room_name}
 
         self.pipeline, params, components = PipelineFactory.build(
-            self.client_name, session_data, room_config, self.dialin_settings
+            self.client_name, session_data, room_config, self.dialin_settings,
+            service_factory=self.service_factory, services_config=self.services_config,
         )
 
         # Initialize components and start warmup
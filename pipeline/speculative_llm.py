@@ -0,0 +1,333 @@
+"""Speculative LLM generation on Deepgram Flux eager end-of-turn.
+
+Flux reports EagerEndOfTurn a few hundred milliseconds before it confirms
+EndOfTurn. SpeculativeLLMProcessor (between the user context aggregator and
+the LLM) starts a streaming completion for the eager transcript right away:
+
+- TurnResumed (the caller kept talking) cancels it.
+- On the confirmed turn, the LLMContextFrame from the user aggregator is
+  compared with the speculation (same history, same user text). On a match
+  the speculative text is pushed downstream in place of a new LLM request.
+- An interruption cancels both the speculation and a commit still waiting.
+
+Only text answers are committed. The speculation's text is buffered until
+its stream ends; any tool call, at the start or after some text, discards the
+whole speculation and the context goes to the real LLM, so function calls
+(flow transitions, DB writes) run exactly once and only after the turn is
+confirmed, and the caller never hears an opening that the real LLM then
+answers again. Speculative requests use the LLM's get_chat_completions, which
+streams the completion without running function handlers.
+
+The confirmed turn waits for the speculation's first token for about one
+measured TTFB, the time a fresh request would take. If it hasn't arrived by
+then the speculation is slower than the real LLM and the turn falls back to it.
+
+The commit runs in a processor task, so frames behind the LLMContextFrame are
+not held up while the speculative stream finishes.
+
+Each outcome is pushed as SpeculationMetricsData for LangfuseLatencyObserver
+(hit rate, latency saved or lost). Token usage of speculative requests,
+including discarded ones, is pushed as LLMUsageMetricsData so cost tracking
+includes it.
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import List, Optional
+
+from loguru import logger
+from pipecat.frames.frames import (
+    Frame,
+    InterruptionFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    MetricsFrame,
+)
+from pipecat.metrics.metrics import LLMTokenUsage, LLMUsageMetricsData, MetricsData
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+# First-token wait for a confirmed turn until a speculation has measured the LLM's TTFB
+DEFAULT_FIRST_TOKEN_WAIT_SECS = 1.0
+# Weight of the newest TTFB in the running estimate
+TTFB_SMOOTHING = 0.3
+
+
+class SpeculationOutcome:
+    HIT = "hit"
+    RESUMED = "resumed"          # Caller kept talking after the eager end-of-turn
+    MISMATCH = "mismatch"        # Final transcript or history differed from the speculation
+    TOOL_CALL = "tool_call"      # Model answered with a tool call; real LLM reruns it
+    TEXT_THEN_TOOL = "text_then_tool"  # Tool call after some text; the buffered text is dropped, real LLM reruns it
+    TIMEOUT = "timeout"          # No first token within one TTFB of the confirmed turn
+    ERROR = "error"
+
+
+class SpeculationMetricsData(MetricsData):
+    """One speculation outcome, pushed in a MetricsFrame for LangfuseLatencyObserver.
+
+    value: milliseconds of first-token latency saved; negative when the
+        speculation made the turn slower (a late hit, or the wait before
+        falling back to the real LLM)
+    """
+    value: float
+    outcome: str
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^\w]+", " ", text.lower()).strip()
+
+
+def _fingerprint(messages: list) -> str:
+    return json.dumps(messages, sort_keys=True, default=str)
+
+
+class _Speculation:
+    """State of one speculative completion."""
+
+    def __init__(self, text: str, history: list):
+        self.text = _normalize(text)
+        self.fingerprint = _fingerprint(history)
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.kind: Optional[str] = None  # "text" or "tool" from the first delta
+        self.tool_call = False
+        self.failed = False
+        self.first_delta = asyncio.Event()  # Set on the first delta or when the stream ends
+        # Text chunks as they stream in; None once no more text will come
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SpeculativeLLMProcessor(FrameProcessor):
+    """Starts the LLM on Flux EagerEndOfTurn and commits the answer on EndOfTurn."""
+
+    def __init__(self, *, llm, context: LLMContext):
+        super().__init__()
+        self._llm = llm
+        self._context = context
+        self._speculation: Optional[_Speculation] = None
+        self._commit_task: Optional[asyncio.Task] = None
+        self._committing: Optional[_Speculation] = None
+        self._enabled = hasattr(llm, "get_chat_completions") and hasattr(llm, "get_llm_adapter")
+        if not self._enabled:
+            logger.info(f"Speculative LLM disabled: {type(llm).__name__} has no chat completions API")
+
+        self._ttfb_estimate: Optional[float] = None
+
+        self.attempts = 0
+        self.hits = 0
+        self.saved_ms: List[float] = []  # Per hit; negative for hits slower than a fresh request
+
+    def attach(self, stt) -> bool:
+        """Listen for Flux eager end-of-turn events. False if the STT doesn't emit them."""
+        events = getattr(stt, "_event_handlers", {})
+        if not self._enabled or "on_eager_end_of_turn" not in events or "on_turn_resumed" not in events:
+            return False
+
+        @stt.event_handler("on_eager_end_of_turn")
+        async def on_eager_end_of_turn(_stt, transcript, *args):
+            await self._start(transcript)
+
+        @stt.event_handler("on_turn_resumed")
+        async def on_turn_resumed(_stt, *args):
+            if self._speculation:
+                await self._discard(SpeculationOutcome.RESUMED)
+
+        logger.info("Speculative LLM generation enabled on eager end-of-turn")
+        return True
+
+    # ==================== Speculation ====================
+
+    async def _start(self, transcript: str):
+        if not self._enabled or not transcript or not transcript.strip():
+            return
+        if self._speculation:
+            await self._discard(SpeculationOutcome.RESUMED)
+
+        history = list(self._context.get_messages())
+        speculation = _Speculation(transcript, history)
+        speculative_context = LLMContext(
+            messages=history + [{"role": "user", "content": transcript.strip()}],
+            tools=self._context.tools,
+            tool_choice=self._context.tool_choice,
+        )
+        speculation.task = self.create_task(self._stream(speculation, speculative_context))
+        self._speculation = speculation
+        self.attempts += 1
+        logger.debug(f"[Speculative] Started on eager end-of-turn: {transcript[:60]!r}")
+
+    async def _stream(self, speculation: _Speculation, context: LLMContext):
+        usage = None
+        try:
+            params = self._llm.get_llm_adapter().get_llm_invocation_params(context)
+            stream = await self._llm.get_chat_completions(params)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.tool_calls and not speculation.tool_call:
+                    # Keep reading for the usage chunk, but no more text is committed
+                    if speculation.kind is None:
+                        speculation.kind = "tool"
+                        self._observe_first_delta(speculation)
+                    speculation.tool_call = True
+                    speculation.chunks.put_nowait(None)
+                if delta.content and not speculation.tool_call:
+                    if speculation.kind is None:
+                        speculation.kind = "text"
+                        self._observe_first_delta(speculation)
+                    speculation.chunks.put_nowait(delta.content)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            speculation.failed = True
+            logger.warning(f"[Speculative] Completion failed: {e}")
+        finally:
+            speculation.first_delta.set()
+            speculation.chunks.put_nowait(None)
+            if usage:
+                await self._push_usage(usage)
+
+    def _observe_first_delta(self, speculation: _Speculation):
+        speculation.first_token_at = time.perf_counter()
+        speculation.first_delta.set()
+        ttfb = speculation.first_token_at - speculation.started_at
+        if self._ttfb_estimate is None:
+            self._ttfb_estimate = ttfb
+        else:
+            self._ttfb_estimate += TTFB_SMOOTHING * (ttfb - self._ttfb_estimate)
+
+    async def _discard(self, outcome: str, speculation: Optional[_Speculation] = None, saved_ms: float = 0.0):
+        """Drop a speculation (the current one by default) and record why."""
+        if speculation is None:
+            speculation, self._speculation = self._speculation, None
+        if speculation and speculation.task and not speculation.task.done() and not speculation.tool_call:
+            await self.cancel_task(speculation.task)
+        await self._push_outcome(outcome, saved_ms)
+
+    async def _cancel_commit(self):
+        """Cancel a commit still waiting for its speculation to finish."""
+        if self._commit_task and not self._commit_task.done():
+            await self.cancel_task(self._commit_task)
+            await self._discard(SpeculationOutcome.RESUMED, self._committing)
+        self._commit_task = None
+        self._committing = None
+
+    def _matches(self, speculation: _Speculation, messages: list) -> bool:
+        if not messages or not isinstance(messages[-1], dict) or messages[-1].get("role") != "user":
+            return False
+        content = messages[-1].get("content")
+        if not isinstance(content, str) or _normalize(content) != speculation.text:
+            return False
+        return _fingerprint(list(messages[:-1])) == speculation.fingerprint
+
+    # ==================== Frame processing ====================
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InterruptionFrame):
+            await self._cancel_commit()
+            if self._speculation:
+                await self._discard(SpeculationOutcome.RESUMED)
+        elif isinstance(frame, LLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            # A newer turn supersedes one whose commit is still waiting
+            await self._cancel_commit()
+            speculation, self._speculation = self._speculation, None
+            if speculation and self._matches(speculation, list(frame.context.get_messages())):
+                self._committing = speculation
+                self._commit_task = self.create_task(self._commit(speculation, frame))
+                return
+            if speculation:
+                await self._discard(SpeculationOutcome.MISMATCH, speculation)
+
+        await self.push_frame(frame, direction)
+
+    async def _commit(self, speculation: _Speculation, frame: LLMContextFrame):
+        """Stream the speculative answer for this turn, or hand the context to the real LLM."""
+        committed_at = time.perf_counter()
+        ttfb = self._ttfb_estimate or DEFAULT_FIRST_TOKEN_WAIT_SECS
+        try:
+            await asyncio.wait_for(speculation.first_delta.wait(), timeout=ttfb)
+        except asyncio.TimeoutError:
+            pass
+
+        outcome = None
+        if not speculation.first_delta.is_set():
+            outcome = SpeculationOutcome.TIMEOUT
+        elif speculation.kind == "tool":
+            outcome = SpeculationOutcome.TOOL_CALL
+        elif speculation.kind is None:
+            outcome = SpeculationOutcome.ERROR
+        if outcome:
+            # Nothing of the speculation was pushed, so the real LLM answers the turn once
+            waited_ms = (time.perf_counter() - committed_at) * 1000
+            await self._discard(outcome, speculation, -waited_ms)
+            await self.push_frame(frame)
+            return
+
+        # Buffer until the stream ends: a tool call after some text hands the turn
+        # to the real LLM, so none of the speculation may reach TTS before then
+        chunks = []
+        while (text := await speculation.chunks.get()) is not None:
+            chunks.append(text)
+
+        if speculation.tool_call or speculation.failed:
+            outcome = SpeculationOutcome.TEXT_THEN_TOOL if speculation.tool_call else SpeculationOutcome.ERROR
+            waited_ms = (time.perf_counter() - committed_at) * 1000
+            await self._discard(outcome, speculation, -waited_ms)
+            await self.push_frame(frame)
+            return
+
+        # Without speculation the first token would arrive one TTFB after the commit
+        saved_ms = (committed_at + ttfb - time.perf_counter()) * 1000
+
+        await self.push_frame(LLMFullResponseStartFrame())
+        for text in chunks:
+            await self.push_frame(LLMTextFrame(text))
+        await self.push_frame(LLMFullResponseEndFrame())
+
+        self.hits += 1
+        self.saved_ms.append(saved_ms)
+        logger.debug(f"[Speculative] Hit, first token {saved_ms:+.0f}ms vs a fresh request")
+        await self._push_outcome(SpeculationOutcome.HIT, saved_ms)
+
+    # ==================== Metrics ====================
+
+    async def _push_outcome(self, outcome: str, saved_ms: float = 0.0):
+        await self.push_frame(MetricsFrame(data=[SpeculationMetricsData(
+            processor=self.name,
+            value=saved_ms,
+            outcome=outcome,
+        )]))
+
+    async def _push_usage(self, usage):
+        await self.push_frame(MetricsFrame(data=[LLMUsageMetricsData(
+            processor=self._llm.name,
+            model=getattr(self._llm, "model_name", None),
+            value=LLMTokenUsage(
+                prompt_tokens=usage.prompt_tokens or 0,
+                completion_tokens=usage.completion_tokens or 0,
+                total_tokens=usage.total_tokens or 0,
+            ),
+        )]))
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._cancel_commit()
+        if self._speculation and self._speculation.task:
+            await self.cancel_task(self._speculation.task)
+        self._speculation = None
+        if self.attempts:
+            avg_saved = sum(self.saved_ms) / len(self.saved_ms) if self.saved_ms else 0
+            logger.info(
+                f"[Speculative] {self.hits}/{self.attempts} speculations committed, "
+                f"avg {avg_saved:+.0f}ms first-token latency saved per hit"
+            )
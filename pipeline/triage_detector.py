@@ -1,28 +1,64 @@
 """Triage Detector - 3-way call classification using parallel pipeline."""
 
 import asyncio
+from typing import Dict, List
 
 from loguru import logger
+from pipecat.frames.frames import (
+    ControlFrame,
+    EndFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    StopFrame,
+    SystemFrame,
+    TranscriptionFrame,
+)
 from pipecat.pipeline.parallel_pipeline import ParallelPipeline
 from pipecat.processors.aggregators.llm_context import LLMContext
 from pipecat.processors.aggregators.llm_response_universal import LLMContextAggregatorPair
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.llm_service import LLMService
 from pipecat.utils.sync.event_notifier import EventNotifier
 
+from pipeline.filtered_parallel_pipeline import (
+    HIGH_RATE_FRAMES,
+    LIFECYCLE_FRAMES,
+    FilteredParallelPipeline,
+    subscribe,
+)
 from pipeline.triage_processors import (
     ClassifierGate,
     ClassifierUpstreamGate,
     MainBranchGate,
+    TriagePreClassifier,
     TriageProcessor,
     TTSGate,
 )
 
+# Per-direction passthrough state once triage has settled
+_GATED = "gated"
+_DRAINING = "draining"
+_PASSTHROUGH = "passthrough"
+
+
+class TriageDrainFrame(ControlFrame):
+    """Marker sent through the main branch to find where passthrough can take over."""
 
-class TriageDetector(ParallelPipeline):
+
+class TriageDetector(FilteredParallelPipeline):
     """Parallel pipeline for 3-way call classification.
 
     Classifies incoming audio as CONVERSATION, IVR, or VOICEMAIL.
 
+    Once a CONVERSATION or IVR decision has opened the main gate, the detector
+    collapses into a passthrough: the gates' wait tasks are cancelled and
+    frames are pushed straight through instead of crossing the parallel
+    branches. To keep ordering, a TriageDrainFrame is first sent through the
+    main branch (per direction) and later frames are held until it comes out.
+    Lifecycle frames still cross the branches so their processors shut down
+    normally. Voicemail keeps the gates (the main gate stays closed and the
+    classifier branch times the voicemail message).
+
     Events:
         on_conversation_detected(conversation_history): Human answered
         on_ivr_detected(conversation_history): IVR menu detected
@@ -36,6 +72,7 @@ class TriageDetector(ParallelPipeline):
         classifier_prompt: str,
         # 2.0s delay allows voicemail beep to complete before speaking
         voicemail_response_delay: float = 2.0,
+        local_prefilter: bool = True,
     ):
         """Initialize the triage detector.
 
@@ -43,6 +80,7 @@ class TriageDetector(ParallelPipeline):
             classifier_llm: Fast LLM for classification (e.g., Groq)
             classifier_prompt: System prompt for 3-way classification
             voicemail_response_delay: Seconds to wait after VM detected before speaking
+            local_prefilter: Decide obvious openers locally before calling the classifier LLM
         """
         self._classifier_llm = classifier_llm
         self._classifier_prompt = classifier_prompt
@@ -88,24 +126,94 @@ class TriageDetector(ParallelPipeline):
             gate_notifier=self._gate_notifier,
         )
 
+        self._pre_classifier = (
+            TriagePreClassifier(triage_processor=self._triage_processor) if local_prefilter else None
+        )
+        pre_classifier = [self._pre_classifier] if self._pre_classifier else []
+
         super().__init__(
             [self._main_branch_gate],
-            [
-                self._classifier_gate,
-                self._context_aggregator.user(),
-                self._classifier_llm,
-                self._triage_processor,
-                self._context_aggregator.assistant(),
-                self._classifier_upstream_gate,  # blocks upstream frames after decision
-            ],
+            # Classifier only needs transcripts and speaking events, not per-chunk audio
+            subscribe(
+                [
+                    self._classifier_gate,
+                    *pre_classifier,
+                    self._context_aggregator.user(),
+                    self._classifier_llm,
+                    self._triage_processor,
+                    self._context_aggregator.assistant(),
+                    self._classifier_upstream_gate,  # blocks upstream frames after decision
+                ],
+                TranscriptionFrame,
+                InterimTranscriptionFrame,
+                SystemFrame,
+                exclude=HIGH_RATE_FRAMES,
+            ),
         )
 
         self._register_event_handler("on_conversation_detected")
         self._register_event_handler("on_ivr_detected")
         self._register_event_handler("on_voicemail_detected")
 
+        directions = (FrameDirection.DOWNSTREAM, FrameDirection.UPSTREAM)
+        self._passthrough_state: Dict[FrameDirection, str] = {d: _GATED for d in directions}
+        self._drain_buffers: Dict[FrameDirection, List[Frame]] = {d: [] for d in directions}
+
         logger.info("TriageDetector initialized")
 
+    def _settled(self) -> bool:
+        # Classifier gate closed too, so the drain marker can only come out of the main branch
+        return (
+            self._triage_processor.decision_made
+            and self._main_branch_gate.gate_open
+            and not self._classifier_gate.gate_open
+        )
+
+    @property
+    def is_passthrough(self) -> bool:
+        return all(state == _PASSTHROUGH for state in self._passthrough_state.values())
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        state = self._passthrough_state[direction]
+        if state == _GATED:
+            if not self._settled():
+                await super().process_frame(frame, direction)
+                return
+            state = self._passthrough_state[direction] = _DRAINING
+            await super().process_frame(TriageDrainFrame(), direction)
+
+        if isinstance(frame, LIFECYCLE_FRAMES):
+            await super().process_frame(frame, direction)
+        elif state == _PASSTHROUGH:
+            await super(ParallelPipeline, self).process_frame(frame, direction)
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, (SystemFrame, EndFrame, StopFrame)):
+            # System frames overtake queued frames anyway
+            await super().process_frame(frame, direction)
+        else:
+            await super(ParallelPipeline, self).process_frame(frame, direction)
+            self._drain_buffers[direction].append(frame)
+
+    async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        if isinstance(frame, TriageDrainFrame):
+            await self._finish_drain(direction)
+            return
+        await super().push_frame(frame, direction)
+
+    async def _finish_drain(self, direction: FrameDirection):
+        """Everything queued before the marker is out: flush held frames, then bypass."""
+        buffer = self._drain_buffers[direction]
+        while buffer:
+            await super().push_frame(buffer.pop(0), direction)
+        self._passthrough_state[direction] = _PASSTHROUGH
+
+        if self.is_passthrough:
+            await self._main_branch_gate.cancel_waits()
+            await self._classifier_gate.cancel_waits()
+            await self._classifier_upstream_gate.cancel_waits()
+            await self._triage_processor.cancel_waits()
+            logger.info("[Triage] Settled, detector collapsed to passthrough")
+
     def detector(self) -> "TriageDetector":
         """Returns self for pipeline placement after STT."""
         return self
@@ -0,0 +1,245 @@
+"""Local first-stage triage classifier - phrase rules plus a small Naive Bayes model.
+
+Runs in front of the classifier LLM (see TriagePreClassifier in
+triage_processors.py). Recognizes openers like "press 1 for...", "please leave a
+message after the tone" or "this is Jane, how can I help?" in well under a
+millisecond, and returns no decision when unsure so the LLM still handles edge
+cases.
+
+Kept free of pipecat imports so the eval trainer can import it:
+    python evals/triage/train_prefilter.py
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONVERSATION = "CONVERSATION"
+IVR = "IVR"
+VOICEMAIL = "VOICEMAIL"
+LABELS = (CONVERSATION, IVR, VOICEMAIL)
+
+MODEL_PATH = Path(__file__).parent / "triage_prefilter_model.json"
+
+# Rule confidence when exactly one label's phrases match
+RULE_CONFIDENCE = 0.97
+# Model-only decisions need more certainty than rule-backed ones
+MODEL_ONLY_THRESHOLD = 0.99
+# Rule decisions are vetoed when the model is this sure of a different label
+MODEL_VETO_THRESHOLD = 0.9
+# The model is only consulted on utterances with at least this many words;
+# one- and two-word openers ("Yes", "Speaking.") carry too little signal
+MODEL_MIN_WORDS = 6
+
+_NUMBER = r"(?:\d|zero|one|two|three|four|five|six|seven|eight|nine|star|pound)"
+_LIVE_OFFER = r"(?:[Hh]ow (?:can|may) I (?:help|assist|direct)|[Ww]hat can I do for you|[Ww]ho am I speaking with)"
+
+PHRASE_RULES: Dict[str, List[re.Pattern]] = {
+    VOICEMAIL: [re.compile(p, re.IGNORECASE) for p in (
+        r"\bleave (?:me |us )?(?:a |your )?(?:brief |short |detailed )?(?:message|voicemail)\b",
+        r"\bafter the (?:tone|beep)\b",
+        r"\bmailbox (?:is full|has not been set up)\b",
+        r"\bnumber you have dialed\b",
+        r"\brecord your message\b",
+        r"\bnot available to take your call\b",
+    )],
+    IVR: [re.compile(p, re.IGNORECASE) for p in (
+        rf"\b(?:press|oprima|dial|enter) {_NUMBER}\b",
+        r"\bfor [^.?!]{1,60}, (?:press|say) \b",
+        r"\b(?:please enter|enter your|say or enter)\b",
+        r"\bif you know your party'?s extension\b",
+        r"\b(?:virtual|digital|automated) assistant\b",
+        r"\bestimated (?:wait|hold) time\b",
+        r"\b(?:please (?:hold|stay on the line)|you are next in queue|your call is important)\b",
+        r"\bmenu options have changed\b",
+        r"\bfor english\b",
+    )],
+    # A name alone isn't enough: greetings like "Hi, this is Sarah, I can't come to
+    # the phone" or "This is Blue Cross..." are recordings. Only a named person
+    # offering help counts, and bare "Hello?"/"Yes" openers go to the LLM.
+    CONVERSATION: [re.compile(p) for p in (
+        rf"\b(?:[Tt]his is|[Mm]y name is|[Ii]t'?s) (?!the\b|a\b|an\b|our\b|your\b)[A-Z][a-z]+\b"
+        rf"[^.?!]{{0,60}}[.?!,]?\s*{_LIVE_OFFER}",
+        rf"\b[A-Z][a-z]+ speaking\b[^.?!]{{0,60}}[.?!,]?\s*{_LIVE_OFFER}",
+    )],
+}
+
+# Recorded-greeting phrasing that rules out a local CONVERSATION decision
+# ("you've reached...", "thank you for calling...", "can't come to the phone")
+RECORDED_CUES = re.compile(
+    r"\b(?:you(?:'ve| have)? reached|(?:thank you|thanks) for calling|"
+    r"(?:can'?t|cannot|unable to) (?:come to|answer|take|get to|talk)|"
+    r"not (?:available|able to|in the office)|away from|out of the office|missed (?:you|your call)|"
+    r"call you back|get back to you|(?:representatives|agents) are (?:all )?busy|busy assisting)\b",
+    re.IGNORECASE,
+)
+
+# Signals that a human might be on the line even when IVR/VM phrases match
+CONVERSATIONAL_CUES = re.compile(
+    r"\b(?:how (?:can|may) I (?:help|assist|direct)|what can I do for you|who am I speaking with|"
+    r"go ahead|just kidding|real person)\b",
+    re.IGNORECASE,
+)
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased unigrams plus bigrams."""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+@dataclass
+class PreDecision:
+    """Result of the local classifier. label is None when deferring to the LLM."""
+    label: Optional[str]
+    confidence: float
+    source: str  # "rules", "rules+model", "model" or "none"
+    latency_ms: float = 0.0
+
+
+class NaiveBayesTriageModel:
+    """Multinomial Naive Bayes over uni/bigrams with Laplace smoothing.
+
+    Uses a uniform class prior. Scores are length-normalized and softened with a
+    temperature before the softmax so that confidences from a tiny training set
+    are not wildly overconfident.
+
+    Defaults to the triage labels; the safety pre-screen trains one over its own
+    label set (see safety_prescreen.py).
+    """
+
+    def __init__(
+        self,
+        class_counts: Dict[str, int],
+        token_counts: Dict[str, Dict[str, int]],
+        temperature: float = 0.15,
+        alpha: float = 1.0,
+        labels: Sequence[str] = LABELS,
+    ):
+        self.labels = tuple(labels)
+        self.class_counts = class_counts
+        self.token_counts = token_counts
+        self.temperature = temperature
+        self.alpha = alpha
+        self.vocab = set()
+        for counts in token_counts.values():
+            self.vocab.update(counts)
+        # Uniform prior: the scenario mix says nothing about real answer rates
+        self._log_prior = {label: -math.log(len(self.labels)) for label in self.labels}
+        self._totals = {label: sum(token_counts.get(label, {}).values()) for label in self.labels}
+
+    @classmethod
+    def train(
+        cls, examples: Iterable[Tuple[str, str]], labels: Sequence[str] = LABELS, **kwargs
+    ) -> "NaiveBayesTriageModel":
+        class_counts: Counter = Counter()
+        token_counts: Dict[str, Counter] = {label: Counter() for label in labels}
+        for text, label in examples:
+            if label not in token_counts:
+                continue
+            class_counts[label] += 1
+            token_counts[label].update(tokenize(text))
+        return cls(dict(class_counts), {k: dict(v) for k, v in token_counts.items()}, labels=labels, **kwargs)
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        tokens = [t for t in tokenize(text) if t in self.vocab]
+        if not tokens:
+            return None, 0.0
+
+        vocab_size = len(self.vocab)
+        scores = {}
+        for label in self.labels:
+            counts = self.token_counts.get(label, {})
+            denom = self._totals[label] + self.alpha * vocab_size
+            log_likelihood = sum(math.log((counts.get(t, 0) + self.alpha) / denom) for t in tokens)
+            scores[label] = (self._log_prior[label] + log_likelihood) / len(tokens)
+
+        top = max(scores.values())
+        exp = {label: math.exp((s - top) / self.temperature) for label, s in scores.items()}
+        norm = sum(exp.values())
+        label = max(exp, key=exp.get)
+        return label, exp[label] / norm
+
+    def to_dict(self) -> dict:
+        return {
+            "class_counts": self.class_counts,
+            "token_counts": self.token_counts,
+            "temperature": self.temperature,
+            "alpha": self.alpha,
+            "labels": list(self.labels),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NaiveBayesTriageModel":
+        return cls(
+            data["class_counts"],
+            data["token_counts"],
+            temperature=data.get("temperature", 0.15),
+            alpha=data.get("alpha", 1.0),
+            labels=data.get("labels", LABELS),
+        )
+
+    def save(self, path: Path = MODEL_PATH) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH) -> Optional["NaiveBayesTriageModel"]:
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def match_rules(text: str) -> Dict[str, int]:
+    """Count phrase-rule hits per label."""
+    return {
+        label: sum(1 for pattern in patterns if pattern.search(text))
+        for label, patterns in PHRASE_RULES.items()
+    }
+
+
+class TriagePreFilter:
+    """Combines phrase rules and the Naive Bayes model into one decision."""
+
+    def __init__(self, model: Optional[NaiveBayesTriageModel] = None):
+        self.model = model if model is not None else NaiveBayesTriageModel.load()
+
+    def classify(self, text: str) -> PreDecision:
+        text = text.strip()
+        if not text:
+            return PreDecision(None, 0.0, "none")
+
+        hits = match_rules(text)
+        matched = [label for label, count in hits.items() if count]
+        model_label, model_conf = None, 0.0
+        if self.model and len(text.split()) >= MODEL_MIN_WORDS:
+            model_label, model_conf = self.model.predict(text)
+
+        if len(matched) == 1:
+            rule_label = matched[0]
+            # IVR/VM phrasing alongside human cues ("Thank you for holding, this is the
+            # eligibility department, how may I direct your call?") is an LLM job
+            if rule_label != CONVERSATION and CONVERSATIONAL_CUES.search(text):
+                return PreDecision(None, 0.0, "none")
+            if rule_label == CONVERSATION and RECORDED_CUES.search(text):
+                return PreDecision(None, 0.0, "none")
+            if model_label and model_label != rule_label and model_conf >= MODEL_VETO_THRESHOLD:
+                return PreDecision(None, 0.0, "none")
+            if model_label == rule_label:
+                return PreDecision(rule_label, max(RULE_CONFIDENCE, model_conf), "rules+model")
+            return PreDecision(rule_label, RULE_CONFIDENCE, "rules")
+
+        if not matched and model_label and model_conf >= MODEL_ONLY_THRESHOLD:
+            if model_label == CONVERSATION and RECORDED_CUES.search(text):
+                return PreDecision(None, 0.0, "none")
+            return PreDecision(model_label, model_conf, "model")
+
+        return PreDecision(None, 0.0, "none")
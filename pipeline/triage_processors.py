@@ -1,4 +1,5 @@
 import asyncio
+import time
 from typing import List, Optional
 
 from loguru import logger
@@ -33,8 +34,10 @@ from pipecat.frames.frames import (
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMTextFrame,
+    MetricsFrame,
     StopFrame,
     SystemFrame,
+    TranscriptionFrame,
     TTSAudioRawFrame,
     TTSStartedFrame,
     TTSStoppedFrame,
@@ -42,9 +45,64 @@ from pipecat.frames.frames import (
     UserStartedSpeakingFrame,
     UserStoppedSpeakingFrame,
 )
+from pipecat.metrics.metrics import MetricsData
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, FrameProcessorSetup
 from pipecat.utils.sync.base_notifier import BaseNotifier
 
+from pipeline.triage_prefilter import TriagePreFilter
+
+
+class TriageDecisionSource:
+    """Which stage produced the triage decision."""
+    LOCAL = "local"            # TriagePreClassifier, no LLM call
+    LLM_EARLY = "llm_early"    # Committed on an unambiguous token prefix
+    LLM_FULL = "llm_full"      # Needed the full classifier completion
+
+
+class TriageDecisionMetricsData(MetricsData):
+    """Triage decision timing, pushed in a MetricsFrame for LangfuseLatencyObserver.
+
+    value: seconds from the classifier's first token to the decision (0 for local)
+    saved_ms: how long before the end of the completion the decision was committed
+    """
+    value: float
+    classification: str
+    source: str
+    saved_ms: float = 0.0
+
+
+class StreamingLabelParser:
+    """Commits to a triage label as soon as the streamed token prefix can only mean one.
+
+    The classifier is prompted to answer with a single word, so "IVR", "VOI" or
+    "CON" is enough. Requires MIN_PREFIX characters so a stray "I ..." or "C..."
+    is not misread; output that stops matching any label is left to the
+    substring check on the full completion.
+    """
+
+    MIN_PREFIX = 3
+    LABELS = (
+        TriageClassification.CONVERSATION,
+        TriageClassification.IVR,
+        TriageClassification.VOICEMAIL,
+    )
+
+    def __init__(self):
+        self._buffer = ""
+
+    def reset(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> Optional[str]:
+        """Add streamed text; return a label once the prefix is unambiguous."""
+        self._buffer += text
+        prefix = self._buffer.lstrip(" \t\n\"'*`").upper()
+        prefix = "".join(ch for ch in prefix if ch.isalpha())
+        if len(prefix) < self.MIN_PREFIX:
+            return None
+        candidates = [label for label in self.LABELS if label.startswith(prefix[:len(label)])]
+        return candidates[0] if len(candidates) == 1 else None
+
 
 class MainBranchGate(FrameProcessor):
     """Blocks main pipeline until CONVERSATION detected, IVR detected, or IVR navigation completed.
@@ -80,6 +138,14 @@ class MainBranchGate(FrameProcessor):
 
     async def cleanup(self):
         await super().cleanup()
+        await self.cancel_waits()
+
+    @property
+    def gate_open(self) -> bool:
+        return self._gate_open
+
+    async def cancel_waits(self):
+        """Cancel notifier wait tasks (called once triage has settled)."""
         if self._conversation_task:
             await self.cancel_task(self._conversation_task)
             self._conversation_task = None
@@ -138,6 +204,14 @@ class ClassifierGate(FrameProcessor):
 
     async def cleanup(self):
         await super().cleanup()
+        await self.cancel_waits()
+
+    @property
+    def gate_open(self) -> bool:
+        return self._gate_open
+
+    async def cancel_waits(self):
+        """Cancel notifier wait tasks (called once triage has settled)."""
         if self._gate_task:
             await self.cancel_task(self._gate_task)
             self._gate_task = None
@@ -186,6 +260,10 @@ class ClassifierUpstreamGate(FrameProcessor):
 
     async def cleanup(self):
         await super().cleanup()
+        await self.cancel_waits()
+
+    async def cancel_waits(self):
+        """Cancel the notifier wait task (called once triage has settled)."""
         if self._gate_task:
             await self.cancel_task(self._gate_task)
             self._gate_task = None
@@ -209,11 +287,61 @@ class ClassifierUpstreamGate(FrameProcessor):
         logger.trace("[Triage] ClassifierUpstreamGate closed")
 
 
+class TriagePreClassifier(FrameProcessor):
+    """Decides obvious openers locally before they reach the classifier LLM.
+
+    Placed in the classifier branch ahead of the user context aggregator. Runs
+    TriagePreFilter (phrase rules + small local model) on the transcribed text
+    heard so far. A confident decision is applied through TriageProcessor and
+    the transcription is dropped so no LLM request is made; otherwise the frame
+    passes through and the LLM classifies as before.
+    """
+
+    def __init__(self, triage_processor: "TriageProcessor", prefilter: Optional[TriagePreFilter] = None):
+        super().__init__()
+        self._triage_processor = triage_processor
+        self._prefilter = prefilter or TriagePreFilter()
+        self._heard_text = ""
+        self.local_decisions = 0
+        self.deferred = 0
+        self.decision_latency_ms: Optional[float] = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if (
+            isinstance(frame, TranscriptionFrame)
+            and frame.text
+            and not self._triage_processor.decision_made
+        ):
+            self._heard_text = f"{self._heard_text} {frame.text}".strip()
+            start = time.perf_counter()
+            decision = self._prefilter.classify(self._heard_text)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            if decision.label:
+                self.local_decisions += 1
+                self.decision_latency_ms = latency_ms
+                logger.info(
+                    f"[Triage] Local decision {decision.label} ({decision.source}, "
+                    f"confidence={decision.confidence:.2f}, {latency_ms:.2f}ms)"
+                )
+                await self._triage_processor.apply_local_decision(decision.label, self._heard_text)
+                return
+
+            self.deferred += 1
+            logger.debug(f"[Triage] Local classifier unsure ({latency_ms:.2f}ms), deferring to LLM")
+
+        await self.push_frame(frame, direction)
+
+
 class TriageProcessor(FrameProcessor):
     """Processes classifier LLM output and emits triage events.
 
-    Aggregates LLM tokens, searches for CONVERSATION/IVR/VOICEMAIL,
-    notifies appropriate notifier, and emits event with conversation history.
+    Parses LLM tokens as they stream and commits as soon as the prefix can only
+    mean one of CONVERSATION/IVR/VOICEMAIL (falling back to a substring search of
+    the full completion), notifies the appropriate notifier, and emits the event
+    with conversation history. Tokens after an early commit are discarded.
     """
 
     def __init__(
@@ -241,6 +369,11 @@ class TriageProcessor(FrameProcessor):
         self._processing_response = False
         self._response_buffer = ""
         self._decision_made = False
+        self._label_parser = StreamingLabelParser()
+        self._first_token_time: Optional[float] = None
+        self._decision_time: Optional[float] = None
+        self._decision_source: Optional[str] = None
+        self._classification: Optional[str] = None
 
         self._voicemail_detected = False
         self._voicemail_task: Optional[asyncio.Task] = None
@@ -253,6 +386,10 @@ class TriageProcessor(FrameProcessor):
 
     async def cleanup(self):
         await super().cleanup()
+        await self.cancel_waits()
+
+    async def cancel_waits(self):
+        """Stop the voicemail timing loop (polls every 100ms until cancelled)."""
         if self._voicemail_task:
             await self.cancel_task(self._voicemail_task)
             self._voicemail_task = None
@@ -263,15 +400,29 @@ class TriageProcessor(FrameProcessor):
         if isinstance(frame, LLMFullResponseStartFrame):
             self._processing_response = True
             self._response_buffer = ""
+            self._label_parser.reset()
+            self._first_token_time = None
 
         elif isinstance(frame, LLMFullResponseEndFrame):
-            if self._processing_response and not self._decision_made:
-                await self._process_classification(self._response_buffer.strip())
+            if self._processing_response:
+                if not self._decision_made:
+                    await self._process_classification(self._response_buffer.strip())
+                await self._report_llm_decision_metrics()
             self._processing_response = False
             self._response_buffer = ""
 
         elif isinstance(frame, LLMTextFrame) and self._processing_response:
+            if self._decision_made:
+                return  # Already committed - discard the rest of the completion
+            if self._first_token_time is None:
+                self._first_token_time = time.perf_counter()
             self._response_buffer += frame.text
+            label = self._label_parser.feed(frame.text)
+            if label:
+                logger.debug(f"[Triage] Early commit on prefix '{self._response_buffer.strip()}'")
+                await self._apply_decision(
+                    label, self._get_conversation_history(), TriageDecisionSource.LLM_EARLY
+                )
 
         elif isinstance(frame, UserStartedSpeakingFrame):
             if self._voicemail_detected:
@@ -293,6 +444,10 @@ class TriageProcessor(FrameProcessor):
             logger.warning(f"Failed to get conversation history: {e}")
             return []
 
+    @property
+    def decision_made(self) -> bool:
+        return self._decision_made
+
     async def _process_classification(self, full_response: str):
         """Process classifier response and trigger appropriate action."""
         if self._decision_made:
@@ -301,33 +456,77 @@ class TriageProcessor(FrameProcessor):
         response = full_response.upper()
         logger.debug(f"[Triage] Classifying: '{full_response}'")
 
-        conversation_history = self._get_conversation_history()
-
         if TriageClassification.CONVERSATION in response:
-            self._decision_made = True
-            logger.info("[Triage] Classification: CONVERSATION")
-            await self._gate_notifier.notify()
+            classification = TriageClassification.CONVERSATION
+        elif TriageClassification.IVR in response:
+            classification = TriageClassification.IVR
+        elif TriageClassification.VOICEMAIL in response:
+            classification = TriageClassification.VOICEMAIL
+        else:
+            logger.debug(f"[Triage] No classification in: '{full_response}'")
+            return
+
+        await self._apply_decision(
+            classification, self._get_conversation_history(), TriageDecisionSource.LLM_FULL
+        )
+
+    async def apply_local_decision(self, classification: str, utterance: str):
+        """Apply a decision made by TriagePreClassifier without the classifier LLM."""
+        if self._decision_made:
+            return
+        await self._push_decision_metrics(classification, TriageDecisionSource.LOCAL, 0.0, 0.0)
+        await self._apply_decision(
+            classification, [{"role": "user", "content": utterance}], TriageDecisionSource.LOCAL
+        )
+
+    async def _apply_decision(self, classification: str, conversation_history: list, source: str):
+        self._decision_made = True
+        self._decision_time = time.perf_counter()
+        self._decision_source = source
+        self._classification = classification
+        logger.info(f"[Triage] Classification: {classification} ({source})")
+        await self._gate_notifier.notify()
+
+        if classification == TriageClassification.CONVERSATION:
             await self._conversation_notifier.notify()
             await self._call_event_handler(TriageEvent.CONVERSATION_DETECTED, conversation_history)
 
-        elif TriageClassification.IVR in response:
-            self._decision_made = True
-            logger.info("[Triage] Classification: IVR")
-            await self._gate_notifier.notify()
+        elif classification == TriageClassification.IVR:
             await self._ivr_notifier.notify()
             await self._call_event_handler(TriageEvent.IVR_DETECTED, conversation_history)
 
-        elif TriageClassification.VOICEMAIL in response:
-            self._decision_made = True
+        elif classification == TriageClassification.VOICEMAIL:
             self._voicemail_detected = True
-            logger.info("[Triage] Classification: VOICEMAIL")
-            await self._gate_notifier.notify()
             await self._voicemail_notifier.notify()
             await self.push_interruption_task_frame_and_wait()
             self._voicemail_event.clear()
 
-        else:
-            logger.debug(f"[Triage] No classification in: '{full_response}'")
+    async def _report_llm_decision_metrics(self):
+        """Report first-token-to-decision time once the completion has ended."""
+        if self._decision_source not in (TriageDecisionSource.LLM_EARLY, TriageDecisionSource.LLM_FULL):
+            return
+        if self._first_token_time is None or self._decision_time is None:
+            return
+        end_time = time.perf_counter()
+        to_decision = max(0.0, self._decision_time - self._first_token_time)
+        saved_ms = max(0.0, (end_time - self._decision_time) * 1000)
+        if self._decision_source == TriageDecisionSource.LLM_EARLY:
+            logger.info(f"[Triage] Early commit saved {saved_ms:.0f}ms")
+        await self._push_decision_metrics(
+            self._classification, self._decision_source, to_decision, saved_ms
+        )
+        self._decision_source = None  # Report once
+
+    async def _push_decision_metrics(
+        self, classification: str, source: str, to_decision: float, saved_ms: float
+    ):
+        await self.push_frame(MetricsFrame(data=[TriageDecisionMetricsData(
+            processor=self.name,
+            value=to_decision,
+            classification=classification,
+            source=source,
+            saved_ms=saved_ms,
+        )]))
 
     async def _delayed_voicemail_handler(self):
         """Wait for voicemail delay, then emit event."""
@@ -379,6 +578,16 @@ class TTSGate(FrameProcessor):
             if task:
                 await self.cancel_task(task)
 
+    async def _release(self):
+        """Drop the buffer and the two wait tasks that can no longer fire."""
+        self._frame_buffer = []
+        current = asyncio.current_task()
+        for name in ("_conversation_task", "_ivr_task", "_voicemail_task"):
+            task = getattr(self, name)
+            setattr(self, name, None)
+            if task and task is not current:
+                await self.cancel_task(task)
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
@@ -394,17 +603,17 @@ class TTSGate(FrameProcessor):
         self._gating_active = False
         for frame, direction in self._frame_buffer:
             await self.push_frame(frame, direction)
-        self._frame_buffer.clear()
+        await self._release()
         logger.trace("[Triage] TTSGate released buffered frames")
 
     async def _wait_for_ivr(self):
         await self._ivr_notifier.wait()
         self._gating_active = False
-        self._frame_buffer.clear()
+        await self._release()
         logger.trace("[Triage] TTSGate cleared buffer (IVR)")
 
     async def _wait_for_voicemail(self):
         await self._voicemail_notifier.wait()
         self._gating_active = False
-        self._frame_buffer.clear()
+        await self._release()
         logger.trace("[Triage] TTSGate cleared buffer (voicemail)")
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 @dataclass
@@ -27,3 +27,16 @@ class ConversationComponents:
     observer_llm: Optional[Any] = None
     observer_context_manager: Optional[Any] = None
     bot_speech_producer: Optional[Any] = None
+    speculative_llm: Optional[Any] = None
+
+    def named_llms(self) -> Dict[str, Any]:
+        """LLM services by the component name latency metrics are recorded under.
+
+        "llm" is the conversation LLM; the others run in side branches.
+        """
+        llms = {
+            "llm": self.active_llm,
+            "classifier_llm": self.classifier_llm,
+            "observer_llm": self.observer_llm,
+        }
+        return {name: llm for name, llm in llms.items() if llm is not None}
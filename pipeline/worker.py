@@ -0,0 +1,298 @@
+"""Multi-call worker - hosts many CallSessions in one interpreter.
+
+The default deployment runs one call per container. In worker mode a single
+process accepts calls until it hits a concurrency, event-loop-lag or CPU
+budget, shares HTTP connection pools across calls (services/client_pool.py),
+binds a per-call log context and can attribute event-loop CPU time to each call.
+
+Per-call CPU attribution is opt-in (WORKER_CPU_ACCOUNTING=1). It installs a
+loop task factory that times each step of a task with time.thread_time and
+charges it to the call in the task's context. asyncio tasks copy the current
+context when created, so every task a call's pipeline spawns is charged to
+that call. Plain loop callbacks that are not task steps (transport protocol
+callbacks, call_soon handlers) and work on non-loop threads (e.g. Daily's
+native audio threads) are not attributed per call and only show up in the
+process totals.
+"""
+
+import asyncio
+import contextvars
+import os
+import resource
+import statistics
+import time
+from collections import deque
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from loguru import logger
+
+from backend.utils import mask_id
+from services.client_pool import close_pools, open_pools
+
+_current_call: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_call", default=None)
+
+
+@dataclass
+class CallResources:
+    """Per-call resource breakdown."""
+    session_id: str
+    started_at: float = field(default_factory=time.monotonic)
+    ended_at: Optional[float] = None
+    status: str = "running"
+    cpu_seconds: float = 0.0
+    task_steps: int = 0
+    max_step_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.ended_at or time.monotonic()
+        return {
+            "session_id": mask_id(self.session_id),
+            "status": self.status,
+            "wall_seconds": round(end - self.started_at, 2),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "task_steps": self.task_steps,
+            "max_step_ms": round(self.max_step_ms, 2),
+        }
+
+
+class _TimedCoroutine(Coroutine):
+    """Wraps a task's coroutine and charges the CPU time of each step to a call."""
+
+    __slots__ = ("_coro", "_resources")
+
+    def __init__(self, coro, resources: CallResources):
+        self._coro = coro
+        self._resources = resources
+
+    def _charge(self, start: float) -> None:
+        elapsed = time.thread_time() - start
+        resources = self._resources
+        resources.cpu_seconds += elapsed
+        resources.task_steps += 1
+        if elapsed * 1000 > resources.max_step_ms:
+            resources.max_step_ms = elapsed * 1000
+
+    def send(self, value):
+        start = time.thread_time()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._charge(start)
+
+    def throw(self, *args):
+        start = time.thread_time()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._charge(start)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+
+class _CallCpuAccounting:
+    """Loop task factory that charges task-step CPU time to the call in the task's context."""
+
+    def __init__(self):
+        self._calls: Dict[str, CallResources] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def install(self, loop: asyncio.AbstractEventLoop) -> bool:
+        if loop.get_task_factory() is not None:
+            logger.warning("Per-call CPU accounting disabled: the event loop already has a task factory")
+            return False
+        loop.set_task_factory(self._create_task)
+        self._loop = loop
+        logger.info(f"Per-call CPU accounting enabled on {type(loop).__name__}")
+        return True
+
+    def uninstall(self) -> None:
+        if self._loop is not None and self._loop.get_task_factory() == self._create_task:
+            self._loop.set_task_factory(None)
+        self._loop = None
+
+    def _create_task(self, loop, coro, **kwargs):
+        context = kwargs.get("context")
+        call_id = context.get(_current_call) if context is not None else _current_call.get()
+        resources = self._calls.get(call_id) if call_id is not None else None
+        if resources is not None:
+            coro = _TimedCoroutine(coro, resources)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    def track(self, resources: CallResources) -> None:
+        self._calls[resources.session_id] = resources
+
+    def untrack(self, session_id: str) -> None:
+        self._calls.pop(session_id, None)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and process CPU utilization on a fixed interval."""
+
+    def __init__(self, interval: float = 0.25, window: int = 40):
+        self.interval = interval
+        self._lag_ms: Deque[float] = deque(maxlen=window)
+        self._cpu_samples: Deque[tuple] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._lag_ms.append(max(0.0, (loop.time() - scheduled) * 1000))
+            self._cpu_samples.append((time.monotonic(), time.process_time()))
+
+    @property
+    def lag_p95_ms(self) -> float:
+        if len(self._lag_ms) < 2:
+            return 0.0
+        return statistics.quantiles(self._lag_ms, n=20)[-1]
+
+    @property
+    def lag_max_ms(self) -> float:
+        return max(self._lag_ms, default=0.0)
+
+    @property
+    def cpu_percent(self) -> float:
+        """Process CPU over the sample window, as a percentage of one core."""
+        if len(self._cpu_samples) < 2:
+            return 0.0
+        (wall_start, cpu_start), (wall_end, cpu_end) = self._cpu_samples[0], self._cpu_samples[-1]
+        wall = wall_end - wall_start
+        return (cpu_end - cpu_start) / wall * 100 if wall > 0 else 0.0
+
+
+class CallWorker:
+    """Admits and runs concurrent calls against a resource budget."""
+
+    def __init__(
+        self,
+        run_call: Callable[[Any], Awaitable[None]],
+        max_calls: int = None,
+        max_loop_lag_ms: float = None,
+        max_cpu_percent: float = None,
+        cpu_accounting: bool = None,
+    ):
+        self._run_call = run_call
+        self.max_calls = max_calls or int(os.getenv("WORKER_MAX_CALLS", "8"))
+        self.max_loop_lag_ms = max_loop_lag_ms or float(os.getenv("WORKER_MAX_LOOP_LAG_MS", "50"))
+        self.max_cpu_percent = max_cpu_percent or float(os.getenv("WORKER_MAX_CPU_PERCENT", "70"))
+        if cpu_accounting is None:
+            cpu_accounting = os.getenv("WORKER_CPU_ACCOUNTING", "").lower() in ("1", "true", "yes")
+        self._cpu_accounting = _CallCpuAccounting() if cpu_accounting else None
+        self.monitor = LoopLagMonitor()
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._resources: Dict[str, CallResources] = {}
+        self._finished: Deque[CallResources] = deque(maxlen=100)
+        self.rejected = 0
+
+    async def start(self) -> None:
+        if self._cpu_accounting and not self._cpu_accounting.install(asyncio.get_running_loop()):
+            self._cpu_accounting = None
+        await open_pools()
+        self.monitor.start()
+        logger.info(
+            f"Call worker started - max_calls={self.max_calls}, "
+            f"max_loop_lag_ms={self.max_loop_lag_ms}, max_cpu_percent={self.max_cpu_percent}"
+        )
+
+    async def stop(self, drain_timeout: float = 30.0) -> None:
+        """Wait for in-flight calls to finish (bounded), then release shared resources."""
+        if self._calls:
+            logger.info(f"Draining {len(self._calls)} active call(s)")
+            _, pending = await asyncio.wait(list(self._calls.values()), timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+        await self.monitor.stop()
+        if self._cpu_accounting:
+            self._cpu_accounting.uninstall()
+        await close_pools()
+
+    @property
+    def active_calls(self) -> int:
+        return len(self._calls)
+
+    def admission_error(self) -> Optional[str]:
+        """Return a reason the worker can't take another call, or None."""
+        if self.active_calls >= self.max_calls:
+            return f"at capacity ({self.active_calls}/{self.max_calls} calls)"
+        lag = self.monitor.lag_p95_ms
+        if lag > self.max_loop_lag_ms:
+            return f"event loop lag p95 {lag:.0f}ms > {self.max_loop_lag_ms:.0f}ms"
+        cpu = self.monitor.cpu_percent
+        if cpu > self.max_cpu_percent:
+            return f"cpu {cpu:.0f}% > {self.max_cpu_percent:.0f}%"
+        return None
+
+    def submit(self, session_id: str, args: Any) -> asyncio.Task:
+        """Start a call. Caller must check admission_error() first."""
+        if session_id in self._calls:
+            raise ValueError(f"Session {mask_id(session_id)} already running")
+
+        resources = CallResources(session_id=session_id)
+        self._resources[session_id] = resources
+        if self._cpu_accounting:
+            self._cpu_accounting.track(resources)
+
+        # Tasks copy the caller's context, so this only tags this call's tasks
+        context = contextvars.copy_context()
+        context.run(_current_call.set, session_id)
+        task = context.run(asyncio.create_task, self._run(session_id, args))
+        self._calls[session_id] = task
+        return task
+
+    async def _run(self, session_id: str, args: Any) -> None:
+        resources = self._resources[session_id]
+        with logger.contextualize(call_id=mask_id(session_id)):
+            try:
+                await self._run_call(args)
+                resources.status = "completed"
+            except asyncio.CancelledError:
+                resources.status = "cancelled"
+                raise
+            except Exception:
+                # Isolation: one failed call must not take down the worker
+                resources.status = "failed"
+                logger.exception("Call failed in worker")
+            finally:
+                resources.ended_at = time.monotonic()
+                self._calls.pop(session_id, None)
+                self._resources.pop(session_id, None)
+                if self._cpu_accounting:
+                    self._cpu_accounting.untrack(session_id)
+                self._finished.append(resources)
+                logger.info(f"Call resources: {resources.to_dict()}")
+
+    def stats(self) -> Dict[str, Any]:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return {
+            "active_calls": self.active_calls,
+            "max_calls": self.max_calls,
+            "rejected_calls": self.rejected,
+            "admission_error": self.admission_error(),
+            "loop_lag_p95_ms": round(self.monitor.lag_p95_ms, 2),
+            "loop_lag_max_ms": round(self.monitor.lag_max_ms, 2),
+            "cpu_percent": round(self.monitor.cpu_percent, 1),
+            "max_rss_mb": round(usage.ru_maxrss / 1024, 1),
+            "calls": [r.to_dict() for r in self._resources.values()],
+            "recent_calls": [r.to_dict() for r in self._finished],
+        }
@@ -0,0 +1,105 @@
+"""Process-wide HTTP connection pools shared by every call in a process.
+
+Pools are opened by the multi-call worker (see pipeline/worker.py) and by
+bot() in single-call containers, so every processor in a call shares one
+HTTP/2 client. When they are not open (evals, scripts) the getters return None
+and callers fall back to creating their own clients.
+"""
+
+from typing import Any, Optional
+
+import aiohttp
+import httpx
+from loguru import logger
+
+try:
+    import h2  # noqa: F401  # httpx only negotiates HTTP/2 when the h2 package is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Generous keep-alive so concurrent calls reuse TLS connections to LLM providers
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=200, max_connections=1000, keepalive_expiry=120)
+HTTP_POOL_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_aiohttp_session: Optional[aiohttp.ClientSession] = None
+
+
+async def open_pools() -> None:
+    """Open the shared pools. No-op if they are already open."""
+    global _http_client, _aiohttp_session
+    if _http_client is not None and _aiohttp_session is not None:
+        return
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=HTTP_POOL_LIMITS, timeout=HTTP_POOL_TIMEOUT, http2=HTTP2_AVAILABLE
+        )
+    if _aiohttp_session is None:
+        _aiohttp_session = aiohttp.ClientSession()
+    logger.info(f"Shared HTTP pools opened (HTTP/2: {HTTP2_AVAILABLE})")
+
+
+async def close_pools() -> None:
+    global _http_client, _aiohttp_session
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _aiohttp_session is not None:
+        await _aiohttp_session.close()
+        _aiohttp_session = None
+    logger.info("Shared HTTP pools closed")
+
+
+def get_shared_http_client() -> Optional[httpx.AsyncClient]:
+    return _http_client
+
+
+def get_shared_aiohttp_session() -> Optional[aiohttp.ClientSession]:
+    return _aiohttp_session
+
+
+def share_http_pool(service: Any) -> Any:
+    """Point a pipecat LLM service's SDK client at the shared httpx pool.
+
+    OpenAI, Groq and Anthropic SDK clients all support with_options(http_client=...).
+    No-op when pools are not open or the service has no SDK client.
+    """
+    client = getattr(service, '_client', None)
+    if _http_client is None or client is None or not hasattr(client, 'with_options'):
+        return service
+    service._client = client.with_options(http_client=_http_client)
+    return service
+
+
+def create_groq_client(api_key: str, http2: bool = False):
+    """Create an AsyncGroq client, reusing the shared pool when available.
+
+    With http2=True and no shared pool, the client gets its own HTTP/2
+    connection; release it with close_client() when done. Cancelling a request then resets one stream instead of
+    dropping the connection, so callers that cancel superseded requests
+    don't pay a new TLS handshake for the next one.
+    """
+    from groq import AsyncGroq
+    if _http_client is not None:
+        return AsyncGroq(api_key=api_key, http_client=_http_client)
+    if http2 and HTTP2_AVAILABLE:
+        return AsyncGroq(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(http2=True, timeout=HTTP_POOL_TIMEOUT),
+        )
+    return AsyncGroq(api_key=api_key)
+
+
+async def close_client(client: Any) -> None:
+    """Close an SDK client from create_groq_client, unless it uses the shared pool.
+
+    Clients created without a shared pool own their connections and must be
+    closed when the call ends; the shared pool is closed by close_pools().
+    """
+    if client is None or getattr(client, '_client', None) is _http_client:
+        return
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Closing {type(client).__name__} failed: {e}")
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 from pipecat.services.anthropic.llm import AnthropicLLMService
 from pipecat.services.cartesia.tts import CartesiaTTSService, GenerationConfig
@@ -7,6 +7,8 @@ from pipecat.services.groq.llm import GroqLLMService
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.daily.transport import DailyDialinSettings, DailyParams, DailyTransport
 
+from services.client_pool import share_http_pool
+from services.tts_cache import DEFAULT_PHRASES, CachedCartesiaTTSService, get_phrase_cache
 from utils.function_call_text_filter import FunctionCallTextFilter
 from utils.spelling_text_filter import SpellingTextFilter
 
@@ -91,11 +93,16 @@ class ServiceFactory:
         if provider not in providers:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
-        return providers[provider](**kwargs)
+        return share_http_pool(providers[provider](**kwargs))
 
     @staticmethod
-    def create_tts(config: Dict[str, Any]) -> CartesiaTTSService:
-        """Create Cartesia TTS service."""
+    def create_tts(config: Dict[str, Any], phrases: Iterable[str] = DEFAULT_PHRASES) -> CartesiaTTSService:
+        """Create Cartesia TTS service.
+
+        `phrases` (the workflow's fixed phrases, see tts_cache.workflow_phrases)
+        are played from the phrase audio cache; set `phrase_cache: false` to
+        always synthesize live.
+        """
         generation_config = None
         if config.get('generation_config'):
             gc = config['generation_config']
@@ -109,7 +116,7 @@ class ServiceFactory:
             generation_config=generation_config
         )
 
-        return CartesiaTTSService(
+        tts_kwargs = dict(
             api_key=config['api_key'],
             voice_id=config['voice_id'],
             model=config['model'],
@@ -117,3 +124,17 @@ class ServiceFactory:
             aggregate_sentences=config.get('aggregate_sentences', True),
             text_filters=[FunctionCallTextFilter(), SpellingTextFilter()]
         )
+        if config.get('phrase_cache', True) is False:
+            return CartesiaTTSService(**tts_kwargs)
+
+        return CachedCartesiaTTSService(
+            phrase_cache=get_phrase_cache(),
+            phrases=phrases,
+            render_params={
+                'api_key': config['api_key'],
+                'voice_id': config['voice_id'],
+                'model': config['model'],
+                'generation_config': config.get('generation_config'),
+            },
+            **tts_kwargs
+        )
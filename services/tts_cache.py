@@ -0,0 +1,382 @@
+"""Content-addressed cache of pre-synthesized audio for fixed TTS phrases.
+
+Transfer notices, the emergency message, apologies and other fixed prompts are
+identical across calls. CachedCartesiaTTSService (built by
+ServiceFactory.create_tts) plays them from this cache instead of a Cartesia
+round trip. Entries are keyed by (voice, model, generation config, sample
+rate, normalized text), so a voice or speed change simply misses.
+
+Only allowlisted phrases are cached: DEFAULT_PHRASES plus `cache_phrases` from
+the tts section of services.yaml. Free-form LLM output can contain PHI and is
+never written to disk.
+
+Tiers: an in-process LRU (shared by every call in a worker process) over a
+disk directory of raw PCM files. A miss is synthesized live as usual and, with
+warm-on-miss, rendered in the background over Cartesia's HTTP API so the next
+call hits. Pre-render known phrases for every workflow with:
+
+    python -m services.tts_cache
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Iterable, Mapping, Optional, Set
+
+import aiohttp
+from loguru import logger
+from pipecat.frames.frames import Frame, TTSAudioRawFrame, TTSStartedFrame
+from pipecat.services.cartesia.tts import CartesiaTTSService
+
+CACHE_DIR = Path(os.getenv("TTS_PHRASE_CACHE_DIR", "cache/tts_phrases"))
+MEMORY_LIMIT_BYTES = int(os.getenv("TTS_PHRASE_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+WARM_ON_MISS = os.getenv("TTS_PHRASE_CACHE_WARM_ON_MISS", "true").lower() in ["true", "1", "yes"]
+CHUNK_SECS = 0.04
+
+CARTESIA_BYTES_URL = "https://api.cartesia.ai/tts/bytes"
+CARTESIA_VERSION = "2025-04-16"
+RENDER_SAMPLE_RATES = (24000,)  # PipelineParams.audio_out_sample_rate
+RENDER_TIMEOUT = 30  # seconds
+
+DEFAULT_PHRASES = (
+    "Transferring you now, please hold.",
+    "If this is an emergency, hang up and dial 911.",
+    "I apologize, let me rephrase that.",
+    "I apologize, the transfer didn't go through.",
+    "Would you like to speak with my manager?",
+    "Sounds good! What's the phone number on your account?",
+    "Can you confirm your date of birth please?",
+    "Let me pull up your account.",
+    "Take care!",
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def normalize_phrase(text: str) -> str:
+    # Case and punctuation change prosody, so only whitespace is normalized
+    return " ".join(text.split())
+
+
+def split_sentences(text: str) -> list:
+    """Split a phrase the way the TTS sentence aggregator will hand it to run_tts."""
+    return [s for s in (normalize_phrase(part) for part in _SENTENCE_END.split(text)) if s]
+
+
+def phrase_allowlist(phrases: Iterable[str]) -> frozenset:
+    return frozenset(sentence for phrase in phrases for sentence in split_sentences(phrase))
+
+
+def cache_key(voice_id: str, model: str, generation_config: Optional[Mapping], sample_rate: int, text: str) -> str:
+    params = json.dumps(
+        [voice_id, model, dict(generation_config or {}), sample_rate, normalize_phrase(text)],
+        sort_keys=True,
+    )
+    return hashlib.sha256(params.encode()).hexdigest()
+
+
+class PhraseAudioCache:
+    """Two-tier (memory LRU + disk) store of raw 16-bit mono PCM by cache key."""
+
+    def __init__(self, directory: Path = CACHE_DIR, memory_limit_bytes: int = MEMORY_LIMIT_BYTES):
+        self.directory = directory
+        self.memory_limit_bytes = memory_limit_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._warming: Set[str] = set()
+        self._background_tasks: set = set()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.renders = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pcm"
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_limit_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return audio
+        try:
+            audio = await asyncio.to_thread(self._path(key).read_bytes)
+        except OSError:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, audio)
+        return audio
+
+    def _write(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(audio)
+        os.replace(tmp, path)  # Atomic: concurrent readers never see a partial file
+
+    async def put(self, key: str, audio: bytes) -> None:
+        self._remember(key, audio)
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            logger.warning(f"[TTSCache] Disk write failed, memory tier only: {e}")
+
+    def warm(self, key: str, text: str, render_params: Mapping[str, Any], sample_rate: int) -> None:
+        """Render a missed phrase in the background so later calls hit."""
+        if key in self._warming:
+            return
+        self._warming.add(key)
+
+        async def render():
+            try:
+                audio = await render_phrase(text, sample_rate=sample_rate, **render_params)
+                await self.put(key, audio)
+                self.renders += 1
+                logger.debug(f"[TTSCache] Warmed {len(audio)} bytes for {text[:40]!r}")
+            except Exception as e:
+                logger.warning(f"[TTSCache] Background render failed: {e}")
+            finally:
+                self._warming.discard(key)
+
+        task = asyncio.create_task(render())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "renders": self.renders,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+
+async def render_phrase(
+    text: str,
+    *,
+    api_key: str,
+    voice_id: str,
+    model: str,
+    sample_rate: int,
+    generation_config: Optional[Mapping] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> bytes:
+    """Synthesize text to raw 16-bit mono PCM with Cartesia's HTTP bytes endpoint."""
+    payload = {
+        "model_id": model,
+        "transcript": text,
+        "voice": {"mode": "id", "id": voice_id},
+        "output_format": {"container": "raw", "encoding": "pcm_s16le", "sample_rate": sample_rate},
+        "language": "en",
+    }
+    if generation_config:
+        payload["generation_config"] = {k: v for k, v in generation_config.items() if v is not None}
+    headers = {"X-API-Key": api_key, "Cartesia-Version": CARTESIA_VERSION}
+
+    own_session = session is None
+    session = session or aiohttp.ClientSession()
+    try:
+        async with session.post(
+            CARTESIA_BYTES_URL, json=payload, headers=headers,
+            timeout=aiohttp.ClientTimeout(total=RENDER_TIMEOUT),
+        ) as resp:
+            if resp.status >= 400:
+                raise RuntimeError(f"Cartesia HTTP {resp.status}: {(await resp.text())[:200]}")
+            return await resp.read()
+    finally:
+        if own_session:
+            await session.close()
+
+
+class CachedCartesiaTTSService(CartesiaTTSService):
+    """CartesiaTTSService that plays allowlisted phrases from PhraseAudioCache.
+
+    Hits go through the same audio context and word-timestamp path as live
+    Cartesia audio, so interruptions and TTSTextFrames (what the assistant
+    context records) behave as for synthesized speech. Contexts play in
+    creation order and word timestamps share one queue, so a hit is only
+    served when no earlier audio is open or still playing; otherwise the
+    phrase is synthesized live in order. No TTS usage is reported for hits.
+    """
+
+    def __init__(
+        self,
+        *,
+        phrase_cache: PhraseAudioCache,
+        phrases: Iterable[str],
+        render_params: Mapping[str, Any],
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._phrase_cache = phrase_cache
+        self._phrases = phrase_allowlist(phrases)
+        self._render_params = dict(render_params)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _key(self, phrase: str) -> str:
+        return cache_key(
+            self._render_params["voice_id"],
+            self._render_params["model"],
+            self._render_params.get("generation_config"),
+            self.sample_rate,
+            phrase,
+        )
+
+    async def run_tts(self, text: str, *args) -> AsyncGenerator[Frame, None]:
+        phrase = normalize_phrase(text)
+        audio = None
+        if phrase in self._phrases and self._audio_idle():
+            key = self._key(phrase)
+            audio = await self._phrase_cache.get(key)
+            if audio is None:
+                self.cache_misses += 1
+                if WARM_ON_MISS:
+                    self._phrase_cache.warm(key, phrase, self._render_params, self.sample_rate)
+
+        if audio is None:
+            async for frame in super().run_tts(text, *args):
+                yield frame
+            return
+
+        self.cache_hits += 1
+        logger.debug(f"[TTSCache] Hit for {phrase[:40]!r} ({len(audio)} bytes)")
+        async for frame in self._play_cached(phrase, audio):
+            yield frame
+
+    def _audio_idle(self) -> bool:
+        # No live Cartesia context accepting text and no context queued or playing
+        return self._context_id is None and not self._contexts
+
+    async def _play_cached(self, phrase: str, audio: bytes) -> AsyncGenerator[Frame, None]:
+        await self.start_ttfb_metrics()
+        context_id = str(uuid.uuid4())
+        await self.create_audio_context(context_id)
+        yield TTSStartedFrame()
+        await self.stop_ttfb_metrics()
+
+        await self.start_word_timestamps()
+        chunk_bytes = int(self.sample_rate * CHUNK_SECS) * 2
+        for offset in range(0, len(audio), chunk_bytes):
+            await self.append_to_audio_context(
+                context_id,
+                TTSAudioRawFrame(audio=audio[offset:offset + chunk_bytes], sample_rate=self.sample_rate, num_channels=1),
+            )
+
+        # Spread words evenly over the clip; Cartesia sends real timings for live audio
+        duration = len(audio) / (self.sample_rate * 2)
+        words = phrase.split()
+        timestamps = [(word, duration * i / len(words)) for i, word in enumerate(words)]
+        await self.add_word_timestamps(timestamps + [("TTSStoppedFrame", 0), ("Reset", 0)])
+        await self.remove_audio_context(context_id)
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self.cache_hits or self.cache_misses:
+            logger.info(
+                f"[TTSCache] Phrase cache: {self.cache_hits} hit(s), {self.cache_misses} miss(es) "
+                f"- process {self._phrase_cache.stats()}"
+            )
+
+
+_cache_instance: Optional[PhraseAudioCache] = None
+
+
+def get_phrase_cache() -> PhraseAudioCache:
+    """Get the process-wide PhraseAudioCache (shared by all calls in a worker)."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = PhraseAudioCache()
+    return _cache_instance
+
+
+# ==================== Pre-render CLI ====================
+
+
+def workflow_phrases(services_config: Mapping[str, Any]) -> list:
+    """Fixed phrases one workflow can speak: defaults, tts.cache_phrases and safety messages."""
+    phrases = list(DEFAULT_PHRASES)
+    phrases.extend(services_config["services"]["tts"].get("cache_phrases", ()))
+    safety = services_config.get("safety_monitors") or {}
+    for field in ("emergency_message", "unsafe_output_message"):
+        if safety.get(field):
+            phrases.append(safety[field])
+    return phrases
+
+
+async def prerender(organization_slug: Optional[str] = None, force: bool = False) -> Dict[str, int]:
+    """Render every workflow's fixed phrases into the disk cache."""
+    from core.client_registry import get_client_registry
+    from utils.function_call_text_filter import FunctionCallTextFilter
+    from utils.spelling_text_filter import SpellingTextFilter
+
+    cache = get_phrase_cache()
+    text_filters = [FunctionCallTextFilter(), SpellingTextFilter()]
+    counts = {"rendered": 0, "cached": 0, "failed": 0}
+
+    async with aiohttp.ClientSession() as session:
+        for entry in get_client_registry().entries(organization_slug):
+            tts = entry.services_config["services"]["tts"]
+            if tts.get("provider", "cartesia") != "cartesia" or tts.get("phrase_cache", True) is False:
+                continue
+            for sentence in sorted(phrase_allowlist(workflow_phrases(entry.services_config))):
+                # run_tts sees text after the service's text filters
+                for text_filter in text_filters:
+                    sentence = await text_filter.filter(sentence)
+                for sample_rate in RENDER_SAMPLE_RATES:
+                    key = cache_key(tts["voice_id"], tts["model"], tts.get("generation_config"), sample_rate, sentence)
+                    if not force and cache._path(key).exists():
+                        counts["cached"] += 1
+                        continue
+                    try:
+                        audio = await render_phrase(
+                            sentence,
+                            api_key=tts["api_key"],
+                            voice_id=tts["voice_id"],
+                            model=tts["model"],
+                            sample_rate=sample_rate,
+                            generation_config=tts.get("generation_config"),
+                            session=session,
+                        )
+                        await cache.put(key, audio)
+                        counts["rendered"] += 1
+                        print(f"  {entry.organization_slug}/{entry.client_name}: {sentence}")
+                    except Exception as e:
+                        counts["failed"] += 1
+                        print(f"  FAILED {entry.organization_slug}/{entry.client_name}: {sentence} - {e}")
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-render fixed TTS phrases into the phrase cache")
+    parser.add_argument("--org", help="Only this organization slug")
+    parser.add_argument("--force", action="store_true", help="Re-render phrases already on disk")
+    args = parser.parse_args()
+
+    print(f"Rendering fixed phrases into {CACHE_DIR}")
+    counts = asyncio.run(prerender(args.org, args.force))
+    print(f"Done: {counts['rendered']} rendered, {counts['cached']} already cached, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
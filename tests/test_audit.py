@@ -0,0 +1,46 @@
+import asyncio
+from collections import defaultdict
+from types import SimpleNamespace
+
+from backend.audit import AuditLogger
+
+
+class FakeCollection:
+    def __init__(self):
+        self.batches = []
+
+    async def insert_many(self, documents, ordered=True):
+        self.batches.append(len(documents))
+
+
+def make_logger(**kwargs):
+    collection = FakeCollection()
+    db = SimpleNamespace(audit_logs=collection)
+    audit = AuditLogger(defaultdict(lambda: db), **kwargs)
+    return audit, collection
+
+
+async def test_full_batches_flush_without_waiting():
+    audit, collection = make_logger(batch_size=200, flush_interval=0.5)
+    audit.start()
+    for i in range(450):
+        audit._queue.put_nowait({"event_type": "api_access", "n": i})
+
+    await asyncio.sleep(0.1)
+
+    assert collection.batches == [200, 200]
+    await audit.stop()
+    assert collection.batches == [200, 200, 50]
+
+
+async def test_short_queue_waits_for_more_entries():
+    audit, collection = make_logger(batch_size=200, flush_interval=0.2)
+    audit.start()
+    audit._queue.put_nowait({"event_type": "api_access"})
+    await asyncio.sleep(0.05)
+    audit._queue.put_nowait({"event_type": "api_access"})
+
+    await asyncio.sleep(0.3)
+
+    assert collection.batches == [2]
+    await audit.stop()
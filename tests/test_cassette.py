@@ -0,0 +1,136 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from evals import cassette
+from evals.cassette import CassetteMiss, openai_client, pinned_today, request_key, use_cassette
+
+MESSAGES = [{"role": "user", "content": "Is the patient eligible?"}]
+
+
+def completion(text: str) -> ChatCompletion:
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": text},
+        }],
+    })
+
+
+@pytest.fixture
+def live(monkeypatch):
+    """Fake provider behind the wrappers; answers "live-1", "live-2", ... in call order."""
+    calls = []
+
+    async def create(**params):
+        calls.append(params)
+        return completion(f"live-{len(calls)}")
+
+    provider = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(cassette, "_shared_client", lambda kwargs, factory: provider)
+    return calls
+
+
+@pytest.fixture
+def mode(monkeypatch):
+    def set_mode(value):
+        monkeypatch.setattr(cassette, "_mode", value)
+    return set_mode
+
+
+async def ask(temperature=0.0):
+    response = await openai_client().chat.completions.create(
+        model="gpt-4o", messages=MESSAGES, temperature=temperature
+    )
+    return response.choices[0].message.content
+
+
+def test_request_key_ignores_unset_params_and_key_order():
+    params = {"model": "gpt-4o", "messages": MESSAGES, "temperature": 0}
+    assert request_key("openai", params) == request_key("openai", {"temperature": 0, **params, "tools": None})
+    assert request_key("openai", params) != request_key("openai", {**params, "temperature": 0.7})
+    assert request_key("openai", params) != request_key("groq", params)
+
+
+async def test_recorded_calls_replay_in_order_without_going_live(tmp_path, live, mode):
+    path = tmp_path / "scenario.json"
+    mode("record")
+    with use_cassette(path):
+        assert [await ask(0.7), await ask(0.7)] == ["live-1", "live-2"]
+
+    mode("replay")
+    with use_cassette(path) as replaying:
+        assert [await ask(0.7), await ask(0.7)] == ["live-1", "live-2"]
+        assert cassette.last_live_latency_ms() is None
+
+    assert len(live) == 2
+    assert (replaying.hits, replaying.misses) == (2, 0)
+
+
+async def test_replay_miss_raises(tmp_path, live, mode):
+    path = tmp_path / "scenario.json"
+    mode("record")
+    with use_cassette(path):
+        await ask()
+
+    mode("replay")
+    with use_cassette(path):
+        await ask()
+        with pytest.raises(CassetteMiss):
+            await ask()  # Second occurrence was never recorded
+        with pytest.raises(CassetteMiss):
+            await ask(temperature=0.5)
+    assert len(live) == 1
+
+
+def test_replay_without_cassette_file_raises(tmp_path, mode):
+    mode("replay")
+    with pytest.raises(CassetteMiss):
+        with use_cassette(tmp_path / "missing.json"):
+            pass
+
+
+async def test_hybrid_miss_goes_live_and_is_recorded(tmp_path, live, mode):
+    path = tmp_path / "scenario.json"
+    mode("record")
+    with use_cassette(path):
+        await ask()
+
+    mode("hybrid")
+    with use_cassette(path) as hybrid:
+        assert await ask() == "live-1"
+        assert await ask(temperature=0.5) == "live-2"
+    assert (hybrid.hits, hybrid.misses, hybrid.recorded) == (1, 1, 1)
+
+    mode("replay")
+    with use_cassette(path):
+        assert await ask(temperature=0.5) == "live-2"
+    assert len(live) == 2
+
+
+async def test_replay_pins_recording_date(tmp_path, live, mode):
+    path = tmp_path / "scenario.json"
+    mode("record")
+    with use_cassette(path) as recording:
+        recording.today = date(2025, 3, 14)
+        await ask()
+
+    mode("replay")
+    with use_cassette(path):
+        assert pinned_today() == date(2025, 3, 14)
+    assert pinned_today() == date.today()
+
+
+async def test_off_mode_calls_live_without_recording(tmp_path, live, mode):
+    mode("off")
+    with use_cassette(tmp_path / "scenario.json") as active:
+        assert active is None
+        assert await ask() == "live-1"
+    assert not (tmp_path / "scenario.json").exists()
@@ -0,0 +1,38 @@
+from services import client_pool
+from services.client_pool import close_client, close_pools, create_groq_client, open_pools
+
+
+async def test_private_client_is_closed():
+    client = create_groq_client("test-key", http2=True)
+    assert not client.is_closed()
+
+    await close_client(client)
+
+    assert client.is_closed()
+
+
+async def test_client_on_shared_pool_leaves_pool_open():
+    await open_pools()
+    try:
+        client = create_groq_client("test-key", http2=True)
+        assert client._client is client_pool.get_shared_http_client()
+
+        await close_client(client)
+
+        assert not client_pool.get_shared_http_client().is_closed
+    finally:
+        await close_pools()
+
+
+async def test_close_client_accepts_none():
+    await close_client(None)
+
+
+async def test_open_pools_twice_keeps_the_same_client():
+    await open_pools()
+    try:
+        shared = client_pool.get_shared_http_client()
+        await open_pools()
+        assert client_pool.get_shared_http_client() is shared
+    finally:
+        await close_pools()
@@ -0,0 +1,136 @@
+import os
+import sys
+from types import MappingProxyType, ModuleType
+
+import pytest
+
+from core import client_registry
+from core.client_registry import ClientRegistry, freeze, thaw
+
+
+def test_thaw_returns_plain_mutable_copy():
+    config = {"services": {"stt": {"keyterm": ["Cigna", "Aetna"], "params": {"language": "en"}}}}
+    frozen = freeze(config)
+    assert isinstance(frozen["services"], MappingProxyType)
+
+    thawed = thaw(frozen)
+
+    assert thawed == config
+    assert type(thawed["services"]["stt"]) is dict
+    assert type(thawed["services"]["stt"]["keyterm"]) is list
+    thawed["services"]["stt"]["keyterm"].append("Humana")
+    assert frozen["services"]["stt"]["keyterm"] == ("Cigna", "Aetna")
+
+
+def make_client(tmp_path):
+    org = tmp_path / "acme"
+    client = org / "intake"
+    client.mkdir(parents=True)
+    for path in (org / "__init__.py", org / "dialin_base_flow.py", client / "services.yaml",
+                 client / "flow_definition.py", client / "schema.py"):
+        path.write_text("")
+    return org, client
+
+
+def bump(path):
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_edit_to_base_flow_or_schema_changes_mtimes(tmp_path):
+    org, client = make_client(tmp_path)
+    registry = ClientRegistry(clients_dir=tmp_path)
+    before = registry._current_mtimes("acme", "intake")
+
+    bump(org / "dialin_base_flow.py")
+    after_base = registry._current_mtimes("acme", "intake")
+    bump(client / "schema.py")
+
+    assert before != after_base != registry._current_mtimes("acme", "intake")
+
+
+def test_workflow_modules_cover_workflow_and_base_flow_modules(tmp_path, monkeypatch):
+    make_client(tmp_path)
+    names = [
+        "clients.acme.intake",
+        "clients.acme.intake.flow_definition",
+        "clients.acme.intake.schema",
+        "clients.acme.dialin_base_flow",
+        "clients.acme",
+        "clients.acme.other.flow_definition",
+    ]
+    for name in names:
+        monkeypatch.setitem(sys.modules, name, ModuleType(name))
+
+    modules = ClientRegistry(clients_dir=tmp_path)._workflow_modules("acme", "intake")
+
+    assert sorted(modules) == sorted(set(names) - {"clients.acme", "clients.acme.other.flow_definition"})
+
+
+SERVICES_YAML = """
+call_type: dialout
+services: {stt: {}, llm: {}, tts: {}, transport: {}}
+"""
+FLOW_MODULE = "clients.acme.intake.flow_definition"
+
+
+class FakeFlowLoader:
+    """Imports a fresh flow module each load, or fails halfway through when `broken`."""
+
+    broken = False
+
+    def __init__(self, organization_slug, client_name):
+        pass
+
+    def load_flow_class(self):
+        module = sys.modules[FLOW_MODULE] = ModuleType(FLOW_MODULE)
+        if self.broken:
+            raise SyntaxError("invalid syntax (flow_definition.py, line 12)")
+        module.IntakeFlow = type("IntakeFlow", (), {"__module__": FLOW_MODULE})
+        return module.IntakeFlow
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    _, client = make_client(tmp_path)
+    (client / "services.yaml").write_text(SERVICES_YAML)
+    monkeypatch.setattr(client_registry, "FlowLoader", FakeFlowLoader)
+    monkeypatch.setattr(FakeFlowLoader, "broken", False)
+    monkeypatch.delitem(sys.modules, FLOW_MODULE, raising=False)
+    yield ClientRegistry(clients_dir=tmp_path, reload_check_interval=0)
+    sys.modules.pop(FLOW_MODULE, None)
+
+
+def test_edited_workflow_is_reloaded(registry, tmp_path):
+    first = registry.get("acme", "intake")
+
+    bump(tmp_path / "acme" / "intake" / "flow_definition.py")
+    second = registry.get("acme", "intake")
+
+    assert second is not first
+    assert second.flow_class is not first.flow_class
+
+
+@pytest.mark.parametrize("break_it", ["yaml", "import"])
+def test_failed_reload_keeps_serving_last_good_entry(registry, tmp_path, monkeypatch, break_it):
+    client = tmp_path / "acme" / "intake"
+    good = registry.get("acme", "intake")
+    good_module = sys.modules[FLOW_MODULE]
+
+    if break_it == "yaml":
+        (client / "services.yaml").write_text("call_type: dialout\nservices: {stt: {}}\n")
+    else:
+        monkeypatch.setattr(FakeFlowLoader, "broken", True)
+    bump(client / "services.yaml")
+
+    assert registry.get("acme", "intake") is good
+    assert ("acme", "intake") in registry._errors
+    assert sys.modules[FLOW_MODULE] is good_module
+
+    # Fixing the files picks up the new version and clears the error
+    (client / "services.yaml").write_text(SERVICES_YAML)
+    monkeypatch.setattr(FakeFlowLoader, "broken", False)
+    bump(client / "flow_definition.py")
+
+    assert registry.get("acme", "intake") is not good
+    assert ("acme", "intake") not in registry._errors
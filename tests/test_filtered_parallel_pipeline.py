@@ -0,0 +1,126 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterruptionFrame,
+    LLMRunFrame,
+    StartFrame,
+    TextFrame,
+    TranscriptionFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline import filtered_parallel_pipeline
+from pipeline.filtered_parallel_pipeline import FilteredParallelPipeline, subscribe
+from pipeline.observer import create_observer_branch
+
+
+class Recorder(FrameProcessor):
+    """Records downstream frames; optionally swallows them (side branches)."""
+
+    def __init__(self, forward: bool = True):
+        super().__init__()
+        self._forward = forward
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            self.frames.append(frame)
+        if self._forward or isinstance(frame, (StartFrame, EndFrame)):
+            await self.push_frame(frame, direction)
+
+
+def labels(frames):
+    out = []
+    for frame in frames:
+        if isinstance(frame, (TextFrame, TranscriptionFrame)):
+            out.append(frame.text)
+        elif isinstance(frame, InputAudioRawFrame):
+            out.append("audio")
+        elif isinstance(frame, InterruptionFrame):
+            out.append("interruption")
+    return out
+
+
+async def run_fanout(interrupt: bool = True):
+    main, side, tail = Recorder(), Recorder(forward=False), Recorder()
+    parallel = FilteredParallelPipeline([main], subscribe([side], TranscriptionFrame))
+    task = PipelineTask(Pipeline([parallel, tail]), cancel_on_idle_timeout=False)
+
+    sent = []
+    for i in range(30):
+        if i % 10 == 5:
+            sent.append(TranscriptionFrame(f"transcript-{i}", "callee", "2026-01-01T00:00:00Z"))
+        elif i == 20 and interrupt:
+            sent.append(InterruptionFrame())
+        elif i % 2:
+            sent.append(TextFrame(f"text-{i}"))
+        else:
+            sent.append(InputAudioRawFrame(audio=bytes(640), sample_rate=16000, num_channels=1))
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        for frame in sent:
+            await task.queue_frame(frame)
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+    return parallel, main, side, tail, labels(sent)
+
+
+async def test_subscribed_branch_gets_lifecycle_and_subscribed_frames_only():
+    parallel, _, side, _, _ = await run_fanout()
+
+    assert any(isinstance(f, StartFrame) for f in side.frames)
+    assert any(isinstance(f, EndFrame) for f in side.frames)
+    received = labels(side.frames)
+    assert [label for label in received if label != "interruption"] == [
+        "transcript-5", "transcript-15", "transcript-25"
+    ]
+    assert received.count("interruption") == 1
+    assert parallel.frames_skipped > 0
+
+
+async def test_main_branch_order_is_unchanged():
+    # No interruption here: it flushes frames still queued in the branches
+    _, main, _, tail, sent = await run_fanout(interrupt=False)
+
+    # Audio is a SystemFrame and may overtake queued data frames in pipecat itself,
+    # so order is compared within data frames and audio is only counted
+    data = [label for label in sent if label != "audio"]
+    for frames in (main.frames, tail.frames):
+        received = labels(frames)
+        assert [label for label in received if label != "audio"] == data
+        assert received.count("audio") == sent.count("audio")
+
+
+def test_installed_pipecat_layout_is_verified():
+    # Fails on a pipecat upgrade: re-check ParallelPipeline internals, then add the version
+    assert filtered_parallel_pipeline.ROUTING_SUPPORTED, filtered_parallel_pipeline._installed_pipecat_version()
+
+
+async def test_observer_branch_keeps_flow_frames_out_when_routing_is_off(monkeypatch):
+    monkeypatch.setattr(filtered_parallel_pipeline, "ROUTING_SUPPORTED", False)
+    consumer = Recorder()
+    branch = create_observer_branch(Recorder(), Recorder(forward=False), consumer)
+    task = PipelineTask(Pipeline([FilteredParallelPipeline([Recorder()], branch)]), cancel_on_idle_timeout=False)
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        await task.queue_frame(LLMRunFrame())
+        await task.queue_frame(TranscriptionFrame("my date of birth is", "callee", "2026-01-01T00:00:00Z"))
+        await asyncio.sleep(0.05)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+
+    assert labels(consumer.frames) == ["my date of birth is"]
+    assert not any(isinstance(f, LLMRunFrame) for f in consumer.frames)
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from pipecat.frames.frames import EndFrame, MetricsFrame, TextFrame, TranscriptionFrame
+from pipecat.processors.frame_processor import FrameDirection
+
+from observers.frame_dispatcher import FrameDispatcher, FrameIdWindow
+
+
+def test_window_reports_first_sighting_only():
+    window = FrameIdWindow(size=4)
+    assert window.first_seen(1)
+    assert not window.first_seen(1)
+    assert window.first_seen(2)
+
+
+def test_window_forgets_oldest_ids_and_stays_bounded():
+    window = FrameIdWindow(size=3)
+    for frame_id in range(10):
+        assert window.first_seen(frame_id)
+        assert len(window) <= 3
+
+    # 7, 8, 9 are still remembered; 6 and older have been evicted
+    assert not window.first_seen(9)
+    assert not window.first_seen(7)
+    assert window.first_seen(6)
+    assert len(window) == 3
+
+
+def pushed(frame, direction=FrameDirection.DOWNSTREAM):
+    return SimpleNamespace(frame=frame, direction=direction, source=None, destination=None)
+
+
+async def test_dedupe_handlers_see_each_frame_once_downstream():
+    dispatcher = FrameDispatcher()
+    first_push, every_hop = [], []
+    dispatcher.subscribe(TextFrame, lambda data: first_push.append(data.frame))
+    dispatcher.subscribe(TextFrame, lambda data: every_hop.append(data.frame), direction=None, dedupe=False)
+
+    frame = TextFrame("hello")
+    for _ in range(3):  # Three processor hops
+        await dispatcher.on_push_frame(pushed(frame))
+    await dispatcher.on_push_frame(pushed(frame, FrameDirection.UPSTREAM))
+
+    assert first_push == [frame]
+    assert len(every_hop) == 4
+
+
+async def test_subclasses_route_and_unsubscribed_frames_are_skipped():
+    dispatcher = FrameDispatcher()
+    texts = []
+    dispatcher.subscribe(TextFrame, lambda data: texts.append(data.frame))
+
+    transcription = TranscriptionFrame("hi", "user", "2026-01-01T00:00:00Z")
+    await dispatcher.on_push_frame(pushed(transcription))
+    await dispatcher.on_push_frame(pushed(MetricsFrame(data=[])))
+
+    assert texts == [transcription]
+    stats = dispatcher.get_stats()
+    assert (stats["frames_observed"], stats["frames_dispatched"]) == (2, 1)
+    # Only frames somebody subscribed to go into the dedup window
+    assert stats["dedup_window_size"] == 1
+
+
+async def test_failing_handler_does_not_stop_others():
+    dispatcher = FrameDispatcher()
+    seen = []
+
+    def broken(data):
+        raise RuntimeError("boom")
+
+    dispatcher.subscribe(EndFrame, broken)
+    dispatcher.subscribe(EndFrame, lambda data: seen.append(data.frame))
+
+    await dispatcher.on_push_frame(pushed(EndFrame()))
+
+    assert len(seen) == 1
+    assert dispatcher.get_stats()["handler_errors"] == 1
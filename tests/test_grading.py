@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from evals import cassette
+from evals.grading import Grader, VerdictCache, verdict_key
+
+
+class FakeMessages:
+    """Anthropic messages endpoint answering PASS after a short delay."""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, model, max_tokens, messages):
+        self.calls.append(messages[0]["content"])
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return SimpleNamespace(content=[SimpleNamespace(text=" PASS - confirmed the appointment \n")])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = VerdictCache(tmp_path / "verdicts.sqlite")
+    yield cache
+    cache.close()
+
+
+def make_grader(cache, **kwargs):
+    grader = Grader(cache=cache, **kwargs)
+    grader.client = SimpleNamespace(messages=FakeMessages())
+    return grader
+
+
+def test_verdict_key_covers_rubric_model_and_prompt():
+    key = verdict_key("lab_results/quality", "model-a", 50, "prompt")
+    assert key == verdict_key("lab_results/quality", "model-a", 50, "prompt")
+    assert key != verdict_key("lab_results/tone", "model-a", 50, "prompt")
+    assert key != verdict_key("lab_results/quality", "model-b", 50, "prompt")
+    assert key != verdict_key("lab_results/quality", "model-a", 100, "prompt")
+    assert key != verdict_key("lab_results/quality", "model-a", 50, "prompt 2")
+
+
+async def test_cached_verdict_is_reused_across_graders(cache):
+    first = make_grader(cache)
+    assert await first.grade("prompt", rubric="quality") == "PASS - confirmed the appointment"
+
+    second = make_grader(cache)
+    assert await second.grade("prompt", rubric="quality") == "PASS - confirmed the appointment"
+    assert await second.grade("other prompt", rubric="quality")
+
+    assert second.client.messages.calls == ["other prompt"]
+    stats = second.stats()
+    assert (stats["cache_hits"], stats["grader_calls"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+async def test_identical_prompts_in_flight_share_one_call():
+    grader = make_grader(None)
+
+    verdicts = await asyncio.gather(*(grader.grade("prompt", rubric="quality") for _ in range(5)))
+
+    assert len(set(verdicts)) == 1
+    assert len(grader.client.messages.calls) == 1
+    assert (grader.shared, grader.grader_calls) == (4, 1)
+    assert grader.by_rubric["quality"] == {"cache_hits": 0, "shared": 4, "grader_calls": 1}
+
+
+async def test_record_mode_skips_cache_reads_and_sharing(cache, monkeypatch):
+    await make_grader(cache).grade("prompt", rubric="quality")
+    monkeypatch.setattr(cassette, "_mode", "record")
+
+    grader = make_grader(cache)
+    await asyncio.gather(grader.grade("prompt", rubric="quality"), grader.grade("prompt", rubric="quality"))
+
+    assert len(grader.client.messages.calls) == 2
+    assert grader.cache_hits == 0
+
+
+async def test_grader_calls_respect_concurrency():
+    grader = make_grader(None, concurrency=2)
+
+    await asyncio.gather(*(grader.grade(f"prompt {i}", rubric="quality") for i in range(6)))
+
+    assert grader.client.messages.peak_in_flight == 2
+    assert grader.grader_calls == 6
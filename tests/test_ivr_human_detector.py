@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+
+from pipecat.frames.frames import EndFrame, TranscriptionFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+
+from pipeline.ivr_human_detector import IVRHumanDetector
+
+
+class FakeCompletions:
+    """Answers CONVERSATION; requests for `slow_text` never complete."""
+
+    def __init__(self, slow_text: str):
+        self.slow_text = slow_text
+        self.started = []
+        self.cancelled = []
+
+    async def create(self, messages, **kwargs):
+        text = messages[-1]["content"]
+        self.started.append(text)
+        if text == self.slow_text:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.append(text)
+                raise
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="CONVERSATION"))])
+
+
+async def test_superseded_request_is_cancelled_through_task_manager():
+    detector = IVRHumanDetector(api_key="test-key")
+    completions = FakeCompletions(slow_text="Hello")
+    detector._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    humans = []
+    leftover = []
+
+    @detector.event_handler("on_human_detected")
+    async def on_human_detected(processor, text):
+        humans.append(text)
+
+    task = PipelineTask(Pipeline([detector]), cancel_on_idle_timeout=False)
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        detector.activate()
+        await task.queue_frame(TranscriptionFrame("Hello", "user", ""))
+        await asyncio.sleep(0.05)
+        await task.queue_frame(TranscriptionFrame("this is Sarah, how can I help you?", "user", ""))
+        await asyncio.sleep(detector.DEBOUNCE_DELAY + 0.2)
+        leftover.extend(
+            t.get_name() for t in detector.task_manager.current_tasks()
+            if t.get_name().endswith(("::_classify", "::_delayed_trigger"))
+        )
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+
+    assert completions.cancelled == ["Hello"]
+    assert detector.cancelled == 1
+    assert humans == ["Hello this is Sarah, how can I help you?"]
+    assert leftover == []
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from pipecat.frames.frames import MetricsFrame
+from pipecat.metrics.metrics import TTFBMetricsData
+from pipecat.services.llm_service import LLMService
+
+from observers.latency_observer import LangfuseLatencyObserver
+from pipeline.speculative_llm import SpeculationMetricsData, SpeculationOutcome
+
+
+def ttfb(observer, service, seconds):
+    frame = MetricsFrame(data=[TTFBMetricsData(processor=service.name, value=seconds)])
+    observer._on_metrics(SimpleNamespace(frame=frame, source=service))
+
+
+def run_turn(observer, metrics):
+    observer._on_user_started(None)
+    observer._on_user_stopped(None)
+    for service, seconds in metrics:
+        ttfb(observer, service, seconds)
+    observer._on_bot_started(None)
+    observer._on_bot_stopped(None)
+
+
+def test_only_the_conversation_llm_counts_as_llm_ttfb():
+    main, classifier, observer_llm = LLMService(), LLMService(), LLMService()
+    observer = LangfuseLatencyObserver(
+        "session", llms={"llm": main, "classifier_llm": classifier, "observer_llm": observer_llm}
+    )
+
+    # Side-branch LLMs report after the conversation LLM in the same turn
+    run_turn(observer, [(main, 0.4), (classifier, 0.1), (observer_llm, 0.9)])
+
+    metrics = observer.get_metrics()
+    assert metrics["turns"][0]["llm_ttfb_ms"] == 400
+    assert set(metrics["side_llm_ttfb"]) == {"classifier_llm", "observer_llm"}
+    assert metrics["side_llm_ttfb"]["observer_llm"]["count"] == 1
+
+
+def test_unregistered_llm_is_recorded_under_its_own_name():
+    main, other = LLMService(), LLMService()
+    observer = LangfuseLatencyObserver("session", llms={"llm": main})
+
+    run_turn(observer, [(main, 0.3), (other, 0.8)])
+
+    metrics = observer.get_metrics()
+    assert metrics["turns"][0]["llm_ttfb_ms"] == 300
+    assert list(metrics["side_llm_ttfb"]) == [other.name]
+
+
+def test_speculation_stats_count_turns_made_slower():
+    observer = LangfuseLatencyObserver("session")
+    outcomes = [(SpeculationOutcome.HIT, 300.0), (SpeculationOutcome.HIT, 200.0), (SpeculationOutcome.TIMEOUT, -450.0)]
+    frame = MetricsFrame(data=[
+        SpeculationMetricsData(processor="speculative", value=value, outcome=outcome) for outcome, value in outcomes
+    ])
+    observer._on_metrics(SimpleNamespace(frame=frame, source=None))
+
+    speculation = observer._speculation_metrics()
+    assert speculation["saved_ms"]["count"] == 2
+    assert speculation["lost_ms"]["count"] == 1
+    assert speculation["net_saved_ms"] == 50
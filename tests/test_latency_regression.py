@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from evals import latency
+from evals.latency import (
+    MIN_SAMPLES,
+    LatencyStore,
+    compare_quantile,
+    compare_workflow,
+    quantile,
+    record_latency,
+)
+
+WORKFLOW = "demo_clinic_alpha/lab_results"
+
+
+def samples(center_ms, n=60, spread_ms=80, seed=1):
+    rng = random.Random(seed)
+    return [rng.gauss(center_ms, spread_ms) for _ in range(n)]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LatencyStore(tmp_path / "latency.sqlite")
+    monkeypatch.setattr(latency, "_store", store)
+    return store
+
+
+def test_quantile_interpolates():
+    assert quantile([], 0.5) == 0.0
+    assert quantile([3, 1, 2], 0.5) == 2
+    assert quantile([0, 10], 0.95) == pytest.approx(9.5)
+
+
+def test_significant_increase_is_a_regression():
+    result = compare_quantile(samples(600), samples(900, seed=2), "p50", 0.5)
+    assert result.regression
+    assert result.delta_ms == pytest.approx(300, abs=60)
+    assert 0 < result.lower_ms < result.delta_ms
+
+
+def test_same_distribution_is_not_a_regression():
+    result = compare_quantile(samples(600), samples(600, seed=2), "p50", 0.5)
+    assert not result.regression
+    assert result.lower_ms <= 0
+
+
+def test_significant_but_small_increase_is_not_a_regression():
+    baseline, candidate = samples(600, spread_ms=5), samples(640, spread_ms=5, seed=2)
+    result = compare_quantile(baseline, candidate, "p50", 0.5, min_delta_ms=100)
+    assert result.lower_ms > 0
+    assert not result.regression
+
+
+def test_bootstrap_is_deterministic_for_a_seed():
+    baseline, candidate = samples(600), samples(700, seed=2)
+    assert compare_quantile(baseline, candidate, "p95", 0.95) == compare_quantile(baseline, candidate, "p95", 0.95)
+
+
+def test_workflow_comparison_against_pinned_baseline(store):
+    store.add("base", WORKFLOW, "s1", latency.TTFB_METRIC, samples(600))
+    store.add("fast", WORKFLOW, "s1", latency.TTFB_METRIC, samples(620, seed=2))
+    store.add("slow", WORKFLOW, "s1", latency.TTFB_METRIC, samples(1000, seed=3))
+
+    assert compare_workflow(store, WORKFLOW, "slow") is None  # Nothing pinned yet
+    store.pin_baseline(WORKFLOW, "base")
+
+    assert compare_workflow(store, WORKFLOW, "fast") is False
+    assert compare_workflow(store, WORKFLOW, "slow") is True
+
+
+def test_too_few_samples_cannot_be_tested(store):
+    store.add("base", WORKFLOW, "s1", latency.TTFB_METRIC, samples(600))
+    store.add("new", WORKFLOW, "s1", latency.TTFB_METRIC, samples(2000, n=MIN_SAMPLES - 1))
+
+    assert compare_workflow(store, WORKFLOW, "new", baseline_sha="base") is None
+
+
+def test_record_latency_stores_samples_under_current_commit(store, monkeypatch):
+    monkeypatch.setattr(latency, "_git_sha", "abc123-dirty")
+
+    record_latency(WORKFLOW, "s1", {"llm_calls": {"samples_ms": [410.5, 388.0]}})
+    record_latency(WORKFLOW, "s2", {"llm_calls": {"samples_ms": []}})
+
+    assert store.samples(WORKFLOW, "abc123-dirty") == [410.5, 388.0]
+    assert store.workflows() == [WORKFLOW]
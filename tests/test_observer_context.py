@@ -0,0 +1,121 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from pipecat.processors.aggregators.llm_context import NOT_GIVEN
+
+from costs.calculator import CostCalculator
+from pipeline.observer import WINDOW_SLIDE_STEP, ObserverContextManager
+
+WINDOW_SIZE = 4
+
+
+class Harness:
+    """Drives an ObserverContextManager turn by turn and keeps every context it pushes."""
+
+    def __init__(self):
+        self.state = {}
+        flow = SimpleNamespace(flow_manager=SimpleNamespace(state=self.state))
+        self.manager = ObserverContextManager(
+            "Extract patient details.", tools=NOT_GIVEN, tool_choice=NOT_GIVEN, flow_ref=flow,
+            extraction_fields=["patient_name", "date_of_birth"], window_size=WINDOW_SIZE,
+        )
+        self.contexts = []
+
+        async def capture(frame, direction=None):
+            self.contexts.append(frame.context.get_messages())
+
+        self.manager.push_frame = capture
+
+    async def turn(self, user_text: str, bot_text: str = "Okay."):
+        # Mirrors ObserverContextManager.process_frame for one exchange
+        self.manager._append_turn("assistant", bot_text)
+        self.manager._append_state_update()
+        self.manager._append_turn("user", user_text)
+        await self.manager._build_and_push_context()
+        return self.contexts[-1]
+
+
+def state_updates(messages):
+    return [
+        json.loads(m["content"].split("```json\n")[1].split("\n```")[0])
+        for m in messages[2:]
+        if m["role"] == "system"
+    ]
+
+
+async def test_consecutive_contexts_share_their_prefix():
+    harness = Harness()
+    previous = await harness.turn("Hi, I'm calling about a patient")
+    harness.state["patient_name"] = "Jane Doe"
+    # Each exchange adds two turns; stop short of the exchange that overflows the window
+    for i in range((WINDOW_SIZE + WINDOW_SLIDE_STEP) // 2 - 2):
+        current = await harness.turn(f"turn {i}")
+        assert current[:len(previous)] == previous
+        previous = current
+
+
+async def test_state_changes_are_appended_as_deltas():
+    harness = Harness()
+    await harness.turn("Hello")
+    harness.state["patient_name"] = "Jane Doe"
+    harness.state["date_of_birth"] = "1980-01-01"
+    await harness.turn("It's Jane Doe, born January first 1980")
+    del harness.state["date_of_birth"]
+    messages = await harness.turn("Sorry, wrong birthday")
+
+    system_prompt, snapshot = messages[0]["content"], messages[1]["content"]
+    assert "Jane Doe" not in system_prompt
+    assert snapshot == "```json\n{}\n```"
+    assert state_updates(messages) == [
+        {"date_of_birth": "1980-01-01", "patient_name": "Jane Doe"},
+        {"date_of_birth": None},
+    ]
+
+
+async def test_window_slides_in_steps_and_rebases_snapshot():
+    harness = Harness()
+    await harness.turn("Hello")
+    harness.state["patient_name"] = "Jane Doe"
+
+    # Each exchange adds two turns; the last one overflows the window by a full step
+    exchanges = (WINDOW_SIZE + WINDOW_SLIDE_STEP) // 2 - 1
+    lengths = [len(await harness.turn(f"turn {i}")) for i in range(exchanges)]
+    messages = harness.contexts[-1]
+
+    assert lengths[:-1] == sorted(lengths[:-1])
+    assert len([m for m in messages if m["role"] != "system"]) == WINDOW_SIZE
+    assert json.loads(messages[1]["content"].strip("`").removeprefix("json\n")) == {"patient_name": "Jane Doe"}
+    assert state_updates(messages) == []
+
+
+@pytest.fixture
+def calculator():
+    return CostCalculator()
+
+
+def test_cached_prompt_tokens_are_billed_at_cached_rate(calculator):
+    uncached = calculator.calculate_llm_cost("openai", "gpt-4o", 1_000_000, 0)
+    half_cached = calculator.calculate_llm_cost("openai", "gpt-4o", 1_000_000, 0, cached_tokens=500_000)
+    assert uncached.cost_usd == pytest.approx(4.25)
+    assert half_cached.cost_usd == pytest.approx(4.25 * 0.75)
+    assert "cached" in half_cached.formula
+
+
+def test_cached_tokens_without_cached_rate_bill_at_input_rate(calculator):
+    plain = calculator.calculate_llm_cost("groq", "llama-3.3-70b-versatile", 10_000, 100)
+    cached = calculator.calculate_llm_cost("groq", "llama-3.3-70b-versatile", 10_000, 100, cached_tokens=5_000)
+    assert cached.cost_usd == pytest.approx(plain.cost_usd)
+
+
+def test_cached_tokens_are_capped_at_prompt_tokens(calculator):
+    result = calculator.calculate_llm_cost("openai", "gpt-4o", 1_000, 0, cached_tokens=5_000)
+    assert result.cost_usd == pytest.approx(1_000 / 1_000_000 * 2.125)
+
+
+def test_session_breakdown_reports_cache_hit_ratio(calculator):
+    usage = {"openai": {"gpt-4o-mini": {"prompt": 2_000, "completion": 100, "cached": 1_500}}}
+    session = calculator.calculate_session_costs(usage, "cartesia", 0, "deepgram", 0, "daily", 0)
+    model = session["usage"]["llm"]["models"]["gpt-4o-mini"]
+    assert session["usage"]["llm"]["cached_tokens"] == 1_500
+    assert model["cache_hit_ratio"] == 0.75
@@ -0,0 +1,103 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline.safety_processors import OutputValidator
+
+
+class SlowVerdictValidator(OutputValidator):
+    """Guard model stand-in whose verdict arrives after the hold-back window."""
+
+    def __init__(self, verdict: bool, delay: float, **kwargs):
+        super().__init__(api_key="test-key", **kwargs)
+        self._verdict = verdict
+        self._delay = delay
+
+    async def _validate(self, text: str):
+        await asyncio.sleep(self._delay)
+        return self._verdict
+
+
+class Collector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+
+async def run_response(validator):
+    collector = Collector()
+    unsafe = []
+
+    @validator.event_handler("on_unsafe_output")
+    async def on_unsafe_output(processor, context):
+        unsafe.append(context)
+
+    task = PipelineTask(Pipeline([validator, collector]), cancel_on_idle_timeout=False)
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        await task.queue_frames([
+            LLMFullResponseStartFrame(),
+            LLMTextFrame("Your refill was sent to the pharmacy today. "),
+            LLMFullResponseEndFrame(),
+        ])
+        await asyncio.sleep(0.3)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+    return collector.frames, unsafe
+
+
+async def test_late_unsafe_verdict_interrupts_the_pipeline():
+    validator = SlowVerdictValidator(verdict=False, delay=0.1, hold_back_ms=0)
+    frames, unsafe = await run_response(validator)
+
+    texts = [i for i, f in enumerate(frames) if isinstance(f, LLMTextFrame)]
+    interruptions = [i for i, f in enumerate(frames) if isinstance(f, InterruptionFrame)]
+    assert texts and interruptions and texts[0] < interruptions[0]
+    assert unsafe == ["Your refill was sent to the pharmacy today."]
+    assert validator.late_unsafe == 1
+
+
+async def test_safe_verdict_does_not_interrupt():
+    validator = SlowVerdictValidator(verdict=True, delay=0.1, hold_back_ms=0)
+    frames, unsafe = await run_response(validator)
+
+    assert not any(isinstance(f, InterruptionFrame) for f in frames)
+    assert any(isinstance(f, LLMTextFrame) for f in frames)
+    assert unsafe == []
+
+
+async def test_zero_hold_back_speaks_before_the_verdict():
+    validator = SlowVerdictValidator(verdict=True, delay=0.1, hold_back_ms=0)
+    await run_response(validator)
+
+    assert validator.released_before_verdict == 1
+    assert validator.hold_ms.max < 50
+
+
+async def test_default_hold_back_drops_unsafe_sentence_before_tts():
+    validator = SlowVerdictValidator(verdict=False, delay=0.1)
+    frames, unsafe = await run_response(validator)
+
+    assert not any(isinstance(f, LLMTextFrame) for f in frames)
+    assert not any(isinstance(f, InterruptionFrame) for f in frames)
+    assert unsafe == ["Your refill was sent to the pharmacy today."]
+    assert validator.blocked == 1
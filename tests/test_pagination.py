@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api import sessions
+from backend.dependencies import (
+    get_audit_logger_dep,
+    get_current_user,
+    get_current_user_organization_id,
+)
+from backend.pagination import (
+    DEFAULT_PAGE_SIZE,
+    InvalidCursorError,
+    apply_cursor,
+    decode_cursor,
+    encode_cursor,
+    split_page,
+)
+
+
+def matches(doc, query):
+    """Evaluate the subset of Mongo query syntax apply_cursor produces."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not doc[key] < condition["$lt"]:
+                return False
+        elif doc[key] != condition:
+            return False
+    return True
+
+
+def newest_first(docs):
+    return sorted(docs, key=lambda d: (d["created_at"], d["_id"]), reverse=True)
+
+
+def make_docs():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    docs = []
+    for i in range(23):
+        # Bulk inserts share created_at, so _id must break ties
+        docs.append({"_id": ObjectId(), "created_at": start + timedelta(seconds=i // 5), "n": i})
+    return docs
+
+
+def page_through(docs, limit, base_query=None):
+    pages, cursor = [], None
+    while True:
+        query = apply_cursor(dict(base_query or {}), cursor)
+        fetched = [d for d in newest_first(docs) if matches(d, query)][: limit + 1]
+        page, cursor = split_page(fetched, limit)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 23, 50])
+def test_pages_cover_every_document_once_in_order(limit):
+    docs = make_docs()
+    pages = page_through(docs, limit)
+
+    seen = [d["_id"] for page in pages for d in page]
+    assert seen == [d["_id"] for d in newest_first(docs)]
+    assert all(len(page) <= limit for page in pages)
+
+
+def test_cursor_keeps_existing_or_clause():
+    docs = make_docs()
+    base = {"$or": [{"n": 1}, {"n": 7}, {"n": 12}, {"n": 20}]}
+    pages = page_through(docs, 2, base)
+
+    assert sorted(d["n"] for page in pages for d in page) == [1, 7, 12, 20]
+
+
+def test_split_page_without_limit_returns_everything():
+    docs = make_docs()
+    assert split_page(docs, None) == (docs, None)
+
+
+def test_cursor_round_trip_keeps_created_at_type():
+    oid = ObjectId()
+    when = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor({"_id": oid, "created_at": when})) == (when, oid)
+    assert decode_cursor(encode_cursor({"_id": oid, "created_at": "2026-03-01"})) == ("2026-03-01", oid)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", encode_cursor({"_id": "x", "created_at": None})])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_session_list_defaults_to_one_page():
+    calls = []
+
+    class FakeSessionDB:
+        async def find_sessions_by_organization(self, org_id, **kwargs):
+            calls.append(kwargs)
+            return [], "next"
+
+    class FakeAuditLogger:
+        async def log_phi_access(self, **kwargs):
+            pass
+
+    app = FastAPI()
+    app.include_router(sessions.router, prefix="/sessions")
+    app.dependency_overrides.update({
+        get_current_user: lambda: {"sub": "user-1"},
+        get_current_user_organization_id: lambda: "org-1",
+        sessions.get_session_db: FakeSessionDB,
+        get_audit_logger_dep: FakeAuditLogger,
+    })
+
+    response = TestClient(app).get("/sessions")
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] == "next"
+    assert calls[0]["limit"] == DEFAULT_PAGE_SIZE
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from loguru import logger
+
+from evals import grading
+from evals.parallel import (
+    ScenarioJob,
+    merge_run_files,
+    parse_shard,
+    patient_lock_key,
+    run_scenarios,
+    select_shard,
+    write_run_file,
+)
+
+
+@pytest.fixture(autouse=True)
+def grader(monkeypatch):
+    # run_scenarios prints the grader summary; keep the verdict cache out of the repo
+    monkeypatch.setenv("EVAL_GRADER_CACHE", "off")
+    monkeypatch.setattr(grading, "_grader", None)
+
+
+def job(scenario_id, lock_key=None, run=None, suite="alpha/lab_results"):
+    async def passing(scenario_id):
+        await asyncio.sleep(0.01)
+        return {"scenario_id": scenario_id, "grade": {"pass": True, "reason": ""}}
+    return ScenarioJob(suite, scenario_id, run or passing, lock_key)
+
+
+def test_patient_lock_key_normalizes_phone_numbers():
+    assert patient_lock_key({"patient": {"phone_number": "+1 (555) 010-2000"}}) == "phone:15550102000"
+    assert patient_lock_key({"patient": {}}) is None
+    assert patient_lock_key({}) is None
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "2", "a/b"])
+def test_parse_shard_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_shards_cover_every_job_once_and_keep_lock_groups_together():
+    jobs = [job(f"s{i}", lock_key=f"phone:{i % 3}" if i % 2 else None) for i in range(11)]
+
+    shards = [select_shard(jobs, index, 3) for index in range(1, 4)]
+
+    assigned = [j.scenario_id for shard in shards for j in shard]
+    assert sorted(assigned) == sorted(j.scenario_id for j in jobs)
+    for key in {j.lock_key for j in jobs if j.lock_key}:
+        assert sum(any(j.lock_key == key for j in shard) for shard in shards) == 1
+
+
+async def test_concurrency_cap_and_lock_keys_are_respected(tmp_path):
+    active, peak, holders = set(), [0], {}
+
+    def tracked(lock_key):
+        async def run(scenario_id):
+            assert holders.setdefault(lock_key, scenario_id) == scenario_id, "lock key overlap"
+            active.add(scenario_id)
+            peak[0] = max(peak[0], len(active))
+            await asyncio.sleep(0.02)
+            active.discard(scenario_id)
+            del holders[lock_key]
+            return {"grade": {"pass": True}}
+        return run
+
+    jobs = [job(f"s{i}", lock_key=f"phone:{i % 2}", run=tracked(f"phone:{i % 2}")) for i in range(6)]
+    jobs += [job(f"free{i}", run=tracked(f"free{i}")) for i in range(4)]
+
+    outcomes = await run_scenarios(jobs, concurrency=3, log_dir=tmp_path)
+
+    assert [o.scenario_id for o in outcomes] == [j.scenario_id for j in jobs]
+    assert all(o.passed for o in outcomes)
+    assert peak[0] == 3
+
+
+async def test_failing_scenario_is_reported_not_raised(tmp_path):
+    async def broken(scenario_id):
+        print("seeding patient")
+        raise RuntimeError("flow crashed")
+
+    outcomes = await run_scenarios([job("ok"), job("broken", run=broken)], concurrency=2, log_dir=tmp_path)
+
+    ok, failed = outcomes
+    assert ok.passed and ok.error is None
+    assert not failed.passed
+    assert failed.error == "RuntimeError: flow crashed"
+    assert "flow crashed" in failed.record()["reason"]
+    # Concurrent runs keep each scenario's output in its own log
+    log = open(failed.log_file).read()
+    assert "seeding patient" in log and "Traceback" in log
+
+
+async def test_concurrent_run_keeps_the_runners_log_handlers(tmp_path):
+    runner_records = []
+    handler_id = logger.add(lambda message: runner_records.append(message.record["message"]), level="INFO")
+
+    async def logging_run(scenario_id):
+        logger.info(f"checking eligibility for {scenario_id}")
+        return {"grade": {"pass": True}}
+
+    try:
+        outcomes = await run_scenarios([job("a", run=logging_run), job("b")], concurrency=2, log_dir=tmp_path)
+        logger.info("run finished")
+    finally:
+        logger.remove(handler_id)
+
+    assert "checking eligibility for a" in open(outcomes[0].log_file).read()
+    assert runner_records == ["checking eligibility for a", "run finished"]
+
+
+async def test_shard_run_files_merge(tmp_path):
+    started = datetime(2026, 1, 1, 9, 0, 0)
+    paths = []
+    for index, ids in ((1, ["b", "c"]), (2, ["a"])):
+        outcomes = await run_scenarios([job(i) for i in ids], concurrency=1)
+        paths.append(write_run_file(outcomes, started, elapsed_s=10 * index, shard=(index, 2), runs_dir=tmp_path))
+
+    merged = json.loads(merge_run_files(paths).read_text())
+
+    assert [r["scenario_id"] for r in merged["scenarios"]] == ["a", "b", "c"]
+    assert merged["shards"] == ["1/2", "2/2"]
+    assert merged["elapsed_s"] == 20
+    assert merged["summary"]["passed"] == 3
@@ -0,0 +1,61 @@
+import threading
+
+from bson import ObjectId
+
+from backend.services.patient_import import PatientImporter, dedup_key
+
+ORG_ID = str(ObjectId())
+
+
+def test_rows_differing_only_in_discriminator_get_different_keys():
+    base = {"workflow": "prescription_status", "patient_name": "Jane Doe", "date_of_birth": "1980-01-01"}
+    lisinopril = dedup_key({**base, "medication_name": "Lisinopril"})
+    metformin = dedup_key({**base, "medication_name": "Metformin"})
+    assert lisinopril != metformin
+
+    labs = {"workflow": "lab_results", "patient_name": "Jane Doe", "date_of_birth": "1980-01-01"}
+    assert dedup_key({**labs, "test_type": "CBC"}) != dedup_key({**labs, "test_type": "Lipid panel"})
+
+
+def test_reupload_of_same_row_gets_same_key():
+    row = {"workflow": "lab_results", "patient_name": "Jane Doe", "test_type": "CBC"}
+    assert dedup_key(row) == dedup_key({**row, "patient_name": " jane doe ", "results_status": "Pending"})
+
+
+def test_unlisted_workflow_keys_on_all_row_fields():
+    row = {"workflow": "custom_intake", "patient_name": "Jane Doe", "visit_reason": "Annual"}
+    assert dedup_key(row) != dedup_key({**row, "visit_reason": "Follow-up"})
+
+
+def test_row_without_key_fields_has_no_key():
+    assert dedup_key({"workflow": "eligibility_verification"}) is None
+    assert dedup_key({"workflow": "lab_results", "patient_name": "", "results_status": "Pending"}) is None
+
+
+class FakePatientDB:
+    def __init__(self):
+        self.inserted = []
+
+    async def insert_patients(self, patients):
+        for patient in patients:
+            patient["_id"] = ObjectId()
+        self.inserted.extend(patients)
+        return {}
+
+
+async def test_ingest_reads_rows_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    reading_threads = set()
+
+    def rows():
+        for i in range(5):
+            reading_threads.add(threading.get_ident())
+            yield {"patient_name": f"Patient {i}"} if i else {}
+
+    db = FakePatientDB()
+    importer = await PatientImporter(db, ORG_ID, default_workflow="lab_results", chunk_size=2).ingest(rows())
+
+    assert loop_thread not in reading_threads
+    assert importer.success_count == 5
+    assert "dedup_key" not in db.inserted[0]
+    assert all("dedup_key" in patient for patient in db.inserted[1:])
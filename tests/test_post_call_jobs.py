@@ -0,0 +1,215 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import post_call_jobs
+from backend.post_call_jobs import (
+    LEASE_SECONDS,
+    MAX_ATTEMPTS,
+    POST_CALL_JOBS_COLLECTION,
+    JobType,
+    PermanentJobError,
+    PostCallJobWorker,
+    enqueue_post_call_jobs,
+    job_id,
+)
+from backend.webhook_delivery import BACKOFF_BASE_SECONDS
+from handlers import post_call
+
+SESSION_ID = "session-1"
+
+
+class FakeJobs:
+    """In-memory post_call_jobs collection covering the operations the queue uses."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            if op._filter["_id"] not in self.docs:
+                self.docs[op._filter["_id"]] = {"_id": op._filter["_id"], **op._doc["$setOnInsert"]}
+
+    async def find_one_and_update(self, query, update, sort, return_document):
+        due = [
+            d for d in self.docs.values()
+            if d["status"] in query["status"]["$in"] and d["next_attempt_at"] <= query["next_attempt_at"]["$lte"]
+        ]
+        if not due:
+            return None
+        doc = min(due, key=lambda d: d["next_attempt_at"])
+        doc.update(update["$set"])
+        for key, n in update["$inc"].items():
+            doc[key] = doc.get(key, 0) + n
+        return dict(doc)
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["_id"])
+        if doc is None or any(doc.get(field) != value for field, value in query.items()):
+            return
+        doc.update(update["$set"])
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+
+
+@pytest.fixture
+def jobs():
+    return FakeJobs()
+
+
+@pytest.fixture
+def worker(jobs):
+    return PostCallJobWorker(db={POST_CALL_JOBS_COLLECTION: jobs})
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Replaces the save_call_data handler; set .error to make attempts fail."""
+
+    class Handler:
+        error = None
+        calls = 0
+
+        async def __call__(self, job, http):
+            self.calls += 1
+            if self.error:
+                raise self.error
+            return {"saved": ["call_transcript"]}
+
+    fake = Handler()
+    monkeypatch.setitem(post_call_jobs.JOB_HANDLERS, JobType.SAVE_CALL_DATA, fake)
+    return fake
+
+
+async def enqueue(jobs, payload=None):
+    queued = [(JobType.SAVE_CALL_DATA, payload or {"transcript": "[]"})]
+    return await enqueue_post_call_jobs(SESSION_ID, "org-1", queued, db={POST_CALL_JOBS_COLLECTION: jobs})
+
+
+async def test_enqueueing_the_same_job_twice_is_a_no_op(jobs):
+    assert await enqueue(jobs, {"transcript": "first"})
+    assert await enqueue(jobs, {"transcript": "second"})
+
+    (doc,) = jobs.docs.values()
+    assert doc["_id"] == job_id(SESSION_ID, JobType.SAVE_CALL_DATA)
+    assert doc["payload"] == {"transcript": "first"}
+    assert (doc["status"], doc["attempts"]) == ("pending", 0)
+
+
+async def test_enqueue_reports_unreachable_queue():
+    class Broken:
+        async def bulk_write(self, ops, ordered=True):
+            raise ConnectionError("mongo down")
+
+    assert not await enqueue(Broken())
+
+
+async def test_claimed_job_is_leased_until_done(jobs, worker, handler):
+    await enqueue(jobs)
+    before = datetime.now(timezone.utc)
+
+    job = await worker._claim()
+    assert job["attempts"] == 1
+    assert job["next_attempt_at"] >= before + timedelta(seconds=LEASE_SECONDS - 1)
+    assert await worker._claim() is None
+
+    await worker._execute(job)
+
+    doc = jobs.docs[job["_id"]]
+    assert doc["status"] == "done"
+    assert doc["result"] == {"saved": ["call_transcript"]}
+    assert "payload" not in doc  # Transcript dropped once the job has run
+    assert worker.stats()["by_type"][JobType.SAVE_CALL_DATA]["completed"] == 1
+
+
+async def test_expired_lease_is_reclaimed(jobs, worker):
+    await enqueue(jobs)
+    job = await worker._claim()
+    jobs.docs[job["_id"]]["next_attempt_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    reclaimed = await worker._claim()
+
+    assert reclaimed["_id"] == job["_id"]
+    assert reclaimed["attempts"] == 2
+
+
+async def test_stale_worker_cannot_overwrite_reclaimed_attempt(jobs, worker, handler):
+    await enqueue(jobs)
+    stale = await worker._claim()
+    jobs.docs[stale["_id"]]["next_attempt_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+    current = await worker._claim()
+
+    await worker._execute(stale)  # Lease ran out; its result must not land
+    assert jobs.docs[stale["_id"]]["status"] == "in_flight"
+
+    handler.error = RuntimeError("boom")
+    await worker._execute(current)
+    assert jobs.docs[stale["_id"]]["status"] == "pending"
+
+
+async def test_failed_attempt_is_retried_with_backoff(jobs, worker, handler):
+    await enqueue(jobs)
+    handler.error = RuntimeError("session update failed")
+    before = datetime.now(timezone.utc)
+
+    await worker._execute(await worker._claim())
+
+    doc = jobs.docs[job_id(SESSION_ID, JobType.SAVE_CALL_DATA)]
+    assert doc["status"] == "pending"
+    assert doc["last_error"] == "session update failed"
+    delay = (doc["next_attempt_at"] - before).total_seconds()
+    assert 0.8 * BACKOFF_BASE_SECONDS <= delay <= 1.2 * BACKOFF_BASE_SECONDS + 1
+    assert worker.stats()["by_type"][JobType.SAVE_CALL_DATA]["retried"] == 1
+
+
+@pytest.mark.parametrize("error,attempts", [
+    (PermanentJobError("patient not found"), 1),
+    (RuntimeError("still failing"), MAX_ATTEMPTS),
+    (asyncio.TimeoutError(), MAX_ATTEMPTS),
+])
+async def test_permanent_or_exhausted_failures_are_final(jobs, worker, handler, error, attempts):
+    await enqueue(jobs)
+    handler.error = error
+    job = await worker._claim()
+    job["attempts"] = jobs.docs[job["_id"]]["attempts"] = attempts
+
+    await worker._execute(job)
+
+    doc = jobs.docs[job["_id"]]
+    assert doc["status"] == "failed"
+    assert "completed_at" in doc
+    assert doc["last_error"]
+    assert "payload" not in doc
+    assert worker.stats()["by_type"][JobType.SAVE_CALL_DATA]["failed"] == 1
+
+
+async def test_outcome_is_not_recorded_once_the_job_left_in_flight(jobs, worker, handler):
+    await enqueue(jobs)
+    job = await worker._claim()
+    jobs.docs[job["_id"]]["status"] = "done"  # Another instance finished it first
+
+    handler.error = RuntimeError("boom")
+    await worker._execute(job)
+
+    assert jobs.docs[job["_id"]]["status"] == "done"
+
+
+async def test_buffered_patient_fields_are_written_before_jobs_are_queued(monkeypatch):
+    events = []
+
+    class Writer:
+        async def flush(self, reason):
+            events.append(("flush", reason))
+
+    async def enqueue(session_id, organization_id, jobs):
+        events.append(("enqueue", [job_type for job_type, _ in jobs]))
+        return True
+
+    monkeypatch.setattr(post_call, "enqueue_post_call_jobs", enqueue)
+    queued = await post_call.queue_post_call_jobs(
+        SESSION_ID, "org-1", [(JobType.FINAL_EXTRACTION, {})], state_writer=Writer()
+    )
+
+    assert queued
+    assert events == [("flush", "post_call"), ("enqueue", [JobType.FINAL_EXTRACTION])]
@@ -0,0 +1,67 @@
+import pytest
+
+from evals.safety.train_prescreen import leave_one_out, load_examples, to_model_examples
+from pipeline.safety_prescreen import (
+    EMERGENCY,
+    MODEL_LABELS,
+    OK,
+    STAFF_REQUEST,
+    SafetyPreScreen,
+    match_lexicons,
+)
+from pipeline.triage_prefilter import NaiveBayesTriageModel
+
+
+@pytest.fixture(scope="module")
+def prescreen():
+    return SafetyPreScreen()
+
+
+def test_shipped_model_escalates_every_risk_scenario(prescreen):
+    assert prescreen.model is not None
+    missed = [
+        text for text, expected in load_examples()
+        if expected != OK and not prescreen.screen(text).escalate
+    ]
+    assert missed == []
+
+
+def test_leave_one_out_keeps_full_recall(capsys):
+    assert leave_one_out(load_examples())
+
+
+@pytest.mark.parametrize("text,label", [
+    ("My chest feels tight", EMERGENCY),
+    ("He fell and can't get up", EMERGENCY),
+    ("Can I talk to a real person?", STAFF_REQUEST),
+])
+def test_lexicon_hits_always_escalate(text, label):
+    assert match_lexicons(text) == label
+    # Even a model that has only ever seen benign text cannot screen these out
+    benign_only = NaiveBayesTriageModel.train([(text, OK)], labels=MODEL_LABELS)
+    result = SafetyPreScreen(benign_only).screen(text)
+    assert (result.escalate, result.reason, result.signal) == (True, "lexicon", label)
+
+
+def test_blood_test_talk_is_not_a_bleeding_signal():
+    assert match_lexicons("I'm calling about my blood test results") is None
+
+
+def test_unknown_vocabulary_escalates():
+    model = NaiveBayesTriageModel.train(
+        to_model_examples([("reschedule my appointment", OK), ("my chest hurts", EMERGENCY)]),
+        labels=MODEL_LABELS,
+    )
+    result = SafetyPreScreen(model).screen("xyzzy plugh")
+    assert (result.escalate, result.reason) == (True, "unknown")
+
+
+def test_routine_request_is_screened_out(prescreen):
+    result = prescreen.screen("I need to reschedule my appointment for next Tuesday")
+    assert (result.escalate, result.reason) == (False, "screened")
+
+
+def test_missing_model_escalates_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr("pipeline.safety_prescreen.MODEL_PATH", tmp_path / "missing.json")
+    result = SafetyPreScreen().screen("I need to reschedule my appointment")
+    assert (result.escalate, result.reason) == (True, "no_model")
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InterruptionFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    MetricsFrame,
+    TextFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline.speculative_llm import (
+    SpeculationMetricsData,
+    SpeculationOutcome,
+    SpeculativeLLMProcessor,
+)
+
+
+def text_chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text, tool_calls=None))])
+
+
+def tool_chunk():
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=None, tool_calls=[{}]))])
+
+
+class FakeLLM:
+    """Streams scripted chunks, `delay` seconds apart."""
+
+    name = "FakeLLM"
+    model_name = "fake"
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def get_llm_adapter(self):
+        return SimpleNamespace(get_llm_invocation_params=lambda context: {})
+
+    async def get_chat_completions(self, params):
+        async def stream():
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield chunk
+        return stream()
+
+
+class Collector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+        self.times = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            self.frames.append(frame)
+            self.times.append(time.perf_counter())
+        await self.push_frame(frame, direction)
+
+
+async def run_turn(
+    llm, *, speculated="Hi there", confirmed="Hi there.", after_context=(), settle=0.05,
+    ttfb_estimate=None, collector=None, metrics=None,
+):
+    """Speculate on `speculated`, confirm the turn with `confirmed` and return (frames, outcomes).
+
+    after_context: frames to queue after the LLMContextFrame; a float sleeps that long.
+    metrics: list to extend with the SpeculationMetricsData pushed.
+    """
+    context = LLMContext(messages=[{"role": "system", "content": "You are a receptionist."}])
+    processor = SpeculativeLLMProcessor(llm=llm, context=context)
+    processor._ttfb_estimate = ttfb_estimate
+    collector = collector or Collector()
+    task = PipelineTask(Pipeline([processor, collector]), cancel_on_idle_timeout=False)
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        await processor._start(speculated)
+        await asyncio.sleep(0.01)
+        context.add_message({"role": "user", "content": confirmed})
+        await task.queue_frame(LLMContextFrame(context=context))
+        for frame in after_context:
+            if isinstance(frame, float):
+                await asyncio.sleep(frame)
+            else:
+                await task.queue_frame(frame)
+        await asyncio.sleep(settle)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+    pushed = [
+        data
+        for frame in collector.frames if isinstance(frame, MetricsFrame)
+        for data in frame.data if isinstance(data, SpeculationMetricsData)
+    ]
+    if metrics is not None:
+        metrics.extend(pushed)
+    outcomes = [data.outcome for data in pushed]
+    frames = [f for f in collector.frames if not isinstance(f, MetricsFrame)]
+    return frames, outcomes
+
+
+def of_type(frames, frame_type):
+    return [f for f in frames if isinstance(f, frame_type)]
+
+
+async def test_text_answer_is_committed_instead_of_llm_request():
+    frames, outcomes = await run_turn(FakeLLM([text_chunk("Hello, "), text_chunk("how can I help?")]))
+
+    assert not of_type(frames, LLMContextFrame)
+    assert "".join(f.text for f in of_type(frames, LLMTextFrame)) == "Hello, how can I help?"
+    assert len(of_type(frames, LLMFullResponseStartFrame)) == 1
+    assert len(of_type(frames, LLMFullResponseEndFrame)) == 1
+    assert outcomes == [SpeculationOutcome.HIT]
+
+
+async def test_tool_call_hands_turn_to_real_llm_without_speaking():
+    frames, outcomes = await run_turn(FakeLLM([tool_chunk()]))
+
+    assert len(of_type(frames, LLMContextFrame)) == 1
+    assert not of_type(frames, LLMTextFrame)
+    assert not of_type(frames, LLMFullResponseStartFrame)
+    assert outcomes == [SpeculationOutcome.TOOL_CALL]
+
+
+async def test_tool_call_after_text_hands_turn_to_real_llm_without_speaking():
+    frames, outcomes = await run_turn(FakeLLM([text_chunk("Let me check. "), tool_chunk(), text_chunk("ignored")]))
+
+    assert len(of_type(frames, LLMContextFrame)) == 1
+    assert not of_type(frames, LLMTextFrame)
+    assert not of_type(frames, LLMFullResponseStartFrame)
+    assert outcomes == [SpeculationOutcome.TEXT_THEN_TOOL]
+
+
+async def test_text_is_held_until_speculation_ends():
+    collector = Collector()
+    chunks = [text_chunk("Hello, "), text_chunk("how "), text_chunk("can "), text_chunk("I help?")]
+    await run_turn(FakeLLM(chunks, delay=0.1), collector=collector, settle=0.5)
+
+    texts = [t for f, t in zip(collector.frames, collector.times) if isinstance(f, LLMTextFrame)]
+    assert len(texts) == 4
+    assert texts[-1] - texts[0] < 0.05
+
+
+async def test_missing_first_token_falls_back_after_one_ttfb():
+    metrics = []
+    llm = FakeLLM([text_chunk("Hello")], delay=0.3)
+    frames, outcomes = await run_turn(llm, ttfb_estimate=0.05, metrics=metrics, settle=0.4)
+
+    assert len(of_type(frames, LLMContextFrame)) == 1
+    assert not of_type(frames, LLMTextFrame)
+    assert outcomes == [SpeculationOutcome.TIMEOUT]
+    assert -150 < metrics[0].value <= -50
+
+
+async def test_hit_records_first_token_time_saved():
+    metrics = []
+    await run_turn(FakeLLM([text_chunk("Hello")]), ttfb_estimate=0.2, metrics=metrics)
+
+    assert [m.outcome for m in metrics] == [SpeculationOutcome.HIT]
+    # The answer was ready at the commit; a fresh request would have needed most of one TTFB
+    assert 50 < metrics[0].value <= 200
+
+
+async def test_mismatched_transcript_goes_to_real_llm():
+    frames, outcomes = await run_turn(FakeLLM([text_chunk("Hello")]), confirmed="Hi there, I need a refill.")
+
+    assert len(of_type(frames, LLMContextFrame)) == 1
+    assert not of_type(frames, LLMTextFrame)
+    assert outcomes == [SpeculationOutcome.MISMATCH]
+
+
+async def test_commit_does_not_block_later_frames():
+    llm = FakeLLM([text_chunk("Hello, "), text_chunk("how can I help?")], delay=0.1)
+    frames, outcomes = await run_turn(llm, after_context=[TextFrame("later")], settle=0.4)
+
+    later = next(i for i, f in enumerate(frames) if isinstance(f, TextFrame) and f.text == "later")
+    start = next(i for i, f in enumerate(frames) if isinstance(f, LLMFullResponseStartFrame))
+    assert later < start
+    assert outcomes == [SpeculationOutcome.HIT]
+
+
+async def test_interruption_cancels_pending_commit():
+    llm = FakeLLM([text_chunk("Hello, "), text_chunk("how can I help?")], delay=0.1)
+    frames, outcomes = await run_turn(llm, after_context=[0.05, InterruptionFrame()], settle=0.4)
+
+    assert not of_type(frames, LLMTextFrame)
+    assert not of_type(frames, LLMContextFrame)
+    assert outcomes == [SpeculationOutcome.RESUMED]
@@ -0,0 +1,98 @@
+import pytest
+
+from clients.demo_clinic_beta.patient_scheduling.flow_definition import PatientSchedulingFlow
+from handlers import state_writer
+from handlers.state_writer import CallStateWriter
+
+PATIENT_ID = "patient-1"
+
+
+class FakePatientDB:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.writes = []
+
+    async def update_patient(self, patient_id, fields, organization_id=None):
+        self.writes.append((patient_id, fields))
+        return self.ok
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakePatientDB()
+    monkeypatch.setattr(state_writer, "get_async_patient_db", lambda: fake)
+    return fake
+
+
+async def test_buffer_maps_update_methods_to_fields(db):
+    writer = CallStateWriter("org-1", flush_interval=60)
+
+    assert writer.buffer("update_field", PATIENT_ID, "member_id", "A1")
+    assert writer.buffer("update_fields", PATIENT_ID, {"plan": "PPO"})
+    assert writer.buffer("update_patient", PATIENT_ID, {"member_id": "A2", "call_status": "Completed"})
+    assert writer.pending_fields == 3
+
+    assert await writer.flush("test")
+    assert db.writes == [(PATIENT_ID, {"member_id": "A2", "plan": "PPO", "call_status": "Completed"})]
+
+
+async def test_buffer_rejects_non_set_methods(db):
+    writer = CallStateWriter("org-1", flush_interval=60)
+
+    assert not writer.buffer("update_call_status", PATIENT_ID, "Completed")
+    assert writer.pending_fields == 0
+
+
+async def test_flush_reports_failed_write(db):
+    db.ok = False
+    writer = CallStateWriter("org-1", flush_interval=60)
+    writer.buffer("update_field", PATIENT_ID, "member_id", "A1")
+
+    assert not await writer.flush("test")
+    assert writer.pending_fields == 1  # Kept for retry
+    await writer.close()
+
+
+class FakeFlowManager:
+    def __init__(self):
+        self.state = {"first_name": "Ada", "last_name": "Lovelace", "appointment_date": "2026-11-02"}
+
+
+def booking_flow(writer):
+    flow_manager = FakeFlowManager()
+    flow = PatientSchedulingFlow(
+        call_data={"patient_id": PATIENT_ID}, session_id="s1", flow_manager=flow_manager,
+        main_llm=None, organization_id="org-1",
+    )
+    flow.state_writer = writer
+    return flow, flow_manager
+
+
+async def test_booking_is_written_through(db):
+    writer = CallStateWriter("org-1", flush_interval=60)
+    flow, flow_manager = booking_flow(writer)
+
+    message, _ = await flow._confirm_booking_handler({}, flow_manager)
+
+    assert message == "Appointment booked successfully!"
+    assert writer.pending_fields == 0
+    assert db.writes[0][1]["call_status"] == "Completed"
+
+
+async def test_failed_booking_write_apologizes(db):
+    db.ok = False
+    writer = CallStateWriter("org-1", flush_interval=60)
+    flow, flow_manager = booking_flow(writer)
+
+    message, _ = await flow._confirm_booking_handler({}, flow_manager)
+
+    assert message.startswith("I apologize")
+    await writer.close()
+
+
+async def test_flow_without_writer_writes_through(db):
+    flow, _ = booking_flow(None)
+
+    assert await flow._try_db_update(PATIENT_ID, "update_patient", {"member_id": "A1"})
+    assert await flow._flush_state("test")
+    assert db.writes == [(PATIENT_ID, {"member_id": "A1"})]
@@ -0,0 +1,82 @@
+import asyncio
+
+from pipecat.frames.frames import EndFrame, Frame, TextFrame, TranscriptionFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from pipeline.triage_detector import TriageDetector
+
+HUMAN_OPENER = "Provider services, this is Amanda, how can I help?"
+
+
+class FakeClassifierLLM(FrameProcessor):
+    """Stands in for the classifier LLM; the local pre-classifier decides before it is needed."""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class Collector(FrameProcessor):
+    """Records numbered TextFrames in the given direction."""
+
+    def __init__(self, direction: FrameDirection):
+        super().__init__()
+        self._direction = direction
+        self.received = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == self._direction and type(frame) is TextFrame:
+            self.received.append(frame.text)
+        await self.push_frame(frame, direction)
+
+
+class Echo(FrameProcessor):
+    """Sends an upstream copy of every numbered downstream TextFrame."""
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM and type(frame) is TextFrame:
+            await self.push_frame(TextFrame(f"up-{frame.text}"), FrameDirection.UPSTREAM)
+
+
+def assert_contiguous_suffix(received, sent):
+    """Frames dropped by the closed gate are fine; once frames flow, none may be lost, duplicated or reordered."""
+    assert received, "no frames came through after the decision"
+    start = sent.index(received[0])
+    assert received == sent[start:]
+
+
+async def test_collapse_to_passthrough_keeps_frame_order():
+    detector = TriageDetector(
+        classifier_llm=FakeClassifierLLM(),
+        classifier_prompt="Classify the call.",
+    )
+    upstream = Collector(FrameDirection.UPSTREAM)
+    downstream = Collector(FrameDirection.DOWNSTREAM)
+    task = PipelineTask(Pipeline([upstream, detector, downstream, Echo()]), cancel_on_idle_timeout=False)
+
+    sent = [str(i) for i in range(400)]
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        for i, text in enumerate(sent):
+            if i == 50:
+                await task.queue_frame(TranscriptionFrame(HUMAN_OPENER, "callee", "2026-01-01T00:00:00Z"))
+            await task.queue_frame(TextFrame(text))
+            if i % 10 == 0:
+                await asyncio.sleep(0.001)
+        await asyncio.sleep(0.2)
+        await task.queue_frame(EndFrame())
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+
+    assert detector.is_passthrough
+    assert_contiguous_suffix(downstream.received, sent)
+    assert_contiguous_suffix(upstream.received, [f"up-{text}" for text in sent])
+    # The collapse happened while frames were flowing, not after the last one
+    assert len(downstream.received) > 300
@@ -0,0 +1,64 @@
+import pytest
+
+from pipeline.triage_prefilter import (
+    CONVERSATION,
+    IVR,
+    VOICEMAIL,
+    NaiveBayesTriageModel,
+    TriagePreFilter,
+)
+
+
+@pytest.fixture(scope="module")
+def prefilter():
+    return TriagePreFilter()
+
+
+@pytest.mark.parametrize("text", [
+    "Hi, this is Sarah, I can't come to the phone right now.",
+    "This is Blue Cross Blue Shield, all of our representatives are busy.",
+    "Thank you for calling Cigna. This is Cigna provider services, how can I help you today?",
+    "Hello, you have reached Aetna. It's Monday, our offices are closed.",
+    "Hi, this is Dan, how can I help? Sorry I missed your call, I'll call you back.",
+])
+def test_recorded_greetings_are_not_conversation(prefilter, text):
+    assert prefilter.classify(text).label != CONVERSATION
+
+
+@pytest.mark.parametrize("text", ["Hello", "Hello?", "Hi.", "Yes", "Yeah", "Speaking."])
+def test_bare_greetings_defer_to_llm(prefilter, text):
+    assert prefilter.classify(text).label is None
+
+
+@pytest.mark.parametrize("text", [
+    "Provider services, this is Amanda, how can I help?",
+    "Cigna eligibility, Amanda speaking, how may I help you?",
+    "Good morning, my name is David, what can I do for you?",
+])
+def test_named_person_offering_help_is_conversation(prefilter, text):
+    assert prefilter.classify(text).label == CONVERSATION
+
+
+@pytest.mark.parametrize("text,label", [
+    ("For claims, press 1. For eligibility, press 2.", IVR),
+    ("Please leave a message after the tone.", VOICEMAIL),
+])
+def test_phrase_rules(prefilter, text, label):
+    assert prefilter.classify(text).label == label
+
+
+def test_ivr_phrasing_with_human_cues_defers(prefilter):
+    text = "Thank you for holding, please hold, how may I direct your call?"
+    assert prefilter.classify(text).label is None
+
+
+def test_model_round_trip():
+    model = NaiveBayesTriageModel.train([
+        ("press one for claims press two for billing", IVR),
+        ("leave a message after the beep", VOICEMAIL),
+        ("hi this is jane how can i help", CONVERSATION),
+    ])
+    restored = NaiveBayesTriageModel.from_dict(model.to_dict())
+    text = "press one for billing"
+    assert restored.predict(text) == model.predict(text)
+    assert model.predict(text)[0] == IVR
@@ -0,0 +1,177 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    EndFrame,
+    Frame,
+    TTSSpeakFrame,
+    TTSStoppedFrame,
+    TTSTextFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from services import tts_cache
+from services.service_factory import ServiceFactory
+from services.tts_cache import (
+    CachedCartesiaTTSService,
+    PhraseAudioCache,
+    cache_key,
+    phrase_allowlist,
+    workflow_phrases,
+)
+
+RENDER_PARAMS = {"voice_id": "voice-a", "model": "sonic-2"}
+
+
+class OfflineCachedTTS(CachedCartesiaTTSService):
+    """Cached TTS with the Cartesia websocket left unopened."""
+
+    async def _connect(self):
+        pass
+
+    async def _disconnect(self):
+        pass
+
+
+class Collector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+
+def test_cache_key_changes_with_voice_and_config_but_not_whitespace():
+    key = cache_key("voice-a", "sonic-2", {"speed": 1.0}, 24000, "Take care!")
+
+    assert key == cache_key("voice-a", "sonic-2", {"speed": 1.0}, 24000, "  Take   care! ")
+    assert key != cache_key("voice-b", "sonic-2", {"speed": 1.0}, 24000, "Take care!")
+    assert key != cache_key("voice-a", "sonic-2", {"speed": 1.1}, 24000, "Take care!")
+    assert key != cache_key("voice-a", "sonic-2", {"speed": 1.0}, 16000, "Take care!")
+    assert key != cache_key("voice-a", "sonic-2", {"speed": 1.0}, 24000, "take care!")
+
+
+def test_allowlist_holds_sentences_as_the_tts_aggregator_splits_them():
+    allowed = phrase_allowlist(["Transferring you now. Please hold!", "Take care!"])
+    assert allowed == {"Transferring you now.", "Please hold!", "Take care!"}
+
+
+def test_workflow_phrases_include_configured_and_safety_messages():
+    config = {
+        "services": {"tts": {"cache_phrases": ["Thanks for calling Demo Clinic."]}},
+        "safety_monitors": {"emergency_message": "Please hang up and dial 911."},
+    }
+    phrases = workflow_phrases(config)
+    assert "Thanks for calling Demo Clinic." in phrases
+    assert "Please hang up and dial 911." in phrases
+    assert "Take care!" in phrases
+
+
+async def test_disk_tier_survives_a_new_process_cache(tmp_path):
+    await PhraseAudioCache(directory=tmp_path).put("ab" * 32, b"\x01\x02" * 100)
+
+    fresh = PhraseAudioCache(directory=tmp_path)
+    assert await fresh.get("ab" * 32) == b"\x01\x02" * 100
+    assert await fresh.get("ab" * 32) == b"\x01\x02" * 100
+    assert (fresh.disk_hits, fresh.memory_hits) == (1, 1)
+    assert await fresh.get("cd" * 32) is None
+    assert fresh.misses == 1
+
+
+async def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = PhraseAudioCache(directory=tmp_path, memory_limit_bytes=250)
+    for key in ("a", "b"):
+        await cache.put(key, bytes(100))
+    await cache.get("a")  # "b" is now least recently used
+    await cache.put("c", bytes(100))
+
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.stats()["memory_bytes"] == 200
+
+
+async def test_warm_renders_a_missed_phrase_once(tmp_path, monkeypatch):
+    renders = []
+
+    async def fake_render(text, *, sample_rate, **params):
+        renders.append(text)
+        await asyncio.sleep(0.01)
+        return b"\x00\x01" * 10
+
+    monkeypatch.setattr(tts_cache, "render_phrase", fake_render)
+    cache = PhraseAudioCache(directory=tmp_path)
+
+    for _ in range(3):
+        cache.warm("k" * 64, "Take care!", {"voice_id": "v", "model": "m"}, 24000)
+    await asyncio.gather(*cache._background_tasks)
+
+    assert renders == ["Take care!"]
+    assert await cache.get("k" * 64) == b"\x00\x01" * 10
+
+
+async def test_cache_hit_emits_words_and_stopped_frame(tmp_path):
+    cache = PhraseAudioCache(directory=tmp_path)
+    await cache.put(cache_key("voice-a", "sonic-2", None, 24000, "Take care!"), bytes(4800))
+    tts = OfflineCachedTTS(
+        api_key="test-key", voice_id="voice-a", model="sonic-2", sample_rate=24000,
+        phrase_cache=cache, phrases=["Take care!"], render_params=RENDER_PARAMS,
+    )
+    collector = Collector()
+    task = PipelineTask(Pipeline([tts, collector]), cancel_on_idle_timeout=False)
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        await task.queue_frame(TTSSpeakFrame("Take care!"))
+        await asyncio.sleep(0.3)
+        # Cartesia pauses frame processing until the (absent) output transport stops speaking
+        await task.queue_frames([BotStoppedSpeakingFrame(), EndFrame()])
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+
+    assert tts.cache_hits == 1
+    words = [f.text for f in collector.frames if isinstance(f, TTSTextFrame)]
+    assert words == ["Take", "care!"]
+    assert any(isinstance(f, TTSStoppedFrame) for f in collector.frames)
+
+
+async def test_hit_is_synthesized_live_while_earlier_audio_is_pending(tmp_path, monkeypatch):
+    live = []
+
+    async def fake_live_tts(self, text, *args):
+        live.append(text)
+        yield None
+
+    monkeypatch.setattr(tts_cache.CartesiaTTSService, "run_tts", fake_live_tts)
+    cache = PhraseAudioCache(directory=tmp_path)
+    await cache.put(cache_key("voice-a", "sonic-2", None, 24000, "Take care!"), bytes(4800))
+    tts = OfflineCachedTTS(
+        api_key="test-key", voice_id="voice-a", model="sonic-2", sample_rate=24000,
+        phrase_cache=cache, phrases=["Take care!"], render_params=RENDER_PARAMS,
+    )
+    tts._sample_rate = 24000  # Normally set by StartFrame
+
+    tts._context_id = "live"  # A response still streaming into an open context
+    [frame async for frame in tts.run_tts("Take care!")]
+    tts._context_id = None
+    tts._contexts["flushed"] = asyncio.Queue()  # Flushed but not yet played out
+    [frame async for frame in tts.run_tts("Take care!")]
+
+    assert live == ["Take care!", "Take care!"]
+    assert tts.cache_hits == 0
+
+
+def test_runtime_allowlist_matches_prerendered_phrases():
+    config = {
+        "services": {"tts": {"api_key": "test-key", "voice_id": "voice-a", "model": "sonic-2"}},
+        "safety_monitors": {"emergency_message": "Please hang up and dial 911 now."},
+    }
+    tts = ServiceFactory.create_tts(config["services"]["tts"], workflow_phrases(config))
+
+    assert tts._phrases == phrase_allowlist(workflow_phrases(config))
+    assert "Please hang up and dial 911 now." in tts._phrases
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from backend import webhook_delivery
+from backend.webhook_delivery import (
+    BACKOFF_BASE_SECONDS,
+    BACKOFF_MAX_SECONDS,
+    LEASE_SECONDS,
+    MAX_ATTEMPTS,
+    DeliveryResult,
+    WebhookDeliveryWorker,
+    WebhookSender,
+    backoff_delay,
+    signed_headers,
+)
+from evals.loadtest.webhook_bench import BENCH_SECRET, LocalWebhookReceiver
+
+
+class FakeCollection:
+    """In-memory stand-in for the claim query's find_one_and_update."""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    @staticmethod
+    def _matches(doc, query):
+        return doc["status"] in query["status"]["$in"] and doc["next_attempt_at"] <= query["next_attempt_at"]["$lte"]
+
+    async def find_one_and_update(self, query, update, sort, return_document):
+        candidates = sorted((d for d in self.docs if self._matches(d, query)), key=lambda d: d["next_attempt_at"])
+        if not candidates:
+            return None
+        doc = candidates[0]
+        doc.update(update["$set"])
+        for key, n in update["$inc"].items():
+            doc[key] = doc.get(key, 0) + n
+        return dict(doc)
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+def make_worker(docs=()):
+    db = FakeDB()
+    db[webhook_delivery.WEBHOOK_DELIVERIES_COLLECTION] = FakeCollection(docs)
+    return WebhookDeliveryWorker(db=db)
+
+
+def delivery(attempts=1, **fields):
+    return {
+        "_id": ObjectId(), "webhook_id": ObjectId(), "event_type": "call.completed",
+        "url": "http://hooks.example/x", "attempts": attempts, **fields,
+    }
+
+
+# ==================== Backoff ====================
+
+@pytest.mark.parametrize("attempt", range(1, 15))
+def test_backoff_doubles_with_jitter_and_caps(attempt):
+    expected = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    assert 0.8 * expected <= backoff_delay(attempt) <= 1.2 * expected
+
+
+# ==================== Lease / claim ====================
+
+async def test_claim_takes_due_delivery_and_leases_it():
+    now = datetime.now(timezone.utc)
+    due = {"_id": 1, "status": "pending", "next_attempt_at": now - timedelta(seconds=1), "attempts": 0}
+    later = {"_id": 2, "status": "pending", "next_attempt_at": now + timedelta(minutes=5), "attempts": 0}
+    worker = make_worker([later, due])
+
+    claimed = await worker._claim()
+
+    assert claimed["_id"] == 1
+    assert claimed["status"] == "in_flight"
+    assert claimed["attempts"] == 1
+    assert claimed["next_attempt_at"] >= now + timedelta(seconds=LEASE_SECONDS - 1)
+    # Leased now, so it isn't handed out twice
+    assert await worker._claim() is None
+
+
+async def test_expired_lease_is_reclaimed():
+    now = datetime.now(timezone.utc)
+    stuck = {"_id": 1, "status": "in_flight", "next_attempt_at": now - timedelta(seconds=1), "attempts": 2}
+    live = {"_id": 2, "status": "in_flight", "next_attempt_at": now + timedelta(seconds=30), "attempts": 1}
+    worker = make_worker([stuck, live])
+
+    claimed = await worker._claim()
+
+    assert claimed["_id"] == 1
+    assert claimed["attempts"] == 3
+    assert await worker._claim() is None
+
+
+# ==================== Recording results ====================
+
+def recorded_update(worker):
+    (op,) = worker._delivery_ops
+    return op._doc["$set"]
+
+
+def test_retryable_failure_is_rescheduled_with_backoff():
+    worker = make_worker()
+    before = datetime.now(timezone.utc)
+
+    worker._record(delivery(attempts=2), DeliveryResult(False, 503, "HTTP 503", retryable=True))
+
+    update = recorded_update(worker)
+    assert update["status"] == "pending"
+    delay = (update["next_attempt_at"] - before).total_seconds()
+    assert 0.8 * BACKOFF_BASE_SECONDS * 2 <= delay <= 1.2 * BACKOFF_BASE_SECONDS * 2 + 1
+    assert worker.retried == 1
+
+
+@pytest.mark.parametrize("attempts,retryable", [(MAX_ATTEMPTS, True), (1, False)])
+def test_last_attempt_or_permanent_error_fails_delivery(attempts, retryable):
+    worker = make_worker()
+
+    worker._record(delivery(attempts=attempts), DeliveryResult(False, 400, "HTTP 400", retryable=retryable))
+
+    update = recorded_update(worker)
+    assert update["status"] == "failed"
+    assert "completed_at" in update
+    assert worker.failed == 1
+
+
+async def test_unexpected_send_error_is_recorded_as_retryable_failure():
+    class BrokenSender:
+        async def send(self, url, body, headers):
+            raise ValueError("invalid URL")
+
+    worker = make_worker()
+    worker.sender = BrokenSender()
+
+    await worker._deliver(delivery(attempts=MAX_ATTEMPTS, body="{}", headers={}))
+
+    update = recorded_update(worker)
+    assert update["status"] == "failed"
+    assert worker.failed == 1
+
+
+def test_success_marks_delivered_and_resets_failures():
+    worker = make_worker()
+
+    worker._record(delivery(), DeliveryResult(True, 204))
+
+    assert recorded_update(worker)["status"] == "delivered"
+    (webhook_op,) = worker._webhook_ops
+    assert webhook_op._doc["$set"]["failure_count"] == 0
+    assert len(worker._log_docs) == 1
+
+
+# ==================== Sender against the local receiver ====================
+
+def signed(secret=BENCH_SECRET):
+    body = b'{"event": "call.completed"}'
+    return body, signed_headers("call.completed", "2026-01-01T00:00:00Z", body, secret)
+
+
+async def test_sender_reuses_pooled_connections():
+    sender = WebhookSender(per_endpoint_concurrency=2)
+    async with LocalWebhookReceiver() as receiver:
+        body, headers = signed()
+        results = [await sender.send(receiver.url, body, headers) for _ in range(20)]
+        await sender.close()
+
+    assert all(r.success for r in results)
+    assert len(receiver.received) == 20
+    assert receiver.connections <= 2
+
+
+async def test_sender_classifies_failures():
+    sender = WebhookSender()
+    async with LocalWebhookReceiver(fail_rate=1.0) as failing:
+        unavailable = await sender.send(failing.url, *signed())
+        bad_signature = await sender.send(failing.url, *signed("wrong-secret"))
+    await sender.close()
+
+    assert unavailable.status_code == 503 and unavailable.retryable
+    assert bad_signature.status_code == 401 and not bad_signature.retryable
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from pipeline.worker import CallWorker
+
+
+def burn(seconds: float) -> None:
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+async def busy_call(cpu_seconds: float) -> None:
+    async def child():
+        burn(cpu_seconds)
+        await asyncio.sleep(0)
+
+    # Work in a task the call spawns is charged to the call too
+    await asyncio.create_task(child())
+
+
+async def run_calls(worker: CallWorker, calls: dict) -> dict:
+    await worker.start()
+    try:
+        await asyncio.gather(*(worker.submit(session_id, cpu) for session_id, cpu in calls.items()))
+    finally:
+        await worker.stop()
+    return {r.session_id: r for r in worker._finished}
+
+
+async def test_cpu_is_charged_to_the_call_that_spent_it():
+    worker = CallWorker(busy_call, cpu_accounting=True)
+    resources = await run_calls(worker, {"heavy-call": 0.2, "light-call": 0.0})
+
+    assert resources["heavy-call"].cpu_seconds >= 0.18
+    assert resources["light-call"].cpu_seconds < 0.05
+    assert resources["heavy-call"].task_steps > 0
+    assert asyncio.get_running_loop().get_task_factory() is None
+
+
+async def test_cpu_accounting_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("WORKER_CPU_ACCOUNTING", raising=False)
+    worker = CallWorker(busy_call)
+    resources = await run_calls(worker, {"call": 0.01})
+
+    assert resources["call"].status == "completed"
+    assert resources["call"].task_steps == 0
+
+
+async def test_existing_task_factory_disables_accounting():
+    loop = asyncio.get_running_loop()
+
+    def factory(loop, coro, **kwargs):
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(factory)
+    try:
+        worker = CallWorker(busy_call, cpu_accounting=True)
+        resources = await run_calls(worker, {"call": 0.01})
+        assert loop.get_task_factory() is factory
+    finally:
+        loop.set_task_factory(None)
+
+    assert resources["call"].status == "completed"
+    assert resources["call"].task_steps == 0